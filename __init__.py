@@ -34,11 +34,38 @@ from . import (
     preferences,
     panels,
     config_manager,
+    watcher,
+    prefetch,
+    image_memory,
+    render,
+    image_ops,
+    previews,
+    frame_share,
+    image_encode,
+    tiling,
+    manifest,
+    camera_import,
+    camera_export,
+    snapshot,
+    planner,
+    async_runtime,
+    node_params,
+    sequences,
+    journal,
+    file_io,
+    profiler,
+    memory_report,
+    metrics,
 )
 
 # Hot reload support for development
 if "bpy" in locals():
     import importlib
+    importlib.reload(async_runtime)
+    importlib.reload(node_params)
+    importlib.reload(file_io)
+    importlib.reload(metrics)
+    importlib.reload(profiler)
     importlib.reload(utils)
     importlib.reload(properties)
     importlib.reload(operators)
@@ -46,6 +73,23 @@ if "bpy" in locals():
     importlib.reload(preferences)
     importlib.reload(panels)
     importlib.reload(config_manager)
+    importlib.reload(watcher)
+    importlib.reload(prefetch)
+    importlib.reload(image_memory)
+    importlib.reload(render)
+    importlib.reload(image_ops)
+    importlib.reload(previews)
+    importlib.reload(frame_share)
+    importlib.reload(image_encode)
+    importlib.reload(tiling)
+    importlib.reload(manifest)
+    importlib.reload(camera_import)
+    importlib.reload(camera_export)
+    importlib.reload(snapshot)
+    importlib.reload(planner)
+    importlib.reload(sequences)
+    importlib.reload(journal)
+    importlib.reload(memory_report)
 
 # -------------------------------------------------------------------
 # REGISTRATION
@@ -62,6 +106,8 @@ def register():
     ui_lists.register()
     preferences.register()
     panels.register()
+    previews.register()
+    sequences.register()
 
     # Register handlers
     bpy.app.handlers.load_post.append(config_manager.load_handler)
@@ -81,6 +127,22 @@ def unregister():
     if bpy.app.timers.is_registered(config_manager.delayed_config_load):
         bpy.app.timers.unregister(config_manager.delayed_config_load)
 
+    # Stop background workers
+    watcher.stop_watching()
+    prefetch.cancel()
+    previews.unregister()
+    sequences.unregister()
+    frame_share.release_all()
+    tiling.release_staging()
+    snapshot.clear()
+    planner.clear()
+    node_params.clear_cache()
+    journal.clear_cache()
+    profiler.clear()
+    memory_report.clear()
+    metrics.flush()
+    async_runtime.shutdown()
+
     # Unregister in reverse order
     panels.unregister()
     preferences.unregister()
@@ -0,0 +1,165 @@
+"""
+Cooperative asyncio runtime stepped from a single bpy.app.timers callback
+
+All background work of the add-on (watcher, prefetch, previews) runs as
+tasks on one private event loop. The loop only ever runs on Blender's main
+thread, inside _tick(), so code between two awaits may use bpy freely.
+Blocking work (file reads, decoding, hashing) hops to worker threads with
+run_in_thread() and resumes on the main thread when it is done.
+"""
+
+import bpy
+import time
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+# Seconds of loop work per timer tick, so the UI never stalls on background tasks
+TICK_BUDGET = 0.008
+
+# Shortest and longest interval of the driving timer while tasks exist. When
+# every task is waiting, the timer sleeps until the earliest asyncio timer is
+# due, but at most IDLE_INTERVAL so results from threads are picked up.
+TICK_INTERVAL = 0.01
+IDLE_INTERVAL = 0.05
+
+# Worker threads for run_in_thread()
+MAX_WORKERS = 4
+
+_loop = None
+_executor = None
+
+# Timer-style callbacks -> task running them (see schedule())
+_periodic = {}
+
+
+def _get_loop():
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+    return _loop
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="AIWorkflowAsync")
+    return _executor
+
+
+def _has_tasks():
+    return _loop is not None and not _loop.is_closed() and bool(asyncio.all_tasks(_loop))
+
+
+def _step_once(loop):
+    """Runs the callbacks that are ready right now (one loop iteration, no blocking)."""
+    loop.call_soon(loop.stop)
+    loop.run_forever()
+
+
+def _ready_count(loop):
+    # asyncio has no public "is anything runnable" query; BaseEventLoop keeps
+    # runnable callbacks in _ready. Without it, one step per tick is taken.
+    return len(getattr(loop, "_ready", ()))
+
+
+def _next_delay(loop):
+    """Seconds until the loop has work again, clamped to [TICK_INTERVAL, IDLE_INTERVAL]."""
+    if _ready_count(loop):
+        return TICK_INTERVAL
+    scheduled = getattr(loop, "_scheduled", None)
+    if scheduled:
+        return min(max(scheduled[0].when() - loop.time(), TICK_INTERVAL), IDLE_INTERVAL)
+    return IDLE_INTERVAL
+
+
+def _tick():
+    """The only bpy.app.timers callback: steps the loop within TICK_BUDGET."""
+    loop = _get_loop()
+    deadline = time.perf_counter() + TICK_BUDGET
+    while True:
+        _step_once(loop)
+        if time.perf_counter() >= deadline or not _ready_count(loop):
+            break
+    return _next_delay(loop) if _has_tasks() else None
+
+
+def _ensure_ticking():
+    if not bpy.app.timers.is_registered(_tick):
+        bpy.app.timers.register(_tick, first_interval=0.0, persistent=True)
+
+
+def spawn(coro, name=None):
+    """Schedules a coroutine on the runtime; returns its asyncio.Task. Main thread only."""
+    task = _get_loop().create_task(coro, name=name)
+    _ensure_ticking()
+    return task
+
+
+async def run_in_thread(func, *args, **kwargs):
+    """Awaits func(*args, **kwargs) on a worker thread; execution resumes on the main thread."""
+    return await _get_loop().run_in_executor(_get_executor(), functools.partial(func, *args, **kwargs))
+
+
+async def _periodic_loop(func, delay):
+    try:
+        while delay is not None:
+            await asyncio.sleep(delay)
+            delay = func()
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"Async runtime: '{func.__name__}' failed and was stopped: {e}")
+    finally:
+        if _periodic.get(func) is asyncio.current_task():
+            del _periodic[func]
+
+
+def schedule(func, first_interval=0.0):
+    """
+    Runs a timer-style callback on the runtime instead of its own bpy timer.
+
+    Same contract as bpy.app.timers.register: func returns the delay until
+    its next call, or None to stop. Scheduling an already scheduled
+    function does nothing.
+    """
+    if is_scheduled(func):
+        return
+    _periodic[func] = spawn(_periodic_loop(func, first_interval), name=func.__name__)
+
+
+def is_scheduled(func):
+    task = _periodic.get(func)
+    return task is not None and not task.done()
+
+
+def unschedule(func):
+    task = _periodic.pop(func, None)
+    if task is not None and not task.done():
+        task.cancel()
+
+
+def task_count():
+    """Number of live tasks on the runtime."""
+    return len(asyncio.all_tasks(_loop)) if _loop is not None and not _loop.is_closed() else 0
+
+
+def shutdown():
+    """Cancels every task, lets them unwind, and stops the timer and worker threads."""
+    global _loop, _executor
+
+    if _loop is not None and not _loop.is_closed():
+        tasks = asyncio.all_tasks(_loop)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            _loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        _loop.close()
+    _loop = None
+    _periodic.clear()
+
+    if bpy.app.timers.is_registered(_tick):
+        bpy.app.timers.unregister(_tick)
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -0,0 +1,122 @@
+"""
+Benchmark: add-on hot paths on the fake bpy package (no Blender)
+
+Loads the add-on on top of tests/fake_bpy and times config save/load for
+many actions, action execution through bpy.ops and the image utilities.
+Numbers measure the add-on's Python and NumPy work only; Blender's own
+costs (image decode, redraws, RNA access) are not modelled.
+
+    python benchmarks/bench_addon.py [--actions 200] [--size 1024] [--repeat 5]
+"""
+
+import io
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tests" / "fake_bpy"))
+
+from addon_loader import load_addon  # noqa: E402
+
+
+def best_of(repeat, func, setup=None):
+    """Best wall time in ms of func() over repeat runs; add-on output is silenced."""
+    best = float('inf')
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def fill_actions(props, count, out_dir):
+    props.actions.clear()
+    for index in range(count):
+        action = props.actions.add()
+        action.button_name = f"Action {index}"
+        if index % 2:
+            action.action_type = 'IMAGE_SAVE'
+            item = action.images_to_save.add()
+            item.name = "Result"
+            item.save_as = str(out_dir / f"result_{index}.png")
+        else:
+            action.select_camera = True
+            action.camera_name = f"Cam{index % 8}"
+            param = action.node_params.add()
+            param.path = "KSampler.inputs[seed]"
+            param.value = str(index)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--actions", type=int, default=200)
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv[1:])
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        addon = load_addon()
+    import bpy
+    import numpy as np
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        addon.config_manager.get_config_path = lambda: tmp / "config.json"
+        bpy.context.preferences.addons[addon.__name__].preferences.journal_directory = str(tmp)
+        props = bpy.context.scene.my_addon_props
+        fill_actions(props, args.actions, tmp)
+
+        results = []
+        results.append((f"save_config ({args.actions} actions)",
+                        best_of(args.repeat, lambda: addon.config_manager.save_config(props.actions))))
+        results.append((f"load_config ({args.actions} actions)",
+                        best_of(args.repeat, lambda: addon.config_manager.load_config(bpy.context))))
+
+        # Action execution: camera select with a node parameter, and a single image save
+        tree = bpy.data.node_groups.new("Workflow", 'ComfyUITree')
+        tree.nodes.new('KSampler').inputs.new('NodeSocketInt', "seed")
+        props.actions[0].change_node_tree = True
+        props.actions[0].node_tree_name = tree.name
+
+        size = args.size
+        rng = np.random.default_rng(0)
+        pixels = rng.random(size * size * 4, dtype=np.float32)
+        for name in ("Result", "Other"):
+            bpy.data.images.new(name, size, size, float_buffer=True).pixels.foreach_set(pixels)
+
+        results.append(("execute camera select + node param",
+                        best_of(args.repeat, lambda: bpy.ops.ai_workflow.execute_action(action_index=0))))
+        results.append((f"execute image save ({size}x{size})",
+                        best_of(args.repeat, lambda: bpy.ops.ai_workflow.execute_action(action_index=1))))
+
+        options = props.actions[1].images_to_save[0]
+        options.custom_output = True
+        options.bit_depth = '16'
+        results.append((f"save_image_to_file custom 16-bit ({size}x{size})",
+                        best_of(args.repeat, lambda: addon.utils.save_image_to_file(
+                            "Result", str(tmp / "custom.png"), options=options))))
+        results.append((f"build_depth_map ({size}x{size})",
+                        best_of(args.repeat, lambda: addon.image_ops.build_depth_map(
+                            "Result", "Depth", clip_mode='PERCENTILE'))))
+        results.append((f"compare_images with heat map ({size}x{size})",
+                        best_of(args.repeat, lambda: addon.image_ops.compare_images(
+                            "Result", "Other", diff_name="Diff"))))
+
+        addon.prefetch.cancel()
+        addon.async_runtime.shutdown()
+
+    width = max(len(label) for label, _ in results)
+    print(f"{'benchmark':<{width}} {'best ms':>9}")
+    for label, ms in results:
+        print(f"{label:<{width}} {ms:>9.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
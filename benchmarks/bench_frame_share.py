@@ -0,0 +1,115 @@
+"""
+Benchmark: PNG round-trip vs. shared memory / memory-mapped .npy frame handoff
+
+Runs in plain Python (NumPy only, no Blender). The PNG path is a minimal
+8-bit encoder/decoder built on zlib with no per-row filtering, so it is a
+lower bound for what img.save() + an external PNG decode costs.
+
+    python benchmarks/bench_frame_share.py [--sizes 1024 2048 4096] [--repeat 5]
+"""
+
+import os
+import sys
+import time
+import zlib
+import struct
+import argparse
+import tempfile
+from pathlib import Path
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def _png_chunk(tag, data):
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+
+def png_roundtrip(pixels, path):
+    """Producer quantizes and encodes; consumer reads and decodes back to float."""
+    height, width, channels = pixels.shape
+    quantized = np.clip(pixels * 255.0 + 0.5, 0, 255).astype(np.uint8)
+    raw = np.zeros((height, width * channels + 1), dtype=np.uint8)
+    raw[:, 1:] = quantized[::-1].reshape(height, -1)
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    with open(path, 'wb') as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(_png_chunk(b"IHDR", header))
+        f.write(_png_chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)))
+        f.write(_png_chunk(b"IEND", b""))
+
+    data = Path(path).read_bytes()
+    idat = data[data.index(b"IDAT") + 4:data.index(b"IEND") - 8]
+    decoded = np.frombuffer(zlib.decompress(idat), dtype=np.uint8).reshape(height, -1)[:, 1:]
+    return decoded.reshape(height, width, channels).astype(np.float32) / 255.0
+
+
+def npy_roundtrip(pixels, path):
+    """Producer writes into a memory-mapped .npy; consumer maps it read-only."""
+    tmp = path.with_suffix(".tmp.npy")
+    mapped = np.lib.format.open_memmap(tmp, mode='w+', dtype=np.float32, shape=pixels.shape)
+    np.copyto(mapped, pixels)
+    mapped.flush()
+    del mapped
+    os.replace(tmp, path)
+    view = np.load(path, mmap_mode='r')
+    return float(view[0, 0, 0])
+
+
+def shm_roundtrip(pixels, segment):
+    """Producer copies into shared memory; consumer attaches a view."""
+    np.copyto(np.ndarray(pixels.shape, dtype=np.float32, buffer=segment.buf), pixels)
+    reader = shared_memory.SharedMemory(name=segment.name)
+    view = np.ndarray(pixels.shape, dtype=np.float32, buffer=reader.buf)
+    value = float(view[0, 0, 0])
+    del view
+    reader.close()
+    return value
+
+
+def _time(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1024, 2048, 4096])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    print(f"{'size':>10} {'PNG (ms)':>10} {'NPY (ms)':>10} {'SHM (ms)':>10} {'NPY x':>7} {'SHM x':>7}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes:
+            # Smooth content so PNG compression is representative of renders
+            ramp = np.linspace(0.0, 1.0, size, dtype=np.float32)
+            pixels = np.empty((size, size, 4), dtype=np.float32)
+            pixels[:, :, 0] = ramp[None, :]
+            pixels[:, :, 1] = ramp[:, None]
+            pixels[:, :, 2] = rng.random((size, size), dtype=np.float32) * 0.05
+            pixels[:, :, 3] = 1.0
+
+            png_path = Path(tmp_dir) / "frame.png"
+            npy_path = Path(tmp_dir) / "frame.npy"
+            segment = shared_memory.SharedMemory(create=True, size=pixels.nbytes)
+            try:
+                t_png = _time(lambda: png_roundtrip(pixels, png_path), args.repeat)
+                t_npy = _time(lambda: npy_roundtrip(pixels, npy_path), args.repeat)
+                t_shm = _time(lambda: shm_roundtrip(pixels, segment), args.repeat)
+            finally:
+                segment.close()
+                segment.unlink()
+
+            print(f"{size:>5}x{size:<4} {t_png * 1e3:>10.1f} {t_npy * 1e3:>10.1f} {t_shm * 1e3:>10.1f} "
+                  f"{t_png / t_npy:>6.1f}x {t_png / t_shm:>6.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
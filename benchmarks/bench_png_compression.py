@@ -0,0 +1,75 @@
+"""
+Benchmark: PNG compression level vs. encode speed and file size
+
+Runs in plain Python (NumPy only, no Blender) using the add-on's own
+encoder in image_encode.py. Pixels are a smooth gradient with noise, which
+is closer to rendered frames than random data.
+
+    python benchmarks/bench_png_compression.py [--size 2048] [--bit-depth 8] [--repeat 3]
+"""
+
+import io
+import sys
+import time
+import argparse
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+
+
+def _load_image_encode():
+    path = Path(__file__).resolve().parent.parent / "image_encode.py"
+    spec = importlib.util.spec_from_file_location("image_encode", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_frame(size, seed=0):
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:size, 0:size].astype(np.float32) / size
+    pixels = np.empty((size, size, 4), dtype=np.float32)
+    pixels[:, :, 0] = x
+    pixels[:, :, 1] = y
+    pixels[:, :, 2] = 0.5 * (x + y)
+    pixels[:, :, :3] += rng.normal(0.0, 0.02, (size, size, 3)).astype(np.float32)
+    pixels[:, :, 3] = 1.0
+    return pixels
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=2048)
+    parser.add_argument("--bit-depth", type=int, choices=(8, 16), default=8)
+    parser.add_argument("--dither", default="NONE", choices=("NONE", "ORDERED", "BLUE_NOISE"))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv[1:])
+
+    image_encode = _load_image_encode()
+    pixels = make_frame(args.size)
+
+    start = time.perf_counter()
+    array = image_encode.prepare_pixels(pixels, bit_depth=args.bit_depth,
+                                        color_transform='LINEAR_TO_SRGB', dither=args.dither)
+    convert_ms = (time.perf_counter() - start) * 1000.0
+    raw_mb = array.nbytes / (1024 * 1024)
+    print(f"{args.size}x{args.size} RGBA, {args.bit_depth}-bit, dither={args.dither}: "
+          f"conversion {convert_ms:.1f} ms, raw {raw_mb:.1f} MB")
+    print(f"{'level':>5} {'encode ms':>10} {'MB/s':>8} {'size MB':>8} {'ratio':>6}")
+
+    for level in range(10):
+        best = float('inf')
+        size = 0
+        for _ in range(args.repeat):
+            buffer = io.BytesIO()
+            start = time.perf_counter()
+            size = image_encode.write_png(buffer, array, level)
+            best = min(best, time.perf_counter() - start)
+        print(f"{level:>5} {best * 1000.0:>10.1f} {raw_mb / best:>8.1f} "
+              f"{size / (1024 * 1024):>8.2f} {array.nbytes / size:>6.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
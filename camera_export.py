@@ -0,0 +1,318 @@
+"""
+Vectorized export of camera intrinsics and extrinsics over frame ranges
+"""
+
+import bpy
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+
+from . import utils
+from . import file_io
+
+# Blender camera space (looking down -Z, Y up) to OpenCV camera space (Z forward, Y down)
+BLENDER_TO_CV = np.diag([1.0, -1.0, -1.0])
+
+# Camera data properties exported per frame (animatable)
+CAMERA_DATA_PATHS = ("lens", "shift_x", "shift_y", "clip_start", "clip_end", "ortho_scale",
+                     "sensor_width", "sensor_height")
+
+# Object transform properties evaluated from F-Curves
+TRANSFORM_PATHS = {
+    "location": 3,
+    "rotation_euler": 3,
+    "rotation_quaternion": 4,
+    "rotation_axis_angle": 4,
+    "scale": 3,
+}
+
+
+def action_camera_names(actions):
+    """Unique camera names referenced by actions, in action order."""
+    names = []
+    for action in actions:
+        if action.camera_name and action.camera_name not in names:
+            names.append(action.camera_name)
+    return names
+
+
+def _has_drivers(id_block):
+    anim = id_block.animation_data
+    return anim is not None and len(anim.drivers) > 0
+
+
+def _has_nla(id_block):
+    anim = id_block.animation_data
+    return anim is not None and len(anim.nla_tracks) > 0
+
+
+def _has_delta_transform(obj):
+    return (any(obj.delta_location) or any(obj.delta_rotation_euler)
+            or tuple(obj.delta_rotation_quaternion) != (1.0, 0.0, 0.0, 0.0)
+            or tuple(obj.delta_scale) != (1.0, 1.0, 1.0))
+
+
+def needs_frame_set(obj):
+    """
+    True if a camera's transform cannot be computed from its own F-Curves.
+
+    Parents, constraints, drivers, NLA tracks and delta transforms all
+    depend on depsgraph evaluation; such cameras fall back to frame_set.
+    """
+    if obj.parent is not None or len(obj.constraints) > 0:
+        return True
+    if _has_drivers(obj) or _has_nla(obj) or _has_delta_transform(obj):
+        return True
+    return _has_drivers(obj.data) or _has_nla(obj.data)
+
+
+def evaluate_channels(id_block, data_path, frames, default):
+    """
+    Returns (F, K) values of a property over frames.
+
+    Animated components are evaluated with FCurve.evaluate (no depsgraph
+    update); the others keep the property's current value.
+    """
+    default = np.atleast_1d(np.asarray(default, dtype=np.float64))
+    values = np.broadcast_to(default, (len(frames), default.size)).copy()
+    fcurves = utils.get_fcurves(id_block)
+    if fcurves is None:
+        return values
+    for index in range(default.size):
+        fcurve = fcurves.find(data_path, index=index)
+        if fcurve is not None and not fcurve.mute:
+            values[:, index] = np.fromiter((fcurve.evaluate(f) for f in frames), dtype=np.float64, count=len(frames))
+    return values
+
+
+def euler_to_matrices(angles, order='XYZ'):
+    """(F, 3) Euler angles in radians to (F, 3, 3) rotation matrices (Blender rotation orders)."""
+    cos = np.cos(angles)
+    sin = np.sin(angles)
+    count = angles.shape[0]
+    axes = {}
+    for i, axis in enumerate("XYZ"):
+        m = np.zeros((count, 3, 3))
+        c, s = cos[:, i], sin[:, i]
+        j, k = [a for a in range(3) if a != i]
+        m[:, i, i] = 1.0
+        m[:, j, j] = c
+        m[:, k, k] = c
+        # Right-handed rotation about axis i
+        sign = 1.0 if (k - j) % 3 == 1 else -1.0
+        m[:, k, j] = sign * s
+        m[:, j, k] = -sign * s
+        axes[axis] = m
+    # 'XYZ' applies X first, so the matrix is Rz @ Ry @ Rx
+    result = axes[order[2]] @ axes[order[1]] @ axes[order[0]]
+    return result
+
+
+def quaternion_to_matrices(quats):
+    """(F, 4) quaternions (w, x, y, z) to (F, 3, 3) rotation matrices."""
+    q = quats / np.linalg.norm(quats, axis=1, keepdims=True).clip(1e-12)
+    w, x, y, z = q.T
+    return np.stack([
+        np.stack([1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)], axis=-1),
+        np.stack([2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)], axis=-1),
+        np.stack([2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)], axis=-1),
+    ], axis=1)
+
+
+def axis_angle_to_quaternions(axis_angles):
+    """(F, 4) axis-angle (angle, x, y, z) to (F, 4) quaternions."""
+    angle = axis_angles[:, 0]
+    axis = axis_angles[:, 1:]
+    axis = axis / np.linalg.norm(axis, axis=1, keepdims=True).clip(1e-12)
+    half = angle / 2.0
+    return np.column_stack([np.cos(half), axis * np.sin(half)[:, None]])
+
+
+def _matrix_world_from_fcurves(obj, frames):
+    """Composes (F, 4, 4) world matrices of an unparented, unconstrained object with NumPy."""
+    loc = evaluate_channels(obj, "location", frames, obj.location)
+    scale = evaluate_channels(obj, "scale", frames, obj.scale)
+
+    mode = obj.rotation_mode
+    if mode == 'QUATERNION':
+        rot = quaternion_to_matrices(evaluate_channels(obj, "rotation_quaternion", frames, obj.rotation_quaternion))
+    elif mode == 'AXIS_ANGLE':
+        axis_angle = evaluate_channels(obj, "rotation_axis_angle", frames, obj.rotation_axis_angle)
+        rot = quaternion_to_matrices(axis_angle_to_quaternions(axis_angle))
+    else:
+        rot = euler_to_matrices(evaluate_channels(obj, "rotation_euler", frames, obj.rotation_euler), mode)
+
+    matrices = np.zeros((len(frames), 4, 4))
+    matrices[:, :3, :3] = rot * scale[:, None, :]
+    matrices[:, :3, 3] = loc
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+
+def _camera_data_from_fcurves(cam, frames):
+    return {path: evaluate_channels(cam, path, frames, getattr(cam, path))[:, 0] for path in CAMERA_DATA_PATHS}
+
+
+def intrinsics(data, render, sensor_fit, camera_type):
+    """
+    (F, 3, 3) OpenCV-style intrinsic matrices in pixels for per-frame camera data.
+
+    Follows Blender's sensor fit rules; shift is in units of the larger
+    (or fitted) image dimension. Orthographic cameras get the scale matrix
+    mapping camera-space units to pixels instead of a focal length.
+    """
+    scale = render.resolution_percentage / 100.0
+    res_x = render.resolution_x * scale
+    res_y = render.resolution_y * scale
+    pixel_aspect = render.pixel_aspect_y / render.pixel_aspect_x
+
+    if sensor_fit == 'AUTO':
+        horizontal = res_x >= res_y * pixel_aspect
+        sensor = data["sensor_width"]
+    else:
+        horizontal = sensor_fit == 'HORIZONTAL'
+        sensor = data["sensor_width"] if horizontal else data["sensor_height"]
+    view_fac = res_x if horizontal else res_y * pixel_aspect
+
+    if camera_type == 'ORTHO':
+        s_u = view_fac / data["ortho_scale"]
+    else:
+        s_u = view_fac * data["lens"] / sensor
+    s_v = s_u / pixel_aspect
+
+    count = len(data["lens"])
+    k = np.zeros((count, 3, 3))
+    k[:, 0, 0] = s_u
+    k[:, 1, 1] = s_v
+    k[:, 0, 2] = res_x / 2.0 - data["shift_x"] * view_fac
+    k[:, 1, 2] = res_y / 2.0 + data["shift_y"] * view_fac / pixel_aspect
+    k[:, 2, 2] = 1.0
+    return k
+
+
+def _sample_with_frame_set(scene, objects, frames):
+    """Evaluates world matrices and camera data of several cameras with one frame_set per frame."""
+    results = {obj.name: (np.zeros((len(frames), 4, 4)), {p: np.zeros(len(frames)) for p in CAMERA_DATA_PATHS})
+               for obj in objects}
+    original_frame = scene.frame_current
+    original_subframe = scene.frame_subframe
+    try:
+        for i, frame in enumerate(frames):
+            scene.frame_set(int(math.floor(frame)), subframe=float(frame - math.floor(frame)))
+            for obj in objects:
+                matrices, data = results[obj.name]
+                matrices[i] = np.array(obj.matrix_world)
+                for path in CAMERA_DATA_PATHS:
+                    data[path][i] = getattr(obj.data, path)
+    finally:
+        scene.frame_set(original_frame, subframe=original_subframe)
+    return results
+
+
+def sample_cameras(scene, camera_names, frames):
+    """
+    Samples camera matrices and projection parameters over frames.
+
+    Cameras whose transform only depends on their own F-Curves are computed
+    with FCurve.evaluate and NumPy; the rest share a single frame_set pass.
+
+    Returns:
+        tuple: (dict of stacked arrays, list of camera names, list of names sampled with frame_set)
+    """
+    frames = np.asarray(frames, dtype=np.float64)
+    objects = []
+    for name in camera_names:
+        obj = bpy.data.objects.get(name)
+        if obj is not None and obj.type == 'CAMERA':
+            objects.append(obj)
+        else:
+            print(f"Camera export: '{name}' is not a camera, skipped")
+
+    fallback = [obj for obj in objects if needs_frame_set(obj)]
+    sampled = _sample_with_frame_set(scene, fallback, frames) if fallback else {}
+
+    matrix_world = np.zeros((len(objects), len(frames), 4, 4))
+    k_matrices = np.zeros((len(objects), len(frames), 3, 3))
+    clip = np.zeros((len(objects), len(frames), 2))
+    lens = np.zeros((len(objects), len(frames)))
+
+    for c, obj in enumerate(objects):
+        if obj.name in sampled:
+            matrix_world[c], data = sampled[obj.name]
+        else:
+            matrix_world[c] = _matrix_world_from_fcurves(obj, frames)
+            data = _camera_data_from_fcurves(obj.data, frames)
+        k_matrices[c] = intrinsics(data, scene.render, obj.data.sensor_fit, obj.data.type)
+        clip[c, :, 0] = data["clip_start"]
+        clip[c, :, 1] = data["clip_end"]
+        lens[c] = data["lens"]
+
+    # World to OpenCV camera: flip Y/Z of the inverse world matrix
+    world_to_camera = np.linalg.inv(matrix_world)
+    extrinsics = BLENDER_TO_CV @ world_to_camera[..., :3, :4]
+
+    arrays = {
+        "frames": frames,
+        "matrix_world": matrix_world.astype(np.float32),
+        "extrinsics_cv": extrinsics.astype(np.float32),
+        "intrinsics": k_matrices.astype(np.float32),
+        "lens": lens.astype(np.float32),
+        "clip": clip.astype(np.float32),
+    }
+    return arrays, [obj.name for obj in objects], [obj.name for obj in fallback]
+
+
+def export_camera_matrices(scene, camera_names, filepath, frame_start, frame_end, frame_step=1):
+    """
+    Writes camera matrices for a frame range to .npz or .json.
+
+    Arrays are stacked as (cameras, frames, ...); the camera order is
+    stored alongside. In .npz files it is the "cameras" array; JSON files
+    hold one object per camera.
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    if not camera_names:
+        return False, "No action cameras to export"
+    if frame_end < frame_start:
+        return False, "Frame end is before frame start"
+
+    frames = np.arange(frame_start, frame_end + 1, max(1, frame_step), dtype=np.float64)
+    arrays, names, fallback = sample_cameras(scene, camera_names, frames)
+    if not names:
+        return False, "None of the action cameras exist"
+
+    scale = scene.render.resolution_percentage / 100.0
+    resolution = [int(scene.render.resolution_x * scale), int(scene.render.resolution_y * scale)]
+    path = Path(bpy.path.abspath(filepath))
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix.lower() == '.json':
+            cameras = []
+            for c, name in enumerate(names):
+                cameras.append({
+                    "name": name,
+                    "matrix_world": arrays["matrix_world"][c].tolist(),
+                    "extrinsics_cv": arrays["extrinsics_cv"][c].tolist(),
+                    "intrinsics": arrays["intrinsics"][c].tolist(),
+                    "lens": arrays["lens"][c].tolist(),
+                    "clip": arrays["clip"][c].tolist(),
+                })
+            with file_io.atomic_open(path, 'w', encoding='utf-8') as f:
+                json.dump({"frames": frames.tolist(), "resolution": resolution, "cameras": cameras}, f)
+        else:
+            if path.suffix.lower() != '.npz':
+                path = path.with_suffix('.npz')
+            with file_io.atomic_open(path, 'wb') as f:
+                np.savez_compressed(f, cameras=np.array(names), resolution=np.array(resolution), **arrays)
+    except OSError as e:
+        return False, f"Could not write '{path}': {e}"
+
+    message = f"Exported {len(names)} camera(s) x {len(frames)} frame(s) to {path.name}"
+    if fallback:
+        message += f" ({len(fallback)} evaluated with frame_set)"
+    print(f"Camera export: {message}")
+    return True, message
@@ -0,0 +1,298 @@
+"""
+Batched camera rig creation from CSV/JSON shot data
+"""
+
+import bpy
+import csv
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+
+from . import utils
+
+# CSV column aliases -> canonical field
+CSV_COLUMNS = {
+    "name": "name", "camera": "name", "shot": "name",
+    "frame": "frame",
+    "x": "loc_x", "loc_x": "loc_x", "location_x": "loc_x",
+    "y": "loc_y", "loc_y": "loc_y", "location_y": "loc_y",
+    "z": "loc_z", "loc_z": "loc_z", "location_z": "loc_z",
+    "rx": "rot_x", "rot_x": "rot_x", "rotation_x": "rot_x",
+    "ry": "rot_y", "rot_y": "rot_y", "rotation_y": "rot_y",
+    "rz": "rot_z", "rot_z": "rot_z", "rotation_z": "rot_z",
+    "lens": "lens", "focal_length": "lens",
+    "sensor_width": "sensor_width", "sensor": "sensor_width",
+    "sensor_height": "sensor_height",
+    "clip_start": "clip_start", "clip_end": "clip_end",
+}
+
+# Default collection receiving imported cameras
+DEFAULT_COLLECTION = "AI Shots"
+
+
+def _shot(name):
+    return {
+        "name": name,
+        "location": (0.0, 0.0, 0.0),
+        "rotation": (0.0, 0.0, 0.0),
+        "lens": None,
+        "sensor_width": None,
+        "sensor_height": None,
+        "clip_start": None,
+        "clip_end": None,
+        # (N, 7): frame, location xyz, rotation xyz (radians)
+        "keys": None,
+        # (N, 2): frame, lens
+        "lens_keys": None,
+    }
+
+
+def _float(value, default=None):
+    if value is None or value == "":
+        return default
+    return float(value)
+
+
+def _finish_keys(shot, rows):
+    """Turns per-frame rows [(frame, loc, rot, lens)] into keyframe arrays."""
+    if not rows:
+        return shot
+    rows.sort(key=lambda r: r[0])
+    keys = np.array([(f, *loc, *rot) for f, loc, rot, _ in rows], dtype=np.float32)
+    shot["keys"] = keys
+    shot["location"] = tuple(float(v) for v in keys[0, 1:4])
+    shot["rotation"] = tuple(float(v) for v in keys[0, 4:7])
+
+    lens_rows = [(f, lens) for f, _, _, lens in rows if lens is not None]
+    if len(lens_rows) > 1:
+        shot["lens_keys"] = np.array(lens_rows, dtype=np.float32)
+    if lens_rows:
+        shot["lens"] = lens_rows[0][1]
+    return shot
+
+
+def parse_csv(path):
+    """
+    Parses a CSV with one row per camera, or one row per camera and frame.
+
+    Rotations are in degrees. Rows with a 'frame' value become keyframes of
+    their camera; rows of the same camera may appear in any order.
+    """
+    shots = {}
+    keyed_rows = {}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        for raw in reader:
+            row = {CSV_COLUMNS.get(k.strip().lower()): v.strip() for k, v in raw.items() if k and v is not None}
+            name = row.get("name")
+            if not name:
+                continue
+
+            shot = shots.setdefault(name, _shot(name))
+            loc = tuple(_float(row.get(k), 0.0) for k in ("loc_x", "loc_y", "loc_z"))
+            rot = tuple(math.radians(_float(row.get(k), 0.0)) for k in ("rot_x", "rot_y", "rot_z"))
+            lens = _float(row.get("lens"))
+
+            for key in ("sensor_width", "sensor_height", "clip_start", "clip_end"):
+                if row.get(key):
+                    shot[key] = _float(row[key])
+
+            if row.get("frame"):
+                keyed_rows.setdefault(name, []).append((_float(row["frame"]), loc, rot, lens))
+            else:
+                shot["location"] = loc
+                shot["rotation"] = rot
+                if lens is not None:
+                    shot["lens"] = lens
+
+    return [_finish_keys(shot, keyed_rows.get(name, [])) for name, shot in shots.items()]
+
+
+def parse_json(path):
+    """
+    Parses a JSON list of cameras (or {"cameras": [...]}).
+
+    Each camera has "name" and optional "location", "rotation" (degrees),
+    "lens", "sensor_width", "sensor_height", "clip_start", "clip_end" and
+    "keyframes": [{"frame", "location", "rotation", "lens"}, ...].
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("cameras", [])
+
+    shots = []
+    for item in data:
+        name = item.get("name")
+        if not name:
+            continue
+        shot = _shot(name)
+        shot["location"] = tuple(float(v) for v in item.get("location", (0, 0, 0)))
+        shot["rotation"] = tuple(math.radians(float(v)) for v in item.get("rotation", (0, 0, 0)))
+        for key in ("lens", "sensor_width", "sensor_height", "clip_start", "clip_end"):
+            shot[key] = _float(item.get(key))
+
+        rows = []
+        for key in item.get("keyframes", []):
+            loc = tuple(float(v) for v in key.get("location", shot["location"]))
+            rot = key.get("rotation")
+            rot = tuple(math.radians(float(v)) for v in rot) if rot is not None else shot["rotation"]
+            rows.append((float(key["frame"]), loc, rot, _float(key.get("lens"), shot["lens"])))
+        shots.append(_finish_keys(shot, rows))
+    return shots
+
+
+def parse_shot_file(path):
+    """Parses a .csv or .json shot file into a list of shot dicts."""
+    suffix = Path(path).suffix.lower()
+    if suffix == '.csv':
+        return parse_csv(path)
+    if suffix == '.json':
+        return parse_json(path)
+    raise ValueError(f"Unsupported shot file type: '{suffix}' (use .csv or .json)")
+
+
+def write_keyframes(id_block, data_path, frames, values):
+    """
+    Writes N keyframes per channel in bulk.
+
+    One keyframe_insert at the first frame creates the action, slot and
+    F-Curves the way Blender expects; the remaining points are added with
+    keyframe_points.add() and filled with a single foreach_set per channel.
+
+    Args:
+        id_block: Object or camera data owning the property
+        data_path: RNA path of the property, e.g. "location" or "lens"
+        frames: (N,) frame numbers, sorted
+        values: (N,) for scalar properties or (N, K) for vector properties
+    """
+    values = np.asarray(values, dtype=np.float32)
+    if values.ndim == 1:
+        values = values[:, None]
+        index_list = [-1]
+    else:
+        index_list = list(range(values.shape[1]))
+
+    count = len(frames)
+    id_block.keyframe_insert(data_path, frame=float(frames[0]))
+
+    co = np.empty(count * 2, dtype=np.float32)
+    co[0::2] = frames
+    for column, index in enumerate(index_list):
+        fcurves = utils.get_fcurves(id_block)
+        fcurve = fcurves.find(data_path, index=max(index, 0)) if fcurves is not None else None
+        if fcurve is None:
+            continue
+        points = fcurve.keyframe_points
+        if len(points) < count:
+            points.add(count - len(points))
+        co[1::2] = values[:, column]
+        points.foreach_set("co", co)
+        points.foreach_set("handle_left", co)
+        points.foreach_set("handle_right", co)
+        # Sorts points and recalculates auto handles
+        fcurve.update()
+
+
+def _get_collection(scene, name):
+    collection = bpy.data.collections.get(name)
+    if collection is None:
+        collection = bpy.data.collections.new(name)
+    if collection.name not in scene.collection.children:
+        scene.collection.children.link(collection)
+    return collection
+
+
+def create_cameras(shots, scene, collection_name=DEFAULT_COLLECTION):
+    """
+    Creates or updates one camera per shot.
+
+    Existing camera objects with the same name are reused and their
+    animation is replaced. Objects of another type keep their name and the
+    shot is skipped.
+
+    Returns:
+        tuple: (list of camera objects, list of skipped shot names)
+    """
+    collection = _get_collection(scene, collection_name)
+    cameras = []
+    skipped = []
+
+    for shot in shots:
+        name = shot["name"]
+        obj = bpy.data.objects.get(name)
+        if obj is not None and obj.type != 'CAMERA':
+            print(f"Camera import: Object '{name}' exists but is not a camera, skipped")
+            skipped.append(name)
+            continue
+
+        if obj is None:
+            obj = bpy.data.objects.new(name, bpy.data.cameras.new(name=name))
+            collection.objects.link(obj)
+        else:
+            obj.animation_data_clear()
+            obj.data.animation_data_clear()
+
+        cam = obj.data
+        for key in ("lens", "sensor_width", "sensor_height", "clip_start", "clip_end"):
+            if shot[key] is not None:
+                setattr(cam, key, shot[key])
+
+        obj.rotation_mode = 'XYZ'
+        obj.location = shot["location"]
+        obj.rotation_euler = shot["rotation"]
+
+        keys = shot["keys"]
+        if keys is not None and len(keys) > 1:
+            write_keyframes(obj, "location", keys[:, 0], keys[:, 1:4])
+            write_keyframes(obj, "rotation_euler", keys[:, 0], keys[:, 4:7])
+        lens_keys = shot["lens_keys"]
+        if lens_keys is not None:
+            cam.lens = float(lens_keys[0, 1])
+            write_keyframes(cam, "lens", lens_keys[:, 0], lens_keys[:, 1])
+
+        cameras.append(obj)
+
+    return cameras, skipped
+
+
+def add_camera_actions(actions, camera_names):
+    """Appends a CAMERA_SELECT action for each camera without one; returns how many were added."""
+    existing = {a.camera_name for a in actions if a.action_type == 'CAMERA_SELECT'}
+    added = 0
+    for name in camera_names:
+        if name in existing:
+            continue
+        action = actions.add()
+        action.button_name = name
+        action.action_type = 'CAMERA_SELECT'
+        action.camera_name = name
+        existing.add(name)
+        added += 1
+    return added
+
+
+def import_shot_file(path, scene, actions=None, collection_name=DEFAULT_COLLECTION):
+    """
+    Imports cameras from a shot file and optionally generates actions.
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    try:
+        shots = parse_shot_file(bpy.path.abspath(path))
+    except (OSError, ValueError, KeyError) as e:
+        return False, f"Could not read shot file: {e}"
+    if not shots:
+        return False, "No cameras found in shot file"
+
+    cameras, skipped = create_cameras(shots, scene, collection_name)
+    message = f"Imported {len(cameras)} camera(s)"
+    if actions is not None:
+        message += f", added {add_camera_actions(actions, [c.name for c in cameras])} action(s)"
+    if skipped:
+        message += f", skipped {len(skipped)}"
+    print(f"Camera import: {message}")
+    return True, message
@@ -3,9 +3,19 @@ Configuration manager for loading and saving JSON configs
 """
 
 import bpy
+import os
 import json
+import time
+import hashlib
 from pathlib import Path
 
+from . import prefetch
+from . import snapshot
+from . import node_params
+from . import journal
+from . import file_io
+from . import profiler
+
 # Module-level initialization flag
 __initialized_flag = False
 
@@ -13,12 +23,105 @@ __initialized_flag = False
 INTERNAL_CONFIG_NAME = "AI_Tool_Config.json"
 
 
+# Output conversion options of a SaveImageProperty and their defaults
+SAVE_OUTPUT_OPTIONS = {
+    "bit_depth": "8",
+    "color_transform": "AUTO",
+    "dither": "NONE",
+    "alpha_mode": "KEEP",
+    "png_compression": 6,
+}
+
+
+def save_output_options_to_dict(save_img):
+    """Returns the JSON keys for a save image's output options (empty when not customized)."""
+    if not save_img.custom_output:
+        return {}
+    options = {"custom_output": True}
+    for key in SAVE_OUTPUT_OPTIONS:
+        options[key] = getattr(save_img, key)
+    return options
+
+
+def load_save_output_options(save_img, img_item):
+    """Applies output options from a JSON image entry to a SaveImageProperty."""
+    save_img.custom_output = img_item.get("custom_output", False)
+    for key, default in SAVE_OUTPUT_OPTIONS.items():
+        setattr(save_img, key, img_item.get(key, default))
+
+
+# Sweep settings of an ActionProperty and their defaults
+SWEEP_OPTIONS = {
+    "sweep_enabled": False,
+    "sweep_cameras": "",
+    "sweep_run_operator": "",
+    "sweep_wait": 0.0,
+}
+
+NODE_PARAM_FIELDS = ("name", "path", "value", "sweep_values")
+
+
+def node_params_to_dict(action):
+    """Returns the JSON keys for an action's node parameters and sweep (empty when unused)."""
+    data = {}
+    if len(action.node_params):
+        data["node_params"] = [
+            {key: getattr(param, key) for key in NODE_PARAM_FIELDS if getattr(param, key)}
+            for param in action.node_params
+        ]
+    if action.sweep_enabled:
+        for key in SWEEP_OPTIONS:
+            data[key] = getattr(action, key)
+    return data
+
+
+def load_node_params(action, item):
+    """Applies node parameters and sweep settings from a JSON action entry."""
+    action.node_params.clear()
+    for param_item in item.get("node_params", []):
+        param = action.node_params.add()
+        for key in NODE_PARAM_FIELDS:
+            value = param_item.get(key, "")
+            # Values may be written as plain JSON numbers/lists in hand-edited configs
+            setattr(param, key, value if isinstance(value, str) else json.dumps(value))
+    for key, default in SWEEP_OPTIONS.items():
+        setattr(action, key, item.get(key, default))
+
+
 def get_config_path():
     """Returns the path to the config.json file."""
     addon_dir = Path(__file__).parent
     return addon_dir / "config.json"
 
 
+# config.json path -> digest of the content this instance last read or wrote
+_known_versions = {}
+
+
+def _content_digest(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def read_config_file(json_path):
+    """
+    Reads config.json, retrying if another instance is caught mid-write,
+    and remembers which version was read (see save_config).
+    """
+    def parse(data):
+        return json.loads(data.decode('utf-8')), _content_digest(data)
+
+    config_data, digest = file_io.read_with_retry(json_path, parse)
+    _known_versions[str(json_path)] = digest
+    return config_data
+
+
+def _current_digest(json_path):
+    try:
+        return file_io.read_with_retry(json_path, _content_digest)
+    except FileNotFoundError:
+        return None
+
+
 def has_internal_config():
     """Check if the current .blend file has an internal config."""
     return INTERNAL_CONFIG_NAME in bpy.data.texts
@@ -89,11 +192,86 @@ def delete_internal_config():
         return False, f"Failed to delete internal config: {str(e)}"
 
 
+def load_action(action, item):
+    """
+    Fills an ActionProperty from a JSON action entry (the inverse of action_to_dict).
+
+    Image lists are only read for the action type that uses them.
+    """
+    action.button_name = item.get("button_name", "Unnamed Action")
+    action.action_type = item.get("action_type", "CAMERA_SELECT")
+    action.select_camera = item.get("select_camera", False)
+    action.camera_name = item.get("camera_object_name", "")
+    action.change_image_editor = item.get("change_image_editor", False)
+    action.image_name_to_view = item.get("image_name_to_view", "")
+    action.reset_images = item.get("reset_images", False)
+    action.change_node_tree = item.get("change_node_tree", False)
+    action.node_tree_name = item.get("node_tree_name", "")
+    action.update_timeline = item.get("update_timeline", False)
+    action.timeline_frame = item.get("timeline_frame", 0)
+    action.watch_output = item.get("watch_output", False)
+    action.watch_directory = item.get("watch_directory", "")
+    action.render_image_name = item.get("render_image_name", "")
+    action.render_resolution_scale = item.get("render_resolution_scale", 1.0)
+    action.render_pass = item.get("render_pass", "COMBINED")
+    action.depth_source_image = item.get("depth_source_image", "")
+    action.depth_target_image = item.get("depth_target_image", "")
+    action.depth_clip_mode = item.get("depth_clip_mode", "PERCENTILE")
+    action.depth_near = item.get("depth_near", 0.1)
+    action.depth_far = item.get("depth_far", 100.0)
+    action.depth_percentile_low = item.get("depth_percentile_low", 1.0)
+    action.depth_percentile_high = item.get("depth_percentile_high", 99.0)
+    action.depth_invert = item.get("depth_invert", True)
+    action.depth_gamma = item.get("depth_gamma", 1.0)
+    action.depth_bit_depth = item.get("depth_bit_depth", "8")
+    action.compare_image_a = item.get("compare_image_a", "")
+    action.compare_image_b = item.get("compare_image_b", "")
+    action.compare_diff_image = item.get("compare_diff_image", "")
+    action.compare_heatmap_gain = item.get("compare_heatmap_gain", 4.0)
+    action.publish_mode = item.get("publish_mode", "SHARED_MEMORY")
+    action.publish_directory = item.get("publish_directory", "//frames/")
+    action.publish_prefix = item.get("publish_prefix", "aiwf")
+
+    # Handle images to reset
+    action.images_to_reset.clear()
+    if item.get("reset_images") and action.action_type == 'RESET':
+        for img_item in item.get("images_to_reset", []):
+            reset_img = action.images_to_reset.add()
+            reset_img.name = img_item.get("name", "")
+
+    # Handle images to save
+    action.images_to_save.clear()
+    if action.action_type == 'IMAGE_SAVE':
+        for img_item in item.get("images_to_save", []):
+            save_img = action.images_to_save.add()
+            save_img.name = img_item.get("name", "")
+            save_img.save_as = img_item.get("save_as", "")
+            save_img.allow_overwrite = img_item.get("allow_overwrite", True)
+            load_save_output_options(save_img, img_item)
+
+    # Handle images to publish
+    action.images_to_publish.clear()
+    if action.action_type == 'PUBLISH':
+        for img_item in item.get("images_to_publish", []):
+            publish_img = action.images_to_publish.add()
+            publish_img.name = img_item.get("name", "")
+
+    # Handle node parameters and sweep
+    load_node_params(action, item)
+
+
 def load_config(context):
     """
     Loads action configuration into scene properties.
     Priority: Internal .blend config > External config.json
     """
+    if profiler.is_armed('CONFIG_LOAD'):
+        return profiler.profile_call('CONFIG_LOAD', "load_config", _load_config, context)
+    return _load_config(context)
+
+
+def _load_config(context):
+    started = time.perf_counter()
     scene = context.scene
     props = scene.my_addon_props
 
@@ -101,6 +279,7 @@ def load_config(context):
     props.error_message = ""
 
     print(f"=== AI Workflow Config Loader ===")
+    source = "internal"
 
     # Check for internal config first (project-specific)
     if has_internal_config():
@@ -118,6 +297,7 @@ def load_config(context):
 
     # Fall back to external config.json if no internal config
     if config_data is None:
+        source = "external"
         json_path = get_config_path()
         print(f"Looking for EXTERNAL config at: {json_path}")
         print(f"Config exists: {json_path.exists()}")
@@ -129,8 +309,7 @@ def load_config(context):
             return
 
         try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
+            config_data = read_config_file(json_path)
 
             print(f"Loaded {len(config_data)} entries from external config")
 
@@ -148,24 +327,13 @@ def load_config(context):
             for idx, item in enumerate(config_data):
                 try:
                     action = props.actions.add()
-
-                    action.button_name = item.get("button_name", "Unnamed Action")
-                    action.action_type = item.get("action_type", "CAMERA_SELECT")
-                    action.select_camera = item.get("select_camera", False)
-                    action.change_image_editor = item.get("change_image_editor", False)
-                    action.image_name_to_view = item.get("image_name_to_view", "")
-                    action.reset_images = item.get("reset_images", False)
-                    action.change_node_tree = item.get("change_node_tree", False)
-                    action.node_tree_name = item.get("node_tree_name", "")
-                    action.update_timeline = item.get("update_timeline", False)
-                    action.timeline_frame = item.get("timeline_frame", 0)
+                    load_action(action, item)
 
                     print(f"  Action {idx}: '{action.button_name}' (type: {action.action_type})")
 
                     # Handle camera
-                    cam_name = item.get("camera_object_name")
+                    cam_name = action.camera_name
                     if cam_name:
-                        action.camera_name = cam_name
                         if cam_name in bpy.data.objects and bpy.data.objects[cam_name].type == 'CAMERA':
                             print(f"    Camera: {cam_name} ✓ (exists)")
                         else:
@@ -177,21 +345,31 @@ def load_config(context):
                     if action.update_timeline:
                         print(f"    Timeline: frame {action.timeline_frame}")
 
-                    # Handle images to reset
-                    if item.get("reset_images") and action.action_type == 'RESET':
-                        for img_item in item.get("images_to_reset", []):
-                            reset_img = action.images_to_reset.add()
-                            reset_img.name = img_item.get("name", "")
-                            print(f"    Reset image: {reset_img.name}")
-
-                    # Handle images to save
-                    if action.action_type == 'IMAGE_SAVE':
-                        for img_item in item.get("images_to_save", []):
-                            save_img = action.images_to_save.add()
-                            save_img.name = img_item.get("name", "")
-                            save_img.save_as = img_item.get("save_as", "")
-                            save_img.allow_overwrite = img_item.get("allow_overwrite", True)
-                            print(f"    Save image: '{save_img.name}' → '{save_img.save_as}'")
+                    if action.watch_output:
+                        print(f"    Watch directory: '{action.watch_directory}'")
+
+                    if action.action_type == 'RENDER':
+                        print(f"    Render: {action.render_pass} → '{action.render_image_name}' (x{action.render_resolution_scale})")
+
+                    if action.action_type == 'DEPTH_MAP':
+                        print(f"    Depth map: '{action.depth_source_image}' → '{action.depth_target_image}' ({action.depth_clip_mode})")
+
+                    if action.action_type == 'COMPARE':
+                        print(f"    Compare: '{action.compare_image_a}' vs '{action.compare_image_b}'")
+
+                    for reset_img in action.images_to_reset:
+                        print(f"    Reset image: {reset_img.name}")
+
+                    for save_img in action.images_to_save:
+                        print(f"    Save image: '{save_img.name}' → '{save_img.save_as}'")
+
+                    if action.action_type == 'PUBLISH':
+                        print(f"    Publish: {len(action.images_to_publish)} image(s) via {action.publish_mode}")
+
+                    if len(action.node_params):
+                        print(f"    Node parameters: {len(action.node_params)}")
+                    if action.sweep_enabled:
+                        print(f"    Sweep: {node_params.variant_count(action)} combination(s)")
 
                 except Exception as e:
                     print(f"  ERROR loading action {idx}: {e}")
@@ -202,6 +380,11 @@ def load_config(context):
             print(f"Successfully loaded {len(props.actions)} actions")
             print("=================================")
 
+            # Warm the images the actions will show, starting with the active one
+            prefetch.schedule_prefetch(context, action_ran=False)
+
+            journal.record_reload(source, config_data, len(props.actions), started)
+
         except Exception as e:
             error_msg = f"Error processing config:\n{str(e)}"
             props.error_message = error_msg
@@ -210,10 +393,117 @@ def load_config(context):
             traceback.print_exc()
 
 
+def action_to_dict(action):
+    """Returns the JSON entry for an action, as written to config.json."""
+    item = {
+        "button_name": action.button_name,
+        "action_type": action.action_type,
+    }
+
+    # Camera settings
+    if action.select_camera and action.camera_name:
+        item["select_camera"] = True
+        item["camera_object_name"] = action.camera_name
+    else:
+        item["select_camera"] = False
+
+    # Image editor settings
+    if action.change_image_editor and action.image_name_to_view:
+        item["change_image_editor"] = True
+        item["image_name_to_view"] = action.image_name_to_view
+    else:
+        item["change_image_editor"] = False
+
+    # Node tree settings
+    if action.change_node_tree and action.node_tree_name:
+        item["change_node_tree"] = True
+        item["node_tree_name"] = action.node_tree_name
+    else:
+        item["change_node_tree"] = False
+
+    # Timeline settings
+    if action.update_timeline:
+        item["update_timeline"] = True
+        item["timeline_frame"] = action.timeline_frame
+    else:
+        item["update_timeline"] = False
+
+    # Output directory watching
+    if action.watch_output and action.watch_directory:
+        item["watch_output"] = True
+        item["watch_directory"] = action.watch_directory
+
+    # Image reset settings (for RESET type)
+    if action.action_type == 'RESET' and action.reset_images:
+        item["reset_images"] = True
+        item["images_to_reset"] = [
+            {"name": img.name} for img in action.images_to_reset
+        ]
+    else:
+        item["reset_images"] = False
+
+    # Image save settings (for IMAGE_SAVE type)
+    if action.action_type == 'IMAGE_SAVE':
+        item["images_to_save"] = [
+            {
+                "name": img.name,
+                "save_as": img.save_as,
+                "allow_overwrite": img.allow_overwrite,
+                **save_output_options_to_dict(img)
+            }
+            for img in action.images_to_save
+        ]
+
+    # Render settings (for RENDER type)
+    if action.action_type == 'RENDER':
+        item["render_image_name"] = action.render_image_name
+        item["render_resolution_scale"] = action.render_resolution_scale
+        item["render_pass"] = action.render_pass
+
+    # Depth map settings (for DEPTH_MAP type)
+    if action.action_type == 'DEPTH_MAP':
+        item["depth_source_image"] = action.depth_source_image
+        item["depth_target_image"] = action.depth_target_image
+        item["depth_clip_mode"] = action.depth_clip_mode
+        item["depth_near"] = action.depth_near
+        item["depth_far"] = action.depth_far
+        item["depth_percentile_low"] = action.depth_percentile_low
+        item["depth_percentile_high"] = action.depth_percentile_high
+        item["depth_invert"] = action.depth_invert
+        item["depth_gamma"] = action.depth_gamma
+        item["depth_bit_depth"] = action.depth_bit_depth
+
+    # Image comparison settings (for COMPARE type)
+    if action.action_type == 'COMPARE':
+        item["compare_image_a"] = action.compare_image_a
+        item["compare_image_b"] = action.compare_image_b
+        item["compare_diff_image"] = action.compare_diff_image
+        item["compare_heatmap_gain"] = action.compare_heatmap_gain
+
+    # Frame publishing settings (for PUBLISH type)
+    if action.action_type == 'PUBLISH':
+        item["images_to_publish"] = [
+            {"name": img.name} for img in action.images_to_publish
+        ]
+        item["publish_mode"] = action.publish_mode
+        item["publish_directory"] = action.publish_directory
+        item["publish_prefix"] = action.publish_prefix
+
+    # Node parameters and sweep settings
+    item.update(node_params_to_dict(action))
+
+    return item
+
+
 def save_config(actions):
     """
     Saves actions to config.json.
 
+    The file is replaced atomically under a lock, so concurrent instances
+    never see or produce a torn file. If another instance saved a different
+    version since this one read the file, nothing is overwritten: this
+    version goes to a config.conflict-*.json file next to it instead.
+
     Args:
         actions: Collection of ActionProperty objects
 
@@ -223,67 +513,24 @@ def save_config(actions):
     json_path = get_config_path()
 
     try:
-        config_data = []
-
-        for action in actions:
-            item = {
-                "button_name": action.button_name,
-                "action_type": action.action_type,
-            }
-
-            # Camera settings
-            if action.select_camera and action.camera_name:
-                item["select_camera"] = True
-                item["camera_object_name"] = action.camera_name
-            else:
-                item["select_camera"] = False
-
-            # Image editor settings
-            if action.change_image_editor and action.image_name_to_view:
-                item["change_image_editor"] = True
-                item["image_name_to_view"] = action.image_name_to_view
-            else:
-                item["change_image_editor"] = False
-
-            # Node tree settings
-            if action.change_node_tree and action.node_tree_name:
-                item["change_node_tree"] = True
-                item["node_tree_name"] = action.node_tree_name
-            else:
-                item["change_node_tree"] = False
-
-            # Timeline settings
-            if action.update_timeline:
-                item["update_timeline"] = True
-                item["timeline_frame"] = action.timeline_frame
-            else:
-                item["update_timeline"] = False
-
-            # Image reset settings (for RESET type)
-            if action.action_type == 'RESET' and action.reset_images:
-                item["reset_images"] = True
-                item["images_to_reset"] = [
-                    {"name": img.name} for img in action.images_to_reset
-                ]
-            else:
-                item["reset_images"] = False
-
-            # Image save settings (for IMAGE_SAVE type)
-            if action.action_type == 'IMAGE_SAVE':
-                item["images_to_save"] = [
-                    {
-                        "name": img.name,
-                        "save_as": img.save_as,
-                        "allow_overwrite": img.allow_overwrite
-                    }
-                    for img in action.images_to_save
-                ]
-
-            config_data.append(item)
-
-        # Write to file with pretty formatting
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(config_data, f, indent=4, ensure_ascii=False)
+        config_data = [action_to_dict(action) for action in actions]
+        text = json.dumps(config_data, indent=4, ensure_ascii=False)
+
+        with file_io.FileLock(json_path):
+            known = _known_versions.get(str(json_path))
+            current = _current_digest(json_path)
+            if known is not None and current is not None and current != known:
+                stamp = time.strftime("%Y%m%d-%H%M%S")
+                conflict_path = json_path.with_name(f"config.conflict-{stamp}-{os.getpid()}.json")
+                file_io.atomic_write_text(conflict_path, text)
+                error_msg = (f"config.json was changed by another instance since it was loaded. "
+                             f"Your version was saved to {conflict_path.name}; reload and re-apply your changes.")
+                print(f"ERROR: {error_msg}")
+                return False, error_msg
+
+            # Write to file with pretty formatting
+            file_io.atomic_write_text(json_path, text)
+            _known_versions[str(json_path)] = _content_digest(text.encode('utf-8'))
 
         print(f"Successfully saved {len(config_data)} actions to {json_path}")
         return True, f"Saved {len(config_data)} action(s) to config.json"
@@ -312,37 +559,12 @@ def load_config_to_preferences(preferences):
         return False, f"Config file not found: {json_path}"
 
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
+        config_data = read_config_file(json_path)
 
         preferences.actions.clear()
 
         for item in config_data:
-            action = preferences.actions.add()
-
-            action.button_name = item.get("button_name", "Unnamed Action")
-            action.action_type = item.get("action_type", "CAMERA_SELECT")
-            action.select_camera = item.get("select_camera", False)
-            action.camera_name = item.get("camera_object_name", "")
-            action.change_image_editor = item.get("change_image_editor", False)
-            action.image_name_to_view = item.get("image_name_to_view", "")
-            action.reset_images = item.get("reset_images", False)
-            action.change_node_tree = item.get("change_node_tree", False)
-            action.node_tree_name = item.get("node_tree_name", "")
-            action.update_timeline = item.get("update_timeline", False)
-            action.timeline_frame = item.get("timeline_frame", 0)
-
-            # Handle images to reset
-            for img_item in item.get("images_to_reset", []):
-                reset_img = action.images_to_reset.add()
-                reset_img.name = img_item.get("name", "")
-
-            # Handle images to save
-            for img_item in item.get("images_to_save", []):
-                save_img = action.images_to_save.add()
-                save_img.name = img_item.get("name", "")
-                save_img.save_as = img_item.get("save_as", "")
-                save_img.allow_overwrite = img_item.get("allow_overwrite", True)
+            load_action(preferences.actions.add(), item)
 
         return True, f"Loaded {len(config_data)} action(s) from config.json"
 
@@ -355,6 +577,10 @@ def load_handler(dummy):
     """Application handler that runs after the scene is loaded/ready."""
     global __initialized_flag
 
+    # Snapshots and resolved node paths refer to the previous file's data
+    snapshot.clear()
+    node_params.clear_cache()
+
     if __initialized_flag:
         return
 
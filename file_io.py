@@ -0,0 +1,257 @@
+"""
+Concurrency-safe file writes and reads
+
+Many Blender instances (farm workers, artists sharing one add-on directory
+on a network share) may write the same config.json, output directory and
+manifest at once. Writers here never expose a partial file: data goes to a
+temporary file in the target directory, is flushed to disk and renamed over
+the target in one step. Read-modify-write sequences hold an advisory lock
+file with a timeout, new outputs can claim a free name with O_EXCL, and
+readers retry briefly when they still catch a file mid-update.
+
+No bpy dependency, so worker processes and tests can use it directly.
+"""
+
+import os
+import json
+import time
+import errno
+import secrets
+from pathlib import Path
+
+# Seconds to wait for a lock before giving up, and between attempts
+LOCK_TIMEOUT = 10.0
+LOCK_POLL = 0.02
+
+# Attempts and first back-off delay (doubled each time) for retrying reads
+READ_ATTEMPTS = 6
+READ_DELAY = 0.02
+
+# Highest numeric suffix tried when claiming a free output name
+MAX_NAME_SUFFIX = 9999
+
+if os.name == 'nt':
+    import msvcrt
+
+    def _try_lock(fd):
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def _unlock(fd):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _try_lock(fd):
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError as e:
+            if e.errno in (errno.EAGAIN, errno.EACCES, errno.EWOULDBLOCK):
+                return False
+            raise
+
+    def _unlock(fd):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class LockTimeout(TimeoutError):
+    """Raised when a file lock could not be acquired in time."""
+
+
+class FileLock:
+    """
+    Advisory exclusive lock on `<path>.lock`, usable as a context manager.
+
+    Locks are per open file, so two FileLocks on the same path exclude each
+    other across threads and processes alike. The lock file stays in place
+    (removing it would race with the next locker). Only cooperating writers
+    are excluded; readers do not need the lock because writes are atomic.
+    """
+
+    def __init__(self, path, timeout=LOCK_TIMEOUT):
+        self.lock_path = str(path) + ".lock"
+        self.timeout = timeout
+        self._fd = None
+
+    def acquire(self):
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o666)
+        deadline = time.monotonic() + self.timeout
+        while not _try_lock(fd):
+            if time.monotonic() >= deadline:
+                os.close(fd)
+                raise LockTimeout(f"Timed out after {self.timeout:g}s waiting for '{self.lock_path}'")
+            time.sleep(LOCK_POLL)
+        self._fd = fd
+        return self
+
+    def release(self):
+        if self._fd is not None:
+            try:
+                _unlock(self._fd)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+
+def _fsync_directory(directory):
+    # Makes the rename itself durable; not possible (or needed) on Windows
+    if os.name == 'nt':
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def temp_path_for(path):
+    """
+    A new unique temporary path next to path, keeping its extension.
+
+    The name starts with '.' so directory watchers matching image names
+    ignore it. The file is created (empty) to reserve the name, with the
+    default permissions (umask), which the target keeps after the rename.
+    """
+    path = Path(path)
+    while True:
+        temp = path.with_name(f".{path.stem}.{os.getpid()}.{secrets.token_hex(4)}.tmp{path.suffix}")
+        try:
+            fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        except FileExistsError:
+            continue
+        os.close(fd)
+        return temp
+
+
+def replace(temp, path, attempts=READ_ATTEMPTS):
+    """
+    Renames temp over path atomically.
+
+    Windows refuses to replace a file another process has open; that is
+    retried with back-off like a read.
+    """
+    delay = READ_DELAY
+    for attempt in range(attempts):
+        try:
+            os.replace(temp, path)
+            break
+        except PermissionError:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(delay)
+            delay *= 2
+    _fsync_directory(Path(path).parent)
+
+
+class atomic_open:
+    """
+    Opens a temporary file for writing that replaces path on a clean exit
+    (and is deleted on an exception), so readers see either the old or the
+    new content, never a mix.
+
+        with file_io.atomic_open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+    """
+
+    def __init__(self, path, mode='w', encoding=None):
+        if 'w' not in mode:
+            raise ValueError("atomic_open only supports write modes")
+        self.path = Path(path)
+        self.mode = mode
+        self.encoding = encoding
+        self.temp = None
+        self._file = None
+
+    def __enter__(self):
+        self.temp = temp_path_for(self.path)
+        self._file = open(self.temp, self.mode, encoding=self.encoding)
+        return self._file
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            self._file.close()
+            if exc_type is None:
+                replace(self.temp, self.path)
+        finally:
+            if self.temp.exists():
+                try:
+                    os.unlink(self.temp)
+                except OSError:
+                    pass
+        return False
+
+
+def atomic_write_text(path, text, encoding='utf-8'):
+    with atomic_open(path, 'w', encoding=encoding) as f:
+        f.write(text)
+
+
+def atomic_write_json(path, data, indent=4):
+    with atomic_open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+
+
+def read_with_retry(path, parse, attempts=READ_ATTEMPTS, delay=READ_DELAY):
+    """
+    Reads a file and parses its bytes, retrying with back-off when parsing
+    fails or the read is refused (a writer without atomic renames, or a
+    network share serving a stale partial copy).
+
+    FileNotFoundError is raised at once; other errors after the last attempt.
+    """
+    for attempt in range(attempts):
+        try:
+            with open(path, 'rb') as f:
+                return parse(f.read())
+        except FileNotFoundError:
+            raise
+        except (ValueError, OSError):
+            if attempt == attempts - 1:
+                raise
+            time.sleep(delay)
+            delay *= 2
+
+
+def read_json(path, attempts=READ_ATTEMPTS):
+    return read_with_retry(path, lambda data: json.loads(data.decode('utf-8')), attempts)
+
+
+def claim_path(path):
+    """
+    Creates and returns a path that did not exist, so concurrent writers
+    never pick the same output: path itself if free, else
+    `<stem>_001<ext>`, `<stem>_002<ext>`, ... Creation uses O_EXCL, which
+    is atomic across processes (and on NFSv3+).
+
+    The claimed file is left empty for the caller to replace.
+    """
+    path = Path(path)
+    for number in range(MAX_NAME_SUFFIX + 1):
+        candidate = path if number == 0 else path.with_name(f"{path.stem}_{number:03d}{path.suffix}")
+        try:
+            fd = os.open(candidate, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        except FileExistsError:
+            continue
+        os.close(fd)
+        return candidate
+    raise FileExistsError(f"No free name for '{path}' after {MAX_NAME_SUFFIX} attempts")
@@ -0,0 +1,185 @@
+"""
+Zero-copy frame handoff to external processes via shared memory or memory-mapped .npy files
+"""
+
+import bpy
+import os
+import re
+import time
+import hashlib
+from pathlib import Path
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from . import file_io
+
+# Version of the JSON descriptor layout (see frame_share_reader.py)
+DESCRIPTOR_VERSION = 2
+
+# Shared memory segments start with a uint64 write counter (a seqlock),
+# padded to a cache line; pixels follow at this offset
+SEGMENT_HEADER_BYTES = 64
+
+# POSIX shared memory names are limited to 31 characters on macOS
+MAX_SHM_NAME_LENGTH = 30
+
+# Segments owned by this Blender process: image name -> SharedMemory
+_segments = {}
+
+# Publish counter per image, lets readers detect new or torn frames
+_sequence = {}
+
+
+def _safe_name(name):
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+
+
+def shm_segment_name(prefix, image_name):
+    """Returns a short, filesystem-safe shared memory name for an image."""
+    digest = hashlib.blake2b(image_name.encode("utf-8"), digest_size=4).hexdigest()
+    base = _safe_name(f"{prefix}_{image_name}")
+    return f"{base[:MAX_SHM_NAME_LENGTH - len(digest) - 1]}_{digest}"
+
+
+def _get_segment(name, image_name, nbytes):
+    """Returns a shared memory segment of the right size, reusing the existing one if possible."""
+    nbytes += SEGMENT_HEADER_BYTES
+    segment = _segments.get(image_name)
+    if segment is not None and segment.name.lstrip("/") == name and segment.size >= nbytes:
+        return segment
+
+    if segment is not None:
+        _release_segment(image_name)
+
+    try:
+        segment = shared_memory.SharedMemory(name=name, create=True, size=nbytes)
+    except FileExistsError:
+        # Left over from a previous session; replace it
+        stale = shared_memory.SharedMemory(name=name)
+        stale.close()
+        stale.unlink()
+        segment = shared_memory.SharedMemory(name=name, create=True, size=nbytes)
+
+    _segments[image_name] = segment
+    return segment
+
+
+def _release_segment(image_name):
+    segment = _segments.pop(image_name, None)
+    if segment is None:
+        return
+    try:
+        segment.close()
+    except BufferError:
+        # A view is still exported; the mapping goes away with the process
+        pass
+    # Unlink regardless, or the segment outlives Blender until reboot
+    try:
+        segment.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def publish_image(image_name, directory, mode='SHARED_MEMORY', prefix="aiwf", scene=None):
+    """
+    Publishes an image's pixels for external processes.
+
+    Pixels are copied once, with foreach_get, straight into the shared
+    memory segment or the memory-mapped .npy file, then a JSON descriptor
+    <directory>/<image>.json is written atomically. Readers map the data
+    without copying (see frame_share_reader.py).
+
+    Shared memory is rewritten in place, so the segment's write counter is
+    set to an odd value (2 * sequence - 1) before the pixels are written and
+    to 2 * sequence after. A reader that sees the same even value before and
+    after copying has a complete frame.
+
+    Args:
+        image_name: Name of the image to publish
+        directory: Directory receiving descriptors (and .npy files)
+        mode: 'SHARED_MEMORY' or 'NPY'
+        prefix: Prefix of shared memory segment names
+        scene: Scene providing frame and camera metadata
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    img = bpy.data.images.get(image_name)
+    if img is None:
+        return False, f"Image '{image_name}' not found for publishing"
+
+    out_dir = Path(bpy.path.abspath(directory))
+    try:
+        out_dir.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        return False, f"Error creating directory '{out_dir}': {e}"
+
+    width, height = img.size
+    shape = (height, width, img.channels)
+    nbytes = int(np.prod(shape)) * 4
+    safe_image = _safe_name(image_name)
+    sequence = _sequence.get(image_name, 0) + 1
+
+    descriptor = {
+        "version": DESCRIPTOR_VERSION,
+        "image": image_name,
+        "shape": list(shape),
+        "dtype": "float32",
+        "row_order": "bottom_up",
+        "colorspace": img.colorspace_settings.name,
+        "is_float": bool(img.is_float),
+        "frame": scene.frame_current if scene else None,
+        "camera": scene.camera.name if scene and scene.camera else None,
+        "sequence": sequence,
+        "timestamp": time.time(),
+    }
+
+    try:
+        if mode == 'SHARED_MEMORY':
+            name = shm_segment_name(prefix, image_name)
+            segment = _get_segment(name, image_name, nbytes)
+            counter = np.ndarray((1,), dtype=np.uint64, buffer=segment.buf)
+            view = np.ndarray(shape, dtype=np.float32, buffer=segment.buf, offset=SEGMENT_HEADER_BYTES)
+            counter[0] = 2 * sequence - 1
+            try:
+                img.pixels.foreach_get(view.reshape(-1))
+            finally:
+                del view
+            # Left odd if the copy failed: readers keep waiting for the next publish
+            counter[0] = 2 * sequence
+            del counter
+            descriptor["transport"] = "shared_memory"
+            descriptor["shm_name"] = segment.name.lstrip("/")
+            descriptor["offset"] = SEGMENT_HEADER_BYTES
+        else:
+            path = out_dir / f"{safe_image}.npy"
+            tmp = out_dir / f".{safe_image}.{os.getpid()}.tmp.npy"
+            mapped = np.lib.format.open_memmap(tmp, mode='w+', dtype=np.float32, shape=shape)
+            img.pixels.foreach_get(mapped.reshape(-1))
+            mapped.flush()
+            del mapped
+            # Readers holding the previous file keep their mapping intact
+            os.replace(tmp, path)
+            descriptor["transport"] = "npy"
+            descriptor["path"] = str(path)
+
+        file_io.atomic_write_json(out_dir / f"{safe_image}.json", descriptor, indent=2)
+        _sequence[image_name] = sequence
+        print(f"Frame share: Published '{image_name}' ({width}x{height}) via {descriptor['transport']}")
+        return True, f"Published '{image_name}'"
+    except Exception as e:
+        print(f"Frame share: Failed to publish '{image_name}': {e}")
+        return False, f"Failed to publish '{image_name}': {e}"
+
+
+def release_all():
+    """Closes and unlinks every shared memory segment owned by this process."""
+    for image_name in list(_segments):
+        _release_segment(image_name)
+    _sequence.clear()
+
+
+def published_count():
+    """Number of live shared memory segments."""
+    return len(_segments)
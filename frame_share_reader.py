@@ -0,0 +1,151 @@
+"""
+Reference reader for frames published by the PUBLISH action (frame_share.py)
+
+Standalone: depends only on NumPy, not on Blender. Copy it next to your
+inference code or run it directly:
+
+    python frame_share_reader.py /path/to/output/FirstFrame.json
+"""
+
+import sys
+import json
+import time
+from pathlib import Path
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Version 1 segments have no write counter; pixels start at offset 0
+SUPPORTED_VERSIONS = (1, 2)
+
+# Pause between attempts of read_frame_copy while a publish is in progress
+RETRY_DELAY = 0.001
+
+
+class PublishedFrame:
+    """
+    A zero-copy view of a published frame.
+
+    `pixels` is an (H, W, C) float32 array backed directly by the shared
+    memory segment or the memory-mapped .npy file. Rows are stored bottom-up
+    like Blender's pixel buffer; use `top_down()` for the usual image order
+    (also a view, no copy). Call `close()` (or use `with`) when done.
+    """
+
+    def __init__(self, descriptor, pixels, handle=None, counter=None):
+        self.descriptor = descriptor
+        self.pixels = pixels
+        self._handle = handle
+        self._counter = counter
+
+    @property
+    def sequence(self):
+        return self.descriptor.get("sequence", 0)
+
+    def write_counter(self):
+        """
+        The segment's current write counter: odd while a publish is writing,
+        2 * sequence once it is done. None for .npy files and old segments.
+        """
+        return int(self._counter[0]) if self._counter is not None else None
+
+    def top_down(self):
+        return self.pixels[::-1]
+
+    def close(self):
+        self.pixels = None
+        self._counter = None
+        if self._handle is not None:
+            # Readers only close; the publishing Blender process owns the segment
+            self._handle.close()
+            self._handle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_descriptor(descriptor_path):
+    with open(descriptor_path, 'r', encoding='utf-8') as f:
+        descriptor = json.load(f)
+    if descriptor.get("version") not in SUPPORTED_VERSIONS:
+        raise ValueError(f"Unsupported descriptor version: {descriptor.get('version')}")
+    return descriptor
+
+
+def open_frame(descriptor_path):
+    """Maps the frame described by a descriptor file without copying pixels."""
+    descriptor = read_descriptor(descriptor_path)
+    shape = tuple(descriptor["shape"])
+    dtype = np.dtype(descriptor["dtype"])
+
+    if descriptor["transport"] == "shared_memory":
+        segment = shared_memory.SharedMemory(name=descriptor["shm_name"])
+        # Attaching must not register the segment for cleanup in this process
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(segment._name, "shared_memory")
+        except Exception:
+            pass
+        offset = descriptor.get("offset", 0)
+        pixels = np.ndarray(shape, dtype=dtype, buffer=segment.buf, offset=offset)
+        counter = np.ndarray((1,), dtype=np.uint64, buffer=segment.buf) if offset else None
+        return PublishedFrame(descriptor, pixels, segment, counter)
+
+    if descriptor["transport"] == "npy":
+        pixels = np.load(descriptor["path"], mmap_mode='r')
+        if pixels.shape != shape:
+            raise ValueError(f"Shape mismatch: descriptor {shape}, file {pixels.shape}")
+        return PublishedFrame(descriptor, pixels)
+
+    raise ValueError(f"Unknown transport: {descriptor['transport']}")
+
+
+def read_frame_copy(descriptor_path, retries=10):
+    """
+    Returns a private copy of a frame that was not overwritten while copying,
+    with the descriptor it belongs to.
+
+    Shared memory segments are rewritten in place by the next publish. The
+    segment's write counter is read before and after the copy; the copy is
+    kept only if both are the same even value matching the descriptor's
+    sequence. Segments without a counter (version 1) fall back to comparing
+    the descriptor's sequence, which cannot catch every torn frame.
+    """
+    for attempt in range(retries):
+        if attempt:
+            time.sleep(RETRY_DELAY)
+        with open_frame(descriptor_path) as frame:
+            before = frame.write_counter()
+            if before is not None and before != 2 * frame.sequence:
+                # Being written, or the descriptor of a newer frame is not out yet
+                continue
+            pixels = np.array(frame.pixels)
+            after = frame.write_counter()
+            descriptor = frame.descriptor
+        if after is not None:
+            if after == before:
+                return pixels, descriptor
+        elif read_descriptor(descriptor_path).get("sequence", 0) == descriptor.get("sequence", 0):
+            return pixels, descriptor
+    raise RuntimeError(f"Frame kept changing while reading '{descriptor_path}'")
+
+
+def main(argv):
+    if len(argv) < 2:
+        print(__doc__)
+        return 1
+
+    for path in argv[1:]:
+        with open_frame(Path(path)) as frame:
+            d = frame.descriptor
+            print(f"{d['image']}: shape={tuple(d['shape'])} transport={d['transport']} "
+                  f"frame={d.get('frame')} camera={d.get('camera')} seq={d.get('sequence')} "
+                  f"mean={float(frame.pixels.mean()):.4f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
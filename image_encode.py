@@ -0,0 +1,326 @@
+"""
+NumPy float-to-integer conversion pipeline and PNG writer for image saving
+
+This module does not import bpy, so benchmarks and external tools can use it
+directly. Pixel arrays follow Blender's layout: (H, W, C) float32, rows
+bottom-up.
+"""
+
+import zlib
+import struct
+
+import numpy as np
+
+# Rows compressed per zlib call when streaming IDAT data
+ROWS_PER_CHUNK = 64
+
+# Size of the tiled dither threshold maps
+DITHER_SIZE = 64
+
+# PNG colour types by channel count
+PNG_COLOR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}
+
+_threshold_maps = {}
+
+
+def linear_to_srgb(values):
+    """IEC 61966-2-1 sRGB transfer function, vectorized."""
+    values = np.clip(values, 0.0, None)
+    return np.where(values <= 0.0031308, values * 12.92, 1.055 * np.power(values, 1.0 / 2.4) - 0.055)
+
+
+def srgb_to_linear(values):
+    """Inverse sRGB transfer function, vectorized."""
+    values = np.clip(values, 0.0, None)
+    return np.where(values <= 0.04045, values / 12.92, np.power((values + 0.055) / 1.055, 2.4))
+
+
+def _bayer_matrix(size):
+    """Recursive Bayer ordered-dither matrix with values in [0, 1)."""
+    matrix = np.zeros((1, 1), dtype=np.float32)
+    while matrix.shape[0] < size:
+        matrix = np.block([[4 * matrix, 4 * matrix + 2],
+                           [4 * matrix + 3, 4 * matrix + 1]])
+    return (matrix + 0.5) / matrix.size
+
+
+def _blue_noise(size, seed=7):
+    """
+    Blue-noise-like threshold map with values in [0, 1).
+
+    White noise is high-pass filtered (noise minus its wrapped box blur) and
+    rank-normalized to a uniform distribution. This approximates a
+    void-and-cluster mask well enough for dithering, without shipping a texture.
+    """
+    rng = np.random.default_rng(seed)
+    noise = rng.random((size, size))
+    blurred = np.zeros_like(noise)
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            blurred += np.roll(np.roll(noise, dy, axis=0), dx, axis=1)
+    high_pass = noise - blurred / 9.0
+    ranks = np.argsort(np.argsort(high_pass, axis=None)).reshape(size, size)
+    return ((ranks + 0.5) / ranks.size).astype(np.float32)
+
+
+def threshold_map(kind, height, width, row_offset=0):
+    """
+    Returns a dither threshold map tiled to (height, width).
+
+    row_offset is the top-down row of the first output row, so maps built
+    for consecutive row tiles line up into one seamless pattern.
+    """
+    if kind not in _threshold_maps:
+        if kind == 'ORDERED':
+            _threshold_maps[kind] = _bayer_matrix(8)
+        else:
+            _threshold_maps[kind] = _blue_noise(DITHER_SIZE)
+    tile = _threshold_maps[kind]
+    phase = row_offset % tile.shape[0]
+    reps_y = -(-(height + phase) // tile.shape[0])
+    reps_x = -(-width // tile.shape[1])
+    return np.tile(tile, (reps_y, reps_x))[phase:phase + height, :width]
+
+
+def prepare_pixels(pixels, bit_depth=8, color_transform='NONE', dither='NONE', alpha_mode='KEEP', row_offset=0):
+    """
+    Converts float pixels to integers ready for encoding.
+
+    Works on whole images or on row tiles (see tiling.iter_tiles with
+    top_down=True); row_offset keeps the dither pattern continuous across tiles.
+
+    Args:
+        pixels: (H, W, C) float array, Blender row order (bottom-up)
+        bit_depth: 8 or 16
+        color_transform: 'NONE', 'LINEAR_TO_SRGB' or 'SRGB_TO_LINEAR' (colour channels only)
+        dither: 'NONE', 'ORDERED' or 'BLUE_NOISE'
+        alpha_mode: 'KEEP', 'PREMULTIPLY' or 'DROP'
+        row_offset: Top-down row of the first output row
+
+    Returns:
+        np.ndarray: (H, W, C') uint8 or uint16 array, rows top-down
+    """
+    pixels = np.asarray(pixels, dtype=np.float32)
+    height, width, channels = pixels.shape
+    has_alpha = channels in (2, 4)
+    color_count = channels - 1 if has_alpha else channels
+
+    out = pixels[::-1].copy()
+    color = out[:, :, :color_count]
+
+    if color_transform == 'LINEAR_TO_SRGB':
+        color[...] = linear_to_srgb(color)
+    elif color_transform == 'SRGB_TO_LINEAR':
+        color[...] = srgb_to_linear(color)
+
+    if has_alpha and alpha_mode == 'PREMULTIPLY':
+        color *= out[:, :, -1:]
+    if has_alpha and alpha_mode == 'DROP':
+        out = out[:, :, :color_count]
+
+    levels = (1 << int(bit_depth)) - 1
+    np.clip(out, 0.0, 1.0, out=out)
+    out *= levels
+
+    if dither != 'NONE':
+        # Threshold in [0, 1) replaces the usual +0.5 rounding offset
+        out += threshold_map(dither, height, width, row_offset)[:, :, None]
+    else:
+        out += 0.5
+
+    np.floor(out, out=out)
+    np.clip(out, 0, levels, out=out)
+    return out.astype(np.uint16 if int(bit_depth) > 8 else np.uint8)
+
+
+def _chunk(tag, data):
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+
+def iter_png_blocks(blocks, width, height, channels, bit_depth=8, compression=6):
+    """
+    Yields the bytes of a PNG file assembled from top-down row blocks.
+
+    Each block is an integer (rows, width, channels) array; blocks may have
+    any number of rows and are typically produced tile by tile, so the
+    whole image never has to exist in integer form. Rows use the PNG 'Up'
+    filter unless compression is 0. Scanlines are compressed in chunks of
+    ROWS_PER_CHUNK and emitted as separate IDAT chunks, so the full
+    compressed stream is never held in memory.
+    """
+    if channels not in PNG_COLOR_TYPES:
+        raise ValueError(f"Unsupported channel count for PNG: {channels}")
+
+    row_size = width * channels * (2 if bit_depth == 16 else 1)
+    filter_type = 2 if compression > 0 else 0
+
+    yield b"\x89PNG\r\n\x1a\n"
+    yield _chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, bit_depth, PNG_COLOR_TYPES[channels], 0, 0, 0))
+
+    compressor = zlib.compressobj(compression)
+    previous = np.zeros(row_size, dtype=np.uint8)
+    scanlines = np.empty((min(ROWS_PER_CHUNK, height), row_size + 1), dtype=np.uint8)
+    scanlines[:, 0] = filter_type
+    written_rows = 0
+
+    for block in blocks:
+        rows = block.astype(">u2" if bit_depth == 16 else np.uint8, copy=False).reshape(block.shape[0], -1).view(np.uint8)
+        for y0 in range(0, rows.shape[0], ROWS_PER_CHUNK):
+            chunk_rows = rows[y0:y0 + ROWS_PER_CHUNK]
+            lines = scanlines[:chunk_rows.shape[0]]
+            if filter_type == 2:
+                np.subtract(chunk_rows[:1], previous, out=lines[:1, 1:])
+                np.subtract(chunk_rows[1:], chunk_rows[:-1], out=lines[1:, 1:])
+            else:
+                lines[:, 1:] = chunk_rows
+            previous = chunk_rows[-1].copy()
+
+            data = compressor.compress(lines.tobytes())
+            if data:
+                yield _chunk(b"IDAT", data)
+        written_rows += rows.shape[0]
+
+    if written_rows != height:
+        raise ValueError(f"PNG blocks contained {written_rows} rows, expected {height}")
+
+    yield _chunk(b"IDAT", compressor.flush())
+    yield _chunk(b"IEND", b"")
+
+
+def iter_png(array, compression=6):
+    """Yields the bytes of a PNG file for an integer (H, W, C) array, top-down."""
+    height, width, channels = array.shape
+    bit_depth = 16 if array.dtype == np.uint16 else 8
+    return iter_png_blocks([array], width, height, channels, bit_depth, compression)
+
+
+def write_png_blocks(file_obj, blocks, width, height, channels, bit_depth=8, compression=6):
+    """Writes a PNG from top-down row blocks to an open binary file; returns the number of bytes written."""
+    written = 0
+    for data in iter_png_blocks(blocks, width, height, channels, bit_depth, compression):
+        file_obj.write(data)
+        written += len(data)
+    return written
+
+
+def write_png(file_obj, array, compression=6):
+    """Writes a PNG to an open binary file; returns the number of bytes written."""
+    height, width, channels = array.shape
+    bit_depth = 16 if array.dtype == np.uint16 else 8
+    return write_png_blocks(file_obj, [array], width, height, channels, bit_depth, compression)
+
+
+# -------------------------------------------------------------------
+# PNG reading
+# -------------------------------------------------------------------
+
+PNG_CHANNELS = {color_type: channels for channels, color_type in PNG_COLOR_TYPES.items()}
+
+
+def _unfilter_rows(filtered, filters):
+    """Reverses None/Sub/Up row filters row by row, vectorized along each row."""
+    out = np.empty_like(filtered)
+    previous = np.zeros_like(filtered[0])
+    for y, kind in enumerate(filters):
+        line = filtered[y]
+        if kind == 1:
+            np.cumsum(line, axis=0, dtype=np.uint8, out=out[y])
+        elif kind == 2:
+            np.add(line, previous, out=out[y])
+        else:
+            out[y] = line
+        previous = out[y]
+    return out
+
+
+def _unfilter_wavefront(filtered, filters):
+    """
+    Reverses any mix of row filters, including Average and Paeth.
+
+    Each pixel depends on its left, upper and upper-left neighbours, so all
+    pixels on one anti-diagonal are independent. Rows are stored skewed
+    (pixel (y, x) at column x + y + 2 of row y + 1, zero padded) so every
+    diagonal is one contiguous column and its neighbours are the two
+    columns before it.
+    """
+    height, width, bpp = filtered.shape
+    recon = np.zeros((height + 1, height + width + 1, bpp), dtype=np.uint8)
+    kinds = np.asarray(filters, dtype=np.int16)[:, None]
+    rows = np.arange(height)
+
+    for d in range(height + width - 1):
+        lo, hi = max(0, d - width + 1), min(height - 1, d) + 1
+        ys = rows[lo:hi]
+        line = filtered[ys, d - ys].astype(np.int16)
+        a = recon[lo + 1:hi + 1, d + 1].astype(np.int16)
+        b = recon[lo:hi, d + 1].astype(np.int16)
+        c = recon[lo:hi, d].astype(np.int16)
+
+        p = a + b - c
+        pa, pb, pc = np.abs(p - a), np.abs(p - b), np.abs(p - c)
+        paeth = np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+        kind = kinds[lo:hi]
+        predictor = np.select([kind == 1, kind == 2, kind == 3, kind == 4],
+                              [a, b, (a + b) >> 1, paeth], 0)
+        recon[lo + 1:hi + 1, d + 2] = (line + predictor) & 0xFF
+
+    return recon[rows[:, None] + 1, np.arange(width)[None, :] + rows[:, None] + 2]
+
+
+def read_png(path):
+    """
+    Reads a PNG into an integer (H, W, C) array, top-down (the counterpart
+    of write_png): uint8 for 8-bit files, uint16 for 16-bit ones.
+
+    Supports non-interlaced grey, grey+alpha, RGB and RGBA at 8 or 16 bits,
+    which covers what image generators write. Anything else (palettes, low
+    bit depths, interlacing, a truncated file) raises ValueError, so callers
+    can fall back to another decoder.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError(f"'{path}' is not a PNG file")
+
+    header = None
+    idat = []
+    offset = 8
+    while offset + 8 <= len(data):
+        length, tag = struct.unpack(">I4s", data[offset:offset + 8])
+        body = data[offset + 8:offset + 8 + length]
+        if tag == b"IHDR":
+            header = struct.unpack(">IIBBBBB", body)
+        elif tag == b"IDAT":
+            idat.append(body)
+        elif tag == b"IEND":
+            break
+        offset += 12 + length
+    else:
+        raise ValueError(f"'{path}' is truncated")
+
+    width, height, bit_depth, color_type, _, _, interlace = header
+    if color_type not in PNG_CHANNELS or bit_depth not in (8, 16) or interlace:
+        raise ValueError(f"Unsupported PNG variant in '{path}' (colour type {color_type}, {bit_depth}-bit)")
+
+    channels = PNG_CHANNELS[color_type]
+    bpp = channels * (2 if bit_depth == 16 else 1)
+    try:
+        raw = zlib.decompress(b"".join(idat))
+    except zlib.error as e:
+        raise ValueError(f"Corrupt PNG data in '{path}': {e}")
+    if len(raw) != height * (width * bpp + 1):
+        raise ValueError(f"PNG data of '{path}' has {len(raw)} bytes, expected {height * (width * bpp + 1)}")
+
+    scanlines = np.frombuffer(raw, dtype=np.uint8).reshape(height, width * bpp + 1)
+    filters = scanlines[:, 0]
+    filtered = scanlines[:, 1:].reshape(height, width, bpp)
+    if filters.max(initial=0) > 4:
+        raise ValueError(f"Invalid PNG filter type in '{path}'")
+    if filters.max(initial=0) <= 2:
+        rows = _unfilter_rows(filtered, filters)
+    else:
+        rows = _unfilter_wavefront(filtered, filters)
+
+    if bit_depth == 16:
+        return rows.reshape(height, -1).view(">u2").astype(np.uint16).reshape(height, width, channels)
+    return rows.reshape(height, width, channels)
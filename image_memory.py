@@ -0,0 +1,157 @@
+"""
+Memory-budgeted LRU for image pixel buffers
+"""
+
+import bpy
+from collections import OrderedDict
+
+# Image sources whose pixels can be reloaded after their buffers are freed
+RELOADABLE_SOURCES = {'FILE', 'SEQUENCE', 'MOVIE'}
+
+
+def image_buffer_bytes(img):
+    """Estimated size of an image's pixel buffer (resolution × channels × float/byte)."""
+    width, height = img.size
+    bytes_per_channel = 4 if img.is_float else 1
+    return width * height * img.channels * bytes_per_channel
+
+
+def format_bytes(num_bytes):
+    """Formats a byte count for display in the UI."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(num_bytes) < 1024 or unit == "GB":
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
+
+def get_budget_bytes():
+    """Returns the configured byte budget, or 0 when the budget is disabled."""
+    try:
+        preferences = bpy.context.preferences.addons[__package__].preferences
+    except (KeyError, AttributeError):
+        return 0
+    return preferences.image_memory_budget_mb * 1024 * 1024
+
+
+class ImageMemoryManager:
+    """
+    Tracks image buffers touched by the add-on in least-recently-used order.
+
+    When resident buffers exceed the budget, the least recently used images
+    that are not dirty, not displayed and reloadable from their source get
+    their buffers freed with Image.buffers_free(). Blender reloads them on
+    next access.
+
+    usage_bytes is the resident size as of the last touch/enforce, for
+    display; the panel must not walk (and prune) the LRU while drawing.
+    """
+
+    def __init__(self):
+        self._lru = OrderedDict()
+        self._created = set()
+        self.usage_bytes = 0
+        self.evictions = 0
+        self.freed_bytes = 0
+        self.last_evicted = ""
+
+    def touch(self, name):
+        """Marks an image as most recently used."""
+        if name not in self._lru:
+            img = bpy.data.images.get(name)
+            if img is not None and img.has_data:
+                self.usage_bytes += image_buffer_bytes(img)
+        self._lru[name] = None
+        self._lru.move_to_end(name)
+
+    def note_created(self, name):
+        """Marks an image as created by the add-on (see memory_report orphans)."""
+        self._created.add(name)
+
+    def created_names(self):
+        return set(self._created)
+
+    def forget(self, name):
+        self._lru.pop(name, None)
+        self._created.discard(name)
+
+    def tracked_names(self):
+        """Image names from least to most recently used."""
+        return list(self._lru)
+
+    def resident_bytes(self):
+        """Bytes held by tracked images whose pixels are currently loaded."""
+        total = 0
+        for name in list(self._lru):
+            img = bpy.data.images.get(name)
+            if img is None:
+                self.forget(name)
+            elif img.has_data:
+                total += image_buffer_bytes(img)
+        self.usage_bytes = total
+        return total
+
+    def _can_evict(self, img, protected):
+        if img.name in protected or not img.has_data or img.is_dirty:
+            return False
+        return img.source in RELOADABLE_SOURCES or bool(img.packed_file)
+
+    def enforce(self, budget_bytes, protected=()):
+        """
+        Frees least recently used buffers until usage fits the budget.
+
+        Args:
+            budget_bytes: Byte budget; 0 disables eviction
+            protected: Image names that must stay resident
+
+        Returns:
+            int: Number of buffers freed
+        """
+        usage = self.resident_bytes()
+        if budget_bytes <= 0:
+            return 0
+
+        protected = set(protected) | displayed_image_names()
+        freed = 0
+
+        for name in list(self._lru):
+            if usage <= budget_bytes:
+                break
+            img = bpy.data.images.get(name)
+            if img is None or not self._can_evict(img, protected):
+                continue
+
+            size = image_buffer_bytes(img)
+            try:
+                img.buffers_free()
+            except Exception as e:
+                print(f"Image memory: Failed to free '{name}': {e}")
+                continue
+
+            usage -= size
+            freed += 1
+            self.evictions += 1
+            self.freed_bytes += size
+            self.last_evicted = name
+            print(f"Image memory: Freed '{name}' ({format_bytes(size)})")
+
+        self.usage_bytes = usage
+        return freed
+
+
+def displayed_image_names():
+    """Names of images currently shown in any Image Editor."""
+    names = set()
+    wm = bpy.context.window_manager
+    if wm is None:
+        return names
+    for window in wm.windows:
+        for area in window.screen.areas:
+            if area.type == 'IMAGE_EDITOR':
+                image = area.spaces.active.image
+                if image:
+                    names.add(image.name)
+    return names
+
+
+# Shared manager instance for the add-on
+manager = ImageMemoryManager()
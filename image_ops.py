@@ -0,0 +1,270 @@
+"""
+Vectorized pixel operations on Blender images using NumPy
+"""
+
+import bpy
+import numpy as np
+
+from . import tiling
+from . import image_memory
+
+# Depth values at or beyond this are treated as background (empty Z pass pixels)
+DEPTH_BACKGROUND_THRESHOLD = 1.0e9
+
+# Pixel count above which percentiles are estimated from a strided sample
+PERCENTILE_SAMPLE_LIMIT = 1 << 20
+
+# Block size of the SSIM approximation (non-overlapping windows)
+SSIM_BLOCK = 8
+
+# Rec. 709 luminance weights
+LUMA_WEIGHTS = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+
+
+def ensure_image(name, width, height, float_buffer=False, colorspace=None):
+    """
+    Returns an image of the given size, creating or rescaling it as needed.
+
+    Blender cannot convert an image's float/byte storage directly, so an
+    existing image of the other type is replaced in place (same name) if
+    the add-on created it. Images from anywhere else are left alone.
+
+    Raises:
+        ValueError: if an image not created by the add-on has the other type
+    """
+    img = bpy.data.images.get(name)
+    if img is not None and img.is_float != float_buffer:
+        if name not in image_memory.manager.created_names():
+            wanted = "float" if float_buffer else "byte"
+            raise ValueError(f"Image '{name}' is not a {wanted} image; "
+                             f"remove it or choose another name so it can be created")
+        bpy.data.images.remove(img)
+        image_memory.manager.forget(name)
+        img = None
+
+    if img is None:
+        img = bpy.data.images.new(name, width, height, alpha=True, float_buffer=float_buffer)
+        image_memory.manager.note_created(img.name)
+    elif tuple(img.size) != (width, height):
+        img.scale(width, height)
+    image_memory.manager.touch(img.name)
+
+    if colorspace:
+        try:
+            img.colorspace_settings.name = colorspace
+        except TypeError:
+            pass
+    return img
+
+
+def quantize(values, bit_depth):
+    """Rounds normalized values to the levels representable at a bit depth."""
+    levels = (1 << int(bit_depth)) - 1
+    return np.round(values * levels) / levels
+
+
+def depth_clip_range(depth, clip_mode='NEAR_FAR', near=0.1, far=100.0, percentile_low=1.0, percentile_high=99.0):
+    """
+    Returns the (near, far) range used to normalize a depth buffer.
+
+    In 'PERCENTILE' mode the range is taken from the distribution of valid
+    (non-background) depth values; large buffers are sampled on a strided
+    grid first, so the mask and the sample stay bounded in size.
+    """
+    if clip_mode != 'PERCENTILE':
+        return float(near), float(far)
+
+    if depth.size > PERCENTILE_SAMPLE_LIMIT:
+        step = int(np.ceil(np.sqrt(depth.size / PERCENTILE_SAMPLE_LIMIT)))
+        depth = depth[::step, ::step]
+
+    valid = depth[np.isfinite(depth) & (depth < DEPTH_BACKGROUND_THRESHOLD)]
+    if valid.size == 0:
+        return float(near), float(far)
+
+    low, high = np.percentile(valid, [percentile_low, percentile_high])
+    return float(low), float(high)
+
+
+def depth_to_map(depth, near, far, invert=True, gamma=1.0, bit_depth=8):
+    """
+    Converts raw depth to a normalized depth map in [0, 1].
+
+    Args:
+        depth: (H, W) float array of distances
+        near, far: Distances mapped to 0 and 1 before inversion
+        invert: Map near to white (ControlNet convention)
+        gamma: Exponent applied to the normalized values
+        bit_depth: 8 or 16; values are quantized to that many levels
+
+    Returns:
+        np.ndarray: (H, W) float32 values
+    """
+    span = max(far - near, 1e-8)
+    out = np.subtract(depth, near, dtype=np.float32)
+    out /= span
+    # Background and invalid pixels end up at the far plane
+    out[~np.isfinite(out)] = 1.0
+    np.clip(out, 0.0, 1.0, out=out)
+
+    if invert:
+        np.subtract(1.0, out, out=out)
+    if gamma != 1.0:
+        np.power(out, gamma, out=out)
+
+    return quantize(out, bit_depth).astype(np.float32, copy=False)
+
+
+def build_depth_map(source_name, target_name, clip_mode='NEAR_FAR', near=0.1, far=100.0,
+                    percentile_low=1.0, percentile_high=99.0, invert=True, gamma=1.0, bit_depth=8):
+    """
+    Builds a depth map image from a float depth image or rendered Z pass.
+
+    The source is staged once (see tiling.py) and its first channel is used
+    as depth; the map is built row tile by row tile into the target's
+    staging buffer. 8-bit maps are written to a byte image, 16-bit maps to a
+    float image quantized to 16-bit levels; both use the Non-Color colorspace.
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    source = bpy.data.images.get(source_name)
+    if source is None:
+        return False, f"Depth source image '{source_name}' not found"
+
+    try:
+        pixels = tiling.read_image(source, 'src')
+        height, width = pixels.shape[:2]
+        low, high = depth_clip_range(pixels[:, :, 0], clip_mode, near, far, percentile_low, percentile_high)
+
+        target = ensure_image(target_name, width, height,
+                              float_buffer=int(bit_depth) > 8, colorspace='Non-Color')
+        out = tiling.output_buffer(target, 'dst')
+
+        rows = tiling.tile_rows(width, max(pixels.shape[2], out.shape[2]))
+        for y0, y1 in tiling.iter_tiles(height, rows):
+            values = depth_to_map(pixels[y0:y1, :, 0], low, high, invert=invert, gamma=gamma, bit_depth=bit_depth)
+            out[y0:y1, :, :3] = values[:, :, None]
+            if out.shape[2] == 4:
+                out[y0:y1, :, 3] = 1.0
+
+        tiling.write_image(target, out)
+
+        print(f"Depth map: '{source_name}' → '{target_name}' (range {low:.4g}..{high:.4g}, {bit_depth}-bit)")
+        return True, f"Built depth map '{target_name}' ({low:.3g}..{high:.3g})"
+    except Exception as e:
+        print(f"Depth map: Failed to build '{target_name}' from '{source_name}': {e}")
+        return False, f"Depth map failed: {e}"
+    finally:
+        tiling.release_staging()
+
+
+def _luminance(rgb):
+    return rgb @ LUMA_WEIGHTS if rgb.shape[-1] >= 3 else rgb[..., 0]
+
+
+def _block_ssim(lum_a, lum_b):
+    """SSIM over non-overlapping blocks; returns (sum of block scores, block count)."""
+    b = SSIM_BLOCK
+    h = lum_a.shape[0] // b * b
+    w = lum_a.shape[1] // b * b
+    if h == 0 or w == 0:
+        return 0.0, 0
+
+    shape = (h // b, b, w // b, b)
+    a = lum_a[:h, :w].reshape(shape).astype(np.float64)
+    c = lum_b[:h, :w].reshape(shape).astype(np.float64)
+
+    mu_a = a.mean(axis=(1, 3))
+    mu_b = c.mean(axis=(1, 3))
+    var_a = a.var(axis=(1, 3))
+    var_b = c.var(axis=(1, 3))
+    cov = (a * c).mean(axis=(1, 3)) - mu_a * mu_b
+
+    c1 = 0.01 ** 2
+    c2 = 0.03 ** 2
+    ssim = ((2 * mu_a * mu_b + c1) * (2 * cov + c2)) / ((mu_a ** 2 + mu_b ** 2 + c1) * (var_a + var_b + c2))
+    return float(ssim.sum()), ssim.size
+
+
+def _heatmap(diff, gain):
+    """Maps per-pixel differences to a black → red → yellow → white ramp."""
+    v = np.clip(diff * gain, 0.0, 1.0) * 3.0
+    return np.stack((
+        np.clip(v, 0.0, 1.0),
+        np.clip(v - 1.0, 0.0, 1.0),
+        np.clip(v - 2.0, 0.0, 1.0),
+    ), axis=-1)
+
+
+def compare_images(name_a, name_b, diff_name="", heatmap_gain=4.0):
+    """
+    Compares two images of the same size.
+
+    Both images are staged once (see tiling.py). Metrics are accumulated over
+    row tiles so temporaries stay bounded, and the heat map is written tile by
+    tile into the first image's staging buffer (no longer needed once a tile
+    is processed) instead of a third full-size array. When the first image's
+    channel count differs from the diff image's, the heat map goes into an
+    output staging buffer instead.
+
+    Returns:
+        tuple: (success: bool, message: str, metrics: dict or None)
+            metrics holds 'mse', 'psnr' and 'ssim' (RGB, data range 0..1)
+    """
+    img_a = bpy.data.images.get(name_a)
+    img_b = bpy.data.images.get(name_b)
+    if img_a is None or img_b is None:
+        missing = name_a if img_a is None else name_b
+        return False, f"Image '{missing}' not found for comparison", None
+    if tuple(img_a.size) != tuple(img_b.size):
+        return False, f"Image sizes differ: {tuple(img_a.size)} vs {tuple(img_b.size)}", None
+
+    try:
+        a = tiling.read_image(img_a, 'src')
+        b = tiling.read_image(img_b, 'aux')
+        height, width = a.shape[:2]
+        color_channels = min(3, a.shape[2], b.shape[2])
+
+        rows = tiling.tile_rows(width, a.shape[2], align=SSIM_BLOCK)
+        heat = None
+        if diff_name:
+            target = ensure_image(diff_name, width, height)
+            heat = a if a.shape[2] == target.channels else tiling.output_buffer(target, 'dst')
+
+        sq_err_sum = 0.0
+        ssim_sum = 0.0
+        ssim_count = 0
+
+        for y0, y1 in tiling.iter_tiles(height, rows):
+            tile_a = a[y0:y1, :, :color_channels]
+            tile_b = b[y0:y1, :, :color_channels]
+
+            delta = tile_a - tile_b
+            sq_err_sum += float(np.einsum('ijk,ijk->', delta, delta, dtype=np.float64))
+
+            block_sum, block_count = _block_ssim(_luminance(tile_a), _luminance(tile_b))
+            ssim_sum += block_sum
+            ssim_count += block_count
+
+            if heat is not None:
+                abs_diff = np.abs(delta).mean(axis=-1)
+                heat[y0:y1, :, :3] = _heatmap(abs_diff, heatmap_gain)
+                if heat.shape[2] == 4:
+                    heat[y0:y1, :, 3] = 1.0
+
+        mse = sq_err_sum / (height * width * color_channels)
+        psnr = float('inf') if mse == 0.0 else 10.0 * np.log10(1.0 / mse)
+        ssim = ssim_sum / ssim_count if ssim_count else 1.0
+        metrics = {"mse": mse, "psnr": float(psnr), "ssim": ssim}
+
+        if heat is not None:
+            tiling.write_image(target, heat)
+
+        print(f"Compare: '{name_a}' vs '{name_b}': MSE={mse:.6g} PSNR={psnr:.2f} dB SSIM≈{ssim:.4f}")
+        return True, f"MSE {mse:.5f}, PSNR {psnr:.2f} dB, SSIM {ssim:.4f}", metrics
+    except Exception as e:
+        print(f"Compare: Failed to compare '{name_a}' and '{name_b}': {e}")
+        return False, f"Comparison failed: {e}", None
+    finally:
+        tiling.release_staging()
@@ -0,0 +1,264 @@
+"""
+Action execution journal
+
+Every executed action and config reload appends one compact JSON line to a
+per-session journal file: the action as it is written to config.json, the
+scene frame and camera it started from, a hash of its inputs, and the time
+of each work unit. journal_replay.py re-runs a journal in `blender -b` with
+per-step timings, so a reported slow session becomes a repeatable test case.
+"""
+
+import bpy
+import os
+import json
+import time
+import hashlib
+import tempfile
+from pathlib import Path
+
+from . import utils
+from . import manifest
+from . import node_params
+
+JOURNAL_VERSION = 1
+
+# Used when the journal directory preference is empty
+DEFAULT_DIRECTORY = Path(tempfile.gettempdir()) / "ai_workflow_journal"
+
+# Journal file of this Blender session (created on first record) and the last sequence number
+_session = {"path": None, "seq": 0}
+
+# (path, size, mtime_ns) -> blake2b digest of an input file, so unchanged files are hashed once
+_file_digests = {}
+
+# When set (by capture()), records are appended here instead of written to the file
+_captured = None
+
+
+def _preferences():
+    try:
+        return bpy.context.preferences.addons[__package__].preferences
+    except (KeyError, AttributeError):
+        return None
+
+
+def is_enabled():
+    """True if records are written (journal preference on, or a capture is active)."""
+    if _captured is not None:
+        return True
+    preferences = _preferences()
+    return preferences is not None and preferences.journal_enabled
+
+
+def journal_directory():
+    preferences = _preferences()
+    directory = preferences.journal_directory if preferences is not None else ""
+    return Path(bpy.path.abspath(directory)) if directory else DEFAULT_DIRECTORY
+
+
+def session_path():
+    """Path of this session's journal file (it may not exist yet)."""
+    if _session["path"] is None:
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        _session["path"] = journal_directory() / f"journal_{stamp}_{os.getpid()}.jsonl"
+    return _session["path"]
+
+
+def _write(entry):
+    _session["seq"] += 1
+    entry = {"v": JOURNAL_VERSION, "seq": _session["seq"], "time": round(time.time(), 3), **entry}
+    if _captured is not None:
+        _captured.append(entry)
+        return
+
+    path = session_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"Journal: Could not write '{path}': {e}")
+
+
+class capture:
+    """
+    Context manager that collects records in a list instead of the journal
+    file (used by the replay so it does not journal itself).
+
+        with journal.capture() as records:
+            bpy.ops.ai_workflow.execute_action(action_index=0)
+    """
+
+    def __enter__(self):
+        global _captured
+        self._previous = _captured
+        _captured = []
+        return _captured
+
+    def __exit__(self, *exc):
+        global _captured
+        _captured = self._previous
+        return False
+
+
+# -------------------------------------------------------------------
+# Input hashing
+# -------------------------------------------------------------------
+
+def _file_digest(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return "missing"
+    key = (path, st.st_size, st.st_mtime_ns)
+    digest = _file_digests.get(key)
+    if digest is None:
+        try:
+            digest = manifest.hash_file(path)[1]
+        except OSError:
+            return "unreadable"
+        _file_digests[key] = digest
+    return digest
+
+
+def _image_signature(img):
+    """
+    What an image contributes to the inputs hash: the content digest of its
+    source file, or its generator settings. Pixels edited in memory are only
+    marked dirty; hashing them would cost a full buffer read per click.
+    """
+    if img is None:
+        return None
+    signature = {"source": img.source}
+    if img.packed_file:
+        signature["packed"] = True
+    elif img.source in ('FILE', 'SEQUENCE', 'MOVIE') and img.filepath:
+        signature["file"] = _file_digest(bpy.path.abspath(img.filepath))
+    elif img.source == 'GENERATED':
+        signature["generated"] = [img.generated_type, img.generated_width, img.generated_height,
+                                  [round(c, 6) for c in img.generated_color]]
+    if img.is_dirty:
+        signature["dirty"] = True
+    return signature
+
+
+def inputs_hash(scene, action, action_entry):
+    """
+    Hash of everything an action reads: its settings, the scene frame and
+    camera, its images and the current values of its node parameters.
+    Equal hashes mean a replay starts from the same inputs.
+    """
+    tree = node_params.target_tree(scene, action)
+    payload = {
+        "action": action_entry,
+        "frame": scene.frame_current,
+        "camera": scene.camera.name if scene.camera else "",
+        "images": {name: _image_signature(bpy.data.images.get(name))
+                   for name in sorted(utils.action_image_names(action))},
+        "nodes": {param.path: node_params.read_value(tree, param.path) if tree is not None else None
+                  for param in action.node_params if param.path},
+    }
+    data = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+# -------------------------------------------------------------------
+# Records
+# -------------------------------------------------------------------
+
+class ActionRecord:
+    """
+    A journal entry for one action run, written by finish().
+
+    step() times each work unit from the previous one (or from resume(),
+    which modal runs call at the start of every timer tick so time spent
+    waiting for the next tick is not charged to a unit).
+    """
+
+    def __init__(self, entry):
+        self.entry = entry
+        self.steps = []
+        self._started = time.perf_counter()
+        self._last = self._started
+
+    def resume(self):
+        self._last = time.perf_counter()
+
+    def step(self, label):
+        now = time.perf_counter()
+        self.steps.append([label, round((now - self._last) * 1000.0, 3)])
+        self._last = now
+
+    def finish(self, status):
+        wall_ms = (time.perf_counter() - self._started) * 1000.0
+        self.entry.update({
+            "status": status,
+            "ms": round(wall_ms, 3),
+            "busy_ms": round(sum(ms for _, ms in self.steps), 3),
+            "steps": self.steps,
+        })
+        _write(self.entry)
+        return self.entry
+
+
+def begin_action(context, action, index, action_entry, mode):
+    """
+    Starts the record of an action run, before it changes anything.
+
+    Args:
+        action_entry: The action as a config dict (config_manager.action_to_dict)
+        mode: 'BLOCKING' or 'MODAL'
+
+    Returns:
+        ActionRecord
+    """
+    scene = context.scene
+    try:
+        digest = inputs_hash(scene, action, action_entry)
+    except Exception as e:
+        print(f"Journal: Could not hash inputs of '{action.button_name}': {e}")
+        digest = ""
+    return ActionRecord({
+        "kind": "action",
+        "id": action.button_name,
+        "index": index,
+        "mode": mode,
+        "blend": bpy.data.filepath,
+        "frame": scene.frame_current,
+        "camera": scene.camera.name if scene.camera else "",
+        "inputs": digest,
+        "action": action_entry,
+    })
+
+
+def record_reload(source, config_data, action_count, started):
+    """Writes a config reload record; started is the time.perf_counter() value when loading began."""
+    if not is_enabled():
+        return
+    data = json.dumps(config_data, sort_keys=True).encode("utf-8")
+    _write({
+        "kind": "reload",
+        "source": source,
+        "blend": bpy.data.filepath,
+        "actions": action_count,
+        "config": hashlib.blake2b(data, digest_size=16).hexdigest(),
+        "ms": round((time.perf_counter() - started) * 1000.0, 3),
+    })
+
+
+def read_journal(path):
+    """Records of a journal file in order; lines that do not parse (a torn last write) are skipped."""
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict) and entry.get("v") == JOURNAL_VERSION:
+                records.append(entry)
+    return records
+
+
+def clear_cache():
+    _file_digests.clear()
@@ -0,0 +1,161 @@
+"""
+Replays an action journal (journal.py) headless, with per-step timings
+
+Run it with the .blend the journal was recorded on; the add-on is enabled
+from the folder this script sits in:
+
+    blender -b scene.blend --python journal_replay.py -- journal_20250101-120000_1234.jsonl [--repeat 3] [--output timings.json]
+
+Each action record is loaded into a scratch action list and executed with
+the blocking operator, starting from the recorded frame and camera. Sweep
+waits and output watching are skipped so the run is as fast as possible;
+the journal's inputs hash is recomputed to show whether a step started from
+the same inputs. The file is not saved.
+"""
+
+import sys
+import json
+import argparse
+import importlib
+from pathlib import Path
+
+import bpy
+
+
+def load_addon():
+    """The add-on package this script belongs to, enabled if needed."""
+    addon_dir = Path(__file__).resolve().parent
+    package = addon_dir.name
+    module = sys.modules.get(package)
+    if module is not None and hasattr(module, "journal"):
+        return module
+
+    import addon_utils
+    module = addon_utils.enable(package, default_set=False)
+    if module is None:
+        # Not inside Blender's add-on paths: import the folder directly
+        sys.path.insert(0, str(addon_dir.parent))
+        module = importlib.import_module(package)
+        module.register()
+    return module
+
+
+def _prepare_scene(scene, record):
+    if record.get("frame") is not None:
+        scene.frame_set(record["frame"])
+    camera = bpy.data.objects.get(record.get("camera") or "")
+    if camera is not None and camera.type == 'CAMERA':
+        scene.camera = camera
+
+
+def _replay_action(addon, context, record):
+    """Runs one action record once; returns (captured record or None, inputs hash)."""
+    props = context.scene.my_addon_props
+    props.actions.clear()
+    action = props.actions.add()
+    addon.config_manager.load_action(action, record["action"])
+    action.sweep_wait = 0.0
+    action.watch_output = False
+
+    _prepare_scene(context.scene, record)
+    digest = addon.journal.inputs_hash(context.scene, action, addon.config_manager.action_to_dict(action))
+
+    with addon.journal.capture() as captured:
+        bpy.ops.ai_workflow.execute_action(action_index=0)
+    return (captured[-1] if captured else None), digest
+
+
+def _replay_reload(addon, context):
+    with addon.journal.capture() as captured:
+        addon.config_manager.load_config(context)
+    return captured[-1] if captured else None
+
+
+def replay_records(addon, records, repeat=1, context=None):
+    """
+    Replays journal records in order, repeat times each.
+
+    Returns:
+        list: One result dict per record with the recorded and best replayed
+        wall time, per-step timings (best run) and whether inputs matched
+    """
+    context = context or bpy.context
+    results = []
+    for record in records:
+        kind = record.get("kind")
+        best = None
+        digest = None
+        for _ in range(max(repeat, 1)):
+            if kind == "action":
+                replayed, digest = _replay_action(addon, context, record)
+            elif kind == "reload":
+                replayed = _replay_reload(addon, context)
+            else:
+                break
+            if replayed is not None and (best is None or replayed["ms"] < best["ms"]):
+                best = replayed
+
+        result = {
+            "seq": record.get("seq"),
+            "kind": kind,
+            "id": record.get("id", record.get("source", "")),
+            "recorded_ms": record.get("ms"),
+            "replay_ms": best["ms"] if best else None,
+            "status": best.get("status", "") if best else "SKIPPED",
+        }
+        if kind == "action":
+            result["inputs_match"] = digest == record.get("inputs")
+            recorded_steps = record.get("steps", [])
+            replay_steps = best.get("steps", []) if best else []
+            result["steps"] = [
+                {"label": label, "recorded_ms": ms,
+                 "replay_ms": replay_steps[i][1] if i < len(replay_steps) else None}
+                for i, (label, ms) in enumerate(recorded_steps)
+            ]
+        results.append(result)
+    return results
+
+
+def _format_ms(ms):
+    return f"{ms:>10.2f}" if ms is not None else f"{'-':>10}"
+
+
+def print_results(results):
+    print(f"{'seq':>5} {'kind':<7} {'recorded':>10} {'replay':>10} {'inputs':<7} name")
+    for result in results:
+        inputs = "" if "inputs_match" not in result else ("same" if result["inputs_match"] else "DIFF")
+        print(f"{result['seq']:>5} {result['kind']:<7} {_format_ms(result['recorded_ms'])} "
+              f"{_format_ms(result['replay_ms'])} {inputs:<7} {result['id']}")
+        for step in result.get("steps", []):
+            print(f"{'':>13} {_format_ms(step['recorded_ms'])} {_format_ms(step['replay_ms'])}   - {step['label']}")
+
+    recorded = sum(r["recorded_ms"] or 0.0 for r in results)
+    replayed = sum(r["replay_ms"] or 0.0 for r in results)
+    print(f"{'total':>13} {_format_ms(recorded)} {_format_ms(replayed)}")
+
+
+def main(argv):
+    argv = argv[argv.index("--") + 1:] if "--" in argv else []
+    parser = argparse.ArgumentParser(prog="journal_replay.py", description=__doc__.splitlines()[1])
+    parser.add_argument("journal", help="Journal .jsonl file")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per record; the fastest is reported")
+    parser.add_argument("--skip-reloads", action="store_true", help="Replay action records only")
+    parser.add_argument("--output", default="", help="Also write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    addon = load_addon()
+    records = addon.journal.read_journal(args.journal)
+    if args.skip_reloads:
+        records = [r for r in records if r.get("kind") == "action"]
+    print(f"Replaying {len(records)} record(s) from {args.journal}")
+
+    results = replay_records(addon, records, repeat=args.repeat)
+    print_results(results)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,191 @@
+"""
+Append-only output manifests with streaming checksums
+
+Every directory written by save_image_to_file gets a manifest file with
+one JSON line per saved output. Batch runs consult it to skip outputs that
+are already complete, and downstream tools can verify files without
+re-hashing the whole directory.
+"""
+
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+
+from . import file_io
+
+# Manifest file name inside each output directory
+MANIFEST_NAME = "ai_workflow_manifest.jsonl"
+
+# Digest size of the recorded blake2b checksums (bytes)
+DIGEST_SIZE = 32
+
+# Read size when hashing files Blender wrote itself
+HASH_CHUNK = 1024 * 1024
+
+# directory -> (manifest stat signature, {relative path: latest entry})
+_cache = {}
+
+
+class HashingWriter:
+    """File wrapper that hashes and counts bytes as they are written."""
+
+    def __init__(self, file_obj):
+        self._file = file_obj
+        self._digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+        self.size = 0
+
+    def write(self, data):
+        self._file.write(data)
+        self._digest.update(data)
+        self.size += len(data)
+        return len(data)
+
+    def hexdigest(self):
+        return self._digest.hexdigest()
+
+
+def hash_file(path):
+    """Returns (size, blake2b hex digest) of a file."""
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    size = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+
+def manifest_path(directory):
+    return Path(directory) / MANIFEST_NAME
+
+
+def _stat_signature(path):
+    try:
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+    except OSError:
+        return None
+
+
+def load_entries(directory):
+    """
+    Returns {relative path: latest entry} for a directory's manifest.
+
+    Later lines win, so re-saving a file supersedes its previous entry.
+    The parsed manifest is cached until the file changes on disk; a
+    truncated last line (interrupted write) is ignored.
+    """
+    directory = str(directory)
+    path = manifest_path(directory)
+    signature = _stat_signature(path)
+    cached = _cache.get(directory)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    entries = {}
+    if signature is not None:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    entries[entry["path"]] = entry
+                except (ValueError, KeyError):
+                    continue
+
+    _cache[directory] = (signature, entries)
+    return entries
+
+
+def _ends_with_newline(path):
+    try:
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+    except OSError:
+        # Missing or empty file
+        return True
+
+
+def record_output(file_path, size, digest, image="", action="", camera="", frame=None):
+    """Appends an entry for a written file to the manifest of its directory."""
+    file_path = Path(file_path)
+    directory = file_path.parent
+    try:
+        mtime_ns = os.stat(file_path).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+
+    entry = {
+        "path": file_path.name,
+        "size": size,
+        "blake2b": digest,
+        "mtime_ns": mtime_ns,
+        "image": image,
+        "action": action,
+        "camera": camera,
+        "frame": frame,
+        "time": time.time(),
+    }
+
+    line = json.dumps(entry) + "\n"
+    path = manifest_path(directory)
+    try:
+        # One write per line under the manifest lock: O_APPEND alone does not
+        # keep writers on network shares from interleaving
+        with file_io.FileLock(path):
+            previous_signature = _stat_signature(path)
+            if not _ends_with_newline(path):
+                # Terminate a line cut short by an interrupted write
+                line = "\n" + line
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(line)
+            signature = _stat_signature(path)
+    except OSError as e:
+        print(f"Manifest: Could not record '{file_path}': {e}")
+        return None
+
+    # Extend an up-to-date cache instead of re-parsing the manifest next time
+    cached = _cache.get(str(directory))
+    if cached is not None and cached[0] == previous_signature:
+        cached[1][entry["path"]] = entry
+        _cache[str(directory)] = (signature, cached[1])
+    else:
+        _cache.pop(str(directory), None)
+    return entry
+
+
+def find_complete(file_path, image="", camera="", frame=None, verify=False):
+    """
+    Returns the manifest entry if file_path is already a complete, valid output.
+
+    The entry must describe the same image, camera and frame, and the file
+    must still have the recorded size and modification time. With
+    verify=True the file is also re-hashed and compared to the digest.
+    """
+    file_path = Path(file_path)
+    entry = load_entries(file_path.parent).get(file_path.name)
+    if entry is None:
+        return None
+    if (entry.get("image"), entry.get("camera"), entry.get("frame")) != (image, camera, frame):
+        return None
+
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    if st.st_size != entry.get("size") or st.st_mtime_ns != entry.get("mtime_ns"):
+        return None
+
+    if verify:
+        try:
+            if hash_file(file_path)[1] != entry.get("blake2b"):
+                return None
+        except OSError:
+            return None
+    return entry
+
+
+def clear_cache():
+    _cache.clear()
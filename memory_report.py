@@ -0,0 +1,240 @@
+"""
+Image memory accounting and allocation tracking
+
+Sums the pixel buffer size of every bpy.data.images entry without loading
+any of them, groups the totals by the loaded actions that reference each
+image and flags orphans:
+images the add-on created (get_or_create_image, ensure_image) that no
+action references and nothing in the file uses. With the Trace
+Allocations preference on, tracemalloc snapshots taken before and after
+each action are diffed, so Python-side buffers that outlive an action show
+up by source line.
+"""
+
+import bpy
+import os
+import tracemalloc
+from collections import namedtuple
+
+from . import utils
+from . import image_memory
+
+# Allocation differences kept per action (largest first)
+TOP_ALLOCATIONS = 10
+
+# Stack frames stored per traced allocation (1 = source line only, the cheapest)
+TRACE_FRAMES = 1
+
+# bytes is None for unloaded file images, whose size is unknown until they are loaded
+ImageUsage = namedtuple("ImageUsage", "name bytes resident source actions created orphan")
+ActionUsage = namedtuple("ActionUsage", "action_name image_names bytes resident_bytes")
+MemoryReport = namedtuple("MemoryReport", "images actions total_bytes resident_bytes orphan_bytes unsized")
+
+# Last report and allocation diff shown in the panel; whether tracemalloc was started here
+_state = {"report": None, "allocations": None, "started_tracing": False}
+
+
+def _preferences():
+    try:
+        return bpy.context.preferences.addons[__package__].preferences
+    except (KeyError, AttributeError):
+        return None
+
+
+def last_report():
+    return _state["report"]
+
+
+def last_allocations():
+    return _state["allocations"]
+
+
+def clear():
+    _state.update(report=None, allocations=None)
+    stop_tracing()
+
+
+# -------------------------------------------------------------------
+# Image accounting
+# -------------------------------------------------------------------
+
+def _image_bytes(img):
+    """
+    Buffer size of an image, or None when it is unknown.
+
+    has_data is read first: size, channels and is_float acquire the image
+    buffer, which decodes an unloaded file image. Unloaded generated images
+    are sized from their settings (always RGBA), other unloaded images are
+    left unsized.
+    """
+    if img.has_data:
+        return image_memory.image_buffer_bytes(img)
+    if img.source == 'GENERATED':
+        return img.generated_width * img.generated_height * 4 * (4 if img.use_generated_float else 1)
+    return None
+
+
+def _sum_bytes(usages):
+    return sum(usage.bytes for usage in usages if usage.bytes)
+
+
+def format_size(num_bytes):
+    """Byte count for display, or 'size unknown' for unsized images."""
+    return "size unknown" if num_bytes is None else image_memory.format_bytes(num_bytes)
+
+
+def _is_orphan(img, referenced, created, displayed):
+    return (img.name in created and img.name not in referenced and img.name not in displayed
+            and img.users == 0 and not img.use_fake_user)
+
+
+def account_images(actions):
+    """
+    Builds and stores a MemoryReport for all images against a list of actions.
+
+    Image sizes are estimated buffer sizes (resolution × channels ×
+    float/byte); an image referenced by several actions counts in each of
+    their groups but once in the totals. Unsized images (see _image_bytes)
+    count in no total. Images and groups are sorted largest first.
+
+    Nothing is loaded, so this is cheap enough to call on demand but is
+    not refreshed automatically.
+    """
+    referenced = {}
+    for action in actions:
+        for name in utils.action_image_names(action):
+            referenced.setdefault(name, []).append(action.button_name)
+
+    created = image_memory.manager.created_names()
+    displayed = image_memory.displayed_image_names()
+
+    images = []
+    for img in bpy.data.images:
+        images.append(ImageUsage(
+            name=img.name,
+            bytes=_image_bytes(img),
+            resident=img.has_data,
+            source=img.source,
+            actions=referenced.get(img.name, []),
+            created=img.name in created,
+            orphan=_is_orphan(img, referenced, created, displayed),
+        ))
+    images.sort(key=lambda usage: usage.bytes or 0, reverse=True)
+
+    by_name = {usage.name: usage for usage in images}
+    groups = []
+    for action in actions:
+        usages = [by_name[name] for name in utils.action_image_names(action) if name in by_name]
+        groups.append(ActionUsage(
+            action_name=action.button_name,
+            image_names=[usage.name for usage in usages],
+            bytes=_sum_bytes(usages),
+            resident_bytes=_sum_bytes(usage for usage in usages if usage.resident),
+        ))
+    groups.sort(key=lambda usage: usage.bytes, reverse=True)
+
+    report = MemoryReport(
+        images=images,
+        actions=groups,
+        total_bytes=_sum_bytes(images),
+        resident_bytes=_sum_bytes(usage for usage in images if usage.resident),
+        orphan_bytes=_sum_bytes(usage for usage in images if usage.orphan),
+        unsized=sum(1 for usage in images if usage.bytes is None),
+    )
+    _state["report"] = report
+    return report
+
+
+def free_orphans(actions):
+    """
+    Removes the orphaned images of a fresh report from bpy.data.
+
+    Returns:
+        tuple: (number of images removed, estimated bytes of the sized ones)
+    """
+    report = account_images(actions)
+    removed = freed = 0
+    for usage in report.images:
+        img = bpy.data.images.get(usage.name) if usage.orphan else None
+        if img is None:
+            continue
+        bpy.data.images.remove(img)
+        image_memory.manager.forget(usage.name)
+        removed += 1
+        freed += usage.bytes or 0
+        print(f"Image memory: Removed orphaned image '{usage.name}' ({format_size(usage.bytes)})")
+
+    account_images(actions)
+    return removed, freed
+
+
+# -------------------------------------------------------------------
+# Allocation tracking
+# -------------------------------------------------------------------
+
+def stop_tracing():
+    """Stops tracemalloc if it was started here (tracing started by someone else is left alone)."""
+    if _state["started_tracing"]:
+        tracemalloc.stop()
+        _state["started_tracing"] = False
+
+
+def allocation_snapshot():
+    """
+    A tracemalloc snapshot to diff after an action, or None when the Trace
+    Allocations preference is off.
+
+    Tracing starts with the first snapshot and stays on while the preference
+    is, so allocations kept from earlier actions are in the baseline.
+    """
+    preferences = _preferences()
+    if preferences is None or not preferences.trace_allocations:
+        stop_tracing()
+        return None
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACE_FRAMES)
+        _state["started_tracing"] = True
+    return tracemalloc.take_snapshot()
+
+
+def diff_allocations(label, before):
+    """
+    Diffs the current allocations against a snapshot from
+    allocation_snapshot() and stores the result for the panel.
+
+    Returns:
+        dict: label, net_bytes and the top lines as dicts with where,
+        size_diff and count_diff (largest change first)
+    """
+    if not tracemalloc.is_tracing():
+        return None
+    ignored = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    after = tracemalloc.take_snapshot().filter_traces(ignored)
+    differences = after.compare_to(before.filter_traces(ignored), 'lineno')
+
+    top = []
+    for stat in differences[:TOP_ALLOCATIONS]:
+        if not stat.size_diff:
+            break
+        frame = stat.traceback[0]
+        top.append({
+            "where": f"{os.path.basename(frame.filename)}:{frame.lineno}",
+            "size_diff": stat.size_diff,
+            "count_diff": stat.count_diff,
+        })
+    result = {
+        "label": label,
+        "net_bytes": sum(stat.size_diff for stat in differences),
+        "top": top,
+    }
+    _state["allocations"] = result
+
+    print(f"Image memory: Python allocations after '{label}': {format_diff(result['net_bytes'])}")
+    for entry in top:
+        print(f"  {format_diff(entry['size_diff']):>12} {entry['count_diff']:+8d} blocks  {entry['where']}")
+    return result
+
+
+def format_diff(num_bytes):
+    """Signed byte count for display ('+1.5 MB', '-200 B')."""
+    return ("+" if num_bytes > 0 else "") + image_memory.format_bytes(num_bytes)
@@ -0,0 +1,376 @@
+"""
+Counters and histograms for farm monitoring
+
+ExecuteActionOperator and save_image_to_file record into an in-process
+registry: actions by type and outcome with their durations, failed units
+per action type, and image saves with their bytes and latency. Recording is
+a few dict updates, cheap enough to leave on.
+
+When a metrics file is set in the preferences, the registry is written
+every interval either as a Prometheus textfile for node_exporter's
+textfile collector (replaced atomically) or as one JSON line per interval
+with rates and latency percentiles. Writes happen on the async runtime
+and, since its timer does not run in background mode (blender -b), also
+from recording once the interval has passed. No network service is
+involved.
+"""
+
+import bpy
+import os
+import json
+import time
+import socket
+import bisect
+
+from . import async_runtime
+from . import file_io
+
+# Histogram bucket upper bounds in seconds
+ACTION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+SAVE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Percentiles estimated for JSON lines output
+QUANTILES = (0.5, 0.9, 0.99)
+
+# Used when the interval preference is unavailable
+DEFAULT_INTERVAL = 15
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return "+Inf"
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class Counter:
+    """A monotonically increasing value per combination of label values."""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def inc(self, *labels, amount=1.0):
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def value(self, *labels):
+        return self.values.get(labels, 0.0)
+
+    def reset(self):
+        self.values.clear()
+
+    def prometheus_lines(self, extra=()):
+        for labels, value in sorted(self.values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, labels, extra)} {_format_value(value)}"
+
+    def samples(self):
+        """{series name: value} for JSON output."""
+        return {f"{self.name}{_format_labels(self.labelnames, labels)}": value
+                for labels, value in sorted(self.values.items())}
+
+
+class Histogram:
+    """
+    Observations counted into fixed buckets per combination of label values,
+    with their sum and count (Prometheus histogram semantics).
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = tuple(labelnames)
+        # label values -> [per-bucket counts (last is +Inf), sum, count]
+        self.series = {}
+
+    def observe(self, value, *labels):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def count(self, *labels):
+        series = self.series.get(labels)
+        return series[2] if series else 0
+
+    def quantile(self, q, *labels):
+        """
+        Estimated q-quantile, interpolated linearly inside its bucket like
+        Prometheus' histogram_quantile(); None without observations.
+        """
+        series = self.series.get(labels)
+        if not series or not series[2]:
+            return None
+        rank = q * series[2]
+        cumulative = 0
+        for index, count in enumerate(series[0]):
+            if cumulative + count >= rank and count:
+                if index == len(self.buckets):
+                    # Beyond the last bucket: its bound is the best estimate
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def reset(self):
+        self.series.clear()
+
+    def prometheus_lines(self, extra=()):
+        for labels, (counts, total, count) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = (("le", _format_value(bound)),)
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, tuple(extra) + le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labels, extra)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labels, extra)} {count}"
+
+    def samples(self):
+        result = {}
+        for labels, (counts, total, count) in sorted(self.series.items()):
+            entry = {"count": count, "sum": round(total, 6)}
+            for q in QUANTILES:
+                value = self.quantile(q, *labels)
+                entry[f"p{round(q * 100):d}"] = round(value, 6) if value is not None else None
+            result[f"{self.name}{_format_labels(self.labelnames, labels)}"] = entry
+        return result
+
+
+class Registry:
+    """Named metrics, rendered together in registration order."""
+
+    def __init__(self):
+        self.metrics = {}
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, buckets, labelnames=()):
+        return self._register(Histogram(name, help_text, buckets, labelnames))
+
+    def _register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric '{metric.name}' is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def reset(self):
+        for metric in self.metrics.values():
+            metric.reset()
+
+    def prometheus_text(self, extra=()):
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.prometheus_lines(extra))
+        return "\n".join(lines) + "\n"
+
+    def samples(self):
+        """{'counters': {series: value}, 'histograms': {series: {count, sum, p50, ...}}}"""
+        result = {"counters": {}, "histograms": {}}
+        for metric in self.metrics.values():
+            result["counters" if metric.kind == "counter" else "histograms"].update(metric.samples())
+        return result
+
+
+registry = Registry()
+
+actions_total = registry.counter(
+    "ai_workflow_actions_total", "Executed actions by action type and outcome", ("action_type", "status"))
+action_seconds = registry.histogram(
+    "ai_workflow_action_seconds", "Action run time in seconds (modal runs: first to last tick)",
+    ACTION_BUCKETS, ("action_type",))
+action_failures_total = registry.counter(
+    "ai_workflow_action_failures_total", "Failed units (saves, renders, publishes, ...) by action type",
+    ("action_type",))
+image_saves_total = registry.counter(
+    "ai_workflow_image_saves_total", "Calls of save_image_to_file by outcome", ("status",))
+image_save_bytes_total = registry.counter(
+    "ai_workflow_image_save_bytes_total", "Bytes written by successful image saves")
+image_save_seconds = registry.histogram(
+    "ai_workflow_image_save_seconds", "Image save latency in seconds, including hashing and the manifest",
+    SAVE_BUCKETS)
+
+# Counter totals of the last JSON line, for per-second rates
+_last_export = {"time": None, "counters": {}}
+
+# time.monotonic() of the last write to the metrics file
+_written = {"at": None}
+
+
+# -------------------------------------------------------------------
+# Recording
+# -------------------------------------------------------------------
+
+def record_action(action_type, status, seconds, failures=0):
+    """
+    Records one action run.
+
+    Args:
+        status: 'FINISHED' or 'CANCELLED'; a finished run with failed units
+            is counted as 'failed'
+        failures: Number of failed units (saves, renders, ...)
+    """
+    outcome = 'failed' if failures and status == 'FINISHED' else status.lower()
+    actions_total.inc(action_type, outcome)
+    action_seconds.observe(seconds, action_type)
+    if failures:
+        action_failures_total.inc(action_type, amount=failures)
+    _export_if_due()
+
+
+def record_save(size, seconds):
+    """Records one save_image_to_file call; size is the written byte count, or None if it failed."""
+    if size is None:
+        image_saves_total.inc('failed')
+    else:
+        image_saves_total.inc('saved')
+        image_save_bytes_total.inc(amount=size)
+    image_save_seconds.observe(seconds)
+    _export_if_due()
+
+
+# -------------------------------------------------------------------
+# Export
+# -------------------------------------------------------------------
+
+def _preferences():
+    try:
+        return bpy.context.preferences.addons[__package__].preferences
+    except (KeyError, AttributeError):
+        return None
+
+
+def metrics_path():
+    """
+    The configured metrics file, or None when export is off.
+
+    '{host}' and '{pid}' in the preference are replaced, so instances
+    sharing a textfile directory write separate files.
+    """
+    preferences = _preferences()
+    if preferences is None or not preferences.metrics_path:
+        return None
+    path = preferences.metrics_path.replace("{host}", socket.gethostname()).replace("{pid}", str(os.getpid()))
+    return bpy.path.abspath(path)
+
+
+def export(path=None, fmt=None):
+    """
+    Writes the registry to path (default: the preference) in fmt
+    ('PROMETHEUS' or 'JSONL', default: the preference).
+
+    Returns:
+        tuple: (success, message)
+    """
+    preferences = _preferences()
+    path = path or metrics_path()
+    if not path:
+        return False, "No metrics file configured"
+    if fmt is None:
+        fmt = preferences.metrics_format if preferences is not None else 'PROMETHEUS'
+
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if fmt == 'PROMETHEUS':
+            # The collector reads the whole file at scrape time: replace it atomically
+            file_io.atomic_write_text(path, registry.prometheus_text(extra=(("pid", os.getpid()),)))
+        else:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(_json_line(), separators=(",", ":")) + "\n")
+    except OSError as e:
+        print(f"Metrics: Could not write '{path}': {e}")
+        return False, f"Could not write metrics: {e}"
+    _written["at"] = time.monotonic()
+    return True, f"Metrics written to '{path}'"
+
+
+def _json_line():
+    now = time.time()
+    samples = registry.samples()
+    counters = samples["counters"]
+
+    # Per-second rates since the previous line (actions/min = rate * 60)
+    rates = {}
+    if _last_export["time"] is not None and now > _last_export["time"]:
+        elapsed = now - _last_export["time"]
+        rates = {series: round((value - _last_export["counters"].get(series, 0.0)) / elapsed, 6)
+                 for series, value in counters.items()}
+    _last_export.update(time=now, counters=dict(counters))
+
+    return {
+        "time": round(now, 3),
+        "host": socket.gethostname(),
+        "pid": os.getpid(),
+        "counters": counters,
+        "rates": rates,
+        "histograms": samples["histograms"],
+    }
+
+
+def _interval():
+    preferences = _preferences()
+    return max(1, preferences.metrics_interval) if preferences is not None else DEFAULT_INTERVAL
+
+
+def _seconds_until_due():
+    """Seconds until the metrics file is due for a write (0 if it is due now)."""
+    if _written["at"] is None:
+        return 0.0
+    return max(0.0, _interval() - (time.monotonic() - _written["at"]))
+
+
+def _export_tick():
+    """Timer-style callback (see async_runtime.schedule) writing the metrics file every interval."""
+    if metrics_path() is None:
+        return None
+    if _seconds_until_due() == 0.0:
+        export()
+    # A write from recording in between moves the next one back
+    return max(1.0, _seconds_until_due())
+
+
+def _export_if_due():
+    """Writes the metrics file now if the interval has passed and keeps the periodic export running."""
+    if metrics_path() is None:
+        return
+    if _seconds_until_due() == 0.0:
+        export()
+    if not async_runtime.is_scheduled(_export_tick):
+        async_runtime.schedule(_export_tick, first_interval=_seconds_until_due())
+
+
+def flush():
+    """Writes the metrics file once more (on unregister) and stops the periodic export."""
+    if async_runtime.is_scheduled(_export_tick):
+        async_runtime.unschedule(_export_tick)
+        export()
+
+
+def clear():
+    registry.reset()
+    _last_export.update(time=None, counters={})
+    _written["at"] = None
@@ -0,0 +1,299 @@
+"""
+Node-tree parameter injection and parameter sweeps
+"""
+
+import bpy
+import re
+import json
+import itertools
+from pathlib import Path
+
+# "Node.inputs[Name]", "Node.inputs[0]" or "Node.attribute"
+_INPUT_PATH = re.compile(r'^(?P<node>.+)\.inputs\[(?P<key>.+)\]$')
+
+# "start..end" (inclusive) integer ranges in sweep values, e.g. seeds "1..50"
+_RANGE = re.compile(r'^\s*(-?\d+)\s*\.\.\s*(-?\d+)\s*$')
+
+# Characters that cannot appear in a file name, replaced in template values
+_UNSAFE = re.compile(r'[\\/:*?"<>|\s]+')
+
+# (tree name, path) -> (node name, kind, key, socket name); kind is 'INPUT'
+# (key = socket index) or 'ATTR' (key = attribute name). Entries are checked
+# on use and resolved again when the node or socket moved.
+_resolved = {}
+
+
+def parse_value(text):
+    """Parses a value as JSON (numbers, booleans, lists, quoted strings), else keeps the raw string."""
+    try:
+        return json.loads(text)
+    except (ValueError, TypeError):
+        return text
+
+
+def parse_sweep_values(text):
+    """
+    Parses the values a parameter sweeps over.
+
+    Accepts a JSON list ('[0.3, 0.5, 0.7]'), an inclusive integer range
+    ('1..50') or values separated by ';' ('a cat; a dog').
+    """
+    text = text.strip()
+    if not text:
+        return []
+    match = _RANGE.match(text)
+    if match:
+        start, end = int(match.group(1)), int(match.group(2))
+        step = 1 if end >= start else -1
+        return list(range(start, end + step, step))
+    if text.startswith('['):
+        values = parse_value(text)
+        if isinstance(values, list):
+            return values
+    return [parse_value(part.strip()) for part in text.split(';') if part.strip()]
+
+
+def _split_path(path):
+    match = _INPUT_PATH.match(path)
+    if match:
+        key = match.group('key').strip().strip('"\'')
+        return match.group('node'), 'INPUT', key
+    node_name, sep, attr = path.rpartition('.')
+    if not sep:
+        return None
+    return node_name, 'ATTR', attr
+
+
+def _resolve(tree, path):
+    """Resolves a path to (node, kind, key) from scratch, or returns None."""
+    parts = _split_path(path)
+    if parts is None:
+        return None
+    node_name, kind, key = parts
+    node = tree.nodes.get(node_name)
+    if node is None:
+        return None
+
+    if kind == 'ATTR':
+        return (node, kind, key) if hasattr(node, key) else None
+
+    if key.isdigit():
+        index = int(key)
+        return (node, kind, index) if index < len(node.inputs) else None
+    for index, socket in enumerate(node.inputs):
+        if socket.name == key or socket.identifier == key:
+            return node, kind, index
+    return None
+
+
+def resolve(tree, path):
+    """
+    Returns (node, kind, key) for a parameter path, using the cache.
+
+    A cached entry is only trusted if its node still exists and, for
+    inputs, the socket at the cached index still has the same name;
+    otherwise the path is resolved again.
+    """
+    cache_key = (tree.name, path)
+    entry = _resolved.get(cache_key)
+    if entry is not None:
+        node_name, kind, key, socket_name = entry
+        node = tree.nodes.get(node_name)
+        if node is not None:
+            if kind == 'ATTR':
+                return node, kind, key
+            if key < len(node.inputs) and node.inputs[key].name == socket_name:
+                return node, kind, key
+
+    result = _resolve(tree, path)
+    if result is None:
+        _resolved.pop(cache_key, None)
+        return None
+    node, kind, key = result
+    socket_name = node.inputs[key].name if kind == 'INPUT' else None
+    _resolved[cache_key] = (node.name, kind, key, socket_name)
+    return result
+
+
+def _coerce(current, value):
+    """Converts value to the type of the property's current value."""
+    if isinstance(current, bool):
+        if isinstance(value, str):
+            return value.strip().lower() in ('1', 'true', 'yes', 'on')
+        return bool(value)
+    if isinstance(current, int):
+        return int(value)
+    if isinstance(current, float):
+        return float(value)
+    if isinstance(current, str):
+        return value if isinstance(value, str) else json.dumps(value)
+    if hasattr(current, '__len__'):
+        values = list(value) if isinstance(value, (list, tuple)) else [value] * len(current)
+        return [float(v) for v in values]
+    return value
+
+
+def _owner_and_attr(node, kind, key):
+    if kind == 'INPUT':
+        return node.inputs[key], 'default_value'
+    return node, key
+
+
+def read_value(tree, path):
+    """Returns the current value at a path (sequences as lists), or None if it does not resolve."""
+    result = resolve(tree, path)
+    if result is None:
+        return None
+    owner, attr = _owner_and_attr(*result)
+    value = getattr(owner, attr, None)
+    if value is not None and not isinstance(value, (bool, int, float, str)):
+        value = list(value)
+    return value
+
+
+def apply_values(tree, values):
+    """
+    Writes {path: value} into a node tree.
+
+    Returns:
+        tuple: (applied count, list of error messages)
+    """
+    applied = 0
+    errors = []
+    for path, value in values.items():
+        result = resolve(tree, path)
+        if result is None:
+            errors.append(f"'{path}' not found in '{tree.name}'")
+            continue
+        owner, attr = _owner_and_attr(*result)
+        try:
+            setattr(owner, attr, _coerce(getattr(owner, attr), value))
+            applied += 1
+        except (TypeError, ValueError, AttributeError) as e:
+            errors.append(f"Could not set '{path}': {e}")
+    return applied, errors
+
+
+def action_values(action):
+    """{path: value} of an action's node parameters with a fixed value (sweep-only ones have none)."""
+    return {p.path: parse_value(p.value) for p in action.node_params if p.path and p.value}
+
+
+def target_tree(scene, action):
+    """
+    The node group an action's parameters are written to.
+
+    The action's own node tree if it changes the tree, otherwise the active
+    ComfyUI tree (sdn.comfyui_tree).
+    """
+    name = action.node_tree_name if action.change_node_tree else ""
+    if not name and hasattr(scene, 'sdn'):
+        name = getattr(scene.sdn, 'comfyui_tree', "") or ""
+        name = getattr(name, 'name', name)
+    return bpy.data.node_groups.get(name) if name else None
+
+
+def sweep_cameras(action):
+    """Camera names of a sweep; [None] (keep the scene camera) when none are listed."""
+    names = [n.strip() for n in action.sweep_cameras.split(',') if n.strip()]
+    return names or [None]
+
+
+def sweep_axes(action):
+    """[(param, values)] for every parameter with sweep values."""
+    axes = []
+    for param in action.node_params:
+        if param.path and param.sweep_values.strip():
+            values = parse_sweep_values(param.sweep_values)
+            if values:
+                axes.append((param, values))
+    return axes
+
+
+def variant_count(action):
+    """Number of combinations a sweep runs (cameras x parameter grid)."""
+    count = len(sweep_cameras(action))
+    for _, values in sweep_axes(action):
+        count *= len(values)
+    return count
+
+
+def iter_variants(action):
+    """
+    Yields (index, camera name or None, {path: value}, fields) per combination.
+
+    Cameras are the outer loop, so each camera is set once for its whole
+    parameter grid. fields holds the template values: camera, index,
+    action and each parameter by its name.
+    """
+    axes = sweep_axes(action)
+    params = [param for param, _ in axes]
+    grids = [values for _, values in axes]
+    index = 0
+    for camera in sweep_cameras(action):
+        for combo in itertools.product(*grids):
+            fields = {"camera": camera or "camera", "index": index, "action": action.button_name}
+            values = {}
+            for param, value in zip(params, combo):
+                values[param.path] = value
+                fields[param.name or f"p{len(values)}"] = value
+            yield index, camera, values, fields
+            index += 1
+
+
+def _safe(value):
+    if isinstance(value, str):
+        return _UNSAFE.sub('_', value.strip())[:64] or "_"
+    return value
+
+
+def expand_template(path, fields):
+    """
+    Expands {field} placeholders in an output path.
+
+    String values are made file-name safe. A path without placeholders gets
+    "_{index:03d}" before its extension so variants never overwrite each other.
+    """
+    if '{' not in path:
+        p = Path(path)
+        return str(p.with_name(f"{p.stem}_{fields['index']:03d}{p.suffix}"))
+    safe = {key: _safe(value) for key, value in fields.items()}
+    try:
+        return path.format_map(safe)
+    except (KeyError, IndexError, ValueError) as e:
+        raise ValueError(f"Bad output template '{path}': {e}") from None
+
+
+def find_operator(idname):
+    """Returns the bpy.ops function for an idname like 'module.name', or None."""
+    module, _, name = idname.strip().partition('.')
+    if not module or not name:
+        return None
+    operator = getattr(getattr(bpy.ops, module, None), name, None)
+    # bpy.ops returns a wrapper for any name; only registered ones have RNA
+    try:
+        operator.get_rna_type()
+    except (AttributeError, KeyError):
+        return None
+    return operator
+
+
+def run_hook(idname):
+    """
+    Calls the operator that runs the workflow (e.g. queues the ComfyUI prompt).
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    operator = find_operator(idname)
+    if operator is None:
+        return False, f"Operator '{idname}' not found"
+    try:
+        result = operator()
+    except RuntimeError as e:
+        return False, f"'{idname}' failed: {e}"
+    return 'FINISHED' in result or 'RUNNING_MODAL' in result, f"'{idname}' returned {set(result)}"
+
+
+def clear_cache():
+    _resolved.clear()
@@ -3,11 +3,59 @@ Operators for AI Workflow Config Tools
 """
 
 import bpy
+import time
 from bpy.types import Operator
-from bpy.props import IntProperty, StringProperty, BoolProperty
+from bpy.props import IntProperty, StringProperty, BoolProperty, EnumProperty
 
 from . import utils
 from . import config_manager
+from . import watcher
+from . import prefetch
+from . import image_memory
+from . import render
+from . import image_ops
+from . import previews
+from . import frame_share
+from . import camera_import
+from . import camera_export
+from . import snapshot
+from . import planner
+from . import node_params
+from . import sequences
+from . import journal
+from . import profiler
+from . import memory_report
+from . import metrics
+from . import tiling
+
+
+# Actions with at least this many work units run modally when invoked from the UI
+MODAL_MIN_UNITS = 4
+
+# Seconds of work per modal timer tick, and the timer interval
+MODAL_TICK_BUDGET = 0.05
+MODAL_TICK_INTERVAL = 0.01
+
+# Only one modal action runs at a time; action buttons are disabled meanwhile
+_modal_state = {"running": False}
+
+
+def count_units(action):
+    """Number of progress units ExecuteActionOperator._steps yields for an action."""
+    units = 2  # setup and editor updates
+    if action.action_type == 'IMAGE_SAVE' and action.sweep_enabled:
+        units += node_params.variant_count(action) * (1 + len(action.images_to_save))
+    elif action.action_type == 'IMAGE_SAVE':
+        units += len(action.images_to_save)
+    elif action.action_type == 'PUBLISH':
+        units += len(action.images_to_publish)
+    elif action.action_type == 'RENDER' and action.render_image_name:
+        units += 1
+    elif action.action_type == 'DEPTH_MAP' and action.depth_source_image and action.depth_target_image:
+        units += 1
+    elif action.action_type == 'COMPARE' and action.compare_image_a and action.compare_image_b:
+        units += 1
+    return units
 
 
 class ExecuteActionOperator(Operator):
@@ -19,14 +67,164 @@ class ExecuteActionOperator(Operator):
 
     action_index: IntProperty(name="Action Index")
 
-    def execute(self, context):
+    _timer = None
+    _action = None
+    _record = None
+    _profile = None
+    _allocations = None
+    _started = 0.0
+    _failures = 0
+    _steps_iter = None
+    _label = ""
+    _done = 0
+    _total = 0
+
+    @classmethod
+    def poll(cls, context):
+        return not _modal_state["running"]
+
+    def _begin(self, context, mode='BLOCKING'):
+        """
+        Validates the index, starts an armed profile and allocation tracking,
+        records the undo snapshot and starts the journal record; returns the
+        action or None.
+        """
         sdn_config = context.scene.my_addon_props
         if self.action_index >= len(sdn_config.actions):
             self.report({'ERROR'}, "Invalid action index.")
-            return {'CANCELLED'}
+            return None
 
         action = sdn_config.actions[self.action_index]
+        self._started = time.perf_counter()
+        self._failures = 0
+        if profiler.is_armed('ACTION'):
+            self._profile = profiler.begin('ACTION', action.button_name)
+        self._allocations = memory_report.allocation_snapshot()
+        snapshot.push(context, action.button_name, action)
+        if journal.is_enabled():
+            self._record = journal.begin_action(context, action, self.action_index,
+                                                config_manager.action_to_dict(action), mode)
+        sdn_config.active_action_index = self.action_index
         self.report({'INFO'}, f"Executing Action: '{action.button_name}'")
+        return action
+
+    def execute(self, context):
+        action = self._begin(context)
+        if action is None:
+            return {'CANCELLED'}
+
+        result = 'CANCELLED'
+        try:
+            for step in self._steps(context, action):
+                if step is None:
+                    # A sweep waiting for its run operator; nothing else can run meanwhile
+                    time.sleep(MODAL_TICK_INTERVAL)
+                    if self._record is not None:
+                        self._record.resume()
+                elif self._record is not None:
+                    self._record.step(step)
+            result = 'FINISHED'
+        finally:
+            # Also after a failing step, so the journal, profile and budget are not left behind
+            self._finish(context, action, result)
+        context.scene.my_addon_props.last_run_status = ""
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        actions = context.scene.my_addon_props.actions
+        if self.action_index >= len(actions):
+            return self.execute(context)
+        action = actions[self.action_index]
+        # Sweeps that wait for their run operator always go modal instead of sleeping on the UI
+        waits = action.action_type == 'IMAGE_SAVE' and action.sweep_enabled and action.sweep_wait > 0
+        if count_units(action) < MODAL_MIN_UNITS and not waits:
+            return self.execute(context)
+
+        # Long action: run its units in timer slices so the UI stays responsive
+        action = self._begin(context, 'MODAL')
+        self._action = action
+        self._total = count_units(action)
+        self._steps_iter = self._steps(context, action)
+        self._done = 0
+        _modal_state["running"] = True
+        wm = context.window_manager
+        wm.progress_begin(0, self._total)
+        self._timer = wm.event_timer_add(MODAL_TICK_INTERVAL, window=context.window)
+        wm.modal_handler_add(self)
+        if self._profile is not None:
+            self._profile.pause()
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self._steps_iter.close()
+            message = f"Cancelled '{self._action.button_name}' after {self._done}/{self._total} step(s)"
+            self._end_modal(context, message, 'CANCELLED')
+            self.report({'WARNING'}, message)
+            return {'CANCELLED'}
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
+
+        deadline = time.perf_counter() + MODAL_TICK_BUDGET
+        if self._profile is not None:
+            self._profile.resume()
+        if self._record is not None:
+            self._record.resume()
+        try:
+            while True:
+                step = next(self._steps_iter)
+                if step is None:
+                    # Waiting: give Blender the rest of the tick
+                    break
+                if self._record is not None:
+                    self._record.step(step)
+                self._label = step
+                self._done += 1
+                if time.perf_counter() >= deadline:
+                    break
+        except StopIteration:
+            self._end_modal(context, "", 'FINISHED')
+            return {'FINISHED'}
+        except Exception as e:
+            # A failing step must not leave the add-on marked as running
+            import traceback
+            traceback.print_exc()
+            message = f"'{self._action.button_name}' failed after {self._done}/{self._total} step(s): {e}"
+            self._end_modal(context, message, 'CANCELLED')
+            self.report({'ERROR'}, message)
+            return {'CANCELLED'}
+
+        context.window_manager.progress_update(self._done)
+        context.workspace.status_text_set(
+            f"AI Workflow: {self._label} ({self._done}/{self._total}) - Esc to cancel"
+        )
+        if self._profile is not None:
+            self._profile.pause()
+        return {'RUNNING_MODAL'}
+
+    def _end_modal(self, context, status, result):
+        """Stops the timer and progress display and finishes a modal run (result 'FINISHED' or 'CANCELLED')."""
+        wm = context.window_manager
+        if self._timer is not None:
+            wm.event_timer_remove(self._timer)
+            self._timer = None
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+        _modal_state["running"] = False
+        self._finish(context, self._action, result)
+        context.scene.my_addon_props.last_run_status = status
+
+    def _steps(self, context, action):
+        """
+        Runs the action's work, yielding a label after each unit.
+
+        Units are the setup (camera, node tree, reset), each saved or
+        published image, each pixel step and the final editor updates, so a
+        modal run can report progress and stop between any two of them.
+        None is yielded while a sweep waits, without completing a unit.
+        """
+        sdn_config = context.scene.my_addon_props
 
         # --- 1. Handle Camera Selection (Create if doesn't exist) ---
         if action.select_camera and action.camera_name:
@@ -76,6 +274,18 @@ class ExecuteActionOperator(Operator):
                 if not node_editor_found:
                     print("Action: Node tree property set, but no Node Editor visible to update.")
 
+        # --- 2b. Apply Node Parameters to the target node tree ---
+        values = node_params.action_values(action)
+        if values:
+            tree = node_params.target_tree(context.scene, action)
+            if tree is None:
+                self.report({'WARNING'}, "No node tree to apply node parameters to.")
+            else:
+                applied, errors = node_params.apply_values(tree, values)
+                for error in errors:
+                    self.report({'WARNING'}, error)
+                print(f"Action: Applied {applied} node parameter(s) to '{tree.name}'")
+
         # --- 3. Handle Image Reset (RESET type - Create if doesn't exist) ---
         if action.action_type == 'RESET' and action.reset_images:
             for item in action.images_to_reset:
@@ -84,25 +294,107 @@ class ExecuteActionOperator(Operator):
                     utils.replace_with_blank(item.name)
             print("Action: Completed image reset.")
 
+        yield "Setup"
+
         # --- 4. Handle Image Save (IMAGE_SAVE type) ---
-        if action.action_type == 'IMAGE_SAVE':
+        if action.action_type == 'IMAGE_SAVE' and action.sweep_enabled:
+            yield from self._sweep_steps(context, action)
+
+        elif action.action_type == 'IMAGE_SAVE':
             saved_count = 0
             failed_count = 0
+            skipped_count = 0
 
-            for item in action.images_to_save:
-                if utils.save_image_to_file(item.name, item.save_as, item.allow_overwrite):
-                    saved_count += 1
-                else:
-                    failed_count += 1
-
-            if saved_count > 0:
-                self.report({'INFO'}, f"Saved {saved_count} image(s)")
-                print(f"Action: Saved {saved_count} image(s)")
-            if failed_count > 0:
-                self.report({'WARNING'}, f"Failed to save {failed_count} image(s)")
-                print(f"Action: Failed to save {failed_count} image(s)")
-
-        # --- 5. Handle Image Editor Display Change (Create if doesn't exist) ---
+            try:
+                for item in action.images_to_save:
+                    if sdn_config.resume_outputs and utils.is_output_complete(item.name, item.save_as):
+                        skipped_count += 1
+                    elif utils.save_image_to_file(item.name, item.save_as, item.allow_overwrite,
+                                                  options=item, action_name=action.button_name):
+                        saved_count += 1
+                    else:
+                        failed_count += 1
+                    yield f"Saved '{item.name}'"
+            finally:
+                # Also reached when a modal run is cancelled, so partial results are reported
+                self._report_save_counts(saved_count, failed_count, skipped_count)
+                # Staging is reused between the saves, not kept resident between actions
+                tiling.release_staging()
+
+        # --- 5. Handle Render (RENDER type) ---
+        if action.action_type == 'RENDER' and action.render_image_name:
+            cam_obj = None
+            if action.camera_name:
+                cam_obj = bpy.data.objects.get(action.camera_name)
+            success, message = render.render_camera_to_image(
+                context,
+                cam_obj,
+                action.render_image_name,
+                resolution_scale=action.render_resolution_scale,
+                render_pass=action.render_pass
+            )
+            self.report({'INFO'} if success else {'ERROR'}, message)
+            self._failures += not success
+            yield f"Rendered '{action.render_image_name}'"
+
+        # --- 6. Handle Depth Map (DEPTH_MAP type) ---
+        if action.action_type == 'DEPTH_MAP' and action.depth_source_image and action.depth_target_image:
+            success, message = image_ops.build_depth_map(
+                action.depth_source_image,
+                action.depth_target_image,
+                clip_mode=action.depth_clip_mode,
+                near=action.depth_near,
+                far=action.depth_far,
+                percentile_low=action.depth_percentile_low,
+                percentile_high=action.depth_percentile_high,
+                invert=action.depth_invert,
+                gamma=action.depth_gamma,
+                bit_depth=int(action.depth_bit_depth)
+            )
+            self.report({'INFO'} if success else {'ERROR'}, message)
+            self._failures += not success
+            yield f"Depth map '{action.depth_target_image}'"
+
+        # --- 7. Handle Image Comparison (COMPARE type) ---
+        if action.action_type == 'COMPARE' and action.compare_image_a and action.compare_image_b:
+            success, message, compare_metrics = image_ops.compare_images(
+                action.compare_image_a,
+                action.compare_image_b,
+                diff_name=action.compare_diff_image,
+                heatmap_gain=action.compare_heatmap_gain
+            )
+            if success:
+                sdn_config.compare_label = f"{action.compare_image_a} vs {action.compare_image_b}"
+                sdn_config.compare_mse = compare_metrics["mse"]
+                sdn_config.compare_psnr = compare_metrics["psnr"]
+                sdn_config.compare_ssim = compare_metrics["ssim"]
+            self.report({'INFO'} if success else {'ERROR'}, message)
+            self._failures += not success
+            yield "Compared images"
+
+        # --- 8. Handle Frame Publishing (PUBLISH type) ---
+        if action.action_type == 'PUBLISH':
+            published_count = 0
+            try:
+                for item in action.images_to_publish:
+                    success, message = frame_share.publish_image(
+                        item.name,
+                        action.publish_directory,
+                        mode=action.publish_mode,
+                        prefix=action.publish_prefix,
+                        scene=context.scene
+                    )
+                    if success:
+                        published_count += 1
+                    else:
+                        self._failures += 1
+                        self.report({'WARNING'}, message)
+                    yield f"Published '{item.name}'"
+            finally:
+                if published_count > 0:
+                    self.report({'INFO'}, f"Published {published_count} image(s)")
+
+        # --- 9. Handle Image Editor Display Change (Create if doesn't exist) ---
         if action.change_image_editor and action.image_name_to_view:
             img = utils.get_or_create_image(action.image_name_to_view)
 
@@ -128,7 +420,7 @@ class ExecuteActionOperator(Operator):
             else:
                 self.report({'ERROR'}, f"Failed to get or create image '{action.image_name_to_view}'.")
 
-        # --- 6. Handle Timeline Update ---
+        # --- 10. Handle Timeline Update ---
         if action.update_timeline:
             try:
                 frame_start = context.scene.frame_start
@@ -149,7 +441,124 @@ class ExecuteActionOperator(Operator):
             except Exception as e:
                 print(f"Warning: Failed to update timeline: {e}")
 
-        return {'FINISHED'}
+        # --- 11. Handle Output Directory Watching ---
+        if action.watch_output and action.watch_directory:
+            success, message = watcher.start_watching(
+                action.watch_directory,
+                utils.action_image_names(action)
+            )
+            self.report({'INFO'} if success else {'WARNING'}, message)
+
+        yield "Editors updated"
+
+    def _sweep_steps(self, context, action):
+        """
+        Runs a parameter sweep: for each camera x parameter combination, sets
+        the camera and node values, calls the run operator and saves every
+        image to its templated path.
+        """
+        sdn_config = context.scene.my_addon_props
+        tree = node_params.target_tree(context.scene, action)
+        if tree is None and node_params.sweep_axes(action):
+            self.report({'WARNING'}, "No node tree for the sweep parameters; only cameras are swept.")
+
+        saved_count = 0
+        failed_count = 0
+        skipped_count = 0
+        variants = 0
+        current_camera = None
+        missing_cameras = set()
+
+        try:
+            for index, camera_name, values, fields in node_params.iter_variants(action):
+                if camera_name in missing_cameras:
+                    # Counted in count_units; take it out so progress still ends at the total
+                    self._total -= 1 + len(action.images_to_save)
+                    continue
+                if camera_name and camera_name != current_camera:
+                    cam_obj = bpy.data.objects.get(camera_name)
+                    if cam_obj is None or cam_obj.type != 'CAMERA':
+                        self.report({'WARNING'}, f"Sweep camera '{camera_name}' not found, skipped.")
+                        missing_cameras.add(camera_name)
+                        self._total -= 1 + len(action.images_to_save)
+                        continue
+                    context.scene.camera = cam_obj
+                    current_camera = camera_name
+
+                if values and tree is not None:
+                    _, errors = node_params.apply_values(tree, values)
+                    for error in errors:
+                        print(f"Sweep: {error}")
+
+                if action.sweep_run_operator:
+                    success, message = node_params.run_hook(action.sweep_run_operator)
+                    if not success:
+                        self.report({'WARNING'}, message)
+                    until = time.perf_counter() + action.sweep_wait
+                    while time.perf_counter() < until:
+                        yield None
+
+                variants += 1
+                yield f"Combination {index + 1}"
+
+                for item in action.images_to_save:
+                    try:
+                        path = node_params.expand_template(item.save_as, dict(fields, image=item.name))
+                    except ValueError as e:
+                        self.report({'ERROR'}, str(e))
+                        failed_count += 1
+                        yield f"Skipped '{item.name}'"
+                        continue
+
+                    if sdn_config.resume_outputs and utils.is_output_complete(item.name, path):
+                        skipped_count += 1
+                    elif utils.save_image_to_file(item.name, path, item.allow_overwrite,
+                                                  options=item, action_name=action.button_name):
+                        saved_count += 1
+                    else:
+                        failed_count += 1
+                    yield f"Saved '{item.name}' ({index + 1})"
+        finally:
+            self._report_save_counts(saved_count, failed_count, skipped_count)
+            tiling.release_staging()
+            print(f"Action: Sweep ran {variants} combination(s)")
+
+    def _report_save_counts(self, saved_count, failed_count, skipped_count):
+        self._failures += failed_count
+        if saved_count > 0:
+            self.report({'INFO'}, f"Saved {saved_count} image(s)")
+            print(f"Action: Saved {saved_count} image(s)")
+        if failed_count > 0:
+            self.report({'WARNING'}, f"Failed to save {failed_count} image(s)")
+            print(f"Action: Failed to save {failed_count} image(s)")
+        if skipped_count > 0:
+            self.report({'INFO'}, f"Skipped {skipped_count} complete output(s)")
+            print(f"Action: Skipped {skipped_count} output(s) already in the manifest")
+
+    def _finish(self, context, action, result):
+        """Bookkeeping after an action ran (also after a cancelled modal run)."""
+        # Keep image buffers within the memory budget, most recent action last
+        action_images = utils.action_image_names(action)
+        previews.invalidate(action_images)
+        for name in action_images:
+            image_memory.manager.touch(name)
+        image_memory.manager.enforce(image_memory.get_budget_bytes(), protected=action_images)
+        metrics.record_action(action.action_type, result, time.perf_counter() - self._started, self._failures)
+        if self._allocations is not None:
+            memory_report.diff_allocations(action.button_name, self._allocations)
+            self._allocations = None
+
+        # Re-prioritize prefetching around the action that just ran
+        prefetch.schedule_prefetch(context)
+
+        if self._record is not None:
+            self._record.step("Finish")
+            self._record.finish(result)
+            self._record = None
+
+        if self._profile is not None:
+            self._profile.finish(result)
+            self._profile = None
 
 
 class ReloadConfigOperator(Operator):
@@ -164,6 +573,138 @@ class ReloadConfigOperator(Operator):
         return {'FINISHED'}
 
 
+class StopWatchingOperator(Operator):
+    """Stop streaming frames from the watched output directory."""
+    bl_idname = "ai_workflow.stop_watching"
+    bl_label = "Stop Watching"
+    bl_description = "Stop watching the output directory for generated frames"
+
+    @classmethod
+    def poll(cls, context):
+        return watcher.get_active_watcher() is not None
+
+    def execute(self, context):
+        watcher.stop_watching()
+        self.report({'INFO'}, "Stopped watching output directory")
+        return {'FINISHED'}
+
+
+class UndoLastActionOperator(Operator):
+    """Restore camera, frame, node tree and image editor from before the last action."""
+    bl_idname = "ai_workflow.undo_last_action"
+    bl_label = "Undo Last Action"
+    bl_description = "Restore the scene and editor state from before the last executed action"
+
+    @classmethod
+    def poll(cls, context):
+        return snapshot.history_count() > 0
+
+    def execute(self, context):
+        success, message = snapshot.undo_last(context)
+        if success:
+            self.report({'INFO'}, message)
+            return {'FINISHED'}
+        self.report({'WARNING'}, message)
+        return {'CANCELLED'}
+
+
+class DryRunOperator(Operator):
+    """Check every action against the current file without running anything."""
+    bl_idname = "ai_workflow.dry_run"
+    bl_label = "Dry Run"
+    bl_description = "Report missing or wrong references, would-be creations and unwritable outputs of all actions"
+
+    use_preferences: BoolProperty(
+        name="Use Preferences",
+        description="Plan the actions being edited in the preferences instead of the loaded ones",
+        default=False
+    )
+
+    def execute(self, context):
+        if self.use_preferences:
+            actions = context.preferences.addons[__package__].preferences.actions
+        else:
+            actions = context.scene.my_addon_props.actions
+
+        ok, issues = planner.preflight(actions, context.scene)
+        summary = planner.summarize(issues)
+        if ok:
+            self.report({'INFO'}, f"Dry run passed: {summary}")
+        else:
+            self.report({'ERROR'}, f"Dry run failed: {summary} (see console)")
+        return {'FINISHED'}
+
+
+class ProfileNextRunsOperator(Operator):
+    """Wrap the next action runs or config loads in cProfile."""
+    bl_idname = "ai_workflow.profile_next"
+    bl_label = "Profile Next Runs"
+    bl_description = "Profile the next action runs or config loads and write pstats and collapsed-stack files"
+
+    target: EnumProperty(
+        name="Target",
+        items=profiler.KINDS,
+        default='ACTION'
+    )
+
+    runs: IntProperty(
+        name="Runs",
+        description="Number of runs to profile (0 = stop profiling)",
+        default=1,
+        min=0,
+        max=100
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return profiler.is_enabled()
+
+    def execute(self, context):
+        profiler.arm(self.target, self.runs)
+        if self.runs:
+            self.report({'INFO'}, f"Profiling the next {self.runs} run(s) into {profiler.session_directory()}")
+        else:
+            self.report({'INFO'}, "Profiling stopped")
+        return {'FINISHED'}
+
+
+class ImageMemoryReportOperator(Operator):
+    """Account the memory of all images, grouped by the actions using them."""
+    bl_idname = "ai_workflow.image_memory_report"
+    bl_label = "Image Memory Report"
+    bl_description = "Sum the buffer size of every image, group it by action and flag orphaned images"
+
+    def execute(self, context):
+        report = memory_report.account_images(context.scene.my_addon_props.actions)
+        orphans = sum(1 for usage in report.images if usage.orphan)
+        message = (f"{len(report.images)} image(s): {image_memory.format_bytes(report.total_bytes)} "
+                   f"({image_memory.format_bytes(report.resident_bytes)} loaded), {orphans} orphaned")
+        if report.unsized:
+            message += f", {report.unsized} unloaded of unknown size"
+        self.report({'INFO'}, message)
+        print(f"Image memory: {message}")
+        for usage in report.actions:
+            print(f"  {usage.action_name}: {image_memory.format_bytes(usage.bytes)} in {len(usage.image_names)} image(s)")
+        return {'FINISHED'}
+
+
+class FreeOrphanImagesOperator(Operator):
+    """Remove images the add-on created that no action or editor uses anymore."""
+    bl_idname = "ai_workflow.free_orphan_images"
+    bl_label = "Free Orphaned Images"
+    bl_description = "Remove images created by the add-on that no loaded action references and nothing else uses"
+
+    @classmethod
+    def poll(cls, context):
+        report = memory_report.last_report()
+        return report is not None and any(usage.orphan for usage in report.images)
+
+    def execute(self, context):
+        removed, freed = memory_report.free_orphans(context.scene.my_addon_props.actions)
+        self.report({'INFO'}, f"Removed {removed} orphaned image(s), {image_memory.format_bytes(freed)}")
+        return {'FINISHED'}
+
+
 class AddActionOperator(Operator):
     """Add a new action to the configuration."""
     bl_idname = "ai_workflow.add_action"
@@ -247,31 +788,9 @@ class DuplicateActionOperator(Operator):
         if index < len(preferences.actions):
             source = preferences.actions[index]
             new_action = preferences.actions.add()
-
-            # Copy all properties
+            # Same round trip as saving and loading, so every field is copied
+            config_manager.load_action(new_action, config_manager.action_to_dict(source))
             new_action.button_name = source.button_name + " (Copy)"
-            new_action.action_type = source.action_type
-            new_action.select_camera = source.select_camera
-            new_action.camera_name = source.camera_name
-            new_action.change_image_editor = source.change_image_editor
-            new_action.image_name_to_view = source.image_name_to_view
-            new_action.reset_images = source.reset_images
-            new_action.change_node_tree = source.change_node_tree
-            new_action.node_tree_name = source.node_tree_name
-            new_action.update_timeline = source.update_timeline
-            new_action.timeline_frame = source.timeline_frame
-
-            # Copy images to reset
-            for reset_img in source.images_to_reset:
-                new_reset = new_action.images_to_reset.add()
-                new_reset.name = reset_img.name
-
-            # Copy images to save
-            for save_img in source.images_to_save:
-                new_save = new_action.images_to_save.add()
-                new_save.name = save_img.name
-                new_save.save_as = save_img.save_as
-                new_save.allow_overwrite = save_img.allow_overwrite
 
             preferences.active_action_index = len(preferences.actions) - 1
             self.report({'INFO'}, "Duplicated action")
@@ -386,6 +905,74 @@ class RemoveSaveImageOperator(Operator):
         return {'FINISHED'}
 
 
+class AddPublishImageOperator(Operator):
+    """Add an image to the publish list."""
+    bl_idname = "ai_workflow.add_publish_image"
+    bl_label = "Add Image"
+    bl_description = "Add an image to the publish list"
+
+    def execute(self, context):
+        preferences = context.preferences.addons[__package__].preferences
+        if preferences.active_action_index < len(preferences.actions):
+            action = preferences.actions[preferences.active_action_index]
+            new_img = action.images_to_publish.add()
+            new_img.name = "ImageName"
+            self.report({'INFO'}, "Added publish image")
+        return {'FINISHED'}
+
+
+class RemovePublishImageOperator(Operator):
+    """Remove an image from the publish list."""
+    bl_idname = "ai_workflow.remove_publish_image"
+    bl_label = "Remove Image"
+    bl_description = "Remove an image from the publish list"
+
+    index: IntProperty()
+
+    def execute(self, context):
+        preferences = context.preferences.addons[__package__].preferences
+        if preferences.active_action_index < len(preferences.actions):
+            action = preferences.actions[preferences.active_action_index]
+            if self.index < len(action.images_to_publish):
+                action.images_to_publish.remove(self.index)
+                self.report({'INFO'}, "Removed publish image")
+        return {'FINISHED'}
+
+
+class AddNodeParamOperator(Operator):
+    """Add a node parameter to the selected action."""
+    bl_idname = "ai_workflow.add_node_param"
+    bl_label = "Add Parameter"
+    bl_description = "Add a node input or attribute to set when the action runs"
+
+    def execute(self, context):
+        preferences = context.preferences.addons[__package__].preferences
+        if preferences.active_action_index < len(preferences.actions):
+            action = preferences.actions[preferences.active_action_index]
+            new_param = action.node_params.add()
+            new_param.path = "Node.inputs[Input]"
+            self.report({'INFO'}, "Added node parameter")
+        return {'FINISHED'}
+
+
+class RemoveNodeParamOperator(Operator):
+    """Remove a node parameter from the selected action."""
+    bl_idname = "ai_workflow.remove_node_param"
+    bl_label = "Remove Parameter"
+    bl_description = "Remove a node parameter from the action"
+
+    index: IntProperty()
+
+    def execute(self, context):
+        preferences = context.preferences.addons[__package__].preferences
+        if preferences.active_action_index < len(preferences.actions):
+            action = preferences.actions[preferences.active_action_index]
+            if self.index < len(action.node_params):
+                action.node_params.remove(self.index)
+                self.report({'INFO'}, "Removed node parameter")
+        return {'FINISHED'}
+
+
 class CreateCameraOperator(Operator):
     """Create a new camera if it doesn't exist."""
     bl_idname = "ai_workflow.create_camera"
@@ -439,6 +1026,125 @@ class CreateCameraOperator(Operator):
             return {'CANCELLED'}
 
 
+class ImportCamerasOperator(Operator):
+    """Create cameras in bulk from a CSV or JSON shot file."""
+    bl_idname = "ai_workflow.import_cameras"
+    bl_label = "Import Cameras"
+    bl_description = "Create cameras (with optional animation) from a CSV or JSON shot file"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    filepath: StringProperty(subtype='FILE_PATH')
+    filter_glob: StringProperty(default="*.csv;*.json", options={'HIDDEN'})
+    collection_name: StringProperty(
+        name="Collection",
+        description="Collection receiving new cameras",
+        default=camera_import.DEFAULT_COLLECTION
+    )
+    create_actions: BoolProperty(
+        name="Create Actions",
+        description="Add a Camera Select action for every imported camera",
+        default=True
+    )
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        preferences = context.preferences.addons[__package__].preferences
+        actions = preferences.actions if self.create_actions else None
+        success, message = camera_import.import_shot_file(
+            self.filepath,
+            context.scene,
+            actions=actions,
+            collection_name=self.collection_name or camera_import.DEFAULT_COLLECTION
+        )
+
+        if success:
+            self.report({'INFO'}, message)
+            return {'FINISHED'}
+        self.report({'ERROR'}, message)
+        return {'CANCELLED'}
+
+
+class ImportSequenceOperator(Operator):
+    """Load a directory of numbered frames as one image sequence or movie clip."""
+    bl_idname = "ai_workflow.import_sequence"
+    bl_label = "Import Frame Sequence"
+    bl_description = "Load a numbered frame directory as a single SEQUENCE image or movie clip synced to the timeline"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    directory: StringProperty(subtype='DIR_PATH')
+    sequence_name: StringProperty(
+        name="Name",
+        description="Name of the image or clip (empty uses the frame file prefix)",
+        default=""
+    )
+    kind: EnumProperty(
+        name="Load As",
+        description="Data-block receiving the frames",
+        items=[
+            ('IMAGE', "Image Sequence", "One image with source 'SEQUENCE', for the Image Editor and image nodes"),
+            ('MOVIE_CLIP', "Movie Clip", "One movie clip, for the Movie Clip Editor, tracking and compositing"),
+        ],
+        default='IMAGE'
+    )
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        success, message = sequences.import_sequence(
+            self.directory,
+            name=self.sequence_name,
+            kind=self.kind,
+            scene=context.scene
+        )
+
+        if success:
+            self.report({'INFO'}, message)
+            return {'FINISHED'}
+        self.report({'ERROR'}, message)
+        return {'CANCELLED'}
+
+
+class ExportCameraMatricesOperator(Operator):
+    """Export matrices and intrinsics of all action cameras over a frame range."""
+    bl_idname = "ai_workflow.export_camera_matrices"
+    bl_label = "Export Camera Matrices"
+    bl_description = "Write world matrices, OpenCV extrinsics and intrinsics of every action camera to .npz or .json"
+
+    filepath: StringProperty(subtype='FILE_PATH', default="//cameras.npz")
+    filter_glob: StringProperty(default="*.npz;*.json", options={'HIDDEN'})
+    frame_start: IntProperty(name="Start", default=1)
+    frame_end: IntProperty(name="End", default=250)
+    frame_step: IntProperty(name="Step", default=1, min=1)
+
+    def invoke(self, context, event):
+        self.frame_start = context.scene.frame_start
+        self.frame_end = context.scene.frame_end
+        context.window_manager.fileselect_add(self)
+        return {'RUNNING_MODAL'}
+
+    def execute(self, context):
+        sdn_config = context.scene.my_addon_props
+        success, message = camera_export.export_camera_matrices(
+            context.scene,
+            camera_export.action_camera_names(sdn_config.actions),
+            self.filepath,
+            self.frame_start,
+            self.frame_end,
+            self.frame_step
+        )
+
+        if success:
+            self.report({'INFO'}, message)
+            return {'FINISHED'}
+        self.report({'ERROR'}, message)
+        return {'CANCELLED'}
+
+
 class CreateCameraForActionOperator(Operator):
     """Create the camera for the current action."""
     bl_idname = "ai_workflow.create_camera_for_action"
@@ -580,48 +1286,7 @@ class SaveToInternalConfigOperator(Operator):
     def execute(self, context):
         preferences = context.preferences.addons[__package__].preferences
 
-        # Build config data from preferences (reuse save_config logic)
-        config_data = []
-        for action in preferences.actions:
-            item = {"button_name": action.button_name, "action_type": action.action_type}
-
-            if action.select_camera and action.camera_name:
-                item["select_camera"] = True
-                item["camera_object_name"] = action.camera_name
-            else:
-                item["select_camera"] = False
-
-            if action.change_image_editor and action.image_name_to_view:
-                item["change_image_editor"] = True
-                item["image_name_to_view"] = action.image_name_to_view
-            else:
-                item["change_image_editor"] = False
-
-            if action.change_node_tree and action.node_tree_name:
-                item["change_node_tree"] = True
-                item["node_tree_name"] = action.node_tree_name
-            else:
-                item["change_node_tree"] = False
-
-            if action.update_timeline:
-                item["update_timeline"] = True
-                item["timeline_frame"] = action.timeline_frame
-            else:
-                item["update_timeline"] = False
-
-            if action.action_type == 'RESET' and action.reset_images:
-                item["reset_images"] = True
-                item["images_to_reset"] = [{"name": img.name} for img in action.images_to_reset]
-            else:
-                item["reset_images"] = False
-
-            if action.action_type == 'IMAGE_SAVE':
-                item["images_to_save"] = [
-                    {"name": img.name, "save_as": img.save_as, "allow_overwrite": img.allow_overwrite}
-                    for img in action.images_to_save
-                ]
-
-            config_data.append(item)
+        config_data = [config_manager.action_to_dict(action) for action in preferences.actions]
 
         # Save to internal config
         success, message = config_manager.save_internal_config(config_data)
@@ -686,6 +1351,12 @@ class DeleteInternalConfigOperator(Operator):
 classes = (
     ExecuteActionOperator,
     ReloadConfigOperator,
+    StopWatchingOperator,
+    UndoLastActionOperator,
+    DryRunOperator,
+    ProfileNextRunsOperator,
+    ImageMemoryReportOperator,
+    FreeOrphanImagesOperator,
     AddActionOperator,
     RemoveActionOperator,
     MoveActionOperator,
@@ -696,7 +1367,14 @@ classes = (
     RemoveResetImageOperator,
     AddSaveImageOperator,
     RemoveSaveImageOperator,
+    AddPublishImageOperator,
+    RemovePublishImageOperator,
+    AddNodeParamOperator,
+    RemoveNodeParamOperator,
     CreateCameraOperator,
+    ImportCamerasOperator,
+    ImportSequenceOperator,
+    ExportCameraMatricesOperator,
     CreateCameraForActionOperator,
     CreateImageOperator,
     CreateImageEditorImageOperator,
@@ -5,6 +5,17 @@ UI panels for AI Workflow Config Tools
 import bpy
 from bpy.types import Panel
 
+from . import watcher
+from . import prefetch
+from . import image_memory
+from . import previews
+from . import tiling
+from . import snapshot
+from . import planner
+from . import sequences
+from . import profiler
+from . import memory_report
+
 
 class AIWorkflowPanel(Panel):
     """Main panel in 3D View sidebar."""
@@ -21,6 +32,7 @@ class AIWorkflowPanel(Panel):
         # Top buttons row
         row = layout.row(align=True)
         row.operator("ai_workflow.reload_config", icon='FILE_REFRESH')
+        row.operator("ai_workflow.dry_run", text="", icon='CHECKBOX_HLT')
 
         # Add "Edit Config" button that opens preferences
         op = row.operator(
@@ -48,7 +60,12 @@ class AIWorkflowPanel(Panel):
 
         # Display buttons for all configured actions
         box = layout.box()
-        box.label(text="Actions", icon='PLAY')
+        row = box.row()
+        row.label(text="Actions", icon='PLAY')
+        row.operator("ai_workflow.export_camera_matrices", text="", icon='OUTLINER_OB_CAMERA')
+        row.operator("ai_workflow.import_sequence", text="", icon='FILE_MOVIE')
+        row.prop(sdn_config, "resume_outputs", text="", icon='CHECKMARK')
+        row.prop(sdn_config, "show_previews", text="", icon='IMAGE_DATA')
 
         for i, action in enumerate(sdn_config.actions):
             # Icon based on action type
@@ -56,16 +73,164 @@ class AIWorkflowPanel(Panel):
                 'CAMERA_SELECT': 'CAMERA_DATA',
                 'RESET': 'FILE_REFRESH',
                 'IMAGE_SAVE': 'FILE_TICK',
+                'RENDER': 'RENDER_STILL',
+                'DEPTH_MAP': 'MOD_DISPLACE',
+                'COMPARE': 'IMAGE_REFERENCE',
+                'PUBLISH': 'EXPORT',
             }
             action_icon = icon_map.get(action.action_type, 'PLAY')
 
-            op = box.operator(
-                "ai_workflow.execute_action",
-                text=action.button_name,
-                icon=action_icon
-            )
+            # Thumbnail of the action's view image (0 while it is being produced)
+            icon_id = 0
+            if action.change_image_editor:
+                icon_id = previews.get_icon_id(action.image_name_to_view)
+
+            if icon_id and sdn_config.show_previews:
+                box.template_icon(icon_value=icon_id, scale=4.0)
+
+            if icon_id:
+                op = box.operator(
+                    "ai_workflow.execute_action",
+                    text=action.button_name,
+                    icon_value=icon_id
+                )
+            else:
+                op = box.operator(
+                    "ai_workflow.execute_action",
+                    text=action.button_name,
+                    icon=action_icon
+                )
             op.action_index = i
 
+        # Outcome of a cancelled long-running action
+        if sdn_config.last_run_status:
+            box.label(text=sdn_config.last_run_status, icon='CANCEL')
+
+        # Step back through executed actions
+        if snapshot.history_count():
+            row = box.row()
+            row.operator(
+                "ai_workflow.undo_last_action",
+                text=f"Undo '{snapshot.last_label()}'",
+                icon='LOOP_BACK'
+            )
+            row.label(text=f"{snapshot.history_count()}/{snapshot.HISTORY_SIZE}")
+
+        # Issues found by the last dry run
+        if planner.last_summary():
+            box = layout.box()
+            issues = planner.last_plan()
+            box.label(text=f"Dry Run: {planner.last_summary()}", icon='ERROR' if issues else 'CHECKMARK')
+            severity_icons = {'ERROR': 'CANCEL', 'WARNING': 'ERROR', 'CREATE': 'ADD'}
+            for issue in issues[:8]:
+                box.label(text=f"{issue.action_name}: {issue.message}", icon=severity_icons[issue.severity])
+            if len(issues) > 8:
+                box.label(text=f"... and {len(issues) - 8} more (see console)")
+
+        # Metrics of the last image comparison
+        if sdn_config.compare_label:
+            box = layout.box()
+            box.label(text=sdn_config.compare_label, icon='IMAGE_REFERENCE')
+            psnr = sdn_config.compare_psnr
+            psnr_text = "∞" if psnr == float('inf') else f"{psnr:.2f} dB"
+            box.label(text=f"MSE: {sdn_config.compare_mse:.6f}")
+            box.label(text=f"PSNR: {psnr_text}")
+            box.label(text=f"SSIM: {sdn_config.compare_ssim:.4f}")
+
+        # Output directory watcher status
+        active_watcher = watcher.get_active_watcher()
+        if active_watcher:
+            box = layout.box()
+            row = box.row()
+            if active_watcher.error:
+                row.alert = True
+                row.label(text=f"Watcher failed: {active_watcher.error}", icon='ERROR')
+            else:
+                row.label(text=f"Watching ({active_watcher.backend_name})", icon='VIEWZOOM')
+            row.operator("ai_workflow.stop_watching", text="", icon='CANCEL')
+            box.label(text=f"Frames applied: {active_watcher.frames_applied}")
+            if active_watcher.last_file:
+                box.label(text=f"Last: {active_watcher.last_file}")
+
+        # Imported frame sequences
+        loaded_sequences = sequences.registered_sequences()
+        if loaded_sequences:
+            box = layout.box()
+            box.label(text=f"Frame Sequences ({len(loaded_sequences)})", icon='FILE_MOVIE')
+            for name, sequence in loaded_sequences.items():
+                end = sequence.start_frame + sequence.duration - 1
+                box.label(text=f"{name}: frames {sequence.start_frame}-{end}")
+
+        # Image prefetch progress
+        pending = prefetch.pending_count()
+        if pending:
+            layout.label(text=f"Prefetching {pending} image(s)...", icon='SORTTIME')
+
+        # Image memory usage
+        memory = image_memory.manager
+        budget = image_memory.get_budget_bytes()
+        usage_text = image_memory.format_bytes(memory.usage_bytes)
+        if budget:
+            usage_text += f" / {image_memory.format_bytes(budget)}"
+        box = layout.box()
+        row = box.row()
+        row.label(text=f"Image Memory: {usage_text}", icon='MEMORY')
+        row.operator("ai_workflow.image_memory_report", text="", icon='VIEWZOOM')
+        staging = tiling.staging_bytes()
+        if staging:
+            box.label(text=f"Staging buffers: {image_memory.format_bytes(staging)}")
+        if memory.evictions:
+            box.label(text=f"Evictions: {memory.evictions} ({image_memory.format_bytes(memory.freed_bytes)} freed)")
+            box.label(text=f"Last freed: {memory.last_evicted}")
+
+        # Accounting of all images by action (after a report was requested)
+        report = memory_report.last_report()
+        if report is not None:
+            box.label(text=f"All images: {image_memory.format_bytes(report.total_bytes)} "
+                           f"({image_memory.format_bytes(report.resident_bytes)} loaded)")
+            if report.unsized:
+                box.label(text=f"Not loaded, size unknown: {report.unsized} image(s)")
+            for usage in report.actions[:6]:
+                if usage.bytes:
+                    box.label(text=f"{usage.action_name}: {image_memory.format_bytes(usage.bytes)} "
+                                   f"in {len(usage.image_names)} image(s)", icon='DOT')
+            for usage in report.images[:5]:
+                icon = 'ORPHAN_DATA' if usage.orphan else ('IMAGE_DATA' if usage.resident else 'IMAGE')
+                box.label(text=f"{usage.name}: {memory_report.format_size(usage.bytes)}", icon=icon)
+            orphans = sum(1 for usage in report.images if usage.orphan)
+            if orphans:
+                row = box.row()
+                row.label(text=f"Orphaned: {orphans} image(s), {image_memory.format_bytes(report.orphan_bytes)}",
+                          icon='ORPHAN_DATA')
+                row.operator("ai_workflow.free_orphan_images", text="", icon='TRASH')
+
+        # Python allocations kept by the last action (Trace Allocations preference)
+        allocations = memory_report.last_allocations()
+        if allocations is not None:
+            box.label(text=f"Allocations after '{allocations['label']}': "
+                           f"{memory_report.format_diff(allocations['net_bytes'])}", icon='MEMORY')
+            for entry in allocations["top"][:5]:
+                box.label(text=f"{memory_report.format_diff(entry['size_diff'])}  {entry['where']}")
+
+        # Profiler: arm the next runs and show the last profile's top functions
+        if profiler.is_enabled():
+            box = layout.box()
+            row = box.row(align=True)
+            row.label(text="Profiler", icon='TIME')
+            op = row.operator("ai_workflow.profile_next", text="", icon='PLAY')
+            op.target = 'ACTION'
+            op = row.operator("ai_workflow.profile_next", text="", icon='FILE_REFRESH')
+            op.target = 'CONFIG_LOAD'
+            for kind, name, _ in profiler.KINDS:
+                if profiler.armed_runs(kind):
+                    box.label(text=f"{name}: next {profiler.armed_runs(kind)} run(s) armed", icon='REC')
+            result = profiler.last_result()
+            if result:
+                box.label(text=f"'{result['label']}': {result['ms']:.1f} ms ({result['status'].lower()})")
+                for entry in result["top"][:8]:
+                    box.label(text=f"{entry['cum_ms']:.1f} ms  {entry['function']}")
+                box.label(text=f"Files: {result['stats_path']}", icon='FILE')
+
         # Collapsible section for loaded actions (debugging info)
         layout.separator()
         box = layout.box()
@@ -0,0 +1,231 @@
+"""
+Dry-run planner: resolves every action against bpy.data without changing anything
+"""
+
+import bpy
+import os
+from pathlib import Path
+from collections import namedtuple
+
+from . import utils
+from . import node_params
+
+# ERROR: the step would fail, WARNING: it would run with a fallback,
+# CREATE: it would create a camera or image
+SEVERITIES = ('ERROR', 'WARNING', 'CREATE')
+
+PlanIssue = namedtuple("PlanIssue", "severity action_index action_name message")
+
+# Issues of the last planned config, shown in the panel
+_last_plan = []
+_last_summary = ""
+
+
+class NameIndex:
+    """Name sets built once from bpy.data, so each reference is an O(1) lookup."""
+
+    def __init__(self):
+        self.object_types = {obj.name: obj.type for obj in bpy.data.objects}
+        self.images = {img.name for img in bpy.data.images}
+        self.node_groups = {ng.name for ng in bpy.data.node_groups}
+
+
+class _WritableCache:
+    """Answers 'could a file be written here' once per directory."""
+
+    def __init__(self):
+        self._dirs = {}
+
+    def directory_writable(self, directory):
+        directory = Path(directory)
+        key = str(directory)
+        if key not in self._dirs:
+            # Walk up to the nearest existing ancestor; missing levels get created on save
+            probe = directory
+            while not probe.exists() and probe.parent != probe:
+                probe = probe.parent
+            self._dirs[key] = probe.is_dir() and os.access(probe, os.W_OK | os.X_OK)
+        return self._dirs[key]
+
+
+def plan_actions(actions, scene, index=None):
+    """
+    Resolves all actions in one linear pass and returns the issues found.
+
+    Mirrors what ExecuteActionOperator would do for each action, without
+    running it: missing or wrong-type references, cameras and images that
+    would be created, clamped timeline frames and unwritable output paths.
+    Cameras and images an action would create are added to the index, so
+    later actions resolve against them and each creation is reported once.
+
+    Args:
+        actions: Collection of ActionProperty (scene or preferences)
+        scene: Scene providing the frame range
+        index: Optional prebuilt NameIndex (extended in place)
+
+    Returns:
+        list: PlanIssue tuples, in action order
+    """
+    index = index or NameIndex()
+    writable = _WritableCache()
+    issues = []
+
+    for i, action in enumerate(actions):
+        name = action.button_name
+
+        def add(severity, message):
+            issues.append(PlanIssue(severity, i, name, message))
+
+        valid, error = utils.validate_action(action)
+        if not valid:
+            add('ERROR', error)
+
+        def image_needed(image_name, label):
+            if image_name and image_name not in index.images:
+                add('ERROR', f"{label} image '{image_name}' not found")
+
+        def image_created(image_name, label):
+            if image_name and image_name not in index.images:
+                add('CREATE', f"{label} image '{image_name}' would be created")
+                index.images.add(image_name)
+
+        def camera_ref(camera_name, create):
+            obj_type = index.object_types.get(camera_name)
+            if obj_type is None:
+                if create:
+                    add('CREATE', f"Camera '{camera_name}' would be created")
+                    index.object_types[camera_name] = 'CAMERA'
+                else:
+                    add('WARNING', f"Camera '{camera_name}' not found, the scene camera would be used")
+            elif obj_type != 'CAMERA':
+                add('ERROR', f"Object '{camera_name}' is a {obj_type.lower()}, not a camera")
+
+        def output_dir(directory, label):
+            if directory and not writable.directory_writable(bpy.path.abspath(str(directory))):
+                add('ERROR', f"{label} directory '{directory}' is not writable")
+
+        if action.select_camera and action.camera_name:
+            camera_ref(action.camera_name, create=True)
+
+        if action.change_node_tree and action.node_tree_name and action.node_tree_name not in index.node_groups:
+            add('WARNING', f"Node group '{action.node_tree_name}' not found, the tree would not change")
+
+        sweeping = action.action_type == 'IMAGE_SAVE' and action.sweep_enabled
+        if len(action.node_params):
+            tree = node_params.target_tree(scene, action)
+            if tree is None:
+                add('WARNING', "No node tree to apply node parameters to")
+            else:
+                for param in action.node_params:
+                    if param.path and (param.value or sweeping) and node_params.resolve(tree, param.path) is None:
+                        add('ERROR', f"Node parameter '{param.path}' not found in '{tree.name}'")
+
+        if sweeping:
+            for camera_name in node_params.sweep_cameras(action):
+                if camera_name:
+                    camera_ref(camera_name, create=False)
+            if action.sweep_run_operator and node_params.find_operator(action.sweep_run_operator) is None:
+                add('ERROR', f"Run operator '{action.sweep_run_operator}' not found")
+
+        if action.action_type == 'RESET' and action.reset_images:
+            for item in action.images_to_reset:
+                image_created(item.name, "Reset")
+
+        elif action.action_type == 'IMAGE_SAVE':
+            for item in action.images_to_save:
+                image_needed(item.name, "Save")
+                if not item.save_as:
+                    continue
+                save_as = item.save_as
+                if sweeping:
+                    # The first combination stands in for all of them
+                    first = next(node_params.iter_variants(action))
+                    try:
+                        save_as = node_params.expand_template(save_as, dict(first[3], image=item.name))
+                    except ValueError as e:
+                        add('ERROR', str(e))
+                        continue
+                path = Path(bpy.path.abspath(save_as))
+                if path.is_dir():
+                    add('ERROR', f"'{item.save_as}' is a directory")
+                else:
+                    if path.exists() and not item.allow_overwrite:
+                        add('WARNING', f"'{item.save_as}' exists and overwrite is disabled; a numbered name will be used")
+                    output_dir(path.parent, "Save")
+                if item.custom_output and path.suffix.lower() != '.png':
+                    add('WARNING', f"Custom output ignored for non-PNG '{item.save_as}'")
+
+        elif action.action_type == 'RENDER':
+            if action.camera_name and not action.select_camera:
+                camera_ref(action.camera_name, create=False)
+            if not action.camera_name and scene.camera is None:
+                add('ERROR', "No camera set and the scene has no active camera")
+            image_created(action.render_image_name, "Render")
+
+        elif action.action_type == 'DEPTH_MAP':
+            image_needed(action.depth_source_image, "Depth source")
+            image_created(action.depth_target_image, "Depth target")
+
+        elif action.action_type == 'COMPARE':
+            image_needed(action.compare_image_a, "Compare")
+            image_needed(action.compare_image_b, "Compare")
+            image_created(action.compare_diff_image, "Difference")
+
+        elif action.action_type == 'PUBLISH':
+            for item in action.images_to_publish:
+                image_needed(item.name, "Publish")
+            output_dir(action.publish_directory, "Publish")
+
+        if action.change_image_editor and action.image_name_to_view:
+            image_created(action.image_name_to_view, "Image Editor")
+
+        if action.update_timeline and not scene.frame_start <= action.timeline_frame <= scene.frame_end:
+            add('WARNING', f"Frame {action.timeline_frame} is outside {scene.frame_start}-{scene.frame_end} "
+                           f"and would be clamped")
+
+        if action.watch_output and action.watch_directory:
+            if not os.path.isdir(bpy.path.abspath(action.watch_directory)):
+                add('ERROR', f"Watch directory '{action.watch_directory}' does not exist")
+
+    return issues
+
+
+def summarize(issues):
+    """Returns a one-line count of issues by severity."""
+    counts = {severity: 0 for severity in SEVERITIES}
+    for issue in issues:
+        counts[issue.severity] += 1
+    return f"{counts['ERROR']} error(s), {counts['WARNING']} warning(s), {counts['CREATE']} creation(s)"
+
+
+def preflight(actions, scene):
+    """
+    Plans a config for batch jobs and prints every issue.
+
+    Returns:
+        tuple: (ok: bool, issues: list) - ok is False if any ERROR was found
+    """
+    global _last_plan, _last_summary
+
+    issues = plan_actions(actions, scene)
+    _last_plan = issues
+    _last_summary = summarize(issues)
+
+    print(f"Dry run: {len(actions)} action(s): {_last_summary}")
+    for issue in issues:
+        print(f"Dry run: [{issue.severity}] #{issue.action_index + 1} '{issue.action_name}': {issue.message}")
+    return not any(issue.severity == 'ERROR' for issue in issues), issues
+
+
+def last_plan():
+    return _last_plan
+
+
+def last_summary():
+    return _last_summary
+
+
+def clear():
+    global _last_plan, _last_summary
+    _last_plan = []
+    _last_summary = ""
@@ -4,10 +4,13 @@ Addon preferences panel for AI Workflow Config Tools
 
 import bpy
 from bpy.types import AddonPreferences
-from bpy.props import CollectionProperty, IntProperty
+from bpy.props import CollectionProperty, IntProperty, BoolProperty, StringProperty, EnumProperty
 
 from .properties import ActionProperty
 from . import config_manager
+from . import node_params
+from . import journal
+from . import profiler
 
 
 class AIWorkflowPreferences(AddonPreferences):
@@ -24,6 +27,70 @@ class AIWorkflowPreferences(AddonPreferences):
         default=0
     )
 
+    # Image memory budget
+    image_memory_budget_mb: IntProperty(
+        name="Image Memory Budget (MB)",
+        description="Free least recently used image buffers when images touched by actions exceed this size (0 = unlimited)",
+        default=4096,
+        min=0
+    )
+
+    # Python allocation tracking around actions
+    trace_allocations: BoolProperty(
+        name="Trace Allocations",
+        description="Diff tracemalloc snapshots before and after each action to find Python buffers kept across actions (slows Python code while on)",
+        default=False
+    )
+
+    # Action journal
+    journal_enabled: BoolProperty(
+        name="Action Journal",
+        description="Append a record of every executed action and config reload to a journal file, for replay with journal_replay.py",
+        default=False
+    )
+    journal_directory: StringProperty(
+        name="Journal Directory",
+        description="Directory for journal files, one per session (empty = system temp directory)",
+        subtype='DIR_PATH',
+        default=""
+    )
+
+    # cProfile hook
+    profile_enabled: BoolProperty(
+        name="Profiler",
+        description="Allow profiling the next action runs or config loads with cProfile (armed from the sidebar panel)",
+        default=False
+    )
+    profile_directory: StringProperty(
+        name="Profile Directory",
+        description="Directory for profile files, one subdirectory per session (empty = system temp directory)",
+        subtype='DIR_PATH',
+        default=""
+    )
+
+    # Metrics export for farm monitoring
+    metrics_path: StringProperty(
+        name="Metrics File",
+        description="Write action and save metrics to this file periodically; {host} and {pid} are replaced (empty = no export)",
+        subtype='FILE_PATH',
+        default=""
+    )
+    metrics_format: EnumProperty(
+        name="Metrics Format",
+        items=[
+            ('PROMETHEUS', "Prometheus Textfile", "Replace the file with the Prometheus text format (node_exporter textfile collector, use a .prom file)"),
+            ('JSONL', "JSON Lines", "Append one JSON line per interval with counters, rates and latency percentiles"),
+        ],
+        default='PROMETHEUS'
+    )
+    metrics_interval: IntProperty(
+        name="Metrics Interval (s)",
+        description="Seconds between metrics file writes",
+        default=15,
+        min=1,
+        max=3600
+    )
+
     def draw(self, context):
         """Draw the preferences panel."""
         layout = self.layout
@@ -34,6 +101,7 @@ class AIWorkflowPreferences(AddonPreferences):
         row.label(text="External Config (JSON File):", icon='FILE_FOLDER')
         row.operator("ai_workflow.load_config", text="Load", icon='IMPORT')
         row.operator("ai_workflow.save_config", text="Save", icon='EXPORT')
+        row.operator("ai_workflow.dry_run", text="Dry Run", icon='CHECKBOX_HLT').use_preferences = True
 
         # Internal .blend config section
         box = layout.box()
@@ -55,6 +123,32 @@ class AIWorkflowPreferences(AddonPreferences):
         else:
             info_row.label(text="ℹ Using external config.json (global)", icon='INFO')
 
+        # Performance settings
+        box = layout.box()
+        box.label(text="Performance", icon='MEMORY')
+        row = box.row()
+        row.prop(self, "image_memory_budget_mb")
+        row.prop(self, "trace_allocations")
+        row = box.row(align=True)
+        row.prop(self, "journal_enabled")
+        sub = row.row(align=True)
+        sub.active = self.journal_enabled
+        sub.prop(self, "journal_directory", text="")
+        if self.journal_enabled:
+            box.label(text=f"Journal: {journal.session_path()}", icon='TEXT')
+        row = box.row(align=True)
+        row.prop(self, "profile_enabled")
+        sub = row.row(align=True)
+        sub.active = self.profile_enabled
+        sub.prop(self, "profile_directory", text="")
+        if self.profile_enabled:
+            box.label(text=f"Profiles: {profiler.session_directory()}", icon='TIME')
+        box.prop(self, "metrics_path")
+        row = box.row()
+        row.active = bool(self.metrics_path)
+        row.prop(self, "metrics_format", text="")
+        row.prop(self, "metrics_interval")
+
         layout.separator()
 
         # Actions list section
@@ -72,6 +166,8 @@ class AIWorkflowPreferences(AddonPreferences):
         col_row.separator()
         col_row.operator("ai_workflow.move_action", text="", icon='TRIA_UP').direction = 'UP'
         col_row.operator("ai_workflow.move_action", text="", icon='TRIA_DOWN').direction = 'DOWN'
+        col_row.separator()
+        col_row.operator("ai_workflow.import_cameras", text="", icon='OUTLINER_OB_CAMERA')
 
         col.template_list(
             "AI_WORKFLOW_UL_action_list",
@@ -114,6 +210,8 @@ class AIWorkflowPreferences(AddonPreferences):
             self.draw_node_tree_settings(box, action)
             box.separator()
             self.draw_timeline_settings(box, action)
+            box.separator()
+            self.draw_watch_settings(box, action)
 
         elif action.action_type == 'RESET':
             self.draw_camera_settings(box, action)
@@ -125,9 +223,35 @@ class AIWorkflowPreferences(AddonPreferences):
             self.draw_node_tree_settings(box, action)
             box.separator()
             self.draw_timeline_settings(box, action)
+            box.separator()
+            self.draw_watch_settings(box, action)
 
         elif action.action_type == 'IMAGE_SAVE':
             self.draw_save_images_settings(box, action)
+            box.separator()
+            self.draw_sweep_settings(box, action)
+
+        elif action.action_type == 'DEPTH_MAP':
+            self.draw_depth_map_settings(box, action)
+            box.separator()
+            self.draw_image_editor_settings(box, action)
+
+        elif action.action_type == 'COMPARE':
+            self.draw_compare_settings(box, action)
+            box.separator()
+            self.draw_image_editor_settings(box, action)
+
+        elif action.action_type == 'PUBLISH':
+            self.draw_publish_settings(box, action)
+
+        elif action.action_type == 'RENDER':
+            self.draw_camera_settings(box, action)
+            box.separator()
+            self.draw_render_settings(box, action)
+            box.separator()
+            self.draw_image_editor_settings(box, action)
+            box.separator()
+            self.draw_timeline_settings(box, action)
 
     def draw_camera_settings(self, layout, action):
         """Draw camera settings."""
@@ -183,6 +307,43 @@ class AIWorkflowPreferences(AddonPreferences):
             # Add node group picker
             row.prop_search(action, "node_tree_name", bpy.data, "node_groups", text="")
 
+        self.draw_node_params_settings(box, action)
+
+    def draw_node_params_settings(self, layout, action):
+        """Draw the node parameters written into the target node tree."""
+        col = layout.column(align=True)
+        col.label(text="Node Parameters", icon='NODETREE')
+
+        for idx, param in enumerate(action.node_params):
+            row = col.row(align=True)
+            row.prop(param, "path", text="")
+            row.prop(param, "value", text="")
+            remove_op = row.operator("ai_workflow.remove_node_param", text="", icon='X')
+            remove_op.index = idx
+
+            if action.sweep_enabled and action.action_type == 'IMAGE_SAVE':
+                row = col.row(align=True)
+                row.prop(param, "name", text="Name")
+                row.prop(param, "sweep_values", text="Sweep")
+
+        row = col.row()
+        row.operator("ai_workflow.add_node_param", text="Add Parameter", icon='ADD')
+
+    def draw_sweep_settings(self, layout, action):
+        """Draw parameter sweep settings."""
+        box = layout.box()
+        row = box.row()
+        row.prop(action, "sweep_enabled", text="Parameter Sweep")
+
+        if action.sweep_enabled:
+            box.prop(action, "sweep_cameras", text="Cameras")
+            row = box.row(align=True)
+            row.prop(action, "sweep_run_operator", text="Run Operator")
+            row.prop(action, "sweep_wait", text="Wait")
+            self.draw_node_tree_settings(box, action)
+            box.label(text=f"{node_params.variant_count(action)} combination(s); "
+                           "paths may use {camera}, {index}, {image} and parameter names", icon='INFO')
+
     def draw_timeline_settings(self, layout, action):
         """Draw timeline settings."""
         box = layout.box()
@@ -193,6 +354,93 @@ class AIWorkflowPreferences(AddonPreferences):
             row = box.row()
             row.prop(action, "timeline_frame", text="Frame")
 
+    def draw_render_settings(self, layout, action):
+        """Draw render settings."""
+        box = layout.box()
+        box.label(text="Render", icon='RENDER_STILL')
+
+        row = box.row(align=True)
+        row.prop(action, "render_image_name", text="Target Image")
+        row.prop_search(action, "render_image_name", bpy.data, "images", text="")
+        box.prop(action, "render_pass", text="Pass")
+        box.prop(action, "render_resolution_scale", text="Resolution Scale")
+
+    def draw_depth_map_settings(self, layout, action):
+        """Draw depth map settings."""
+        box = layout.box()
+        box.label(text="Depth Map", icon='MOD_DISPLACE')
+
+        row = box.row(align=True)
+        row.prop(action, "depth_source_image", text="Source")
+        row.prop_search(action, "depth_source_image", bpy.data, "images", text="")
+        row = box.row(align=True)
+        row.prop(action, "depth_target_image", text="Target")
+        row.prop_search(action, "depth_target_image", bpy.data, "images", text="")
+
+        box.prop(action, "depth_clip_mode", text="Clip")
+        row = box.row(align=True)
+        if action.depth_clip_mode == 'NEAR_FAR':
+            row.prop(action, "depth_near")
+            row.prop(action, "depth_far")
+        else:
+            row.prop(action, "depth_percentile_low", text="Low %")
+            row.prop(action, "depth_percentile_high", text="High %")
+
+        row = box.row(align=True)
+        row.prop(action, "depth_invert")
+        row.prop(action, "depth_gamma")
+        box.prop(action, "depth_bit_depth", expand=True)
+
+    def draw_compare_settings(self, layout, action):
+        """Draw image comparison settings."""
+        box = layout.box()
+        box.label(text="Compare Images", icon='IMAGE_REFERENCE')
+
+        for prop, label in (("compare_image_a", "Image A"),
+                            ("compare_image_b", "Image B"),
+                            ("compare_diff_image", "Heat Map")):
+            row = box.row(align=True)
+            row.prop(action, prop, text=label)
+            row.prop_search(action, prop, bpy.data, "images", text="")
+
+        box.prop(action, "compare_heatmap_gain")
+
+    def draw_publish_settings(self, layout, action):
+        """Draw frame publishing settings."""
+        box = layout.box()
+        box.label(text="Images to Publish", icon='EXPORT')
+
+        box.prop(action, "publish_mode", text="Mode")
+        box.prop(action, "publish_directory", text="Descriptors")
+        if action.publish_mode == 'SHARED_MEMORY':
+            box.prop(action, "publish_prefix", text="Segment Prefix")
+
+        col = box.column(align=True)
+        for idx, img in enumerate(action.images_to_publish):
+            row = col.row(align=True)
+            row.prop(img, "name", text="")
+            row.prop_search(img, "name", bpy.data, "images", text="")
+
+            remove_op = row.operator("ai_workflow.remove_publish_image", text="", icon='X')
+            remove_op.index = idx
+
+            if img.name and img.name not in bpy.data.images:
+                warning_row = col.row()
+                warning_row.label(text=f"  ⚠ '{img.name}' doesn't exist", icon='ERROR')
+
+        row = col.row()
+        row.operator("ai_workflow.add_publish_image", text="Add Image", icon='ADD')
+
+    def draw_watch_settings(self, layout, action):
+        """Draw output directory watching settings."""
+        box = layout.box()
+        row = box.row()
+        row.prop(action, "watch_output", text="Watch Output Directory")
+
+        if action.watch_output:
+            box.prop(action, "watch_directory", text="Directory")
+            box.label(text="Files named '<ImageName>*' stream into this action's images", icon='INFO')
+
     def draw_reset_images_settings(self, layout, action):
         """Draw reset images settings."""
         box = layout.box()
@@ -253,6 +501,17 @@ class AIWorkflowPreferences(AddonPreferences):
             sub_box.prop(img, "save_as", text="Save Path")
             sub_box.prop(img, "allow_overwrite", text="Allow Overwrite")
 
+            sub_box.prop(img, "custom_output", text="Custom Output (PNG)")
+            if img.custom_output:
+                col_opts = sub_box.column(align=True)
+                col_opts.prop(img, "bit_depth", expand=True)
+                col_opts.prop(img, "color_transform")
+                col_opts.prop(img, "dither")
+                col_opts.prop(img, "alpha_mode")
+                col_opts.prop(img, "png_compression")
+                if img.save_as and not img.save_as.lower().endswith('.png'):
+                    sub_box.label(text="⚠ Custom output only applies to .png files", icon='ERROR')
+
         row = col.row()
         row.operator("ai_workflow.add_save_image", text="Add Image", icon='ADD')
 
@@ -0,0 +1,186 @@
+"""
+Background prefetching of images referenced by configured actions
+"""
+
+import bpy
+import time
+import asyncio
+from pathlib import Path
+
+from . import utils
+from . import image_memory
+from . import async_runtime
+
+# File reads kept in flight ahead of the next Blender-side load
+READ_AHEAD = 2
+
+# Chunk size used when streaming file bytes into the OS cache
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Main-thread time budget per timer tick (seconds)
+TICK_BUDGET = 0.008
+
+# Pause once a tick's budget is used up (seconds)
+TICK_INTERVAL = 0.05
+
+# Task warming the queued images (see _prefetch)
+_task = None
+
+# Ordered list of [image_name, file path or None, read task or None] waiting for their Blender-side load
+_queue = []
+
+_stats = {"loaded": 0, "skipped": 0}
+
+
+def read_file(path):
+    """Worker thread: streams a file once so its bytes are in the OS cache."""
+    total = 0
+    try:
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                total += len(chunk)
+    except OSError as e:
+        print(f"Prefetch: Could not read '{path}': {e}")
+    return total
+
+
+def prioritized_image_names(actions, last_index=-1):
+    """
+    Returns image names ordered by how soon their action is likely to run.
+
+    Actions are visited in order starting right after the last executed one
+    (wrapping around), so the next button in the workflow is warmed first.
+    """
+    count = len(actions)
+    names = []
+    seen = set()
+    for offset in range(1, count + 1):
+        action = actions[(last_index + offset) % count]
+        for name in utils.action_image_names(action):
+            if name not in seen:
+                seen.add(name)
+                names.append(name)
+    return names
+
+
+def _needs_load(img):
+    """True if the image is file-backed and its pixels are not loaded yet."""
+    if img.source != 'FILE' or img.has_data:
+        return False
+    return bool(img.filepath or img.packed_file)
+
+
+def schedule_prefetch(context, action_ran=True):
+    """
+    Queues every image referenced by the scene's actions for warming.
+
+    File bytes are read on the async runtime's worker threads; the
+    Blender-side load is finished in short slices on the main thread.
+
+    Args:
+        action_ran: False right after loading a config, when the active
+            action has not run yet and is warmed first
+    """
+    global _task
+
+    props = context.scene.my_addon_props
+    if not props.actions:
+        return 0
+
+    last_index = props.active_action_index if action_ran else props.active_action_index - 1
+    names = prioritized_image_names(props.actions, last_index)
+
+    cancel()
+    for name in names:
+        img = bpy.data.images.get(name)
+        if img is None or not _needs_load(img):
+            continue
+
+        path = None
+        if not img.packed_file:
+            path = Path(bpy.path.abspath(img.filepath))
+            path = str(path) if path.is_file() else None
+        _queue.append([name, path, None])
+
+    if _queue:
+        _task = async_runtime.spawn(_prefetch(), name="prefetch")
+        print(f"Prefetch: Queued {len(_queue)} image(s): {[entry[0] for entry in _queue]}")
+    return len(_queue)
+
+
+def _load_image(img):
+    """Main thread: decodes the image so the Image Editor can show it at once."""
+    if not bpy.app.background:
+        try:
+            # Decodes the file and uploads the GPU texture the editor draws with
+            if img.gl_load() == 0:
+                return
+        except Exception:
+            pass
+    # Acquiring the image buffer decodes the file without a GPU context
+    img.update()
+
+
+async def _prefetch():
+    """Runtime task: warms queued images in priority order, loading within a time budget per tick."""
+    deadline = time.perf_counter() + TICK_BUDGET
+
+    while _queue:
+        if time.perf_counter() >= deadline:
+            await asyncio.sleep(TICK_INTERVAL)
+            deadline = time.perf_counter() + TICK_BUDGET
+
+        for entry in _queue[:READ_AHEAD]:
+            if entry[1] is not None and entry[2] is None:
+                entry[2] = async_runtime.spawn(async_runtime.run_in_thread(read_file, entry[1]))
+
+        name, _path, read = _queue[0]
+        if read is not None:
+            await read
+        _queue.pop(0)
+
+        img = bpy.data.images.get(name)
+        if img is None or not _needs_load(img):
+            _stats["skipped"] += 1
+            continue
+
+        # Prefetching stops once image memory reaches its budget
+        # (the size of an unloaded image is unknown without loading it)
+        budget = image_memory.get_budget_bytes()
+        if budget and image_memory.manager.resident_bytes() >= budget:
+            _stats["skipped"] += 1
+            continue
+
+        try:
+            _load_image(img)
+            image_memory.manager.touch(name)
+            _stats["loaded"] += 1
+        except Exception as e:
+            _stats["skipped"] += 1
+            print(f"Prefetch: Failed to load '{name}': {e}")
+
+
+def pending_count():
+    """Number of images still waiting to be warmed."""
+    return len(_queue)
+
+
+def get_stats():
+    """Returns a copy of the prefetch counters."""
+    return dict(_stats)
+
+
+def cancel():
+    """Drops pending work and cancels the file reads still in flight."""
+    global _task
+
+    if _task is not None:
+        _task.cancel()
+        _task = None
+    for _name, _path, read in _queue:
+        if read is not None:
+            read.cancel()
+    _queue.clear()
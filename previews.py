@@ -0,0 +1,258 @@
+"""
+Cached thumbnail previews for action buttons
+"""
+
+import bpy
+import bpy.utils.previews
+import os
+import time
+import asyncio
+import hashlib
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from . import tiling
+from . import async_runtime
+
+# Longest side of a generated thumbnail (pixels)
+PREVIEW_SIZE = 128
+
+# On-disk cache of downsampled thumbnails, keyed by content hash
+CACHE_DIR = Path(tempfile.gettempdir()) / "ai_workflow_previews"
+
+# Shortest time between two main-thread pixel reads, so drawing never stalls (seconds)
+PIXEL_READ_INTERVAL = 0.1
+
+_preview_collection = None
+
+# image name -> signature the current preview was built for
+_ready = {}
+# image name -> signature of the request in flight
+_requested = {}
+# image name -> runtime task building its preview (see _build)
+_tasks = {}
+# Earliest time.monotonic() at which the next image's pixels may be read
+_next_pixel_read = 0.0
+
+
+def box_downsample(pixels, max_size=PREVIEW_SIZE):
+    """
+    Downsamples an (H, W, C) array with an integer box filter.
+
+    The image is cropped to a multiple of the filter size and each block is
+    averaged with a single reshape/mean, so no Python loop touches pixels.
+    """
+    height, width = pixels.shape[:2]
+    factor = max(1, -(-max(height, width) // max_size))
+    h = height // factor * factor
+    w = width // factor * factor
+    if h == 0 or w == 0:
+        return pixels[:max_size, :max_size].copy()
+    blocks = pixels[:h, :w].reshape(h // factor, factor, w // factor, factor, pixels.shape[2])
+    return blocks.mean(axis=(1, 3), dtype=np.float32)
+
+
+def _signature(img):
+    """Cheap signature telling whether an image may have changed since its preview."""
+    sig = (img.source, img.is_dirty, img.filepath)
+    # Image.size loads unloaded images, so it is only read once pixels are resident
+    if img.has_data:
+        sig += tuple(img.size)
+    if img.source == 'FILE' and img.filepath and not img.packed_file:
+        try:
+            st = os.stat(bpy.path.abspath(img.filepath))
+            sig += (st.st_size, st.st_mtime_ns)
+        except OSError:
+            pass
+    return sig
+
+
+def _cache_path(content_hash):
+    return CACHE_DIR / f"{content_hash}.npy"
+
+
+def _load_cached(content_hash):
+    path = _cache_path(content_hash)
+    if path.is_file():
+        try:
+            return np.load(path, allow_pickle=False)
+        except Exception:
+            pass
+    return None
+
+
+def _store_cached(content_hash, thumbnail):
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = CACHE_DIR / f"{content_hash}.{os.getpid()}.tmp.npy"
+        np.save(tmp, thumbnail)
+        os.replace(tmp, _cache_path(content_hash))
+    except OSError as e:
+        print(f"Previews: Could not write cache for {content_hash}: {e}")
+
+
+def _hash_file(path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _file_job(path):
+    """Worker: hashes a file-backed image and looks its thumbnail up in the cache."""
+    try:
+        return _load_cached("f" + _hash_file(path))
+    except OSError:
+        return None
+
+
+def _pixels_job(pixels, file_path):
+    """Worker: hashes and downsamples pixels read on the main thread."""
+    if file_path:
+        content_hash = "f" + _hash_file(file_path)
+    else:
+        content_hash = "p" + hashlib.blake2b(pixels.tobytes(), digest_size=16).hexdigest()
+
+    thumbnail = _load_cached(content_hash)
+    if thumbnail is None:
+        thumbnail = box_downsample(pixels)
+        _store_cached(content_hash, thumbnail)
+    return thumbnail
+
+
+def _file_path_for(img):
+    """Returns the absolute file of a clean, file-backed image, else None."""
+    if img.source == 'FILE' and img.filepath and not img.packed_file and not img.is_dirty:
+        path = bpy.path.abspath(img.filepath)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _set_preview(name, thumbnail):
+    if _preview_collection is None:
+        return
+    preview = _preview_collection.get(name) or _preview_collection.new(name)
+    height, width = thumbnail.shape[:2]
+    rgba = np.ones((height, width, 4), dtype=np.float32)
+    channels = min(4, thumbnail.shape[2])
+    rgba[:, :, :channels] = thumbnail[:, :, :channels]
+    if channels == 1:
+        rgba[:, :, 1:3] = thumbnail[:, :, :1]
+    flat = np.clip(rgba, 0.0, 1.0).ravel()
+
+    preview.icon_size = (width, height)
+    preview.icon_pixels_float.foreach_set(flat)
+    preview.image_size = (width, height)
+    preview.image_pixels_float.foreach_set(flat)
+
+
+async def _read_pixels(name):
+    """Reads an image's pixels on the main thread, at most one image per PIXEL_READ_INTERVAL."""
+    global _next_pixel_read
+
+    while time.monotonic() < _next_pixel_read:
+        await asyncio.sleep(_next_pixel_read - time.monotonic())
+    _next_pixel_read = time.monotonic() + PIXEL_READ_INTERVAL
+
+    img = bpy.data.images.get(name)
+    if img is None:
+        return None, None
+    pixels = tiling.read_image(img, 'preview')
+    # The worker keeps the only reference; the next read stages a new buffer
+    tiling.release_staging('preview')
+    return pixels, _file_path_for(img)
+
+
+async def _build(name, signature, file_path):
+    """Runtime task: looks the thumbnail up by file, else builds it from the image's pixels."""
+    try:
+        thumbnail = None
+        if file_path:
+            thumbnail = await async_runtime.run_in_thread(_file_job, file_path)
+        if thumbnail is None:
+            pixels, file_path = await _read_pixels(name)
+            if pixels is not None:
+                thumbnail = await async_runtime.run_in_thread(_pixels_job, pixels, file_path)
+        if thumbnail is not None:
+            _set_preview(name, thumbnail)
+            _ready[name] = signature
+            _tag_redraw()
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"Previews: Failed to build preview for '{name}': {e}")
+    finally:
+        if _tasks.get(name) is asyncio.current_task():
+            del _tasks[name]
+            _requested.pop(name, None)
+
+
+def _tag_redraw():
+    wm = bpy.context.window_manager
+    if wm is None:
+        return
+    for window in wm.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+
+def _request(name, img, signature):
+    # A newer request replaces the one in flight, whose result would be outdated
+    previous = _tasks.pop(name, None)
+    if previous is not None:
+        previous.cancel()
+
+    _requested[name] = signature
+    _tasks[name] = async_runtime.spawn(_build(name, signature, _file_path_for(img)), name=f"preview:{name}")
+
+
+def get_icon_id(image_name):
+    """
+    Returns the preview icon id for an image, or 0 if none is ready yet.
+
+    Never blocks: missing or outdated previews are queued and produced in the
+    background; the caller draws its generic icon until then.
+    """
+    if _preview_collection is None or not image_name:
+        return 0
+
+    img = bpy.data.images.get(image_name)
+    if img is None:
+        return 0
+
+    signature = _signature(img)
+    if _ready.get(image_name) != signature and _requested.get(image_name) != signature:
+        _request(image_name, img, signature)
+
+    preview = _preview_collection.get(image_name)
+    return preview.icon_id if preview else 0
+
+
+def invalidate(image_names):
+    """Forces previews of the given images to be rebuilt on next draw."""
+    for name in image_names:
+        _ready.pop(name, None)
+
+
+def register():
+    global _preview_collection
+    _preview_collection = bpy.utils.previews.new()
+
+
+def unregister():
+    global _preview_collection
+
+    for task in _tasks.values():
+        task.cancel()
+    _tasks.clear()
+    if _preview_collection is not None:
+        bpy.utils.previews.remove(_preview_collection)
+        _preview_collection = None
+
+    _ready.clear()
+    _requested.clear()
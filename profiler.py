@@ -0,0 +1,281 @@
+"""
+Built-in cProfile hook for actions and config loads
+
+The profile operator arms the next N action runs (ExecuteActionOperator) or
+config loads. Each armed run is wrapped in cProfile and writes, to a
+per-session directory, a .prof file for pstats/snakeviz and a .folded file
+of collapsed stacks for flamegraph.pl or speedscope. The top functions by
+cumulative time of the last run are shown in the sidebar panel.
+
+Nothing is profiled unless runs are armed; the hooks then cost one dict
+lookup.
+"""
+
+import bpy
+import os
+import time
+import pstats
+import cProfile
+import tempfile
+from pathlib import Path
+from collections import defaultdict
+
+# What can be profiled, as (identifier, name, description) enum items
+KINDS = [
+    ('ACTION', "Actions", "Profile the next action runs"),
+    ('CONFIG_LOAD', "Config Loads", "Profile the next config loads"),
+]
+
+# Used when the profile directory preference is empty
+DEFAULT_DIRECTORY = Path(tempfile.gettempdir()) / "ai_workflow_profiles"
+
+# Functions listed in the panel and console summary
+TOP_FUNCTIONS = 10
+
+# Results kept for the panel, most recent last
+HISTORY_SIZE = 5
+
+# Collapsed stacks are cut at this depth and drop frames under 1 µs
+MAX_STACK_DEPTH = 64
+
+# Armed runs left per kind
+_armed = {kind: 0 for kind, _, _ in KINDS}
+
+# Session directory (created on the first profile) and number of profiles written
+_session = {"directory": None, "count": 0}
+
+_results = []
+
+
+def _preferences():
+    try:
+        return bpy.context.preferences.addons[__package__].preferences
+    except (KeyError, AttributeError):
+        return None
+
+
+def is_enabled():
+    preferences = _preferences()
+    return preferences is not None and preferences.profile_enabled
+
+
+def arm(kind, runs=1):
+    """Profiles the next runs of kind ('ACTION' or 'CONFIG_LOAD')."""
+    _armed[kind] = max(0, runs)
+
+
+def disarm():
+    for kind in _armed:
+        _armed[kind] = 0
+
+
+def armed_runs(kind):
+    return _armed[kind]
+
+
+def is_armed(kind):
+    """True if the next run of kind is profiled (the preference is only read when runs are armed)."""
+    return _armed[kind] > 0 and is_enabled()
+
+
+def session_directory():
+    """This session's profile directory (it may not exist yet)."""
+    if _session["directory"] is None:
+        preferences = _preferences()
+        directory = preferences.profile_directory if preferences is not None else ""
+        base = Path(bpy.path.abspath(directory)) if directory else DEFAULT_DIRECTORY
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        _session["directory"] = base / f"session_{stamp}_{os.getpid()}"
+    return _session["directory"]
+
+
+def results():
+    return list(_results)
+
+
+def last_result():
+    return _results[-1] if _results else None
+
+
+def clear():
+    disarm()
+    _results.clear()
+    _session.update(directory=None, count=0)
+
+
+# -------------------------------------------------------------------
+# Reports
+# -------------------------------------------------------------------
+
+def function_label(func):
+    """'name (file.py:line)' for a pstats function key; built-ins keep their own name."""
+    filename, line, name = func
+    if filename == '~':
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def top_functions(stats, limit=TOP_FUNCTIONS):
+    """The functions with the most cumulative time, as dicts with function, calls, cum_ms and self_ms."""
+    entries = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+    return [{
+        "function": function_label(func),
+        "calls": nc,
+        "cum_ms": round(ct * 1000.0, 3),
+        "self_ms": round(tt * 1000.0, 3),
+    } for func, (cc, nc, tt, ct, callers) in entries[:limit]]
+
+
+def collapsed_stacks(stats):
+    """
+    Collapsed stack lines ('outer;inner;leaf <µs>') from pstats data.
+
+    cProfile keeps caller/callee edges, not full stacks, so each stack is
+    rebuilt by walking down from the entry points and splitting a
+    function's time between its callees in proportion to their edges.
+    Totals per function are exact; how a shared helper's time divides
+    between its callers' stacks is an estimate.
+    """
+    children = defaultdict(dict)
+    roots = []
+    for func, (cc, nc, tt, ct, callers) in stats.stats.items():
+        external = ct if not callers else 0.0
+        for caller, edge in callers.items():
+            if caller in stats.stats:
+                children[caller][func] = edge[3]
+            else:
+                # Called from a frame entered before profiling started
+                external += edge[3]
+        if external > 0:
+            roots.append((func, external))
+
+    folded = defaultdict(float)
+
+    def walk(func, stack, on_stack, inclusive):
+        cc, nc, tt, ct, callers = stats.stats[func]
+        scale = inclusive / ct if ct > 0 else 0.0
+        stack = stack + (function_label(func).replace(";", ","),)
+        own = tt * scale
+        if own > 0:
+            folded[";".join(stack)] += own
+        if len(stack) >= MAX_STACK_DEPTH:
+            return
+        on_stack = on_stack | {func}
+        for child, edge_time in children[func].items():
+            share = edge_time * scale
+            if child not in on_stack and share >= 1e-6:
+                walk(child, stack, on_stack, share)
+
+    for func, inclusive in roots:
+        walk(func, (), frozenset(), inclusive)
+
+    lines = []
+    for stack, seconds in sorted(folded.items()):
+        micros = int(round(seconds * 1e6))
+        if micros:
+            lines.append(f"{stack} {micros}")
+    return lines
+
+
+# -------------------------------------------------------------------
+# Profiled runs
+# -------------------------------------------------------------------
+
+class ProfileRun:
+    """
+    One profiled run, written by finish().
+
+    Modal actions call pause() when a timer tick ends and resume() when the
+    next begins, so time Blender spends between ticks is not profiled.
+    """
+
+    def __init__(self, kind, label):
+        self.kind = kind
+        self.label = label
+        self.profile = cProfile.Profile()
+        self.busy = 0.0
+        self._since = None
+
+    def resume(self):
+        if self._since is None:
+            self.profile.enable()
+            self._since = time.perf_counter()
+
+    def pause(self):
+        if self._since is not None:
+            self.profile.disable()
+            self.busy += time.perf_counter() - self._since
+            self._since = None
+
+    def finish(self, status):
+        """Writes the .prof and .folded files and returns the result dict (None if nothing was written)."""
+        self.pause()
+        try:
+            stats = pstats.Stats(self.profile)
+        except TypeError:
+            # No function calls recorded
+            return None
+
+        _session["count"] += 1
+        directory = session_directory()
+        slug = "".join(c if c.isalnum() else "_" for c in self.label)[:40] or "run"
+        stem = f"{_session['count']:03d}_{self.kind.lower()}_{slug}"
+        stats_path = directory / f"{stem}.prof"
+        folded_path = directory / f"{stem}.folded"
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            stats.dump_stats(str(stats_path))
+            with open(folded_path, 'w', encoding='utf-8') as f:
+                f.write("\n".join(collapsed_stacks(stats)) + "\n")
+        except OSError as e:
+            print(f"Profiler: Could not write profile of '{self.label}': {e}")
+            return None
+
+        result = {
+            "kind": self.kind,
+            "label": self.label,
+            "status": status,
+            "ms": round(self.busy * 1000.0, 3),
+            "stats_path": str(stats_path),
+            "folded_path": str(folded_path),
+            "top": top_functions(stats),
+        }
+        _results.append(result)
+        del _results[:-HISTORY_SIZE]
+
+        print(f"Profiler: '{self.label}' ({status}) {result['ms']:.1f} ms -> {stats_path}")
+        for entry in result["top"]:
+            print(f"  {entry['cum_ms']:10.2f} ms {entry['calls']:8d}x  {entry['function']}")
+        return result
+
+
+def begin(kind, label):
+    """
+    Starts profiling an armed run, using up one armed run.
+
+    Returns:
+        ProfileRun (already profiling), or None if another profiler is active
+    """
+    _armed[kind] = max(0, _armed[kind] - 1)
+    run = ProfileRun(kind, label)
+    try:
+        run.resume()
+    except ValueError as e:
+        # Only one profiler can be active at a time (e.g. one attached by hand)
+        print(f"Profiler: Could not profile '{label}': {e}")
+        return None
+    return run
+
+
+def profile_call(kind, label, func, *args, **kwargs):
+    """Calls func, profiled as one run of kind; returns its result."""
+    run = begin(kind, label)
+    if run is None:
+        return func(*args, **kwargs)
+    status = 'CANCELLED'
+    try:
+        value = func(*args, **kwargs)
+        status = 'FINISHED'
+        return value
+    finally:
+        run.finish(status)
@@ -9,6 +9,7 @@ from bpy.props import (
     StringProperty,
     BoolProperty,
     IntProperty,
+    FloatProperty,
     PointerProperty,
     CollectionProperty,
 )
@@ -35,10 +36,96 @@ class SaveImageProperty(PropertyGroup):
     )
     allow_overwrite: BoolProperty(
         name="Allow Overwrite",
-        description="Allow overwriting existing files",
+        description="Allow overwriting existing files; otherwise the first free numbered name (name_001.png, ...) is used",
         default=True
     )
 
+    # Output conversion (PNG only; otherwise Blender's img.save() converts)
+    custom_output: BoolProperty(
+        name="Custom Output",
+        description="Convert pixels with the options below before encoding the PNG",
+        default=False
+    )
+    bit_depth: EnumProperty(
+        name="Bit Depth",
+        description="Bits per channel of the written PNG",
+        items=[
+            ('8', "8-bit", "8 bits per channel"),
+            ('16', "16-bit", "16 bits per channel"),
+        ],
+        default='8'
+    )
+    color_transform: EnumProperty(
+        name="Colour Transform",
+        description="Transfer function applied to colour channels before quantization",
+        items=[
+            ('AUTO', "Auto", "Linear to sRGB for float colour images, none otherwise"),
+            ('NONE', "None", "Write values as stored"),
+            ('LINEAR_TO_SRGB', "Linear → sRGB", "Apply the sRGB transfer function"),
+            ('SRGB_TO_LINEAR', "sRGB → Linear", "Remove the sRGB transfer function"),
+        ],
+        default='AUTO'
+    )
+    dither: EnumProperty(
+        name="Dither",
+        description="Dithering applied when quantizing to integers",
+        items=[
+            ('NONE', "None", "Round to the nearest level"),
+            ('ORDERED', "Ordered", "8x8 Bayer ordered dithering"),
+            ('BLUE_NOISE', "Blue Noise", "Blue-noise threshold dithering"),
+        ],
+        default='NONE'
+    )
+    alpha_mode: EnumProperty(
+        name="Alpha",
+        description="How the alpha channel is written",
+        items=[
+            ('KEEP', "Keep", "Write alpha as stored"),
+            ('PREMULTIPLY', "Premultiply", "Multiply colour by alpha"),
+            ('DROP', "Drop", "Write RGB only"),
+        ],
+        default='KEEP'
+    )
+    png_compression: IntProperty(
+        name="PNG Compression",
+        description="zlib compression level (0 = fastest, 9 = smallest)",
+        default=6,
+        min=0,
+        max=9
+    )
+
+
+class PublishImageProperty(PropertyGroup):
+    """Property group for a single image name to publish to external processes."""
+    name: StringProperty(
+        name="Image Name",
+        description="Name of the Blender Image data-block to publish"
+    )
+
+
+class NodeParamProperty(PropertyGroup):
+    """Property group for one node input or attribute written by an action."""
+    name: StringProperty(
+        name="Name",
+        description="Short name used as {name} in sweep output templates",
+        default=""
+    )
+    path: StringProperty(
+        name="Path",
+        description="Node parameter: 'Node.inputs[Socket]', 'Node.inputs[0]' or 'Node.attribute'",
+        default=""
+    )
+    value: StringProperty(
+        name="Value",
+        description="Value to write (JSON number/bool/list, otherwise text)",
+        default=""
+    )
+    sweep_values: StringProperty(
+        name="Sweep Values",
+        description="Values swept over in sweep mode: JSON list, 'start..end' range or 'a; b; c'",
+        default=""
+    )
+
 
 class ActionProperty(PropertyGroup):
     """A single configured action, simulating one entry from the JSON."""
@@ -50,6 +137,10 @@ class ActionProperty(PropertyGroup):
             ('CAMERA_SELECT', "Camera Select / View", "Selects a camera, changes image and node tree"),
             ('RESET', "Reset Images", "Resets images and optionally changes camera/node tree"),
             ('IMAGE_SAVE', "Save Images", "Saves specified images to disk"),
+            ('RENDER', "Render to Image", "Renders the camera straight into a named image"),
+            ('DEPTH_MAP', "Depth Map", "Builds a normalized depth map image from a depth image or Z pass"),
+            ('COMPARE', "Compare Images", "Computes difference metrics and a heat map between two images"),
+            ('PUBLISH', "Publish Frames", "Shares image pixels with external processes via shared memory or .npy files"),
         ],
         default='CAMERA_SELECT'
     )
@@ -112,6 +203,34 @@ class ActionProperty(PropertyGroup):
         description="Name of the node tree to activate",
         default="NodeTree"
     )
+    node_params: CollectionProperty(
+        type=NodeParamProperty,
+        name="Node Parameters"
+    )
+
+    # Parameter sweep (IMAGE_SAVE type)
+    sweep_enabled: BoolProperty(
+        name="Sweep",
+        description="Save the images once per combination of cameras and parameter sweep values",
+        default=False
+    )
+    sweep_cameras: StringProperty(
+        name="Sweep Cameras",
+        description="Comma-separated camera names (empty keeps the scene camera)",
+        default=""
+    )
+    sweep_run_operator: StringProperty(
+        name="Run Operator",
+        description="Operator run after setting each combination, before saving (e.g. the one queuing the workflow)",
+        default=""
+    )
+    sweep_wait: FloatProperty(
+        name="Wait",
+        description="Seconds to wait after the run operator before saving each combination",
+        default=0.0,
+        min=0.0,
+        max=3600.0
+    )
 
     # Timeline control
     update_timeline: BoolProperty(
@@ -126,6 +245,160 @@ class ActionProperty(PropertyGroup):
         min=0
     )
 
+    # Render settings
+    render_image_name: StringProperty(
+        name="Render Target Image",
+        description="Name of the image the render result is copied into",
+        default=""
+    )
+    render_resolution_scale: FloatProperty(
+        name="Resolution Scale",
+        description="Multiplier applied to the scene's render resolution percentage",
+        default=1.0,
+        min=0.01,
+        max=4.0
+    )
+    render_pass: EnumProperty(
+        name="Render Pass",
+        description="Render pass copied into the target image",
+        items=[
+            ('COMBINED', "Combined", "Final combined render"),
+            ('DEPTH', "Depth", "Z depth pass"),
+        ],
+        default='COMBINED'
+    )
+
+    # Depth map settings
+    depth_source_image: StringProperty(
+        name="Depth Source Image",
+        description="Float depth image or rendered Z pass to convert",
+        default=""
+    )
+    depth_target_image: StringProperty(
+        name="Depth Target Image",
+        description="Image receiving the normalized depth map",
+        default=""
+    )
+    depth_clip_mode: EnumProperty(
+        name="Clip Mode",
+        description="How the depth range mapped to black/white is chosen",
+        items=[
+            ('NEAR_FAR', "Near/Far", "Use fixed near and far distances"),
+            ('PERCENTILE', "Percentile", "Use percentiles of the valid depth values"),
+        ],
+        default='PERCENTILE'
+    )
+    depth_near: FloatProperty(
+        name="Near",
+        description="Distance mapped to the near end of the depth map",
+        default=0.1,
+        min=0.0
+    )
+    depth_far: FloatProperty(
+        name="Far",
+        description="Distance mapped to the far end of the depth map",
+        default=100.0,
+        min=0.0
+    )
+    depth_percentile_low: FloatProperty(
+        name="Low Percentile",
+        description="Percentile of depth values mapped to the near end",
+        default=1.0,
+        min=0.0,
+        max=100.0
+    )
+    depth_percentile_high: FloatProperty(
+        name="High Percentile",
+        description="Percentile of depth values mapped to the far end",
+        default=99.0,
+        min=0.0,
+        max=100.0
+    )
+    depth_invert: BoolProperty(
+        name="Invert",
+        description="Show near surfaces as white (ControlNet convention)",
+        default=True
+    )
+    depth_gamma: FloatProperty(
+        name="Gamma",
+        description="Exponent applied to the normalized depth values",
+        default=1.0,
+        min=0.01,
+        max=10.0
+    )
+    depth_bit_depth: EnumProperty(
+        name="Bit Depth",
+        description="Precision of the generated depth map",
+        items=[
+            ('8', "8-bit", "256 levels, stored in a byte image"),
+            ('16', "16-bit", "65536 levels, stored in a float image"),
+        ],
+        default='8'
+    )
+
+    # Image comparison settings
+    compare_image_a: StringProperty(
+        name="Image A",
+        description="First image to compare",
+        default=""
+    )
+    compare_image_b: StringProperty(
+        name="Image B",
+        description="Second image to compare",
+        default=""
+    )
+    compare_diff_image: StringProperty(
+        name="Heat Map Image",
+        description="Image receiving the difference heat map (leave empty to skip)",
+        default=""
+    )
+    compare_heatmap_gain: FloatProperty(
+        name="Heat Map Gain",
+        description="Multiplier applied to differences before mapping them to colours",
+        default=4.0,
+        min=0.01,
+        max=1000.0
+    )
+
+    # Frame publishing settings
+    images_to_publish: CollectionProperty(
+        type=PublishImageProperty,
+        name="Images to Publish"
+    )
+    publish_mode: EnumProperty(
+        name="Publish Mode",
+        description="How pixels are handed to external processes",
+        items=[
+            ('SHARED_MEMORY', "Shared Memory", "Publish into named shared memory segments"),
+            ('NPY', "Memory-Mapped .npy", "Publish into .npy files readers can memory-map"),
+        ],
+        default='SHARED_MEMORY'
+    )
+    publish_directory: StringProperty(
+        name="Publish Directory",
+        description="Directory receiving the JSON descriptors (and .npy files)",
+        default="//frames/",
+        subtype='DIR_PATH'
+    )
+    publish_prefix: StringProperty(
+        name="Segment Prefix",
+        description="Prefix of shared memory segment names",
+        default="aiwf"
+    )
+
+    # Output directory watching
+    watch_output: BoolProperty(
+        name="Watch Output Directory",
+        description="Stream new files from a directory into this action's images",
+        default=False
+    )
+    watch_directory: StringProperty(
+        name="Watch Directory",
+        description="Directory to watch for generated frames (e.g. the ComfyUI output folder)",
+        default="",
+        subtype='DIR_PATH'
+    )
+
 
 class MainProperties(PropertyGroup):
     """Main property group attached to the scene, holding all actions."""
@@ -135,7 +408,7 @@ class MainProperties(PropertyGroup):
     )
     active_action_index: IntProperty(
         name="Active Action Index",
-        description="Index of the currently selected action",
+        description="Index of the last executed action",
         default=0
     )
     error_message: StringProperty(
@@ -149,6 +422,32 @@ class MainProperties(PropertyGroup):
         default=False
     )
 
+    last_run_status: StringProperty(
+        name="Last Run Status",
+        description="Outcome of the last modal action run (empty when it completed)",
+        default=""
+    )
+    resume_outputs: BoolProperty(
+        name="Resume Outputs",
+        description="Skip saving images whose output manifest entry shows they are already complete for this camera and frame",
+        default=False
+    )
+    show_previews: BoolProperty(
+        name="Show Previews",
+        description="Show large thumbnails of each action's image above its button",
+        default=False
+    )
+
+    # Results of the last image comparison
+    compare_label: StringProperty(
+        name="Compared Images",
+        description="Images compared by the last Compare Images action",
+        default=""
+    )
+    compare_mse: FloatProperty(name="MSE", default=0.0)
+    compare_psnr: FloatProperty(name="PSNR", default=0.0)
+    compare_ssim: FloatProperty(name="SSIM", default=0.0)
+
 
 # -------------------------------------------------------------------
 # REGISTRATION
@@ -157,6 +456,8 @@ class MainProperties(PropertyGroup):
 classes = (
     ResetImageProperty,
     SaveImageProperty,
+    PublishImageProperty,
+    NodeParamProperty,
     ActionProperty,
     MainProperties,
 )
@@ -0,0 +1,126 @@
+"""
+Render a camera straight into a named image without a disk round-trip
+"""
+
+import bpy
+
+from . import image_ops
+from . import tiling
+
+# Compositor output socket for each render pass
+PASS_SOCKETS = {
+    'COMBINED': "Image",
+    'DEPTH': "Depth",
+}
+
+# Names of the temporary compositor nodes added while rendering
+RENDER_LAYERS_NODE_NAME = "AIWorkflow_RenderLayers"
+VIEWER_NODE_NAME = "AIWorkflow_Viewer"
+
+# Image the compositor Viewer node writes into
+VIEWER_IMAGE_NAME = "Viewer Node"
+
+
+def render_camera_to_image(context, camera_obj, image_name, resolution_scale=1.0, render_pass='COMBINED'):
+    """
+    Renders the scene from a camera and copies the result into a named image.
+
+    The Render Result image does not expose its pixels to Python, so the
+    selected pass is routed through a temporary compositor Viewer node and
+    copied from the 'Viewer Node' image with foreach_get/foreach_set. All
+    touched scene settings and compositor nodes are restored afterwards,
+    including the default nodes Blender adds when the scene had no
+    compositor tree yet. The target is a float image, so passes are not
+    clamped to 0..1.
+
+    Args:
+        context: Blender context
+        camera_obj: Camera object to render from (None uses scene.camera)
+        image_name: Name of the target image (created if missing)
+        resolution_scale: Multiplier applied to the scene's resolution percentage
+        render_pass: 'COMBINED' or 'DEPTH'
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    scene = context.scene
+    view_layer = context.view_layer
+    camera_obj = camera_obj or scene.camera
+
+    if camera_obj is None or camera_obj.type != 'CAMERA':
+        return False, "No camera to render from"
+    if render_pass not in PASS_SOCKETS:
+        return False, f"Unsupported render pass '{render_pass}'"
+
+    # Remember everything we touch
+    saved = {
+        "camera": scene.camera,
+        "resolution_percentage": scene.render.resolution_percentage,
+        "use_compositing": scene.render.use_compositing,
+        "use_nodes": scene.use_nodes,
+        "use_pass_z": view_layer.use_pass_z,
+    }
+    tree = None
+    added_nodes = []
+    saved_active_node = None
+
+    try:
+        scene.camera = camera_obj
+        scene.render.resolution_percentage = max(1, round(saved["resolution_percentage"] * resolution_scale))
+        scene.render.use_compositing = True
+        if render_pass == 'DEPTH':
+            view_layer.use_pass_z = True
+
+        # Enabling nodes on a scene without a tree creates one with default nodes
+        had_tree = scene.node_tree is not None
+        scene.use_nodes = True
+        tree = scene.node_tree
+        if not had_tree:
+            added_nodes.extend(tree.nodes)
+        saved_active_node = tree.nodes.active
+
+        layers_node = tree.nodes.new('CompositorNodeRLayers')
+        layers_node.name = RENDER_LAYERS_NODE_NAME
+        layers_node.layer = view_layer.name
+        added_nodes.append(layers_node)
+
+        viewer_node = tree.nodes.new('CompositorNodeViewer')
+        viewer_node.name = VIEWER_NODE_NAME
+        added_nodes.append(viewer_node)
+
+        tree.links.new(layers_node.outputs[PASS_SOCKETS[render_pass]], viewer_node.inputs["Image"])
+        tree.nodes.active = viewer_node
+
+        bpy.ops.render.render(write_still=False)
+
+        viewer_img = bpy.data.images.get(VIEWER_IMAGE_NAME)
+        if viewer_img is None:
+            return False, "Render finished but no Viewer Node image was produced"
+
+        width, height = viewer_img.size
+        pixels = tiling.read_image(viewer_img, 'src')
+
+        target = image_ops.ensure_image(image_name, width, height, float_buffer=True)
+        tiling.write_image(target, pixels)
+
+        print(f"Render: {camera_obj.name} ({render_pass}) → '{image_name}' ({width}x{height})")
+        return True, f"Rendered '{camera_obj.name}' into '{image_name}'"
+
+    except Exception as e:
+        print(f"Render: Failed to render '{camera_obj.name}' into '{image_name}': {e}")
+        import traceback
+        traceback.print_exc()
+        return False, f"Render failed: {e}"
+
+    finally:
+        tiling.release_staging()
+        if tree is not None:
+            for node in added_nodes:
+                tree.nodes.remove(node)
+            if saved_active_node is not None and saved_active_node not in added_nodes:
+                tree.nodes.active = saved_active_node
+        scene.use_nodes = saved["use_nodes"]
+        view_layer.use_pass_z = saved["use_pass_z"]
+        scene.render.use_compositing = saved["use_compositing"]
+        scene.render.resolution_percentage = saved["resolution_percentage"]
+        scene.camera = saved["camera"]
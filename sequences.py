@@ -0,0 +1,278 @@
+"""
+Numbered frame directories as single SEQUENCE image or movie clip data-blocks
+"""
+
+import bpy
+import os
+import re
+from collections import OrderedDict
+from pathlib import Path
+
+from . import prefetch
+from . import async_runtime
+
+# File types a frame sequence may consist of
+FRAME_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.bmp', '.tga', '.tif', '.tiff', '.exr', '.webp'}
+
+# Frames read ahead of the current one on worker threads, so Blender's lazy
+# decode of the next frames finds their bytes in the OS cache
+LOOKAHEAD = 8
+
+# Frame files remembered as already warm (oldest are forgotten first)
+WARM_CACHE_SIZE = 256
+
+# ID property tagging imported data-blocks with their frame directory
+SEQUENCE_TAG = "ai_workflow_sequence"
+
+# "<prefix><number><suffix>", e.g. "ComfyUI_00042_.png" -> ("ComfyUI_", "00042", "_.png")
+_FRAME_FILE = re.compile(r'^(?P<prefix>.*?)(?P<number>\d+)(?P<suffix>[^\d]*\.[A-Za-z0-9]+)$')
+
+# data-block name -> FrameSequence, for images and clips imported by the add-on
+_registry = {}
+
+# Paths read recently or in flight (bounded, see WARM_CACHE_SIZE)
+_warm = OrderedDict()
+_last_frame = None
+
+
+class FrameSequence:
+    """One numbered run of files in a directory, mapped onto the timeline."""
+
+    __slots__ = ("directory", "prefix", "suffix", "padding", "numbers", "start_frame", "kind", "_present")
+
+    def __init__(self, directory, prefix, suffix, padding, numbers, start_frame=1, kind='IMAGE'):
+        self.directory = directory
+        self.prefix = prefix
+        self.suffix = suffix
+        self.padding = padding
+        self.numbers = numbers
+        self.start_frame = start_frame
+        self.kind = kind
+        # numbers is sorted; a run without gaps needs no set
+        self._present = range(numbers[0], numbers[-1] + 1) if numbers[-1] - numbers[0] + 1 == len(numbers) \
+            else frozenset(numbers)
+
+    @property
+    def first(self):
+        return self.numbers[0]
+
+    @property
+    def last(self):
+        return self.numbers[-1]
+
+    @property
+    def duration(self):
+        return self.last - self.first + 1
+
+    @property
+    def gaps(self):
+        return self.duration - len(self.numbers)
+
+    def file_name(self, number):
+        return f"{self.prefix}{number:0{self.padding}d}{self.suffix}"
+
+    def path_for_frame(self, frame):
+        """File shown at a scene frame, or None outside the sequence or in a gap."""
+        number = self.first + frame - self.start_frame
+        if number not in self._present:
+            return None
+        return os.path.join(self.directory, self.file_name(number))
+
+
+def scan_directory(directory, prefix=None):
+    """
+    Finds the longest numbered run of frame files in a directory.
+
+    Files are grouped by prefix, suffix and digit count; one os.scandir
+    call lists the directory, no file is opened.
+
+    Args:
+        directory: Directory to scan
+        prefix: Only consider files whose name starts with this prefix
+
+    Returns:
+        FrameSequence or None if no numbered frame files were found
+    """
+    groups = {}
+    try:
+        entries = list(os.scandir(directory))
+    except OSError as e:
+        print(f"Sequences: Could not list '{directory}': {e}")
+        return None
+
+    for entry in entries:
+        name = entry.name
+        if Path(name).suffix.lower() not in FRAME_EXTENSIONS or not entry.is_file():
+            continue
+        match = _FRAME_FILE.match(name)
+        if match is None or (prefix and not match.group('prefix').startswith(prefix)):
+            continue
+        number = match.group('number')
+        key = (match.group('prefix'), match.group('suffix'), len(number))
+        groups.setdefault(key, []).append(int(number))
+
+    if not groups:
+        return None
+    (seq_prefix, suffix, padding), numbers = max(groups.items(), key=lambda item: len(item[1]))
+    return FrameSequence(str(directory), seq_prefix, suffix, padding, sorted(numbers))
+
+
+def _sync_image_user(image_user, sequence):
+    """Maps file number sequence.first to scene frame sequence.start_frame."""
+    if image_user.frame_duration != sequence.duration:
+        image_user.frame_duration = sequence.duration
+    if image_user.frame_start != sequence.start_frame:
+        image_user.frame_start = sequence.start_frame
+    # The image user shows file number (frame - frame_start + 1 + frame_offset)
+    offset = sequence.first - 1
+    if image_user.frame_offset != offset:
+        image_user.frame_offset = offset
+    if not image_user.use_auto_refresh:
+        image_user.use_auto_refresh = True
+
+
+def sync_image_editors(context):
+    """Keeps the image users of Image Editors showing a registered sequence in sync."""
+    if not _registry or context.window_manager is None:
+        return
+    for window in context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type != 'IMAGE_EDITOR':
+                continue
+            space = area.spaces.active
+            image = space.image
+            sequence = _registry.get(image.name) if image is not None else None
+            if sequence is not None and sequence.kind == 'IMAGE':
+                _sync_image_user(space.image_user, sequence)
+
+
+def import_sequence(directory, name="", kind='IMAGE', scene=None, prefix=None):
+    """
+    Loads a numbered frame directory as one data-block.
+
+    IMAGE creates a SEQUENCE image, MOVIE_CLIP a movie clip; the first file
+    is mapped to the scene's start frame. Re-importing the same name reloads
+    the existing data-block instead of adding another one.
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    scene = scene or bpy.context.scene
+    directory = bpy.path.abspath(directory)
+    sequence = scan_directory(directory, prefix)
+    if sequence is None:
+        return False, f"No numbered frames found in '{directory}'"
+
+    sequence.start_frame = scene.frame_start
+    sequence.kind = kind
+    first_path = os.path.join(directory, sequence.file_name(sequence.first))
+    name = name or sequence.prefix.rstrip("_-. ") or Path(directory).name
+
+    try:
+        if kind == 'MOVIE_CLIP':
+            block = bpy.data.movieclips.get(name)
+            if block is None or bpy.path.abspath(block.filepath) != first_path:
+                block = bpy.data.movieclips.load(first_path)
+                block.name = name
+            else:
+                block.reload()
+            # A clip always starts at its first file; frame_start places it on the timeline
+            block.frame_start = sequence.start_frame
+        else:
+            block = bpy.data.images.get(name)
+            if block is None or bpy.path.abspath(block.filepath) != first_path:
+                block = bpy.data.images.load(first_path, check_existing=False)
+                block.name = name
+            block.source = 'SEQUENCE'
+            block.reload()
+    except RuntimeError as e:
+        return False, f"Could not load '{first_path}': {e}"
+
+    block[SEQUENCE_TAG] = {"directory": directory, "start_frame": sequence.start_frame}
+    _registry[block.name] = sequence
+    sync_image_editors(bpy.context)
+
+    message = (f"Imported {len(sequence.numbers)} frame(s) as {kind.replace('_', ' ').lower()} "
+               f"'{block.name}' (frames {sequence.start_frame}-{sequence.start_frame + sequence.duration - 1})")
+    if sequence.gaps:
+        message += f", {sequence.gaps} missing frame(s)"
+    print(f"Sequences: {message}")
+    return True, message
+
+
+def _warm_ahead(frame, step):
+    """Reads the next LOOKAHEAD frame files of every sequence on worker threads."""
+    for sequence in _registry.values():
+        for ahead in range(1, LOOKAHEAD + 1):
+            path = sequence.path_for_frame(frame + ahead * step)
+            if path is None:
+                continue
+            if path in _warm:
+                _warm.move_to_end(path)
+                continue
+            _warm[path] = True
+            async_runtime.spawn(async_runtime.run_in_thread(prefetch.read_file, path), name="sequence_warm")
+
+    while len(_warm) > WARM_CACHE_SIZE:
+        _warm.popitem(last=False)
+
+
+@bpy.app.handlers.persistent
+def frame_change_handler(scene, depsgraph=None):
+    """Syncs Image Editors and warms the frames after the current one (or before it when scrubbing back)."""
+    global _last_frame
+
+    if not _registry:
+        return
+    frame = scene.frame_current
+    step = -1 if _last_frame is not None and frame < _last_frame else 1
+    _last_frame = frame
+
+    sync_image_editors(bpy.context)
+    if not bpy.app.background:
+        _warm_ahead(frame, step)
+
+
+def rebuild_registry():
+    """Finds data-blocks imported by the add-on (after loading a file) and rescans their directories."""
+    _registry.clear()
+    _warm.clear()
+    for collection, kind in ((bpy.data.images, 'IMAGE'), (bpy.data.movieclips, 'MOVIE_CLIP')):
+        for block in collection:
+            tag = block.get(SEQUENCE_TAG)
+            if not tag:
+                continue
+            prefix = _FRAME_FILE.match(Path(block.filepath).name)
+            sequence = scan_directory(tag.get("directory", ""), prefix.group('prefix') if prefix else None)
+            if sequence is None:
+                continue
+            sequence.kind = kind
+            sequence.start_frame = tag.get("start_frame", 1)
+            _registry[block.name] = sequence
+
+
+@bpy.app.handlers.persistent
+def load_handler(dummy):
+    rebuild_registry()
+
+
+def registered_sequences():
+    """Returns {data-block name: FrameSequence} of the imported sequences."""
+    return dict(_registry)
+
+
+def register():
+    bpy.app.handlers.frame_change_post.append(frame_change_handler)
+    bpy.app.handlers.load_post.append(load_handler)
+
+
+def unregister():
+    global _last_frame
+
+    if frame_change_handler in bpy.app.handlers.frame_change_post:
+        bpy.app.handlers.frame_change_post.remove(frame_change_handler)
+    if load_handler in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(load_handler)
+    _registry.clear()
+    _warm.clear()
+    _last_frame = None
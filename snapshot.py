@@ -0,0 +1,178 @@
+"""
+Compact scene-state snapshots taken before actions, for instant undo
+"""
+
+import bpy
+from collections import deque
+
+from . import node_params
+
+# Number of actions that can be stepped back
+HISTORY_SIZE = 16
+
+_history = deque(maxlen=HISTORY_SIZE)
+
+
+def _editor_areas(context, area_type):
+    """Yields (window index, area index, area) for every area of a type."""
+    for w, window in enumerate(context.window_manager.windows):
+        for a, area in enumerate(window.screen.areas):
+            if area.type == area_type:
+                yield w, a, area
+
+
+def _find_area(context, key, area_type):
+    w, a = key
+    windows = context.window_manager.windows
+    if w >= len(windows):
+        return None
+    areas = windows[w].screen.areas
+    if a >= len(areas) or areas[a].type != area_type:
+        return None
+    return areas[a]
+
+
+class SceneSnapshot:
+    """
+    The scene and editor fields an action can change, stored by name.
+
+    Only names and numbers are kept (no bpy references), so a snapshot stays
+    valid across undo steps and data-block renames simply fail softly.
+    """
+
+    __slots__ = ("label", "scene_name", "camera_name", "frame", "subframe", "comfyui_tree",
+                 "node_editor_trees", "image_editor_images", "active_action_index", "node_values")
+
+    @classmethod
+    def capture(cls, context, label="", action=None):
+        scene = context.scene
+        snap = cls()
+        snap.label = label
+        snap.scene_name = scene.name
+        snap.camera_name = scene.camera.name if scene.camera else None
+        snap.frame = scene.frame_current
+        snap.subframe = scene.frame_subframe
+        snap.active_action_index = scene.my_addon_props.active_action_index
+
+        snap.comfyui_tree = None
+        if hasattr(scene, 'sdn') and hasattr(scene.sdn, 'comfyui_tree'):
+            snap.comfyui_tree = scene.sdn.comfyui_tree
+
+        snap.node_editor_trees = {}
+        for w, a, area in _editor_areas(context, 'NODE_EDITOR'):
+            tree = area.spaces.active.node_tree
+            snap.node_editor_trees[(w, a)] = tree.name if tree else None
+
+        snap.image_editor_images = {}
+        for w, a, area in _editor_areas(context, 'IMAGE_EDITOR'):
+            image = area.spaces.active.image
+            snap.image_editor_images[(w, a)] = image.name if image else None
+
+        # Node parameters the action writes: (tree name, {path: value})
+        snap.node_values = None
+        if action is not None and len(action.node_params):
+            tree = node_params.target_tree(context.scene, action)
+            if tree is not None:
+                values = {p.path: node_params.read_value(tree, p.path) for p in action.node_params if p.path}
+                snap.node_values = (tree.name, {k: v for k, v in values.items() if v is not None})
+        return snap
+
+    def restore(self, context):
+        """
+        Puts the recorded fields back, touching only those that differ.
+
+        Returns:
+            list: Warnings for fields that could not be restored
+        """
+        warnings = []
+        scene = bpy.data.scenes.get(self.scene_name)
+        if scene is None:
+            return [f"Scene '{self.scene_name}' no longer exists"]
+
+        camera = bpy.data.objects.get(self.camera_name) if self.camera_name else None
+        if self.camera_name and camera is None:
+            warnings.append(f"Camera '{self.camera_name}' no longer exists")
+        elif scene.camera != camera:
+            scene.camera = camera
+
+        # frame_set re-evaluates the depsgraph, so skip it when nothing changed
+        if (scene.frame_current, scene.frame_subframe) != (self.frame, self.subframe):
+            scene.frame_set(self.frame, subframe=self.subframe)
+
+        if self.comfyui_tree is not None and hasattr(scene, 'sdn'):
+            try:
+                if scene.sdn.comfyui_tree != self.comfyui_tree:
+                    scene.sdn.comfyui_tree = self.comfyui_tree
+            except Exception as e:
+                warnings.append(f"Could not restore sdn.comfyui_tree: {e}")
+
+        for key, tree_name in self.node_editor_trees.items():
+            area = _find_area(context, key, 'NODE_EDITOR')
+            if area is None:
+                continue
+            tree = bpy.data.node_groups.get(tree_name) if tree_name else None
+            space = area.spaces.active
+            if space.node_tree != tree:
+                try:
+                    space.node_tree = tree
+                    area.tag_redraw()
+                except Exception as e:
+                    warnings.append(f"Could not restore Node Editor tree: {e}")
+
+        for key, image_name in self.image_editor_images.items():
+            area = _find_area(context, key, 'IMAGE_EDITOR')
+            if area is None:
+                continue
+            image = bpy.data.images.get(image_name) if image_name else None
+            space = area.spaces.active
+            if space.image != image:
+                space.image = image
+                area.tag_redraw()
+
+        if self.node_values is not None:
+            tree_name, values = self.node_values
+            tree = bpy.data.node_groups.get(tree_name)
+            if tree is None:
+                warnings.append(f"Node group '{tree_name}' no longer exists")
+            else:
+                warnings.extend(node_params.apply_values(tree, values)[1])
+
+        if scene.my_addon_props.active_action_index != self.active_action_index:
+            scene.my_addon_props.active_action_index = self.active_action_index
+        return warnings
+
+
+def push(context, label="", action=None):
+    """Captures the current state before an action runs (plus the node values it writes)."""
+    _history.append(SceneSnapshot.capture(context, label, action))
+
+
+def undo_last(context):
+    """
+    Restores the state from before the most recent action.
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    if not _history:
+        return False, "No action to undo"
+    snap = _history.pop()
+    warnings = snap.restore(context)
+    for warning in warnings:
+        print(f"Snapshot: {warning}")
+    message = f"Undid '{snap.label}'"
+    if warnings:
+        message += f" ({len(warnings)} field(s) not restored)"
+    return True, message
+
+
+def history_count():
+    return len(_history)
+
+
+def last_label():
+    return _history[-1].label if _history else ""
+
+
+def clear():
+    _history.clear()
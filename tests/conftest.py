@@ -0,0 +1,103 @@
+"""
+Shared fixtures: the add-on registered on the fake bpy package, and a clean
+.blend state for every test.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / "fake_bpy"))
+
+from addon_loader import load_addon, preferences  # noqa: E402
+
+import bpy  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def addon():
+    """The registered add-on package."""
+    return load_addon()
+
+
+@pytest.fixture(autouse=True)
+def clean_state(addon, tmp_path, monkeypatch):
+    """
+    Resets bpy.data, the add-on's module state and its preferences, and
+    points config.json at a temporary file so the repository copy is never
+    written.
+    """
+    bpy._fake.reset()
+    preferences().actions.clear()
+    preferences().journal_enabled = False
+    preferences().journal_directory = str(tmp_path / "journal")
+    addon.journal._session.update(path=None, seq=0)
+    addon.journal.clear_cache()
+    preferences().profile_enabled = False
+    preferences().profile_directory = str(tmp_path / "profiles")
+    addon.profiler.clear()
+    preferences().trace_allocations = False
+    addon.memory_report.clear()
+    preferences().metrics_path = ""
+    preferences().metrics_format = 'PROMETHEUS'
+    addon.metrics.clear()
+    addon.snapshot.clear()
+    addon.planner.clear()
+    addon.node_params.clear_cache()
+    addon.manifest.clear_cache()
+    addon.image_memory.manager = addon.image_memory.ImageMemoryManager()
+    addon.operators._modal_state["running"] = False
+    monkeypatch.setattr(addon.config_manager, "get_config_path", lambda: tmp_path / "config.json")
+    yield
+    addon.prefetch.cancel()
+    addon.watcher.stop_watching()
+    addon.async_runtime.shutdown()
+
+
+@pytest.fixture
+def props(addon):
+    """The scene's action list property group."""
+    return bpy.context.scene.my_addon_props
+
+
+@pytest.fixture
+def add_action(props):
+    """Appends an action to the scene's list; keyword arguments set its properties."""
+    def add(button_name, action_type='CAMERA_SELECT', **values):
+        action = props.actions.add()
+        action.button_name = button_name
+        action.action_type = action_type
+        for key, value in values.items():
+            setattr(action, key, value)
+        return action
+    return add
+
+
+@pytest.fixture
+def filled_image():
+    """Creates an image whose every pixel has the given RGBA colour."""
+    def create(name, width=8, height=8, color=(0.25, 0.5, 0.75, 1.0), float_buffer=False):
+        img = bpy.data.images.new(name, width, height, float_buffer=float_buffer)
+        img.pixels.foreach_set(list(color) * (width * height))
+        return img
+    return create
+
+
+@pytest.fixture
+def save_action(add_action, filled_image, tmp_path):
+    """
+    Appends an IMAGE_SAVE action "Save" writing each named image to
+    tmp_path/out/<name>.png. Images are made with make_image, except the
+    names in missing.
+    """
+    def add(names, make_image=filled_image, missing=()):
+        action = add_action("Save", 'IMAGE_SAVE')
+        for name in names:
+            if name not in missing:
+                make_image(name)
+            item = action.images_to_save.add()
+            item.name = name
+            item.save_as = str(tmp_path / "out" / f"{name}.png")
+        return action
+    return add
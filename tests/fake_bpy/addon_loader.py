@@ -0,0 +1,42 @@
+"""
+Imports the add-on on top of the fake bpy package
+
+The repository root is the add-on package; it is loaded under PACKAGE_NAME
+so its relative imports and `__package__` (preferences lookups) work as
+they do when Blender installs it.
+"""
+
+import sys
+import importlib.util
+from pathlib import Path
+
+FAKE_BPY_DIR = Path(__file__).resolve().parent
+ADDON_ROOT = FAKE_BPY_DIR.parent.parent
+PACKAGE_NAME = "ai_workflow_tools"
+
+if str(FAKE_BPY_DIR) not in sys.path:
+    sys.path.insert(0, str(FAKE_BPY_DIR))
+
+
+def load_addon(register=True):
+    """Imports (once) and optionally registers the add-on; returns its package module."""
+    addon = sys.modules.get(PACKAGE_NAME)
+    if addon is None:
+        spec = importlib.util.spec_from_file_location(
+            PACKAGE_NAME, ADDON_ROOT / "__init__.py", submodule_search_locations=[str(ADDON_ROOT)]
+        )
+        addon = importlib.util.module_from_spec(spec)
+        sys.modules[PACKAGE_NAME] = addon
+        spec.loader.exec_module(addon)
+        addon._fake_registered = False
+
+    if register and not addon._fake_registered:
+        addon.register()
+        addon._fake_registered = True
+    return addon
+
+
+def preferences():
+    """The add-on's AddonPreferences instance."""
+    import bpy
+    return bpy.context.preferences.addons[PACKAGE_NAME].preferences
@@ -0,0 +1,26 @@
+"""
+Pure-Python stand-in for Blender's bpy module, for tests and benchmarks
+
+Models what the add-on uses: bpy.data collections with unique names,
+PropertyGroups with typed properties and CollectionProperty, images with a
+float pixel buffer (foreach_get/foreach_set, PNG save/load), operators
+called through bpy.ops, bpy.app.timers and handlers, and one window with a
+3D View, an Image Editor and a Node Editor. Rendering, drawing, the
+depsgraph and animation evaluation are not modelled.
+
+Test helpers that Blender does not have live in bpy._fake.
+"""
+
+from . import _fake
+from . import props
+from . import types
+from . import app
+from . import path
+from . import ops
+from . import utils
+from . import _data
+
+data = _data.BlendData()
+context = types.Context()
+
+_fake.reset()
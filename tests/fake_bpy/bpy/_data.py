@@ -0,0 +1,23 @@
+"""
+bpy.data: the data-block collections of the (single, in-memory) open file
+"""
+
+from . import types
+
+
+class BlendData:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Empties every collection, like opening a new file."""
+        self.filepath = ""
+        self.is_dirty = False
+        self.images = types.BlendDataImages()
+        self.objects = types.IDCollection(types.Object)
+        self.cameras = types.IDCollection(types.Camera)
+        self.collections = types.IDCollection(types.Collection)
+        self.scenes = types.IDCollection(types.Scene)
+        self.texts = types.IDCollection(types.Text)
+        self.node_groups = types.IDCollection(types.NodeTree)
+        self.movieclips = types.BlendDataMovieClips()
@@ -0,0 +1,103 @@
+"""
+Test-side state and helpers of the fake bpy package
+
+Nothing here exists in Blender. Tests use reset() between cases, the timer
+helpers to drive bpy.app.timers callbacks, and run_modal() to feed events
+to operators that went modal.
+"""
+
+import time
+
+# bl_idname -> registered Operator class
+operators = {}
+
+# Registered classes (any bpy.types base)
+registered = []
+
+# (type set, message) of every Operator.report() call
+reports = []
+
+# Operators currently running modally
+modal_handlers = []
+
+
+def reset():
+    """Gives the next test an empty file: fresh bpy.data, one scene, one window."""
+    import bpy
+    from . import types
+
+    bpy.data.reset()
+    scene = bpy.data.scenes.new("Scene")
+    bpy.context.scene = scene
+    bpy.context.view_layer = types.ViewLayer()
+    bpy.context.window_manager = types.WindowManager.default()
+    bpy.context.window = bpy.context.window_manager.windows[0]
+    bpy.context.workspace = types.WorkSpace()
+    bpy.app.timers._timers.clear()
+    for handlers in bpy.app.handlers._lists():
+        handlers[:] = [h for h in handlers if getattr(h, "_bpy_persistent", False)]
+    reports.clear()
+    modal_handlers.clear()
+
+
+def step_timers():
+    """Calls every timer that is due once; returns how many were called."""
+    import bpy
+
+    timers = bpy.app.timers._timers
+    now = time.monotonic()
+    due = [func for func, when in list(timers.items()) if when <= now]
+    for func in due:
+        if func not in timers:
+            continue
+        delay = func()
+        if delay is None:
+            timers.pop(func, None)
+        elif func in timers:
+            timers[func] = time.monotonic() + delay
+    return len(due)
+
+
+def run_timers(timeout=5.0, until=None):
+    """
+    Runs timers like Blender's event loop until none are left (or until()
+    is true), sleeping until the next one is due.
+
+    Returns:
+        bool: False if timeout elapsed first
+    """
+    import bpy
+
+    timers = bpy.app.timers._timers
+    deadline = time.monotonic() + timeout
+    while timers and not (until and until()):
+        if time.monotonic() >= deadline:
+            return False
+        next_due = min(timers.values())
+        wait = next_due - time.monotonic()
+        if wait > 0:
+            time.sleep(min(wait, max(deadline - time.monotonic(), 0)))
+        step_timers()
+    return True
+
+
+def run_modal(event_type='TIMER', max_events=100000):
+    """
+    Sends events to modal operators until all of them finished.
+
+    Returns:
+        list: Final result set of each operator, in completion order
+    """
+    import bpy
+    from . import types
+
+    results = []
+    for _ in range(max_events):
+        if not modal_handlers:
+            break
+        for op in list(modal_handlers):
+            result = op.modal(bpy.context, types.Event(event_type))
+            if 'RUNNING_MODAL' not in result and 'PASS_THROUGH' not in result:
+                modal_handlers.remove(op)
+                results.append(result)
+    return results
@@ -0,0 +1,107 @@
+"""
+Minimal PNG reader/writer for fake images (8/16-bit grey, grey+alpha, RGB, RGBA)
+"""
+
+import zlib
+import struct
+
+import numpy as np
+
+_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+_CHANNELS = {0: 1, 4: 2, 2: 3, 6: 4}
+_COLOR_TYPES = {channels: color_type for color_type, channels in _CHANNELS.items()}
+
+
+def _chunk(tag, data):
+    body = tag + data
+    return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xFFFFFFFF)
+
+
+def write(path, pixels, bit_depth=8):
+    """Writes (H, W, C) floats in 0..1, stored bottom-up like Blender, as a top-down PNG."""
+    height, width, channels = pixels.shape
+    scale = 65535 if bit_depth == 16 else 255
+    values = np.clip(pixels[::-1], 0.0, 1.0) * scale + 0.5
+    data = values.astype('>u2' if bit_depth == 16 else np.uint8).reshape(height, -1).view(np.uint8)
+    raw = np.zeros((height, data.shape[1] + 1), dtype=np.uint8)
+    raw[:, 1:] = data
+    header = struct.pack(">IIBBBBB", width, height, bit_depth, _COLOR_TYPES[channels], 0, 0, 0)
+    with open(path, 'wb') as f:
+        f.write(_SIGNATURE)
+        f.write(_chunk(b'IHDR', header))
+        f.write(_chunk(b'IDAT', zlib.compress(raw.tobytes(), 1)))
+        f.write(_chunk(b'IEND', b''))
+
+
+def read_header(path):
+    """Returns (width, height, bit_depth, channels), or None if the file is not a PNG."""
+    with open(path, 'rb') as f:
+        head = f.read(33)
+    if len(head) < 33 or head[:8] != _SIGNATURE or head[12:16] != b'IHDR':
+        return None
+    width, height, bit_depth, color_type = struct.unpack(">IIBB", head[16:26])
+    return width, height, bit_depth, _CHANNELS.get(color_type, 4)
+
+
+def _unfilter(raw, height, stride, bpp):
+    rows = np.frombuffer(raw, dtype=np.uint8).reshape(height, stride + 1)
+    out = np.zeros((height, stride), dtype=np.uint8)
+    previous = np.zeros(stride, dtype=np.int32)
+    for y in range(height):
+        kind = rows[y, 0]
+        line = rows[y, 1:].astype(np.int32)
+        if kind == 0:
+            current = line
+        elif kind == 2:
+            current = (line + previous) & 0xFF
+        else:
+            current = np.zeros(stride, dtype=np.int32)
+            for x in range(stride):
+                left = current[x - bpp] if x >= bpp else 0
+                up = previous[x]
+                if kind == 1:
+                    predictor = left
+                elif kind == 3:
+                    predictor = (left + up) // 2
+                else:
+                    upper_left = previous[x - bpp] if x >= bpp else 0
+                    p = left + up - upper_left
+                    pa, pb, pc = abs(p - left), abs(p - up), abs(p - upper_left)
+                    predictor = left if pa <= pb and pa <= pc else (up if pb <= pc else upper_left)
+                current[x] = (line[x] + predictor) & 0xFF
+        out[y] = current
+        previous = current
+    return out
+
+
+def read(path):
+    """Reads a PNG into (H, W, C) float32 in 0..1, bottom-up like Blender."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:8] != _SIGNATURE:
+        raise ValueError(f"'{path}' is not a PNG file")
+
+    offset = 8
+    idat = []
+    header = None
+    while offset < len(data):
+        length, tag = struct.unpack(">I4s", data[offset:offset + 8])
+        body = data[offset + 8:offset + 8 + length]
+        if tag == b'IHDR':
+            header = struct.unpack(">IIBBBBB", body)
+        elif tag == b'IDAT':
+            idat.append(body)
+        elif tag == b'IEND':
+            break
+        offset += 12 + length
+
+    width, height, bit_depth, color_type = header[:4]
+    channels = _CHANNELS[color_type]
+    bytes_per_sample = 2 if bit_depth == 16 else 1
+    stride = width * channels * bytes_per_sample
+    rows = _unfilter(zlib.decompress(b''.join(idat)), height, stride, channels * bytes_per_sample)
+    if bit_depth == 16:
+        values = rows.view('>u2').astype(np.float32) / 65535.0
+    else:
+        values = rows.astype(np.float32) / 255.0
+    return values.reshape(height, width, channels)[::-1].copy()
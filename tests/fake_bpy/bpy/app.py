@@ -0,0 +1,52 @@
+"""
+bpy.app: version info, timers and handlers
+
+Timers only run when a test calls bpy._fake.step_timers() or
+bpy._fake.run_timers(), standing in for Blender's event loop.
+"""
+
+import time
+import types as _types
+
+version = (4, 5, 0)
+version_string = "4.5.0"
+background = True
+binary_path = ""
+debug = False
+
+
+class _Timers:
+    def __init__(self):
+        # function -> monotonic time of its next call
+        self._timers = {}
+
+    def register(self, function, first_interval=0.0, persistent=False):
+        self._timers[function] = time.monotonic() + first_interval
+
+    def unregister(self, function):
+        if function not in self._timers:
+            raise ValueError("Error: function is not registered")
+        del self._timers[function]
+
+    def is_registered(self, function):
+        return function in self._timers
+
+
+timers = _Timers()
+
+
+def _persistent(function):
+    function._bpy_persistent = True
+    return function
+
+
+_HANDLER_NAMES = (
+    "load_pre", "load_post", "save_pre", "save_post",
+    "frame_change_pre", "frame_change_post",
+    "depsgraph_update_pre", "depsgraph_update_post",
+    "render_pre", "render_post", "render_complete", "render_cancel",
+    "undo_pre", "undo_post", "redo_pre", "redo_post",
+)
+
+handlers = _types.SimpleNamespace(persistent=_persistent, **{name: [] for name in _HANDLER_NAMES})
+handlers._lists = lambda: [getattr(handlers, name) for name in _HANDLER_NAMES]
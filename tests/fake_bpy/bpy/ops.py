@@ -0,0 +1,66 @@
+"""
+bpy.ops: calls registered Operator classes by bl_idname
+
+Unregistered operators behave as in Blender: attribute access works, but
+calling them or asking for their RNA type fails.
+"""
+
+from . import _fake
+
+
+class _OperatorCall:
+    def __init__(self, module, name):
+        self.idname = f"{module}.{name}"
+
+    def _class(self):
+        try:
+            return _fake.operators[self.idname]
+        except KeyError:
+            raise AttributeError(f"Calling operator \"bpy.ops.{self.idname}\" error, could not be found") from None
+
+    def get_rna_type(self):
+        if self.idname not in _fake.operators:
+            raise KeyError(f"'{self.idname}' not found")
+        return self._class()
+
+    def poll(self, *args):
+        import bpy
+        cls = self._class()
+        return not hasattr(cls, "poll") or cls.poll(bpy.context)
+
+    def __call__(self, *args, **kwargs):
+        import bpy
+        from . import types
+
+        cls = self._class()
+        execution_context = args[0] if args and isinstance(args[0], str) else 'EXEC_DEFAULT'
+        if hasattr(cls, "poll") and not cls.poll(bpy.context):
+            raise RuntimeError(f"Operator bpy.ops.{self.idname}.poll() failed, context is incorrect")
+
+        op = cls()
+        properties = cls.bl_rna_properties()
+        for key, value in kwargs.items():
+            if key not in properties:
+                raise TypeError(f"Converting py args to operator properties: keyword \"{key}\" unrecognized")
+            setattr(op, key, value)
+        if execution_context.startswith('INVOKE') and hasattr(op, "invoke"):
+            result = op.invoke(bpy.context, types.Event('NONE'))
+        else:
+            result = op.execute(bpy.context)
+        return set(result)
+
+
+class _OperatorModule:
+    def __init__(self, module):
+        self._module = module
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return _OperatorCall(self._module, name)
+
+
+def __getattr__(module):
+    if module.startswith("__"):
+        raise AttributeError(module)
+    return _OperatorModule(module)
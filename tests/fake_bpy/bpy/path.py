@@ -0,0 +1,50 @@
+"""
+bpy.path: Blender-relative ("//") path helpers
+"""
+
+import os
+
+
+def _blend_dir():
+    import bpy
+    return os.path.dirname(bpy.data.filepath) if bpy.data.filepath else os.getcwd()
+
+
+def abspath(path, start=None, library=None):
+    """Expands a leading "//" relative to the .blend (or the working directory when unsaved)."""
+    if isinstance(path, bytes):
+        path = path.decode()
+    if path.startswith("//"):
+        return os.path.join(start or _blend_dir(), path[2:])
+    return path
+
+
+def relpath(path, start=None):
+    base = start or _blend_dir()
+    if path.startswith("//"):
+        return path
+    try:
+        return "//" + os.path.relpath(path, base)
+    except ValueError:
+        return path
+
+
+def basename(path):
+    return os.path.basename(path[2:] if path.startswith("//") else path)
+
+
+def clean_name(name, replace="_"):
+    return "".join(c if c.isalnum() or c in "-_." else replace for c in name)
+
+
+def ensure_ext(filepath, ext, case_sensitive=False):
+    if (filepath if case_sensitive else filepath.lower()).endswith(ext if case_sensitive else ext.lower()):
+        return filepath
+    return filepath + ext
+
+
+def display_name(name, has_ext=True, title_case=True):
+    if has_ext:
+        name = os.path.splitext(os.path.basename(name))[0]
+    name = name.replace("_", " ")
+    return name.title() if title_case else name
@@ -0,0 +1,224 @@
+"""
+Property definitions (bpy.props) with Blender's coercion rules
+
+Each function returns a descriptor. bpy.types installs the ones declared as
+class annotations, and ones assigned to a class (bpy.types.Scene.x = ...)
+work directly. Values are type-checked, numbers clamped to min/max and enum
+values validated against their items, as Blender does.
+"""
+
+
+class _Property:
+    kind = None
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.attr = None
+
+    def __set_name__(self, owner, name):
+        self.attr = name
+
+    def default_value(self):
+        return self.kwargs.get("default", self._zero())
+
+    def _zero(self):
+        return None
+
+    def create(self, owner):
+        return self.default_value()
+
+    def coerce(self, value):
+        return value
+
+    def _storage(self, instance):
+        try:
+            return instance.__dict__["_rna_values"]
+        except KeyError:
+            storage = instance.__dict__["_rna_values"] = {}
+            return storage
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        storage = self._storage(instance)
+        try:
+            return storage[self]
+        except KeyError:
+            value = storage[self] = self.create(instance)
+            return value
+
+    def __set__(self, instance, value):
+        try:
+            value = self.coerce(value)
+        except TypeError as e:
+            raise TypeError(f"bpy_struct: item.{self.attr} = value: {e}") from None
+        self._storage(instance)[self] = value
+        update = self.kwargs.get("update")
+        if update is not None:
+            import bpy
+            update(instance, bpy.context)
+
+
+class _BoolProperty(_Property):
+    kind = 'BOOLEAN'
+
+    def _zero(self):
+        return False
+
+    def coerce(self, value):
+        if not isinstance(value, (bool, int)):
+            raise TypeError(f"expected True/False or 0/1, not {type(value).__name__}")
+        return bool(value)
+
+
+class _IntProperty(_Property):
+    kind = 'INT'
+
+    def _zero(self):
+        return 0
+
+    def coerce(self, value):
+        if not hasattr(value, "__index__"):
+            raise TypeError(f"expected an int type, not {type(value).__name__}")
+        value = value.__index__()
+        low = self.kwargs.get("min")
+        high = self.kwargs.get("max")
+        if low is not None and value < low:
+            value = low
+        if high is not None and value > high:
+            value = high
+        return int(value)
+
+
+class _FloatProperty(_Property):
+    kind = 'FLOAT'
+
+    def _zero(self):
+        return 0.0
+
+    def coerce(self, value):
+        if isinstance(value, str) or not hasattr(value, "__float__"):
+            raise TypeError(f"expected a float type, not {type(value).__name__}")
+        value = float(value)
+        low = self.kwargs.get("min")
+        high = self.kwargs.get("max")
+        if low is not None and value < low:
+            value = float(low)
+        if high is not None and value > high:
+            value = float(high)
+        return value
+
+
+class _StringProperty(_Property):
+    kind = 'STRING'
+
+    def _zero(self):
+        return ""
+
+    def coerce(self, value):
+        if not isinstance(value, str):
+            raise TypeError(f"expected a string type, not {type(value).__name__}")
+        return value
+
+
+class _EnumProperty(_Property):
+    kind = 'ENUM'
+
+    def identifiers(self):
+        items = self.kwargs.get("items", ())
+        if callable(items):
+            return None
+        return [item[0] for item in items]
+
+    def default_value(self):
+        if "default" in self.kwargs:
+            return self.kwargs["default"]
+        identifiers = self.identifiers()
+        return identifiers[0] if identifiers else ""
+
+    def coerce(self, value):
+        if not isinstance(value, str):
+            raise TypeError(f"expected a string enum, not {type(value).__name__}")
+        identifiers = self.identifiers()
+        if identifiers is not None and value not in identifiers:
+            raise TypeError(f"enum \"{value}\" not found in {tuple(identifiers)}")
+        return value
+
+
+class _PointerProperty(_Property):
+    kind = 'POINTER'
+
+    def create(self, owner):
+        cls = self.kwargs["type"]
+        return cls() if not _is_id_type(cls) else None
+
+    def coerce(self, value):
+        cls = self.kwargs["type"]
+        if not _is_id_type(cls):
+            raise TypeError("pointer to a PropertyGroup is read-only")
+        if value is not None and not isinstance(value, cls):
+            raise TypeError(f"expected a {cls.__name__} type, not {type(value).__name__}")
+        return value
+
+
+class _CollectionProperty(_Property):
+    kind = 'COLLECTION'
+
+    def create(self, owner):
+        from .types import bpy_prop_collection
+        return bpy_prop_collection(self.kwargs["type"])
+
+    def coerce(self, value):
+        raise TypeError("collection properties are read-only")
+
+
+class _FloatVectorProperty(_Property):
+    kind = 'FLOAT_VECTOR'
+
+    def default_value(self):
+        size = self.kwargs.get("size", 3)
+        return list(self.kwargs.get("default", [0.0] * size))
+
+    def coerce(self, value):
+        size = self.kwargs.get("size", 3)
+        values = [float(v) for v in value]
+        if len(values) != size:
+            raise TypeError(f"sequence expected with {size} items, not {len(values)}")
+        return values
+
+
+def _is_id_type(cls):
+    from .types import ID
+    return isinstance(cls, type) and issubclass(cls, ID)
+
+
+def BoolProperty(**kwargs):
+    return _BoolProperty(**kwargs)
+
+
+def IntProperty(**kwargs):
+    return _IntProperty(**kwargs)
+
+
+def FloatProperty(**kwargs):
+    return _FloatProperty(**kwargs)
+
+
+def StringProperty(**kwargs):
+    return _StringProperty(**kwargs)
+
+
+def EnumProperty(**kwargs):
+    return _EnumProperty(**kwargs)
+
+
+def PointerProperty(**kwargs):
+    return _PointerProperty(**kwargs)
+
+
+def CollectionProperty(**kwargs):
+    return _CollectionProperty(**kwargs)
+
+
+def FloatVectorProperty(**kwargs):
+    return _FloatVectorProperty(**kwargs)
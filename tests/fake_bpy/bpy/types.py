@@ -0,0 +1,994 @@
+"""
+Fake bpy.types: struct bases, ID data-blocks and the UI/window types the add-on touches
+"""
+
+import os
+import itertools
+
+import numpy as np
+
+from . import _fake
+from . import _png
+from .props import _Property, StringProperty
+
+
+# -------------------------------------------------------------------
+# Struct and collection bases
+# -------------------------------------------------------------------
+
+class bpy_struct:
+    """Base of every fake RNA struct; installs annotated properties as descriptors."""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name, value in cls.__dict__.get("__annotations__", {}).items():
+            if isinstance(value, _Property):
+                value.attr = name
+                setattr(cls, name, value)
+
+    @classmethod
+    def bl_rna_properties(cls):
+        """Names of the RNA properties of this struct (fake-only helper)."""
+        names = []
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if isinstance(value, _Property) and name not in names:
+                    names.append(name)
+        return names
+
+
+class bpy_prop_collection:
+    """A CollectionProperty: ordered items of one PropertyGroup type."""
+
+    def __init__(self, item_type):
+        self._type = item_type
+        self._items = []
+
+    def add(self):
+        item = self._type()
+        self._items.append(item)
+        return item
+
+    def remove(self, index):
+        if not -len(self._items) <= index < len(self._items):
+            raise IndexError(f"bpy_prop_collection.remove(): index {index} out of range")
+        del self._items[index]
+
+    def move(self, from_index, to_index):
+        item = self._items.pop(from_index)
+        self._items.insert(to_index, item)
+
+    def clear(self):
+        self._items.clear()
+
+    def find(self, key):
+        for index, item in enumerate(self._items):
+            if getattr(item, "name", None) == key:
+                return index
+        return -1
+
+    def get(self, key, default=None):
+        index = self.find(key)
+        return self._items[index] if index >= 0 else default
+
+    def keys(self):
+        return [item.name for item in self._items]
+
+    def values(self):
+        return list(self._items)
+
+    def items(self):
+        return [(item.name, item) for item in self._items]
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            index = self.find(key)
+            if index < 0:
+                raise KeyError(f"bpy_prop_collection[key]: key \"{key}\" not found")
+            return self._items[index]
+        return self._items[key]
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return self.find(key) >= 0
+        return key in self._items
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return bool(self._items)
+
+
+class PropertyGroup(bpy_struct):
+    pass
+
+
+PropertyGroup.name = StringProperty(name="Name")
+PropertyGroup.name.attr = "name"
+
+
+# -------------------------------------------------------------------
+# Operators, UI classes and events
+# -------------------------------------------------------------------
+
+class Operator(bpy_struct):
+    bl_idname = ""
+    bl_label = ""
+    bl_description = ""
+    bl_options = set()
+
+    def __init__(self):
+        self.reports = []
+        self.layout = UILayout()
+
+    def report(self, type, message):
+        self.reports.append((set(type), message))
+        _fake.reports.append((set(type), message))
+
+
+class Panel(bpy_struct):
+    def __init__(self):
+        self.layout = UILayout()
+
+
+class UIList(bpy_struct):
+    def __init__(self):
+        self.layout = UILayout()
+
+
+class Menu(bpy_struct):
+    def __init__(self):
+        self.layout = UILayout()
+
+
+class AddonPreferences(bpy_struct):
+    bl_idname = ""
+
+    def __init__(self):
+        self.layout = UILayout()
+
+
+class UILayout:
+    """Accepts every layout call and returns another layout; nothing is drawn."""
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            return UILayout()
+        return call
+
+
+class Event:
+    def __init__(self, type='TIMER', value='PRESS'):
+        self.type = type
+        self.value = value
+        self.shift = self.ctrl = self.alt = False
+
+
+class Timer:
+    def __init__(self, time_step):
+        self.time_step = time_step
+        self.time_duration = 0.0
+
+
+# -------------------------------------------------------------------
+# ID data-blocks
+# -------------------------------------------------------------------
+
+class ID(bpy_struct):
+    """Data-block with a unique name inside its bpy.data collection and ID properties."""
+
+    def __init__(self, name):
+        self._name = name
+        self._owner = None
+        self._id_props = {}
+        self.use_fake_user = False
+        self.users = 0
+        self.library = None
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        if self._owner is not None:
+            self._owner._rename(self, value)
+        else:
+            self._name = value
+
+    @property
+    def name_full(self):
+        return self._name
+
+    def __getitem__(self, key):
+        return self._id_props[key]
+
+    def __setitem__(self, key, value):
+        self._id_props[key] = value
+
+    def __delitem__(self, key):
+        del self._id_props[key]
+
+    def __contains__(self, key):
+        return key in self._id_props
+
+    def get(self, key, default=None):
+        return self._id_props.get(key, default)
+
+    def keys(self):
+        return self._id_props.keys()
+
+    def __repr__(self):
+        return f"bpy.data.{type(self).__name__.lower()}s['{self._name}']"
+
+
+class IDCollection:
+    """A bpy.data collection; names are unique (a clash gets a .001 suffix)."""
+
+    def __init__(self, id_type):
+        self._type = id_type
+        self._by_name = {}
+
+    def _unique_name(self, name):
+        name = name[:63]
+        if name not in self._by_name:
+            return name
+        base = name
+        if len(base) > 4 and base[-4] == '.' and base[-3:].isdigit():
+            base = base[:-4]
+        for number in itertools.count(1):
+            candidate = f"{base}.{number:03d}"
+            if candidate not in self._by_name:
+                return candidate
+
+    def _link(self, block):
+        block._name = self._unique_name(block._name)
+        block._owner = self
+        self._by_name[block._name] = block
+        return block
+
+    def _rename(self, block, new_name):
+        del self._by_name[block._name]
+        block._name = self._unique_name(new_name)
+        self._by_name[block._name] = block
+
+    def new(self, name, *args, **kwargs):
+        return self._link(self._type(name, *args, **kwargs))
+
+    def remove(self, block, do_unlink=True):
+        if self._by_name.get(block.name) is not block:
+            raise ReferenceError(f"{block!r} is not in this collection")
+        del self._by_name[block.name]
+        block._owner = None
+
+    def get(self, name, default=None):
+        return self._by_name.get(name, default)
+
+    def keys(self):
+        return list(self._by_name)
+
+    def values(self):
+        return list(self._by_name.values())
+
+    def items(self):
+        return list(self._by_name.items())
+
+    def find(self, name):
+        for index, key in enumerate(self._by_name):
+            if key == name:
+                return index
+        return -1
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return self._by_name[key]
+            except KeyError:
+                raise KeyError(f"bpy_prop_collection[key]: key \"{key}\" not found") from None
+        return list(self._by_name.values())[key]
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return key in self._by_name
+        return key in self._by_name.values()
+
+    def __iter__(self):
+        return iter(list(self._by_name.values()))
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def __bool__(self):
+        return bool(self._by_name)
+
+
+# -------------------------------------------------------------------
+# Images
+# -------------------------------------------------------------------
+
+class ColorManagedInputColorspaceSettings:
+    def __init__(self, name):
+        self.name = name
+        self.is_data = name in ('Non-Color', 'Raw')
+
+
+class bpy_prop_array_pixels:
+    """Image.pixels: a flat float array with foreach_get/foreach_set and slicing."""
+
+    def __init__(self, image):
+        self._image = image
+
+    def _buffer(self):
+        return self._image._ensure_pixels()
+
+    def __len__(self):
+        width, height = self._image.size
+        return width * height * self._image.channels
+
+    def foreach_get(self, seq):
+        buffer = self._buffer()
+        if len(seq) != buffer.size:
+            raise RuntimeError("internal error setting the array")
+        if isinstance(seq, np.ndarray):
+            seq[...] = buffer.reshape(seq.shape)
+        else:
+            seq[:] = buffer.tolist()
+
+    def foreach_set(self, seq):
+        buffer = self._buffer()
+        values = np.asarray(seq, dtype=np.float32).ravel()
+        if values.size != buffer.size:
+            raise RuntimeError("internal error setting the array")
+        buffer[...] = values
+        self._image.is_dirty = True
+
+    def __getitem__(self, index):
+        values = self._buffer()[index]
+        return tuple(values.tolist()) if isinstance(index, slice) else float(values)
+
+    def __setitem__(self, index, value):
+        self._buffer()[index] = value
+        self._image.is_dirty = True
+
+    def __iter__(self):
+        return iter(self._buffer().tolist())
+
+
+class Image(ID):
+    """An image whose pixels live in a float32 NumPy buffer, like Blender's float copy of them."""
+
+    def __init__(self, name, width=0, height=0, alpha=False, float_buffer=False,
+                 stereo3d=False, is_data=False, tiled=False):
+        super().__init__(name)
+        self.size = [int(width), int(height)]
+        self.channels = 4
+        self.depth = 128 if float_buffer else 32
+        self.is_float = bool(float_buffer)
+        self.source = 'GENERATED'
+        self.filepath = ""
+        self.filepath_raw = ""
+        self.file_format = 'PNG'
+        self.packed_file = None
+        self.is_dirty = False
+        self.alpha_mode = 'STRAIGHT'
+        self.use_generated_float = bool(float_buffer)
+        self.colorspace_settings = ColorManagedInputColorspaceSettings(
+            'Non-Color' if is_data else ('Linear Rec.709' if float_buffer else 'sRGB'))
+        self._generated = {"type": 'BLANK', "width": int(width), "height": int(height),
+                           "color": (0.0, 0.0, 0.0, 1.0)}
+        self._pixels = None
+        self._has_data = True
+        self.gl_loads = 0
+
+    # --- pixel storage ---
+
+    def _generate(self):
+        width, height = self.size
+        pixels = np.empty((height * width, self.channels), dtype=np.float32)
+        pixels[:] = self._generated["color"][:self.channels]
+        return pixels.ravel()
+
+    def _ensure_pixels(self):
+        if self._pixels is None:
+            width, height = self.size
+            path = bpy_path_abspath(self.filepath) if self.filepath else ""
+            if self.source in ('FILE', 'SEQUENCE') and path and os.path.isfile(path):
+                self._load_file(path)
+            elif self.source == 'GENERATED':
+                self._pixels = self._generate()
+            else:
+                self._pixels = np.zeros(width * height * self.channels, dtype=np.float32)
+        self._has_data = True
+        return self._pixels
+
+    def _load_file(self, path):
+        try:
+            pixels = _png.read(path)
+        except (ValueError, OSError, KeyError):
+            header = _png.read_header(path)
+            width, height = header[:2] if header else (0, 0)
+            pixels = np.zeros((height, width, 4), dtype=np.float32)
+        height, width, channels = pixels.shape
+        rgba = np.ones((height, width, 4), dtype=np.float32)
+        if channels in (1, 2):
+            rgba[:, :, :3] = pixels[:, :, :1]
+            if channels == 2:
+                rgba[:, :, 3] = pixels[:, :, 1]
+        else:
+            rgba[:, :, :channels] = pixels
+        self.size = [width, height]
+        self.channels = 4
+        self._pixels = rgba.ravel()
+
+    @property
+    def pixels(self):
+        return bpy_prop_array_pixels(self)
+
+    @pixels.setter
+    def pixels(self, values):
+        self.pixels.foreach_set(values)
+
+    @property
+    def has_data(self):
+        return self._has_data and self._pixels is not None
+
+    @property
+    def bindcode(self):
+        return 1 if self.gl_loads else 0
+
+    # --- generated images ---
+
+    def _set_generated(self, key, value):
+        self._generated[key] = value
+        if key in ("width", "height"):
+            self.size = [self._generated["width"], self._generated["height"]]
+        if self.source == 'GENERATED':
+            self._pixels = None
+
+    generated_type = property(lambda self: self._generated["type"],
+                              lambda self, v: self._set_generated("type", v))
+    generated_width = property(lambda self: self._generated["width"],
+                               lambda self, v: self._set_generated("width", int(v)))
+    generated_height = property(lambda self: self._generated["height"],
+                                lambda self, v: self._set_generated("height", int(v)))
+    generated_color = property(lambda self: self._generated["color"],
+                               lambda self, v: self._set_generated("color", tuple(v)))
+
+    # --- methods ---
+
+    def scale(self, width, height, frame=0, tile_index=0):
+        old_width, old_height = self.size
+        pixels = self._ensure_pixels().reshape(old_height, old_width, self.channels)
+        ys = (np.arange(height) * old_height // max(height, 1)).clip(0, max(old_height - 1, 0))
+        xs = (np.arange(width) * old_width // max(width, 1)).clip(0, max(old_width - 1, 0))
+        if old_width and old_height:
+            resized = pixels[ys][:, xs]
+        else:
+            resized = np.zeros((height, width, self.channels), dtype=np.float32)
+        self.size = [int(width), int(height)]
+        self._pixels = np.ascontiguousarray(resized, dtype=np.float32).ravel()
+        self.is_dirty = True
+
+    def save(self, filepath=None, quality=None):
+        path = bpy_path_abspath(filepath or self.filepath_raw or self.filepath)
+        if not path:
+            raise RuntimeError(f"Image '{self.name}' does not have a file path")
+        width, height = self.size
+        pixels = self._ensure_pixels().reshape(height, width, self.channels)
+        _png.write(path, pixels, bit_depth=16 if self.is_float else 8)
+        self.is_dirty = False
+
+    def save_render(self, filepath, scene=None, quality=None):
+        self.save(filepath)
+
+    def update(self):
+        self._ensure_pixels()
+
+    def gl_load(self, frame=0, layer_index=0, pass_index=0):
+        self._ensure_pixels()
+        self.gl_loads += 1
+        return 0
+
+    def gl_free(self):
+        self.gl_loads = 0
+
+    def buffers_free(self):
+        self._pixels = None
+        self._has_data = False
+        self.gl_loads = 0
+
+    def reload(self):
+        self._pixels = None
+        self.is_dirty = False
+
+    def pack(self, data=None, data_len=0):
+        self.packed_file = object()
+
+    def unpack(self, method='USE_LOCAL'):
+        self.packed_file = None
+
+
+def _load_image(collection, filepath, check_existing=False):
+    path = bpy_path_abspath(filepath)
+    if check_existing:
+        for image in collection:
+            if bpy_path_abspath(image.filepath) == path:
+                return image
+    if not os.path.isfile(path):
+        raise RuntimeError(f"Error: Cannot read image file \"{path}\"")
+    image = collection.new(os.path.basename(path))
+    image.source = 'FILE'
+    image.filepath = filepath
+    image.filepath_raw = filepath
+    header = _png.read_header(path)
+    if header:
+        image.size = [header[0], header[1]]
+        image.is_float = header[2] == 16
+    image._pixels = None
+    image._has_data = False
+    return image
+
+
+class BlendDataImages(IDCollection):
+    def __init__(self):
+        super().__init__(Image)
+
+    def load(self, filepath, check_existing=False):
+        return _load_image(self, filepath, check_existing)
+
+
+# -------------------------------------------------------------------
+# Objects, cameras, collections, scenes
+# -------------------------------------------------------------------
+
+class Camera(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.type = 'PERSP'
+        self.lens = 50.0
+        self.sensor_width = 36.0
+        self.sensor_height = 24.0
+        self.sensor_fit = 'AUTO'
+        self.clip_start = 0.1
+        self.clip_end = 1000.0
+        self.shift_x = 0.0
+        self.shift_y = 0.0
+        self.ortho_scale = 6.0
+        self.animation_data = None
+
+    def animation_data_clear(self):
+        self.animation_data = None
+
+
+class Object(ID):
+    def __init__(self, name, object_data=None):
+        super().__init__(name)
+        self.data = object_data
+        if isinstance(object_data, Camera):
+            self.type = 'CAMERA'
+        elif object_data is None:
+            self.type = 'EMPTY'
+        else:
+            self.type = 'MESH'
+        self.location = [0.0, 0.0, 0.0]
+        self.rotation_euler = [0.0, 0.0, 0.0]
+        self.rotation_quaternion = [1.0, 0.0, 0.0, 0.0]
+        self.rotation_mode = 'XYZ'
+        self.scale = [1.0, 1.0, 1.0]
+        self.parent = None
+        self.constraints = []
+        self.animation_data = None
+
+    def animation_data_clear(self):
+        self.animation_data = None
+
+
+class _ObjectLinks:
+    def __init__(self):
+        self._objects = []
+
+    def link(self, obj):
+        if obj in self._objects:
+            raise RuntimeError(f"Object '{obj.name}' already in collection")
+        self._objects.append(obj)
+        obj.users += 1
+
+    def unlink(self, obj):
+        self._objects.remove(obj)
+        obj.users -= 1
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return any(obj.name == key for obj in self._objects)
+        return key in self._objects
+
+    def __iter__(self):
+        return iter(list(self._objects))
+
+    def __len__(self):
+        return len(self._objects)
+
+
+class _ChildLinks(_ObjectLinks):
+    pass
+
+
+class Collection(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.objects = _ObjectLinks()
+        self.children = _ChildLinks()
+
+
+class RenderSettings:
+    def __init__(self):
+        self.resolution_x = 1920
+        self.resolution_y = 1080
+        self.resolution_percentage = 100
+        self.pixel_aspect_x = 1.0
+        self.pixel_aspect_y = 1.0
+        self.engine = 'BLENDER_EEVEE_NEXT'
+        self.filepath = "/tmp/"
+        self.use_compositing = True
+
+
+class Scene(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.camera = None
+        self.frame_current = 1
+        self.frame_subframe = 0.0
+        self.frame_start = 1
+        self.frame_end = 250
+        self.frame_step = 1
+        self.render = RenderSettings()
+        self.collection = Collection("Scene Collection")
+
+    def frame_set(self, frame, subframe=0.0):
+        import bpy
+
+        for handler in list(bpy.app.handlers.frame_change_pre):
+            handler(self, None)
+        self.frame_current = int(frame)
+        self.frame_subframe = float(subframe)
+        for handler in list(bpy.app.handlers.frame_change_post):
+            handler(self, None)
+
+
+class ViewLayer:
+    def __init__(self):
+        self.name = "ViewLayer"
+
+    def update(self):
+        pass
+
+
+class Text(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self._body = ""
+
+    def as_string(self):
+        return self._body
+
+    def from_string(self, text):
+        self._body = text
+
+    def write(self, text):
+        self._body += text
+
+    def clear(self):
+        self._body = ""
+
+
+class MovieClip(ID):
+    def __init__(self, name):
+        super().__init__(name)
+        self.filepath = ""
+        self.source = 'SEQUENCE'
+        self.frame_start = 1
+        self.frame_offset = 0
+        self.frame_duration = 0
+        self.size = [0, 0]
+
+    def reload(self):
+        pass
+
+
+class BlendDataMovieClips(IDCollection):
+    def __init__(self):
+        super().__init__(MovieClip)
+
+    def load(self, filepath, check_existing=False):
+        path = bpy_path_abspath(filepath)
+        if not os.path.isfile(path):
+            raise RuntimeError(f"Error: Cannot read movie clip \"{path}\"")
+        clip = self.new(os.path.basename(path))
+        clip.filepath = filepath
+        return clip
+
+
+# -------------------------------------------------------------------
+# Node trees
+# -------------------------------------------------------------------
+
+_SOCKET_DEFAULTS = {
+    'NodeSocketFloat': 0.0,
+    'NodeSocketInt': 0,
+    'NodeSocketBool': False,
+    'NodeSocketString': "",
+    'NodeSocketColor': (0.0, 0.0, 0.0, 1.0),
+    'NodeSocketVector': (0.0, 0.0, 0.0),
+}
+
+
+class NodeSocket(bpy_struct):
+    def __init__(self, type, name, identifier=None):
+        self.bl_idname = type
+        self.type = type.replace('NodeSocket', '').upper()
+        self.name = name
+        self.identifier = identifier or name
+        default = _SOCKET_DEFAULTS.get(type, 0.0)
+        self.default_value = list(default) if isinstance(default, tuple) else default
+        self.is_linked = False
+
+
+class NodeSockets:
+    def __init__(self):
+        self._sockets = []
+
+    def new(self, type, name, identifier=None):
+        socket = NodeSocket(type, name, identifier)
+        self._sockets.append(socket)
+        return socket
+
+    def get(self, key, default=None):
+        for socket in self._sockets:
+            if socket.name == key:
+                return socket
+        return default
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            socket = self.get(key)
+            if socket is None:
+                raise KeyError(f"bpy_prop_collection[key]: key \"{key}\" not found")
+            return socket
+        return self._sockets[key]
+
+    def __iter__(self):
+        return iter(list(self._sockets))
+
+    def __len__(self):
+        return len(self._sockets)
+
+
+class Node(bpy_struct):
+    def __init__(self, type, name):
+        self.bl_idname = type
+        self.type = type
+        self.name = name
+        self.label = ""
+        self.inputs = NodeSockets()
+        self.outputs = NodeSockets()
+        self.mute = False
+
+
+class Nodes:
+    def __init__(self):
+        self._nodes = {}
+
+    def new(self, type):
+        name = type
+        number = 0
+        while name in self._nodes:
+            number += 1
+            name = f"{type}.{number:03d}"
+        node = Node(type, name)
+        self._nodes[name] = node
+        return node
+
+    def remove(self, node):
+        del self._nodes[node.name]
+
+    def rename(self, node, new_name):
+        """Fake-only: renames a node (Blender does this when node.name is assigned)."""
+        del self._nodes[node.name]
+        node.name = new_name
+        self._nodes[new_name] = node
+
+    def get(self, name, default=None):
+        return self._nodes.get(name, default)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._nodes[key]
+        return list(self._nodes.values())[key]
+
+    def __contains__(self, key):
+        return key in self._nodes
+
+    def __iter__(self):
+        return iter(list(self._nodes.values()))
+
+    def __len__(self):
+        return len(self._nodes)
+
+
+class NodeTree(ID):
+    def __init__(self, name, type='ShaderNodeTree'):
+        super().__init__(name)
+        self.bl_idname = type
+        self.nodes = Nodes()
+        self.links = []
+
+
+# -------------------------------------------------------------------
+# Windows, editors and preferences
+# -------------------------------------------------------------------
+
+class ImageUser:
+    def __init__(self):
+        self.frame_duration = 1
+        self.frame_start = 1
+        self.frame_offset = 0
+        self.frame_current = 1
+        self.use_auto_refresh = False
+        self.use_cyclic = False
+
+
+class Space:
+    def __init__(self, type):
+        self.type = type
+
+
+class SpaceImageEditor(Space):
+    def __init__(self):
+        super().__init__('IMAGE_EDITOR')
+        self.image = None
+        self.image_user = ImageUser()
+        self.zoom = (1.0, 1.0)
+        self.cursor_location = (0.0, 0.0)
+
+
+class SpaceNodeEditor(Space):
+    def __init__(self):
+        super().__init__('NODE_EDITOR')
+        self.node_tree = None
+        self.tree_type = 'ShaderNodeTree'
+
+
+class SpaceView3D(Space):
+    def __init__(self):
+        super().__init__('VIEW_3D')
+
+
+_SPACE_TYPES = {
+    'IMAGE_EDITOR': SpaceImageEditor,
+    'NODE_EDITOR': SpaceNodeEditor,
+    'VIEW_3D': SpaceView3D,
+}
+
+
+class AreaSpaces:
+    def __init__(self, active):
+        self.active = active
+
+    def __iter__(self):
+        return iter([self.active])
+
+
+class Area:
+    def __init__(self, type):
+        self.type = type
+        space_type = _SPACE_TYPES.get(type)
+        self.spaces = AreaSpaces(space_type() if space_type else Space(type))
+        self.redraws = 0
+
+    def tag_redraw(self):
+        self.redraws += 1
+
+
+class Screen:
+    def __init__(self, areas):
+        self.name = "Layout"
+        self.areas = areas
+
+
+class Window:
+    def __init__(self, screen):
+        self.screen = screen
+
+
+class WindowManager:
+    def __init__(self, windows):
+        self.windows = windows
+        self.progress = None
+        self.timers = []
+
+    @classmethod
+    def default(cls):
+        """One window with a 3D View, an Image Editor and a Node Editor."""
+        return cls([Window(Screen([Area('VIEW_3D'), Area('IMAGE_EDITOR'), Area('NODE_EDITOR')]))])
+
+    def progress_begin(self, min, max):
+        self.progress = [min, max, min]
+
+    def progress_update(self, value):
+        if self.progress is not None:
+            self.progress[2] = value
+
+    def progress_end(self):
+        self.progress = None
+
+    def event_timer_add(self, time_step, window=None):
+        timer = Timer(time_step)
+        self.timers.append(timer)
+        return timer
+
+    def event_timer_remove(self, timer):
+        self.timers.remove(timer)
+
+    def modal_handler_add(self, operator):
+        _fake.modal_handlers.append(operator)
+        return True
+
+    def fileselect_add(self, operator):
+        pass
+
+    def invoke_props_dialog(self, operator, width=300):
+        return {'RUNNING_MODAL'}
+
+    def invoke_confirm(self, operator, event):
+        return {'RUNNING_MODAL'}
+
+
+class WorkSpace:
+    def __init__(self):
+        self.status_text = None
+
+    def status_text_set(self, text):
+        self.status_text = text
+
+
+class Addon:
+    def __init__(self, module, preferences):
+        self.module = module
+        self.preferences = preferences
+
+
+class Addons(dict):
+    """context.preferences.addons: module name -> Addon."""
+
+
+class PreferencesSystem:
+    def __init__(self):
+        self.memory_cache_limit = 4096
+
+
+class Preferences:
+    def __init__(self):
+        self.addons = Addons()
+        self.system = PreferencesSystem()
+
+
+class Context:
+    def __init__(self):
+        self.scene = None
+        self.view_layer = None
+        self.window_manager = None
+        self.window = None
+        self.workspace = None
+        self.area = None
+        self.screen = None
+        self.preferences = Preferences()
+
+
+def bpy_path_abspath(path):
+    from . import path as bpy_path
+    return bpy_path.abspath(path) if path else ""
+
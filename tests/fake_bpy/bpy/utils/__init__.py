@@ -0,0 +1,33 @@
+"""
+bpy.utils: class registration
+"""
+
+from .. import _fake
+
+
+def register_class(cls):
+    from .. import types
+    import bpy
+
+    if cls in _fake.registered:
+        raise ValueError(f"register_class(...): already registered as a subclass '{cls.__name__}'")
+    if issubclass(cls, types.Operator):
+        if not cls.bl_idname or "." not in cls.bl_idname:
+            raise ValueError(f"register_class(...): invalid bl_idname '{cls.bl_idname}'")
+        _fake.operators[cls.bl_idname] = cls
+    elif issubclass(cls, types.AddonPreferences):
+        bpy.context.preferences.addons[cls.bl_idname] = types.Addon(cls.bl_idname, cls())
+    _fake.registered.append(cls)
+
+
+def unregister_class(cls):
+    from .. import types
+    import bpy
+
+    if cls not in _fake.registered:
+        raise RuntimeError(f"unregister_class(...): missing bl_rna attribute from '{cls.__name__}'")
+    _fake.registered.remove(cls)
+    if issubclass(cls, types.Operator):
+        _fake.operators.pop(cls.bl_idname, None)
+    elif issubclass(cls, types.AddonPreferences):
+        bpy.context.preferences.addons.pop(cls.bl_idname, None)
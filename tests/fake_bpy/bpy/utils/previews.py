@@ -0,0 +1,55 @@
+"""
+bpy.utils.previews: icon preview collections
+"""
+
+import itertools
+
+_icon_ids = itertools.count(1000)
+
+
+class _PixelArray:
+    def __init__(self):
+        self.values = []
+
+    def foreach_set(self, seq):
+        self.values = list(seq)
+
+    def foreach_get(self, seq):
+        seq[:] = self.values
+
+
+class ImagePreview:
+    def __init__(self):
+        self.icon_id = next(_icon_ids)
+        self.icon_size = (0, 0)
+        self.image_size = (0, 0)
+        self.icon_pixels_float = _PixelArray()
+        self.image_pixels_float = _PixelArray()
+
+
+class ImagePreviewCollection(dict):
+    def new(self, name):
+        if name in self:
+            raise KeyError(f"key '{name}' already exists")
+        preview = self[name] = ImagePreview()
+        return preview
+
+    def load(self, name, filepath, filetype, force_reload=False):
+        return self.get(name) or self.new(name)
+
+    def close(self):
+        self.clear()
+
+
+_collections = []
+
+
+def new():
+    collection = ImagePreviewCollection()
+    _collections.append(collection)
+    return collection
+
+
+def remove(collection):
+    collection.close()
+    _collections.remove(collection)
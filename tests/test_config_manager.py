@@ -0,0 +1,147 @@
+"""
+config.json and internal text block round trips
+"""
+
+import json
+
+import bpy
+
+from addon_loader import preferences
+
+
+def test_save_and_load_round_trip(addon, props, add_action):
+    cam = add_action("Front", select_camera=True, camera_name="CamFront",
+                     update_timeline=True, timeline_frame=12)
+    cam.change_image_editor = True
+    cam.image_name_to_view = "Result"
+
+    save = add_action("Save", 'IMAGE_SAVE')
+    item = save.images_to_save.add()
+    item.name = "Result"
+    item.save_as = "//out/result.png"
+    item.custom_output = True
+    item.bit_depth = '16'
+    item.dither = 'ORDERED'
+    item.png_compression = 2
+
+    depth = add_action("Depth", 'DEPTH_MAP', depth_source_image="Z", depth_target_image="Depth",
+                       depth_clip_mode='NEAR_FAR', depth_far=42.0, depth_bit_depth='16')
+
+    success, message = addon.config_manager.save_config(props.actions)
+    assert success, message
+    data = json.loads(addon.config_manager.get_config_path().read_text(encoding="utf-8"))
+    assert [entry["button_name"] for entry in data] == ["Front", "Save", "Depth"]
+    assert data[0]["camera_object_name"] == "CamFront"
+    assert data[1]["images_to_save"][0]["bit_depth"] == '16'
+
+    addon.config_manager.load_config(bpy.context)
+    assert props.error_message == ""
+    assert [a.button_name for a in props.actions] == ["Front", "Save", "Depth"]
+
+    front, save, depth = props.actions
+    assert front.camera_name == "CamFront"
+    assert front.update_timeline and front.timeline_frame == 12
+    assert front.image_name_to_view == "Result"
+    loaded_item = save.images_to_save[0]
+    assert (loaded_item.save_as, loaded_item.custom_output, loaded_item.bit_depth) == ("//out/result.png", True, '16')
+    assert (loaded_item.dither, loaded_item.png_compression) == ('ORDERED', 2)
+    assert depth.depth_clip_mode == 'NEAR_FAR'
+    assert depth.depth_far == 42.0
+    assert depth.depth_bit_depth == '16'
+
+
+def test_node_params_and_sweep_round_trip(addon, props, add_action):
+    action = add_action("Sweep", 'IMAGE_SAVE', sweep_enabled=True, sweep_cameras="A, B", sweep_wait=0.5)
+    param = action.node_params.add()
+    param.name = "seed"
+    param.path = "KSampler.inputs[seed]"
+    param.sweep_values = "1..3"
+
+    assert addon.config_manager.save_config(props.actions)[0]
+    entry = json.loads(addon.config_manager.get_config_path().read_text(encoding="utf-8"))[0]
+    assert entry["node_params"] == [{"name": "seed", "path": "KSampler.inputs[seed]", "sweep_values": "1..3"}]
+    assert entry["sweep_cameras"] == "A, B"
+
+    addon.config_manager.load_config(bpy.context)
+    loaded = props.actions[0]
+    assert loaded.sweep_enabled and loaded.sweep_wait == 0.5
+    assert [(p.name, p.path, p.sweep_values) for p in loaded.node_params] == [("seed", "KSampler.inputs[seed]", "1..3")]
+    assert addon.node_params.variant_count(loaded) == 6
+
+
+def test_hand_edited_node_param_values_are_stored_as_json(addon, props):
+    addon.config_manager.get_config_path().write_text(json.dumps([{
+        "button_name": "Steps",
+        "action_type": "CAMERA_SELECT",
+        "node_params": [{"path": "KSampler.inputs[steps]", "value": 30, "sweep_values": [10, 20]}],
+    }]), encoding="utf-8")
+
+    addon.config_manager.load_config(bpy.context)
+    param = props.actions[0].node_params[0]
+    assert (param.value, param.sweep_values) == ("30", "[10, 20]")
+
+
+def test_internal_config_takes_priority(addon, props):
+    addon.config_manager.get_config_path().write_text(
+        json.dumps([{"button_name": "External"}]), encoding="utf-8")
+    success, _ = addon.config_manager.save_internal_config([{"button_name": "Internal", "action_type": "RESET"}])
+    assert success
+
+    addon.config_manager.load_config(bpy.context)
+    assert [(a.button_name, a.action_type) for a in props.actions] == [("Internal", 'RESET')]
+
+    assert addon.config_manager.delete_internal_config()[0]
+    addon.config_manager.load_config(bpy.context)
+    assert [a.button_name for a in props.actions] == ["External"]
+
+
+def test_fresh_load_prefetches_first_action_first(addon, props, monkeypatch):
+    addon.config_manager.get_config_path().write_text(json.dumps([
+        {"button_name": "One", "action_type": "PUBLISH", "images_to_publish": [{"name": "A"}]},
+        {"button_name": "Two", "action_type": "PUBLISH", "images_to_publish": [{"name": "B"}]},
+    ]), encoding="utf-8")
+    orders = []
+    prioritized = addon.prefetch.prioritized_image_names
+    monkeypatch.setattr(addon.prefetch, "prioritized_image_names",
+                        lambda actions, last_index: orders.append(prioritized(actions, last_index)) or [])
+
+    addon.config_manager.load_config(bpy.context)
+    assert orders == [["A", "B"]]
+
+    addon.prefetch.schedule_prefetch(bpy.context)
+    assert orders[-1] == ["B", "A"]
+
+
+def test_missing_config_sets_error(addon, props):
+    addon.config_manager.load_config(bpy.context)
+    assert len(props.actions) == 0
+    assert props.error_message.startswith("Config not found")
+
+
+def test_load_config_to_preferences(addon):
+    addon.config_manager.get_config_path().write_text(json.dumps([
+        {"button_name": "One", "action_type": "PUBLISH", "images_to_publish": [{"name": "Frame"}]},
+        {"button_name": "Two", "action_type": "RESET", "reset_images": True, "images_to_reset": [{"name": "Mask"}]},
+    ]), encoding="utf-8")
+
+    prefs = preferences()
+    success, message = addon.config_manager.load_config_to_preferences(prefs)
+    assert success, message
+    assert [a.button_name for a in prefs.actions] == ["One", "Two"]
+    assert prefs.actions[0].images_to_publish[0].name == "Frame"
+    assert prefs.actions[1].images_to_reset[0].name == "Mask"
+
+
+def test_save_to_internal_operator_serializes_preferences(addon):
+    prefs = preferences()
+    action = prefs.actions.add()
+    action.button_name = "Pref"
+    action.action_type = 'COMPARE'
+    action.compare_image_a = "A"
+    action.compare_image_b = "B"
+
+    assert bpy.ops.ai_workflow.save_to_internal() == {'FINISHED'}
+    success, data, error = addon.config_manager.get_internal_config_data()
+    assert success, error
+    assert data[0]["button_name"] == "Pref"
+    assert data[0]["compare_image_a"] == "A"
@@ -0,0 +1,177 @@
+"""
+Atomic writes, locks and output naming, including a multi-process stress test
+"""
+
+import os
+import json
+import time
+import importlib.util
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import bpy
+
+from addon_loader import ADDON_ROOT
+
+PROCESSES = 8
+ITERATIONS = 40
+
+_module = None
+
+
+def _file_io():
+    """file_io.py loaded on its own (it has no bpy or package imports), also in worker processes."""
+    global _module
+    if _module is None:
+        spec = importlib.util.spec_from_file_location("file_io", ADDON_ROOT / "file_io.py")
+        _module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_module)
+    return _module
+
+
+# -------------------------------------------------------------------
+# Worker processes
+# -------------------------------------------------------------------
+
+def _increment_worker(path, iterations):
+    """Locked read-modify-write of a shared counter file."""
+    file_io = _file_io()
+    for _ in range(iterations):
+        with file_io.FileLock(path):
+            data = file_io.read_json(path)
+            data["count"] += 1
+            data["history"].append(os.getpid())
+            file_io.atomic_write_json(path, data)
+    return iterations
+
+
+def _reader_worker(path, seconds):
+    """Reads the counter without lock or retry; returns (reads, torn reads)."""
+    file_io = _file_io()
+    reads = torn = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        try:
+            data = file_io.read_json(path, attempts=1)
+            assert len(data["history"]) == data["count"]
+            reads += 1
+        except (ValueError, AssertionError):
+            torn += 1
+    return reads, torn
+
+
+def _claim_worker(path, count):
+    """Claims output names and writes its pid into each; returns the claimed names."""
+    file_io = _file_io()
+    names = []
+    for index in range(count):
+        claimed = file_io.claim_path(path)
+        file_io.atomic_write_text(claimed, f"{os.getpid()} {index}")
+        names.append(claimed.name)
+    return names
+
+
+def _pool():
+    return ProcessPoolExecutor(max_workers=PROCESSES, mp_context=multiprocessing.get_context("spawn"))
+
+
+# -------------------------------------------------------------------
+# Tests
+# -------------------------------------------------------------------
+
+def test_locked_updates_are_not_lost_and_reads_never_torn(tmp_path):
+    file_io = _file_io()
+    path = tmp_path / "config.json"
+    file_io.atomic_write_json(path, {"count": 0, "history": []})
+
+    with _pool() as pool:
+        readers = [pool.submit(_reader_worker, str(path), 2.0) for _ in range(2)]
+        writers = [pool.submit(_increment_worker, str(path), ITERATIONS) for _ in range(PROCESSES - 2)]
+        assert sum(w.result() for w in writers) == (PROCESSES - 2) * ITERATIONS
+        read_results = [r.result() for r in readers]
+
+    data = file_io.read_json(path)
+    assert data["count"] == (PROCESSES - 2) * ITERATIONS
+    assert all(reads > 0 and torn == 0 for reads, torn in read_results)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["config.json", "config.json.lock"]
+
+
+def test_claimed_names_are_unique_across_processes(tmp_path):
+    path = tmp_path / "frame.png"
+    with _pool() as pool:
+        results = [pool.submit(_claim_worker, str(path), ITERATIONS) for _ in range(PROCESSES)]
+        names = [name for r in results for name in r.result()]
+
+    assert len(names) == len(set(names)) == PROCESSES * ITERATIONS
+    assert "frame.png" in names
+    files = {p.name: p.read_text() for p in tmp_path.iterdir()}
+    assert set(files) == set(names)
+    assert all(files.values())
+
+
+def test_lock_times_out(tmp_path):
+    file_io = _file_io()
+    path = tmp_path / "config.json"
+    with file_io.FileLock(path):
+        with pytest.raises(file_io.LockTimeout):
+            file_io.FileLock(path, timeout=0.1).acquire()
+    with file_io.FileLock(path, timeout=0.1):
+        pass
+
+
+def test_failed_atomic_write_keeps_old_content(tmp_path):
+    file_io = _file_io()
+    path = tmp_path / "data.json"
+    file_io.atomic_write_json(path, {"version": 1})
+
+    with pytest.raises(RuntimeError):
+        with file_io.atomic_open(path, 'w', encoding='utf-8') as f:
+            f.write('{"version": ')
+            raise RuntimeError("interrupted")
+
+    assert json.loads(path.read_text()) == {"version": 1}
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+def test_read_retries_until_writer_finishes(tmp_path):
+    file_io = _file_io()
+    path = tmp_path / "partial.json"
+    path.write_text('{"done": ')
+    calls = []
+
+    def parse(data):
+        calls.append(data)
+        if len(calls) == 2:
+            # A non-atomic writer finishes while the reader backs off
+            path.write_text('{"done": true}')
+        return json.loads(data)
+
+    assert file_io.read_with_retry(path, parse) == {"done": True}
+    assert len(calls) == 3
+    with pytest.raises(FileNotFoundError):
+        file_io.read_json(tmp_path / "missing.json")
+
+
+def test_save_config_keeps_concurrent_changes(addon, props):
+    config_manager = addon.config_manager
+    path = config_manager.get_config_path()
+    path.write_text(json.dumps([{"button_name": "Original"}]), encoding="utf-8")
+    config_manager.load_config(bpy.context)
+
+    # Another instance saves in between
+    path.write_text(json.dumps([{"button_name": "Theirs"}]), encoding="utf-8")
+    props.actions[0].button_name = "Mine"
+
+    success, message = config_manager.save_config(props.actions)
+    assert not success and "changed by another instance" in message
+    assert json.loads(path.read_text())[0]["button_name"] == "Theirs"
+    conflict = next(path.parent.glob("config.conflict-*.json"))
+    assert json.loads(conflict.read_text())[0]["button_name"] == "Mine"
+
+    # After reloading, saving goes through
+    config_manager.load_config(bpy.context)
+    props.actions[0].button_name = "Mine again"
+    assert config_manager.save_config(props.actions)[0]
+    assert json.loads(path.read_text())[0]["button_name"] == "Mine again"
@@ -0,0 +1,66 @@
+"""
+Publishing frames and reading them back with the standalone reader
+"""
+
+import importlib.util
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+import bpy
+
+from addon_loader import ADDON_ROOT
+
+
+def _reader():
+    spec = importlib.util.spec_from_file_location("frame_share_reader", ADDON_ROOT / "frame_share_reader.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+PREFIX = "aiwftest"
+
+
+@pytest.fixture
+def published(addon, filled_image, tmp_path, monkeypatch):
+    # Reader and publisher share this process: keep the segment registered for the publisher
+    monkeypatch.setattr("multiprocessing.resource_tracker.unregister", lambda name, rtype: None)
+    filled_image("Frame", width=4, height=3, color=(0.25, 0.5, 0.75, 1.0))
+    success, message = addon.frame_share.publish_image("Frame", str(tmp_path), prefix=PREFIX)
+    assert success, message
+    yield tmp_path / "Frame.json"
+    addon.frame_share.release_all()
+
+
+def test_copy_waits_for_complete_frames(addon, published):
+    reader = _reader()
+    pixels, descriptor = reader.read_frame_copy(published)
+    assert descriptor["sequence"] == 1 and descriptor["offset"] == addon.frame_share.SEGMENT_HEADER_BYTES
+    assert pixels.shape == (3, 4, 4)
+    np.testing.assert_allclose(pixels[1, 2], [0.25, 0.5, 0.75, 1.0])
+
+    # A publish in progress: the write counter is odd
+    with reader.open_frame(published) as frame:
+        frame._counter[0] = 1
+        with pytest.raises(RuntimeError):
+            reader.read_frame_copy(published, retries=2)
+        frame._counter[0] = 2
+
+    bpy.data.images["Frame"].pixels.foreach_set(np.zeros(3 * 4 * 4, dtype=np.float32))
+    assert addon.frame_share.publish_image("Frame", str(published.parent), prefix=PREFIX)[0]
+    with reader.open_frame(published) as frame:
+        assert frame.write_counter() == 4
+    pixels, descriptor = reader.read_frame_copy(published)
+    assert descriptor["sequence"] == 2 and not pixels.any()
+
+
+def test_release_unlinks_segments_with_live_views(addon, published):
+    segment = addon.frame_share._segments["Frame"]
+    view = np.ndarray((4,), dtype=np.float32, buffer=segment.buf)
+    addon.frame_share.release_all()
+
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=segment.name)
+    del view
@@ -0,0 +1,266 @@
+"""
+Image helpers: creation, saving, pixel operations, tiling and memory budget
+"""
+
+import numpy as np
+import pytest
+
+import bpy
+
+
+def _pixels(img):
+    width, height = img.size
+    values = np.empty(width * height * img.channels, dtype=np.float32)
+    img.pixels.foreach_get(values)
+    return values.reshape(height, width, img.channels)
+
+
+def test_get_or_create_image_reuses_existing(addon):
+    created = addon.utils.get_or_create_image("Result", 16, 8)
+    assert tuple(created.size) == (16, 8)
+    assert addon.utils.get_or_create_image("Result") is created
+    assert addon.image_memory.manager.tracked_names() == ["Result"]
+
+
+def test_replace_with_blank(addon, filled_image):
+    filled_image("Mask", color=(1.0, 1.0, 1.0, 1.0))
+    addon.utils.replace_with_blank("Mask", width=4, height=2)
+    img = bpy.data.images["Mask"]
+    assert img.source == 'GENERATED'
+    assert tuple(img.size) == (4, 2)
+    assert _pixels(img).max(axis=(0, 1)).tolist() == [0.0, 0.0, 0.0, 1.0]
+
+
+def test_save_without_overwrite_claims_numbered_names(addon, filled_image, tmp_path):
+    filled_image("Result")
+    target = tmp_path / "nested" / "result.png"
+    assert addon.utils.save_image_to_file("Result", str(target))
+    original = target.read_bytes()
+
+    for _ in range(2):
+        assert addon.utils.save_image_to_file("Result", str(target), allow_overwrite=False)
+    assert target.read_bytes() == original
+    assert sorted(p.name for p in target.parent.iterdir() if not p.name.startswith("ai_workflow_manifest")) == [
+        "result.png", "result_001.png", "result_002.png"]
+    assert bpy.data.images["Result"].filepath_raw == str(target.with_name("result_002.png"))
+
+    assert not addon.utils.save_image_to_file("Missing", str(tmp_path / "missing.png"))
+
+
+@pytest.mark.parametrize("bit_depth", ['8', '16'])
+def test_custom_png_round_trip(addon, props, add_action, filled_image, tmp_path, bit_depth):
+    img = filled_image("Gradient", width=5, height=3, float_buffer=True)
+    ramp = np.linspace(0.0, 1.0, 5 * 3 * 4, dtype=np.float32)
+    img.pixels.foreach_set(ramp)
+
+    options = add_action("Save", 'IMAGE_SAVE').images_to_save.add()
+    options.custom_output = True
+    options.bit_depth = bit_depth
+    options.color_transform = 'NONE'
+
+    path = tmp_path / "gradient.png"
+    assert addon.utils.save_image_to_file("Gradient", str(path), options=options)
+    loaded = _pixels(bpy.data.images.load(str(path)))
+    levels = 255 if bit_depth == '8' else 65535
+    np.testing.assert_allclose(loaded.ravel(), np.round(ramp * levels) / levels, atol=1e-6)
+
+
+def test_depth_map_inverts_near_far(addon):
+    depth = bpy.data.images.new("Z", 4, 1, float_buffer=True)
+    depth.pixels.foreach_set([d for z in (1.0, 2.0, 3.0, 4.0) for d in (z, z, z, 1.0)])
+
+    success, message = addon.image_ops.build_depth_map("Z", "Depth", clip_mode='NEAR_FAR', near=1.0, far=4.0)
+    assert success, message
+    values = _pixels(bpy.data.images["Depth"])[0, :, 0]
+    np.testing.assert_allclose(values, [1.0, 2 / 3, 1 / 3, 0.0], atol=1 / 255)
+    assert bpy.data.images["Depth"].colorspace_settings.name == 'Non-Color'
+    assert addon.tiling.staging_bytes() == 0
+
+
+def test_compare_identical_and_different_images(addon, filled_image):
+    filled_image("A", width=16, height=16)
+    filled_image("B", width=16, height=16)
+    success, _, metrics = addon.image_ops.compare_images("A", "B")
+    assert success
+    assert metrics["mse"] == 0.0 and metrics["psnr"] == float('inf')
+
+    filled_image("C", width=16, height=16, color=(0.35, 0.5, 0.75, 1.0))
+    success, _, metrics = addon.image_ops.compare_images("A", "C", diff_name="Diff")
+    assert success
+    assert metrics["mse"] == pytest.approx(0.01 / 3, rel=1e-4)
+    assert "Diff" in bpy.data.images
+
+    filled_image("Small", width=4, height=4)
+    assert not addon.image_ops.compare_images("A", "Small")[0]
+
+
+def test_compare_writes_heat_map_for_rgb_images(addon, filled_image):
+    rgb = bpy.data.images.new("RGB", 16, 16)
+    rgb.channels = 3
+    rgb.pixels.foreach_set([0.35, 0.5, 0.75] * 256)
+    filled_image("A", width=16, height=16)
+
+    success, _, metrics = addon.image_ops.compare_images("RGB", "A", diff_name="Diff")
+    assert success
+    assert metrics["mse"] == pytest.approx(0.01 / 3, rel=1e-4)
+    heat = _pixels(bpy.data.images["Diff"])
+    # Mean abs difference 0.1/3 at gain 4 → red 0.4 on the black-red-yellow ramp
+    np.testing.assert_allclose(heat[0, 0], [0.4, 0.0, 0.0, 1.0], atol=1e-5)
+
+
+def test_released_staging_slot_keeps_handed_out_views(addon, filled_image):
+    tiling = addon.tiling
+    pixels = tiling.read_image(filled_image("A", width=4, height=4), 'preview')
+    tiling.release_staging('preview')
+    assert tiling.staging_bytes() == 0
+
+    tiling.read_image(filled_image("B", width=4, height=4, color=(1.0, 1.0, 1.0, 1.0)), 'preview')
+    assert pixels[0, 0].tolist() == [0.25, 0.5, 0.75, 1.0]
+    tiling.release_staging()
+
+
+def test_iter_tiles_covers_every_row(addon):
+    rows = addon.tiling.tile_rows(width=100, channels=4, tile_bytes=100 * 4 * 4 * 7, align=2)
+    assert rows % 2 == 0
+    for top_down in (False, True):
+        spans = list(addon.tiling.iter_tiles(23, rows, top_down=top_down))
+        covered = sorted(y for y0, y1 in spans for y in range(y0, y1))
+        assert covered == list(range(23))
+
+
+def test_memory_budget_frees_least_recently_used(addon, filled_image, tmp_path):
+    manager = addon.image_memory.manager
+    for name in ("Old", "Mid", "New"):
+        img = filled_image(name, width=32, height=32)
+        img.save(str(tmp_path / f"{name}.png"))
+        img.source = 'FILE'
+        img.filepath = str(tmp_path / f"{name}.png")
+        manager.touch(name)
+
+    one_image = addon.image_memory.image_buffer_bytes(bpy.data.images["Old"])
+    assert manager.usage_bytes == one_image * 3
+    assert manager.enforce(one_image * 2, protected={"Mid"}) == 1
+    assert manager.last_evicted == "Old"
+    assert not bpy.data.images["Old"].has_data
+    assert manager.usage_bytes == one_image * 2
+
+    # Freed buffers reload from their file on next access
+    assert _pixels(bpy.data.images["Old"])[0, 0].tolist() == pytest.approx([0.25, 0.5, 0.75, 1.0], abs=1 / 255)
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16])
+def test_read_png_matches_written_pixels(addon, tmp_path, dtype):
+    rng = np.random.default_rng(3)
+    array = rng.integers(0, np.iinfo(dtype).max, size=(7, 9, 4), dtype=dtype)
+    array[3:] = array[3]
+    path = tmp_path / "frame.png"
+    with open(path, 'wb') as f:
+        addon.image_encode.write_png(f, array)
+
+    decoded = addon.image_encode.read_png(path)
+    assert decoded.dtype == dtype
+    np.testing.assert_array_equal(decoded, array)
+
+    path.write_bytes(path.read_bytes()[:40])
+    with pytest.raises(ValueError):
+        addon.image_encode.read_png(path)
+
+
+def test_watcher_decodes_png_and_keeps_float_frames(addon, tmp_path):
+    addon.utils.get_or_create_image("Stream", 2, 2)
+    array = np.full((3, 2, 4), 65535, dtype=np.uint16)
+    array[0, :, 0] = 32768
+    path = tmp_path / "stream_0001.png"
+    with open(path, 'wb') as f:
+        addon.image_encode.write_png(f, array)
+
+    watcher = addon.watcher.OutputWatcher(tmp_path, ["Stream"])
+    pixels = watcher._decode(str(path))
+    assert pixels.dtype == np.float32
+    assert watcher._apply_frame("Stream", str(path), pixels)
+
+    img = bpy.data.images["Stream"]
+    assert img.is_float and tuple(img.size) == (2, 3)
+    # Top row of the file is the last row of the image; colour is linearized like Blender's loader does
+    top = _pixels(img)[2, 0]
+    assert top[0] == pytest.approx(float(addon.image_encode.srgb_to_linear(32768 / 65535)), rel=1e-5)
+    assert top[0] == pytest.approx(0.214, abs=1e-3)
+    assert top[1:].tolist() == [1.0, 1.0, 1.0]
+
+
+def test_watcher_16bit_alpha_stays_linear(addon, tmp_path):
+    array = np.zeros((1, 1, 4), dtype=np.uint16)
+    array[0, 0] = (65535, 0, 0, 32768)
+    path = tmp_path / "stream_0001.png"
+    with open(path, 'wb') as f:
+        addon.image_encode.write_png(f, array)
+
+    pixels = addon.watcher.OutputWatcher(tmp_path, ["Stream"])._decode(str(path))
+    np.testing.assert_allclose(pixels[0, 0], [1.0, 0.0, 0.0, 32768 / 65535], rtol=1e-6)
+
+
+def test_watcher_worker_error_is_reported(addon, tmp_path):
+    class BrokenBackend:
+        def wait(self, timeout):
+            raise OSError("directory removed")
+
+    watcher = addon.watcher.OutputWatcher(tmp_path, ["Stream"])
+    watcher._backend = BrokenBackend()
+    task = addon.async_runtime.spawn(watcher._run())
+    assert bpy._fake.run_timers(until=task.done)
+    assert watcher.error == "OSError: directory removed"
+
+
+def test_watcher_streams_frames_on_the_runtime(addon, tmp_path):
+    ok, message = addon.watcher.start_watching(str(tmp_path), ["Stream"])
+    assert ok, message
+    np.save(tmp_path / "stream_0001.npy", np.full((2, 3, 4), 0.5, dtype=np.float32))
+
+    watcher = addon.watcher.get_active_watcher()
+    assert bpy._fake.run_timers(until=lambda: watcher.frames_applied)
+    assert watcher.last_file == "stream_0001.npy"
+    assert _pixels(bpy.data.images["Stream"]).shape == (2, 3, 4)
+
+    addon.watcher.stop_watching()
+    assert bpy._fake.run_timers()
+    assert addon.async_runtime.task_count() == 0
+
+
+def test_preview_is_built_in_the_background(addon, filled_image, tmp_path, monkeypatch):
+    monkeypatch.setattr(addon.previews, "CACHE_DIR", tmp_path / "previews")
+    filled_image("Thumb", width=256, height=64, color=(1.0, 0.0, 0.0, 1.0))
+
+    assert addon.previews.get_icon_id("Thumb") == 0
+    assert bpy._fake.run_timers(until=lambda: "Thumb" in addon.previews._ready)
+    assert addon.previews.get_icon_id("Thumb") != 0
+    assert addon.previews._preview_collection["Thumb"].icon_size == (128, 32)
+    assert not addon.previews._requested and not addon.previews._tasks
+    assert len(list((tmp_path / "previews").glob("p*.npy"))) == 1
+
+
+def test_prefetch_loads_file_images_in_the_background(addon, add_action, tmp_path):
+    path = tmp_path / "frame.png"
+    with open(path, 'wb') as f:
+        addon.image_encode.write_png(f, np.zeros((2, 2, 4), dtype=np.uint8))
+    img = bpy.data.images.load(str(path))
+    assert not img.has_data
+    action = add_action("Publish", 'PUBLISH')
+    action.images_to_publish.add().name = img.name
+
+    loaded = addon.prefetch.get_stats()["loaded"]
+    assert addon.prefetch.schedule_prefetch(bpy.context) == 1
+    assert bpy._fake.run_timers(until=lambda: addon.prefetch.pending_count() == 0)
+    assert img.has_data
+    assert addon.prefetch.get_stats()["loaded"] == loaded + 1
+
+
+def test_ensure_image_keeps_images_it_did_not_create(addon):
+    bpy.data.images.new("Painted", 4, 2)
+    with pytest.raises(ValueError, match="not a float image"):
+        addon.image_ops.ensure_image("Painted", 4, 2, float_buffer=True)
+    assert not bpy.data.images["Painted"].is_float
+
+    addon.image_ops.ensure_image("Generated", 4, 2)
+    replaced = addon.image_ops.ensure_image("Generated", 8, 4, float_buffer=True)
+    assert replaced.is_float and tuple(replaced.size) == (8, 4)
+    assert "Generated" in addon.image_memory.manager.created_names()
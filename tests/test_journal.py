@@ -0,0 +1,109 @@
+"""
+Action journal records and headless replay
+"""
+
+import json
+import importlib.util
+
+import pytest
+
+import bpy
+
+from bpy import _fake
+
+from addon_loader import ADDON_ROOT, preferences
+
+
+def _load_replay():
+    spec = importlib.util.spec_from_file_location("journal_replay", ADDON_ROOT / "journal_replay.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(autouse=True)
+def journal_enabled():
+    preferences().journal_enabled = True
+
+
+def test_actions_and_reloads_are_journaled(addon, props, save_action, tmp_path):
+    addon.config_manager.get_config_path().write_text(json.dumps([{"button_name": "Loaded"}]), encoding="utf-8")
+    addon.config_manager.load_config(bpy.context)
+    save_action(["Img0", "Img1"])
+    bpy.context.scene.frame_set(7)
+
+    bpy.ops.ai_workflow.execute_action(action_index=1)
+
+    path = addon.journal.session_path()
+    assert path.parent == tmp_path / "journal"
+    reload_record, action_record = addon.journal.read_journal(path)
+
+    assert (reload_record["kind"], reload_record["source"], reload_record["actions"]) == ("reload", "external", 1)
+    assert action_record["kind"] == "action"
+    assert (action_record["id"], action_record["index"], action_record["mode"]) == ("Save", 1, 'BLOCKING')
+    assert action_record["frame"] == 7
+    assert action_record["status"] == 'FINISHED'
+    assert action_record["action"] == addon.config_manager.action_to_dict(props.actions[1])
+    assert [label for label, _ in action_record["steps"]] == [
+        "Setup", "Saved 'Img0'", "Saved 'Img1'", "Editors updated", "Finish"]
+    assert action_record["busy_ms"] <= action_record["ms"]
+    assert len(action_record["inputs"]) == 32
+
+
+def test_cancelled_modal_run_is_journaled(addon, save_action):
+    save_action([f"Img{index}" for index in range(5)])
+    bpy.ops.ai_workflow.execute_action('INVOKE_DEFAULT', action_index=0)
+    _fake.run_modal(event_type='ESC')
+
+    record = addon.journal.read_journal(addon.journal.session_path())[-1]
+    assert (record["mode"], record["status"]) == ('MODAL', 'CANCELLED')
+    assert [label for label, _ in record["steps"]] == ["Finish"]
+
+
+def test_inputs_hash_follows_image_files(addon, add_action, filled_image, tmp_path):
+    img = filled_image("Source")
+    source = tmp_path / "source.png"
+    img.save(str(source))
+    img.source = 'FILE'
+    img.filepath = str(source)
+    action = add_action("View", change_image_editor=True, image_name_to_view="Source")
+    entry = addon.config_manager.action_to_dict(action)
+
+    first = addon.journal.inputs_hash(bpy.context.scene, action, entry)
+    assert addon.journal.inputs_hash(bpy.context.scene, action, entry) == first
+
+    filled_image("Other", color=(1.0, 0.0, 0.0, 1.0)).save(str(source))
+    assert addon.journal.inputs_hash(bpy.context.scene, action, entry) != first
+
+
+def test_disabled_journal_writes_nothing(addon, add_action):
+    preferences().journal_enabled = False
+    add_action("Camera", select_camera=True, camera_name="Cam")
+    bpy.ops.ai_workflow.execute_action(action_index=0)
+    assert not addon.journal.session_path().exists()
+
+
+def test_replay_reports_per_step_timings(addon, props, save_action):
+    # Generated images: saving them does not change their inputs signature (no dirty pixels)
+    save_action(["Img0", "Img1"], make_image=lambda name: bpy.data.images.new(name, 8, 8))
+    camera = addon.utils.get_or_create_camera("Cam")
+    bpy.context.scene.camera = camera
+    bpy.ops.ai_workflow.execute_action(action_index=0)
+    records = addon.journal.read_journal(addon.journal.session_path())
+
+    # Replay on a changed scene: the recorded frame and camera are restored
+    bpy.context.scene.frame_set(30)
+    bpy.context.scene.camera = None
+    replay = _load_replay()
+    results = replay.replay_records(addon, records, repeat=2)
+
+    assert len(results) == 1
+    result = results[0]
+    assert result["status"] == 'FINISHED' and result["inputs_match"]
+    assert result["replay_ms"] > 0
+    assert [step["label"] for step in result["steps"]] == [label for label, _ in records[0]["steps"]]
+    assert all(step["replay_ms"] is not None for step in result["steps"])
+    assert bpy.context.scene.camera is camera
+
+    # The replay itself is not journaled
+    assert len(addon.journal.read_journal(addon.journal.session_path())) == 1
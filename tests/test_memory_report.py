@@ -0,0 +1,107 @@
+"""
+Image memory accounting by action, orphaned images and allocation diffs
+"""
+
+import tracemalloc
+
+import numpy as np
+
+import bpy
+
+from addon_loader import preferences
+
+_kept = []
+
+
+def test_accounting_groups_images_by_action(addon, props, add_action):
+    addon.utils.get_or_create_image("View", 16, 8)
+    addon.utils.get_or_create_image("Float", 8, 8, float_buffer=True)
+    addon.utils.get_or_create_image("Leftover", 32, 32)
+    bpy.data.images.new("Artist", 4, 4)
+    add_action("Show", change_image_editor=True, image_name_to_view="View")
+    save = add_action("Save", 'IMAGE_SAVE')
+    for name in ("View", "Float", "Missing"):
+        save.images_to_save.add().name = name
+
+    report = addon.memory_report.account_images(props.actions)
+
+    sizes = {usage.name: usage.bytes for usage in report.images}
+    assert sizes == {"View": 512, "Float": 1024, "Leftover": 4096, "Artist": 64}
+    assert report.total_bytes == 512 + 1024 + 4096 + 64
+    assert [usage.name for usage in report.images][0] == "Leftover"
+    groups = {usage.action_name: (usage.image_names, usage.bytes) for usage in report.actions}
+    assert groups == {"Save": (["View", "Float"], 1536), "Show": (["View"], 512)}
+    assert [usage.action_name for usage in report.actions] == ["Save", "Show"]
+
+    # Only add-on images nothing references are orphans
+    assert [usage.name for usage in report.images if usage.orphan] == ["Leftover"]
+    assert report.orphan_bytes == 4096
+    assert addon.memory_report.last_report() is report
+
+
+def test_accounting_never_loads_images(addon, props, add_action, filled_image, tmp_path):
+    path = tmp_path / "frame.png"
+    with open(path, 'wb') as f:
+        addon.image_encode.write_png(f, np.zeros((4, 4, 4), dtype=np.uint8))
+    on_disk = bpy.data.images.load(str(path))
+    filled_image("Loaded", width=4, height=4)
+    bpy.data.images.new("Blank", 8, 8, float_buffer=True)
+    add_action("Show", change_image_editor=True, image_name_to_view=on_disk.name)
+
+    report = addon.memory_report.account_images(props.actions)
+
+    usages = {usage.name: (usage.bytes, usage.resident) for usage in report.images}
+    assert usages == {on_disk.name: (None, False), "Loaded": (64, True), "Blank": (1024, False)}
+    assert not on_disk.has_data and not bpy.data.images["Blank"].has_data
+    assert (report.total_bytes, report.resident_bytes, report.unsized) == (1088, 64, 1)
+    assert report.actions[0].bytes == 0
+
+    # Actions do not re-account behind the user's back
+    add_action("Camera", select_camera=True, camera_name="Cam")
+    bpy.ops.ai_workflow.execute_action(action_index=1)
+    assert addon.memory_report.last_report() is report
+
+
+def test_free_orphans_keeps_used_images(addon, props, add_action):
+    addon.utils.get_or_create_image("Leftover", 8, 8)
+    addon.utils.get_or_create_image("Kept", 8, 8).use_fake_user = True
+    addon.utils.get_or_create_image("Viewed", 8, 8)
+    add_action("Show", change_image_editor=True, image_name_to_view="Viewed")
+
+    bpy.ops.ai_workflow.image_memory_report()
+    bpy.ops.ai_workflow.free_orphan_images()
+
+    assert sorted(img.name for img in bpy.data.images) == ["Kept", "Viewed"]
+    assert "Leftover" not in addon.image_memory.manager.tracked_names()
+    assert addon.memory_report.last_report().orphan_bytes == 0
+
+
+def test_allocation_diff_around_action(addon, add_action, monkeypatch):
+    create_camera = addon.utils.get_or_create_camera
+
+    def leaky(name, *args):
+        _kept.append(bytearray(256 * 1024))
+        return create_camera(name, *args)
+
+    monkeypatch.setattr(addon.utils, "get_or_create_camera", leaky)
+    add_action("Camera", select_camera=True, camera_name="Cam")
+
+    # Off by default: no tracing
+    bpy.ops.ai_workflow.execute_action(action_index=0)
+    assert addon.memory_report.last_allocations() is None
+    assert not tracemalloc.is_tracing()
+
+    preferences().trace_allocations = True
+    try:
+        bpy.ops.ai_workflow.execute_action(action_index=0)
+        result = addon.memory_report.last_allocations()
+        assert result["label"] == "Camera"
+        assert result["net_bytes"] >= 256 * 1024
+        assert result["top"][0]["where"].startswith("test_memory_report.py:")
+        assert result["top"][0]["size_diff"] >= 256 * 1024
+    finally:
+        preferences().trace_allocations = False
+        _kept.clear()
+
+    assert addon.memory_report.allocation_snapshot() is None
+    assert not tracemalloc.is_tracing()
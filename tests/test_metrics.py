@@ -0,0 +1,109 @@
+"""
+Metrics registry: action and save recording, Prometheus textfile and JSON lines export
+"""
+
+import os
+import json
+
+import pytest
+
+import bpy
+
+from bpy import _fake
+
+from addon_loader import preferences
+
+
+def test_actions_and_saves_are_counted(addon, add_action, save_action, tmp_path):
+    metrics = addon.metrics
+    save_action(["Result", "Missing"], missing=["Missing"])
+    add_action("Camera", select_camera=True, camera_name="Cam")
+
+    bpy.ops.ai_workflow.execute_action(action_index=0)
+    bpy.ops.ai_workflow.execute_action(action_index=1)
+
+    assert metrics.actions_total.value('IMAGE_SAVE', 'failed') == 1
+    assert metrics.actions_total.value('CAMERA_SELECT', 'finished') == 1
+    assert metrics.action_failures_total.value('IMAGE_SAVE') == 1
+    assert metrics.action_seconds.count('IMAGE_SAVE') == 1
+    assert metrics.image_saves_total.value('saved') == metrics.image_saves_total.value('failed') == 1
+    assert metrics.image_save_bytes_total.value() == (tmp_path / "out" / "Result.png").stat().st_size
+    assert metrics.image_save_seconds.count() == 2
+
+
+def test_cancelled_modal_run_is_counted(addon, save_action):
+    save_action([f"Img{index}" for index in range(4)])
+    bpy.ops.ai_workflow.execute_action('INVOKE_DEFAULT', action_index=0)
+    _fake.run_modal(event_type='ESC')
+    assert addon.metrics.actions_total.value('IMAGE_SAVE', 'cancelled') == 1
+
+
+def test_prometheus_textfile_export(addon, add_action, tmp_path):
+    preferences().metrics_path = str(tmp_path / "textfile" / "ai_workflow_{pid}.prom")
+    add_action("Camera", select_camera=True, camera_name="Cam")
+    bpy.ops.ai_workflow.execute_action(action_index=0)
+
+    # The first write happens while recording, later ones on the async runtime
+    path = tmp_path / "textfile" / f"ai_workflow_{os.getpid()}.prom"
+    assert path.exists()
+    assert addon.async_runtime.is_scheduled(addon.metrics._export_tick)
+
+    text = path.read_text()
+    pid = f'pid="{os.getpid()}"'
+    assert "# TYPE ai_workflow_actions_total counter" in text
+    assert f'ai_workflow_actions_total{{action_type="CAMERA_SELECT",status="finished",{pid}}} 1' in text
+    assert f'ai_workflow_action_seconds_bucket{{action_type="CAMERA_SELECT",{pid},le="+Inf"}} 1' in text
+    assert f'ai_workflow_action_seconds_count{{action_type="CAMERA_SELECT",{pid}}} 1' in text
+    assert not [p for p in path.parent.iterdir() if p.name.startswith(".")]
+
+
+def test_recording_exports_when_timers_do_not_run(addon, tmp_path):
+    metrics = addon.metrics
+    path = tmp_path / "metrics.jsonl"
+    preferences().metrics_path = str(path)
+    preferences().metrics_format = 'JSONL'
+
+    # No timer ticks here, as in blender -b
+    metrics.record_save(100, 0.01)
+    metrics.record_save(100, 0.01)
+    assert len(path.read_text().splitlines()) == 1
+
+    metrics._written["at"] -= preferences().metrics_interval
+    metrics.record_action('RESET', 'FINISHED', 0.1)
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(lines) == 2
+    assert lines[1]["counters"]['ai_workflow_image_saves_total{status="saved"}'] == 2
+
+
+def test_json_lines_have_rates_and_percentiles(addon, tmp_path):
+    metrics = addon.metrics
+    path = tmp_path / "metrics.jsonl"
+    for seconds in (0.02, 0.03, 0.2, 0.4):
+        metrics.record_save(1000, seconds)
+
+    assert metrics.export(str(path), 'JSONL')[0]
+    metrics.record_save(None, 7.0)
+    assert metrics.export(str(path), 'JSONL')[0]
+
+    first, second = [json.loads(line) for line in path.read_text().splitlines()]
+    assert first["counters"]['ai_workflow_image_save_bytes_total'] == 4000
+    assert first["rates"] == {}
+    assert second["rates"]['ai_workflow_image_saves_total{status="failed"}'] > 0
+    assert second["rates"]['ai_workflow_image_save_bytes_total'] == 0
+    latency = second["histograms"]['ai_workflow_image_save_seconds']
+    assert latency["count"] == 5
+    assert 0.025 <= latency["p50"] <= 0.25
+    # Fifth observation in the (5, 10] bucket: 5 + 5 * (4.95 - 4) / 1
+    assert latency["p99"] == pytest.approx(9.75)
+
+
+def test_histogram_quantiles_interpolate_in_buckets(addon):
+    histogram = addon.metrics.Histogram("test_seconds", "Test", (1.0, 2.0, 4.0))
+    assert histogram.quantile(0.5) is None
+    for value in (0.5, 1.5, 1.5, 3.0):
+        histogram.observe(value)
+    assert histogram.quantile(0.25) == pytest.approx(1.0)
+    assert histogram.quantile(0.5) == pytest.approx(1.5)
+    assert histogram.quantile(1.0) == pytest.approx(4.0)
+    histogram.observe(100.0)
+    assert histogram.quantile(1.0) == 4.0
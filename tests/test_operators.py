@@ -0,0 +1,215 @@
+"""
+Action execution through bpy.ops, blocking and modal
+"""
+
+import pytest
+
+import bpy
+
+from bpy import _fake
+
+from addon_loader import preferences
+
+
+def _execute(index=0, invoke=False):
+    if invoke:
+        return bpy.ops.ai_workflow.execute_action('INVOKE_DEFAULT', action_index=index)
+    return bpy.ops.ai_workflow.execute_action(action_index=index)
+
+
+def _add_save(action, name, save_as, **options):
+    item = action.images_to_save.add()
+    item.name = name
+    item.save_as = save_as
+    for key, value in options.items():
+        setattr(item, key, value)
+    return item
+
+
+def _sampler_tree(name="Workflow"):
+    tree = bpy.data.node_groups.new(name, 'ComfyUITree')
+    sampler = tree.nodes.new('KSampler')
+    sampler.inputs.new('NodeSocketInt', "seed")
+    sampler.inputs.new('NodeSocketFloat', "cfg")
+    return tree, sampler
+
+
+def test_camera_select_creates_camera_and_sets_views(addon, props, add_action):
+    tree, _ = _sampler_tree()
+    add_action("Front", select_camera=True, camera_name="CamFront",
+               change_image_editor=True, image_name_to_view="Result",
+               change_node_tree=True, node_tree_name=tree.name)
+
+    assert _execute() == {'FINISHED'}
+    assert bpy.context.scene.camera.name == "CamFront"
+    assert bpy.context.scene.camera.type == 'CAMERA'
+    assert "Result" in bpy.data.images
+    assert addon.utils.get_image_editor_space(bpy.context).image.name == "Result"
+    node_space = next(area.spaces.active for area in bpy.context.window.screen.areas if area.type == 'NODE_EDITOR')
+    assert node_space.node_tree is tree
+    assert props.active_action_index == 0
+
+
+def test_invalid_index_is_cancelled(addon):
+    assert _execute(index=3) == {'CANCELLED'}
+    assert ({'ERROR'}, "Invalid action index.") in _fake.reports
+
+
+def test_timeline_frame_is_clamped(addon, add_action):
+    scene = bpy.context.scene
+    scene.frame_start, scene.frame_end = 1, 50
+    add_action("Late", update_timeline=True, timeline_frame=80)
+
+    _execute()
+    assert scene.frame_current == 50
+
+
+def test_image_save_writes_pngs_and_manifest(addon, props, add_action, filled_image, tmp_path):
+    filled_image("Plain", color=(1.0, 0.0, 0.0, 1.0))
+    filled_image("Custom", color=(0.0, 0.5, 1.0, 1.0), float_buffer=True)
+    action = add_action("Save", 'IMAGE_SAVE')
+    _add_save(action, "Plain", str(tmp_path / "plain.png"))
+    _add_save(action, "Custom", str(tmp_path / "custom.png"), custom_output=True,
+              bit_depth='16', color_transform='NONE')
+
+    assert _execute() == {'FINISHED'}
+    assert ({'INFO'}, "Saved 2 image(s)") in _fake.reports
+    assert addon.tiling.staging_bytes() == 0
+
+    loaded = bpy.data.images.load(str(tmp_path / "custom.png"))
+    assert loaded.size[:] == [8, 8]
+    assert tuple(round(v, 3) for v in loaded.pixels[:4]) == (0.0, 0.5, 1.0, 1.0)
+
+    entries = addon.manifest.load_entries(str(tmp_path))
+    assert {entry["image"] for entry in entries.values()} == {"Plain", "Custom"}
+
+    # With resume enabled, both outputs are found complete in the manifest
+    props.resume_outputs = True
+    _fake.reports.clear()
+    _execute()
+    assert ({'INFO'}, "Skipped 2 complete output(s)") in _fake.reports
+
+
+def test_node_params_are_applied_and_undone(addon, add_action):
+    tree, sampler = _sampler_tree()
+    sampler.inputs["seed"].default_value = 7
+    action = add_action("Seed", change_node_tree=True, node_tree_name=tree.name)
+    param = action.node_params.add()
+    param.path = "KSampler.inputs[seed]"
+    param.value = "42"
+
+    _execute()
+    assert sampler.inputs["seed"].default_value == 42
+
+    assert bpy.ops.ai_workflow.undo_last_action() == {'FINISHED'}
+    assert sampler.inputs["seed"].default_value == 7
+
+
+def test_undo_restores_camera_and_frame(addon, add_action):
+    scene = bpy.context.scene
+    first = addon.utils.get_or_create_camera("First")
+    scene.camera = first
+    scene.frame_set(3)
+    add_action("Second", select_camera=True, camera_name="Second", update_timeline=True, timeline_frame=9)
+
+    _execute()
+    assert (scene.camera.name, scene.frame_current) == ("Second", 9)
+    bpy.ops.ai_workflow.undo_last_action()
+    assert (scene.camera, scene.frame_current) == (first, 3)
+
+
+def test_sweep_saves_every_combination(addon, add_action, filled_image, tmp_path):
+    tree, sampler = _sampler_tree()
+    for name in ("CamA", "CamB"):
+        addon.utils.get_or_create_camera(name)
+    filled_image("Result")
+
+    action = add_action("Sweep", 'IMAGE_SAVE', change_node_tree=True, node_tree_name=tree.name,
+                        sweep_enabled=True, sweep_cameras="CamA, CamB")
+    param = action.node_params.add()
+    param.name = "seed"
+    param.path = "KSampler.inputs[seed]"
+    param.sweep_values = "1..3"
+    _add_save(action, "Result", str(tmp_path / "{camera}" / "seed_{seed}.png"))
+
+    assert _execute(invoke=True) == {'RUNNING_MODAL'}
+    assert _fake.run_modal() == [{'FINISHED'}]
+
+    written = sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*.png"))
+    assert written == [f"{cam}/seed_{seed}.png" for cam in ("CamA", "CamB") for seed in (1, 2, 3)]
+    assert sampler.inputs["seed"].default_value == 3
+    assert bpy.context.scene.camera.name == "CamB"
+
+
+def test_modal_run_can_be_cancelled(addon, props, add_action, filled_image, tmp_path):
+    action = add_action("Many", 'IMAGE_SAVE')
+    for index in range(6):
+        filled_image(f"Img{index}")
+        _add_save(action, f"Img{index}", str(tmp_path / f"img{index}.png"))
+
+    assert _execute(invoke=True) == {'RUNNING_MODAL'}
+    assert not bpy.ops.ai_workflow.execute_action.poll()
+    assert _fake.run_modal(event_type='ESC') == [{'CANCELLED'}]
+
+    assert props.last_run_status.startswith("Cancelled 'Many' after 0/")
+    assert not list(tmp_path.glob("*.png"))
+    assert bpy.ops.ai_workflow.execute_action.poll()
+
+
+def test_failing_step_ends_the_run(addon, props, add_action, filled_image, tmp_path, monkeypatch):
+    action = add_action("Many", 'IMAGE_SAVE')
+    for index in range(6):
+        filled_image(f"Img{index}")
+        _add_save(action, f"Img{index}", str(tmp_path / f"img{index}.png"))
+
+    def broken_save(*args, **kwargs):
+        raise OSError("disk gone")
+    monkeypatch.setattr(addon.utils, "save_image_to_file", broken_save)
+
+    assert _execute(invoke=True) == {'RUNNING_MODAL'}
+    assert _fake.run_modal() == [{'CANCELLED'}]
+    assert props.last_run_status == "'Many' failed after 1/8 step(s): disk gone"
+    assert bpy.ops.ai_workflow.execute_action.poll()
+
+    with pytest.raises(OSError):
+        _execute()
+    assert addon.metrics.actions_total.value('IMAGE_SAVE', 'cancelled') == 2
+
+
+def test_sweep_progress_skips_missing_cameras_and_waits_modally(addon, add_action, filled_image, tmp_path):
+    addon.utils.get_or_create_camera("CamA")
+    filled_image("Result")
+    action = add_action("Sweep", 'IMAGE_SAVE', sweep_enabled=True, sweep_cameras="CamA, Missing")
+    _add_save(action, "Result", str(tmp_path / "{camera}.png"))
+
+    assert _execute(invoke=True) == {'RUNNING_MODAL'}
+    operator = _fake.modal_handlers[0]
+    assert operator._total == 6
+    assert _fake.run_modal() == [{'FINISHED'}]
+    assert operator._done == operator._total == 4
+
+    # Too short to go modal on its own, but it waits for the run operator
+    waiting = add_action("Wait", 'IMAGE_SAVE', sweep_enabled=True, sweep_cameras="CamA",
+                         sweep_run_operator="sdn.queue_prompt", sweep_wait=0.01)
+    assert addon.operators.count_units(waiting) < addon.operators.MODAL_MIN_UNITS
+    assert _execute(index=1, invoke=True) == {'RUNNING_MODAL'}
+    assert _fake.run_modal() == [{'FINISHED'}]
+
+
+def test_duplicate_and_move_preference_actions(addon):
+    prefs = preferences()
+    for name in ("A", "B"):
+        prefs.actions.add().button_name = name
+    original = prefs.actions[1]
+    original.action_type = 'IMAGE_SAVE'
+    _add_save(original, "Result", "//result.png", custom_output=True, bit_depth='16')
+    prefs.active_action_index = 1
+
+    assert bpy.ops.ai_workflow.duplicate_action() == {'FINISHED'}
+    copy = prefs.actions[2]
+    assert (copy.button_name, copy.action_type) == ("B (Copy)", 'IMAGE_SAVE')
+    assert (copy.images_to_save[0].save_as, copy.images_to_save[0].bit_depth) == ("//result.png", '16')
+
+    bpy.ops.ai_workflow.move_action(direction='UP')
+    assert [a.button_name for a in prefs.actions] == ["A", "B (Copy)", "B"]
+    assert prefs.active_action_index == 1
@@ -0,0 +1,57 @@
+"""
+Dry-run planning of actions against bpy.data
+"""
+
+import bpy
+
+from bpy import _fake
+
+
+def _messages(issues, severity=None):
+    return [issue.message for issue in issues if severity is None or issue.severity == severity]
+
+
+def test_save_paths_are_checked(addon, props, save_action, tmp_path):
+    save_action(["Result"])
+    # A file where the output directory should be
+    blocked = tmp_path / "blocked"
+    blocked.write_text("")
+    item = props.actions[0].images_to_save.add()
+    item.name = "Result"
+    item.save_as = str(blocked / "result.png")
+
+    ok, issues = addon.planner.preflight(props.actions, bpy.context.scene)
+    assert _messages(issues) == [f"Save directory '{blocked}' is not writable"]
+    assert not ok
+    assert bpy.ops.ai_workflow.dry_run() == {'FINISHED'}
+    assert _fake.reports[-1][0] == {'ERROR'}
+
+
+def test_later_actions_resolve_against_earlier_creations(addon, props, add_action, tmp_path):
+    add_action("Reset", 'RESET', reset_images=True, select_camera=True, camera_name="CamA")
+    props.actions[0].images_to_reset.add().name = "FirstFrame"
+    save = add_action("Save", 'IMAGE_SAVE', select_camera=True, camera_name="CamA")
+    item = save.images_to_save.add()
+    item.name = "FirstFrame"
+    item.save_as = str(tmp_path / "first.png")
+    add_action("Render", 'RENDER', camera_name="CamA", render_image_name="FirstFrame")
+
+    issues = addon.planner.plan_actions(props.actions, bpy.context.scene)
+    assert _messages(issues) == [
+        "Camera 'CamA' would be created",
+        "Reset image 'FirstFrame' would be created",
+    ]
+    assert [issue.action_index for issue in issues] == [0, 0]
+
+
+def test_wrong_references_are_errors(addon, props, add_action):
+    bpy.data.objects.new("Empty", None)
+    add_action("Depth", 'DEPTH_MAP', depth_source_image="Z", depth_target_image="Depth")
+    add_action("Camera", select_camera=True, camera_name="Empty")
+
+    issues = addon.planner.plan_actions(props.actions, bpy.context.scene)
+    assert _messages(issues, 'ERROR') == [
+        "Depth source image 'Z' not found",
+        "Object 'Empty' is a empty, not a camera",
+    ]
+    assert _messages(issues, 'CREATE') == ["Depth target image 'Depth' would be created"]
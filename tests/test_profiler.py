@@ -0,0 +1,107 @@
+"""
+cProfile hook: armed action runs and config loads, reports and collapsed stacks
+"""
+
+import json
+import pstats
+
+import pytest
+
+import bpy
+
+from bpy import _fake
+
+from addon_loader import preferences
+
+
+@pytest.fixture
+def profiling(addon):
+    preferences().profile_enabled = True
+    return addon.profiler
+
+
+def _fib(n):
+    return n if n < 2 else _fib(n - 1) + _fib(n - 2)
+
+
+def _outer():
+    return _inner() + _fib(12)
+
+
+def _inner():
+    return sum(_fib(10) for _ in range(3))
+
+
+def test_armed_action_runs_are_profiled(addon, profiling, add_action, tmp_path):
+    add_action("Camera", select_camera=True, camera_name="Cam")
+    bpy.ops.ai_workflow.profile_next(target='ACTION', runs=2)
+    assert profiling.armed_runs('ACTION') == 2
+
+    for _ in range(3):
+        bpy.ops.ai_workflow.execute_action(action_index=0)
+
+    results = profiling.results()
+    assert len(results) == 2 and profiling.armed_runs('ACTION') == 0
+    result = results[-1]
+    assert (result["kind"], result["label"], result["status"]) == ('ACTION', "Camera", 'FINISHED')
+    assert result["stats_path"].startswith(str(tmp_path / "profiles" / "session_"))
+
+    stats = pstats.Stats(result["stats_path"])
+    assert {"get_or_create_camera", "_steps"} <= {name for _, _, name in stats.stats}
+    assert len(result["top"]) == profiling.TOP_FUNCTIONS
+    cum = [entry["cum_ms"] for entry in result["top"]]
+    assert cum == sorted(cum, reverse=True)
+
+    folded = open(result["folded_path"], encoding="utf-8").read().split("\n")
+    assert any("get_or_create_camera" in line for line in folded)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in folded if line)
+
+
+def test_modal_run_profiles_only_its_ticks(addon, profiling, save_action):
+    save_action([f"Img{index}" for index in range(4)])
+
+    profiling.arm('ACTION')
+    bpy.ops.ai_workflow.execute_action('INVOKE_DEFAULT', action_index=0)
+    assert not profiling.results()
+    _fake.run_modal()
+
+    result = profiling.last_result()
+    assert result["status"] == 'FINISHED'
+    assert any("save_image_to_file" in entry["function"] for entry in result["top"])
+
+
+def test_config_load_profile(addon, profiling):
+    addon.config_manager.get_config_path().write_text(json.dumps([{"button_name": "Loaded"}]), encoding="utf-8")
+    bpy.ops.ai_workflow.profile_next(target='CONFIG_LOAD')
+    bpy.ops.ai_workflow.reload_config()
+    bpy.ops.ai_workflow.reload_config()
+
+    assert [r["kind"] for r in profiling.results()] == ['CONFIG_LOAD']
+    assert any("load_action" in entry["function"] for entry in profiling.last_result()["top"])
+    assert len(bpy.context.scene.my_addon_props.actions) == 1
+
+
+def test_disabled_profiler_profiles_nothing(addon, add_action, tmp_path):
+    with pytest.raises(RuntimeError):
+        bpy.ops.ai_workflow.profile_next(target='ACTION')
+
+    # Armed before the preference was turned off
+    addon.profiler.arm('ACTION')
+    add_action("Camera", select_camera=True, camera_name="Cam")
+    bpy.ops.ai_workflow.execute_action(action_index=0)
+    assert not addon.profiler.results()
+    assert not (tmp_path / "profiles").exists()
+
+
+def test_collapsed_stacks_follow_call_paths(addon):
+    import cProfile
+    profile = cProfile.Profile()
+    profile.runcall(_outer)
+    lines = addon.profiler.collapsed_stacks(pstats.Stats(profile))
+
+    stacks = [line.rsplit(" ", 1)[0].split(";") for line in lines]
+    names = [[frame.split(" ")[0] for frame in stack] for stack in stacks]
+    assert any(stack[:2] == ["_outer", "_inner"] and stack[-2:] == ["<genexpr>", "_fib"] for stack in names)
+    assert any(stack[:2] == ["_outer", "_fib"] for stack in names)
+    # Recursion is folded into its first frame
+    assert all(stack.count("_fib") <= 1 for stack in names)
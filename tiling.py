@@ -0,0 +1,106 @@
+"""
+Tiled pixel processing with bounded, reusable buffers
+
+Blender only exposes an image's pixels as one flat array (foreach_get /
+foreach_set work on the whole buffer), so each image is staged exactly once
+in a float32 buffer that is reused across calls. All transforms then run on
+row tiles of that staging buffer, so temporaries are bounded by TILE_BYTES
+instead of growing with resolution.
+
+Staging is only reused within one pixel step (e.g. the saves of one
+action): depth maps, comparisons and the save steps release it when they
+end, so it is not held outside the image memory budget between actions.
+
+This module does not import bpy; anything with .size, .channels and a
+.pixels collection supporting foreach_get/foreach_set can be staged.
+"""
+
+import numpy as np
+
+# Target size of one processing tile (bytes of float32 pixels)
+TILE_BYTES = 32 * 1024 * 1024
+
+# Staging buffers larger than this are released after each save within a step
+STAGING_KEEP_BYTES = 256 * 1024 * 1024
+
+# slot name -> flat float32 array, grown on demand and reused
+_staging = {}
+
+
+def staging_buffer(slot, count):
+    """Returns a float32 buffer of `count` values for a slot, reusing the previous allocation if large enough."""
+    if slot not in _staging or _staging[slot].size < count:
+        # Drop the old buffer first so both are never alive at once
+        _staging.pop(slot, None)
+        _staging[slot] = np.empty(count, dtype=np.float32)
+    return _staging[slot][:count]
+
+
+def trim_staging(keep_bytes=STAGING_KEEP_BYTES):
+    """Releases staging buffers larger than keep_bytes (0 releases all)."""
+    for slot in list(_staging):
+        if _staging[slot].nbytes > keep_bytes:
+            del _staging[slot]
+
+
+def release_staging(slot=None):
+    """
+    Releases all staging buffers, or one slot. Views already handed out
+    (e.g. to a worker thread) stay valid; the slot just stops reusing them.
+    """
+    if slot is None:
+        _staging.clear()
+    else:
+        _staging.pop(slot, None)
+
+
+def staging_bytes():
+    """Bytes currently held by staging buffers."""
+    return sum(buffer.nbytes for buffer in _staging.values())
+
+
+def read_image(img, slot='src'):
+    """Stages an image's pixels with one foreach_get; returns an (H, W, C) view of the slot buffer."""
+    width, height = img.size
+    channels = img.channels
+    flat = staging_buffer(slot, width * height * channels)
+    img.pixels.foreach_get(flat)
+    return flat.reshape(height, width, channels)
+
+
+def output_buffer(img, slot='dst'):
+    """Returns an (H, W, C) staging view sized for an image, to be filled and passed to write_image."""
+    width, height = img.size
+    channels = img.channels
+    return staging_buffer(slot, width * height * channels).reshape(height, width, channels)
+
+
+def write_image(img, pixels):
+    """Writes a contiguous (H, W, C) float32 staging view back with one foreach_set."""
+    img.pixels.foreach_set(pixels.reshape(-1))
+    img.update()
+
+
+def tile_rows(width, channels, tile_bytes=TILE_BYTES, align=1):
+    """Rows per tile so one tile of float32 pixels stays near tile_bytes; a multiple of align."""
+    row_bytes = max(width * channels * 4, 1)
+    rows = max(1, tile_bytes // row_bytes)
+    if align > 1:
+        rows = max(align, rows // align * align)
+    return rows
+
+
+def iter_tiles(height, rows, top_down=False):
+    """
+    Yields (y0, y1) row ranges covering [0, height).
+
+    Ranges index Blender's bottom-up rows; with top_down=True they are
+    yielded from the top of the image downwards (for encoders).
+    """
+    if top_down:
+        for y1 in range(height, 0, -rows):
+            yield max(0, y1 - rows), y1
+    else:
+        for y0 in range(0, height, rows):
+            yield y0, min(y0 + rows, height)
+
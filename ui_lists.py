@@ -20,6 +20,10 @@ class ActionUIList(UIList):
                 'CAMERA_SELECT': 'CAMERA_DATA',
                 'RESET': 'FILE_REFRESH',
                 'IMAGE_SAVE': 'FILE_TICK',
+                'RENDER': 'RENDER_STILL',
+                'DEPTH_MAP': 'MOD_DISPLACE',
+                'COMPARE': 'IMAGE_REFERENCE',
+                'PUBLISH': 'EXPORT',
             }
             action_icon = icon_map.get(item.action_type, 'DOT')
 
@@ -30,6 +34,10 @@ class ActionUIList(UIList):
                 'CAMERA_SELECT': "CAM",
                 'RESET': "RST",
                 'IMAGE_SAVE': "SAVE",
+                'RENDER': "RND",
+                'DEPTH_MAP': "DEPTH",
+                'COMPARE': "CMP",
+                'PUBLISH': "PUB",
             }.get(item.action_type, "")
 
             row.label(text=type_text)
@@ -3,8 +3,17 @@ Utility functions for AI Workflow Config Tools
 """
 
 import bpy
+import os
+import time
 from pathlib import Path
 
+from . import image_memory
+from . import tiling
+from . import image_encode
+from . import manifest
+from . import file_io
+from . import metrics
+
 
 def get_image_editor_space(context):
     """Finds the active space data of the first Image Editor area."""
@@ -57,49 +66,182 @@ def get_or_create_camera(name, location=(0, 0, 0)):
         return None
 
 
-def get_or_create_image(name, width=1024, height=1024):
+def get_fcurves(id_block):
+    """
+    Returns the F-Curves animating an ID, or None.
+
+    On Blender 4.4+ actions are slotted, so the curves are looked up in the
+    channelbag of the ID's slot; older versions use action.fcurves.
+    """
+    anim = id_block.animation_data
+    if anim is None or anim.action is None:
+        return None
+    slot = getattr(anim, "action_slot", None)
+    if slot is not None:
+        try:
+            from bpy_extras import anim_utils
+            channelbag = anim_utils.action_get_channelbag_for_slot(anim.action, slot)
+            return channelbag.fcurves if channelbag is not None else None
+        except (ImportError, AttributeError):
+            pass
+    return anim.action.fcurves
+
+
+def get_or_create_image(name, width=1024, height=1024, float_buffer=False):
     """Gets existing image or creates a new one if it doesn't exist."""
     if name in bpy.data.images:
         print(f"Using existing image: '{name}'")
+        image_memory.manager.touch(name)
         return bpy.data.images[name]
 
     try:
-        img = bpy.data.images.new(name, width, height)
+        img = bpy.data.images.new(name, width, height, float_buffer=float_buffer)
         print(f"Created new image: '{name}' ({width}x{height})")
+        image_memory.manager.touch(img.name)
+        image_memory.manager.note_created(img.name)
         return img
     except Exception as e:
         print(f"Error creating image '{name}': {e}")
         return None
 
 
-def save_image_to_file(image_name, filepath, allow_overwrite=True):
-    """Saves an image to disk."""
+def _resolve_color_transform(img, color_transform):
+    """Resolves 'AUTO' to the transform img.save() would apply for PNG output."""
+    if color_transform != 'AUTO':
+        return color_transform
+    if img.is_float and img.colorspace_settings.name not in {'Non-Color', 'Raw'}:
+        return 'LINEAR_TO_SRGB'
+    return 'NONE'
+
+
+def _save_png_with_options(img, file_path, options):
+    """
+    Converts pixels with NumPy and writes the PNG without img.save().
+
+    Pixels are staged once and converted row tile by row tile, top-down,
+    straight into the streaming PNG encoder (see tiling.py).
+
+    Returns:
+        tuple: (size in bytes, blake2b hex digest) of the written file
+    """
+    pixels = tiling.read_image(img, 'src')
+    height, width, channels = pixels.shape
+    bit_depth = int(options.bit_depth)
+    color_transform = _resolve_color_transform(img, options.color_transform)
+    out_channels = channels - 1 if options.alpha_mode == 'DROP' and channels in (2, 4) else channels
+
+    def blocks():
+        rows = tiling.tile_rows(width, channels)
+        for y0, y1 in tiling.iter_tiles(height, rows, top_down=True):
+            yield image_encode.prepare_pixels(
+                pixels[y0:y1],
+                bit_depth=bit_depth,
+                color_transform=color_transform,
+                dither=options.dither,
+                alpha_mode=options.alpha_mode,
+                row_offset=height - y1,
+            )
+
+    try:
+        with file_io.atomic_open(file_path, 'wb') as f:
+            writer = manifest.HashingWriter(f)
+            image_encode.write_png_blocks(writer, blocks(), width, height, out_channels, bit_depth, options.png_compression)
+        return writer.size, writer.hexdigest()
+    finally:
+        tiling.trim_staging()
+
+
+def _scene_camera_and_frame():
+    scene = bpy.context.scene
+    if scene is None:
+        return "", None
+    return (scene.camera.name if scene.camera else ""), scene.frame_current
+
+
+def is_output_complete(image_name, filepath):
+    """True if the output manifest shows filepath was already written from this image, camera and frame."""
+    camera, frame = _scene_camera_and_frame()
+    return manifest.find_complete(bpy.path.abspath(filepath), image_name, camera, frame) is not None
+
+
+def save_image_to_file(image_name, filepath, allow_overwrite=True, options=None, action_name=""):
+    """
+    Saves an image to disk.
+
+    When options (a SaveImageProperty) has custom_output enabled and the
+    target is a PNG, pixels are converted with the NumPy pipeline in
+    image_encode (bit depth, colour transform, dithering, alpha, compression).
+    Otherwise img.save() converts implicitly.
+
+    Every saved file is recorded in the output directory's manifest (see
+    manifest.py). The PNG pipeline hashes bytes as they are written; files
+    written by img.save() are hashed once afterwards.
+
+    Files are written to a temporary name and renamed into place (see
+    file_io.py), so other processes never read a partial output. Without
+    allow_overwrite an existing file is kept and the first free numbered
+    name (result_001.png, ...) is claimed atomically instead.
+
+    Each call is recorded in the metrics registry (see metrics.py).
+    """
+    started = time.perf_counter()
+    size = _save_image_to_file(image_name, filepath, allow_overwrite, options, action_name)
+    metrics.record_save(size, time.perf_counter() - started)
+    return size is not None
+
+
+def _save_image_to_file(image_name, filepath, allow_overwrite, options, action_name):
+    """save_image_to_file(); returns the written size in bytes, or None if saving failed."""
     if image_name not in bpy.data.images:
         print(f"Error: Image '{image_name}' not found for saving.")
-        return False
+        return None
 
     img = bpy.data.images[image_name]
 
-    # Check if file exists and overwrite is not allowed
-    file_path = Path(filepath)
-    if file_path.exists() and not allow_overwrite:
-        print(f"Error: File '{filepath}' already exists and overwrite is disabled.")
-        return False
-
     # Create parent directory if it doesn't exist
+    file_path = Path(filepath)
     try:
         file_path.parent.mkdir(parents=True, exist_ok=True)
     except Exception as e:
         print(f"Error creating directory '{file_path.parent}': {e}")
-        return False
+        return None
+
+    # Keep existing files: claim a free name, safe against concurrent writers
+    claimed = None
+    if not allow_overwrite:
+        try:
+            claimed = file_io.claim_path(bpy.path.abspath(str(file_path)))
+        except OSError as e:
+            print(f"Error: Could not claim an output name for '{filepath}': {e}")
+            return None
+        if claimed.name != file_path.name:
+            print(f"Note: '{filepath}' exists and overwrite is disabled; saving as '{claimed.name}'")
+        file_path = file_path.with_name(claimed.name)
+    abs_path = bpy.path.abspath(str(file_path))
+
+    # Save through the NumPy conversion pipeline
+    if options is not None and options.custom_output:
+        if file_path.suffix.lower() == '.png':
+            try:
+                size, digest = _save_png_with_options(img, abs_path, options)
+                _record_output(abs_path, size, digest, image_name, action_name)
+                print(f"Saved image '{image_name}' to '{file_path}' ({options.bit_depth}-bit, custom output)")
+                return size
+            except Exception as e:
+                print(f"Error saving image '{image_name}' to '{file_path}': {e}")
+                _discard_claim(claimed)
+                return None
+        print(f"Warning: Custom output only applies to PNG; saving '{file_path}' with img.save()")
 
     # Save the image
+    temp_path = None
     try:
         # Store original filepath
         original_filepath = img.filepath
 
-        # Set new filepath and save
-        img.filepath_raw = str(file_path)
+        # Save to a temporary name next to the target, renamed into place below
+        temp_path = file_io.temp_path_for(abs_path)
+        img.filepath_raw = str(temp_path)
 
         # Set file format based on extension
         extension = file_path.suffix.lower()
@@ -116,16 +258,62 @@ def save_image_to_file(image_name, filepath, allow_overwrite=True):
         img.file_format = format_map.get(extension, 'PNG')
 
         img.save()
+        file_io.replace(temp_path, abs_path)
+        temp_path = None
 
         # Restore original filepath to avoid changing the image's internal path
         if original_filepath:
             img.filepath = original_filepath
+        else:
+            img.filepath_raw = str(file_path)
 
-        print(f"Saved image '{image_name}' to '{filepath}'")
-        return True
+        size, digest = manifest.hash_file(abs_path)
+        _record_output(abs_path, size, digest, image_name, action_name)
+
+        print(f"Saved image '{image_name}' to '{file_path}'")
+        return size
     except Exception as e:
-        print(f"Error saving image '{image_name}' to '{filepath}': {e}")
-        return False
+        print(f"Error saving image '{image_name}' to '{file_path}': {e}")
+        _discard_claim(temp_path)
+        _discard_claim(claimed)
+        return None
+
+
+def _discard_claim(path):
+    """Removes a temporary or claimed-but-unwritten output file."""
+    if path is not None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _record_output(abs_path, size, digest, image_name, action_name):
+    camera, frame = _scene_camera_and_frame()
+    manifest.record_output(abs_path, size, digest, image=image_name, action=action_name,
+                           camera=camera, frame=frame)
+
+
+def action_image_names(action):
+    """Returns the unique image names referenced by an action, in use order."""
+    names = []
+    if action.change_image_editor and action.image_name_to_view:
+        names.append(action.image_name_to_view)
+    if action.action_type == 'RESET' and action.reset_images:
+        names.extend(img.name for img in action.images_to_reset)
+    if action.action_type == 'IMAGE_SAVE':
+        names.extend(img.name for img in action.images_to_save)
+    if action.action_type == 'RENDER':
+        names.append(action.render_image_name)
+    if action.action_type == 'DEPTH_MAP':
+        names.extend((action.depth_source_image, action.depth_target_image))
+    if action.action_type == 'COMPARE':
+        names.extend((action.compare_image_a, action.compare_image_b, action.compare_diff_image))
+    if action.action_type == 'PUBLISH':
+        names.extend(img.name for img in action.images_to_publish)
+
+    seen = set()
+    return [name for name in names if name.strip() and not (name in seen or seen.add(name))]
 
 
 def validate_action(action):
@@ -150,4 +338,29 @@ def validate_action(action):
             if not img.save_as.strip():
                 return False, f"Save path for image '{img.name}' cannot be empty"
 
+    elif action.action_type == 'RENDER':
+        if not action.render_image_name.strip():
+            return False, "Target image is required for rendering"
+
+    elif action.action_type == 'DEPTH_MAP':
+        if not action.depth_source_image.strip() or not action.depth_target_image.strip():
+            return False, "Source and target images are required for depth maps"
+        if action.depth_clip_mode == 'NEAR_FAR' and action.depth_far <= action.depth_near:
+            return False, "Depth far distance must be greater than near distance"
+        if action.depth_clip_mode == 'PERCENTILE' and action.depth_percentile_high <= action.depth_percentile_low:
+            return False, "Upper depth percentile must be greater than lower percentile"
+
+    elif action.action_type == 'COMPARE':
+        if not action.compare_image_a.strip() or not action.compare_image_b.strip():
+            return False, "Two images are required for comparison"
+
+    elif action.action_type == 'PUBLISH':
+        if len(action.images_to_publish) == 0:
+            return False, "At least one image must be specified for publishing"
+        if not action.publish_directory.strip():
+            return False, "Publish directory cannot be empty"
+
+    if action.watch_output and not action.watch_directory.strip():
+        return False, "Watch directory is required when 'Watch Output Directory' is enabled"
+
     return True, ""
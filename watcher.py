@@ -0,0 +1,412 @@
+"""
+Output directory watcher for streaming generated frames into Blender images
+"""
+
+import bpy
+import os
+import sys
+import time
+import asyncio
+import struct
+import select
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from . import previews
+from . import async_runtime
+from . import image_ops
+from . import image_encode
+
+# File types picked up from the watched directory
+SUPPORTED_EXTENSIONS = {
+    '.png', '.jpg', '.jpeg', '.bmp', '.tga', '.tif', '.tiff', '.exr', '.npy',
+}
+
+# A file must keep the same size/mtime for this long before it is decoded,
+# so half-written outputs are never loaded.
+DEBOUNCE_SECONDS = 0.3
+
+# Stat polling interval when inotify is not available
+POLL_INTERVAL = 0.5
+
+# Module-level watcher instance (one watched directory at a time)
+_active_watcher = None
+
+
+class _PollingBackend:
+    """Detects changed files by comparing directory stat snapshots."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._seen = {}
+        # Files already present when watching starts are not reported
+        self._scan()
+
+    def _scan(self):
+        changed = set()
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return changed
+
+        for entry in entries:
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            signature = (st.st_size, st.st_mtime_ns)
+            if self._seen.get(entry.path) != signature:
+                self._seen[entry.path] = signature
+                changed.add(entry.path)
+        return changed
+
+    def wait(self, timeout):
+        """Blocks up to timeout seconds and returns the set of changed paths."""
+        time.sleep(min(timeout, POLL_INTERVAL))
+        return self._scan()
+
+    def close(self):
+        pass
+
+
+class _InotifyBackend:
+    """Linux inotify backend using libc through ctypes."""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_NONBLOCK = 0x00000800
+    IN_CLOEXEC = 0x00080000
+    _EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, directory):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.directory = directory
+        self._fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        wd = libc.inotify_add_watch(self._fd, os.fsencode(directory), mask)
+        if wd < 0:
+            os.close(self._fd)
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for '{directory}'")
+
+    def wait(self, timeout):
+        """Blocks up to timeout seconds and returns the set of changed paths."""
+        changed = set()
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return changed
+
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        header_size = self._EVENT_HEADER.size
+        while offset + header_size <= len(data):
+            _wd, _mask, _cookie, length = self._EVENT_HEADER.unpack_from(data, offset)
+            raw_name = data[offset + header_size:offset + header_size + length]
+            offset += header_size + length
+            name = raw_name.rstrip(b"\0")
+            if name:
+                changed.add(os.path.join(self.directory, os.fsdecode(name)))
+        return changed
+
+    def close(self):
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+
+
+def _create_backend(directory):
+    """Returns an inotify backend where available, otherwise stat polling."""
+    if sys.platform.startswith("linux"):
+        try:
+            return _InotifyBackend(directory)
+        except Exception as e:
+            print(f"Watcher: inotify unavailable ({e}), falling back to polling")
+    return _PollingBackend(directory)
+
+
+def match_image_name(filename, image_names):
+    """
+    Maps an output filename to the image it belongs to.
+
+    A file belongs to an image when its stem starts with the image name
+    (case-insensitive), e.g. 'FirstFrameDepth_00012_.png' → 'FirstFrameDepth'.
+    The longest matching name wins so 'FirstFrame' does not shadow
+    'FirstFrameDepth'.
+
+    Returns:
+        str or None: The matching image name
+    """
+    stem = Path(filename).stem.lower()
+    best = None
+    for name in image_names:
+        if stem.startswith(name.lower()) and (best is None or len(name) > len(best)):
+            best = name
+    return best
+
+
+class OutputWatcher:
+    """
+    Watches a directory and streams new frames into named Blender images.
+
+    Runs as a task on the add-on's async runtime. File events are collected
+    and debounced on a worker thread. Files that can be decoded without bpy
+    (.npy and PNG, see image_encode.read_png) are decoded there as well; EXR
+    and the other formats are loaded on the main thread, where bpy access
+    is allowed. Each frame is applied on the main thread once decoded.
+
+    If watching fails (e.g. the directory disappears), it stops and error
+    holds the reason for the panel.
+    """
+
+    def __init__(self, directory, image_names):
+        self.directory = str(directory)
+        self.image_names = list(image_names)
+        self.frames_applied = 0
+        self.last_file = ""
+        self.error = ""
+        self._task = None
+        self._backend = None
+        # Held by the worker thread while it waits, so the backend is never closed mid-wait
+        self._backend_lock = threading.Lock()
+
+    @property
+    def backend_name(self):
+        return "inotify" if isinstance(self._backend, _InotifyBackend) else "polling"
+
+    def start(self):
+        self._backend = _create_backend(self.directory)
+        self._task = async_runtime.spawn(self._run(), name="watcher")
+        print(f"Watcher: Watching '{self.directory}' ({self.backend_name}) for {self.image_names}")
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+        if self._backend:
+            with self._backend_lock:
+                self._backend.close()
+        print(f"Watcher: Stopped watching '{self.directory}'")
+
+    async def _run(self):
+        """Runtime task: waits for and decodes frames on worker threads, applies them here."""
+        # path -> (signature, time the signature was first seen)
+        pending = {}
+        try:
+            while True:
+                newest = await async_runtime.run_in_thread(self._poll, pending)
+                for image_name, path in newest.items():
+                    pixels = await async_runtime.run_in_thread(self._decode, path)
+                    self._apply(image_name, path, pixels)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            print(f"Watcher: Stopped watching '{self.directory}' after an error: {self.error}")
+
+    def _poll(self, pending):
+        """
+        Worker thread: waits briefly for file events and debounces them.
+
+        Returns {image name: path} of files that stopped changing, newest
+        file per image.
+        """
+        with self._backend_lock:
+            changed = self._backend.wait(DEBOUNCE_SECONDS / 2)
+        for path in changed:
+            if Path(path).suffix.lower() not in SUPPORTED_EXTENSIONS:
+                continue
+            if match_image_name(path, self.image_names):
+                pending.setdefault(path, (None, 0.0))
+
+        now = time.monotonic()
+        ready = []
+        for path, (signature, since) in list(pending.items()):
+            try:
+                st = os.stat(path)
+            except OSError:
+                del pending[path]
+                continue
+            current = (st.st_size, st.st_mtime_ns)
+            if current != signature:
+                pending[path] = (current, now)
+            elif st.st_size > 0 and now - since >= DEBOUNCE_SECONDS:
+                ready.append((st.st_mtime_ns, path))
+                del pending[path]
+
+        # Only the newest file per image matters within one batch
+        newest = {}
+        for _mtime, path in sorted(ready):
+            newest[match_image_name(path, self.image_names)] = path
+        return newest
+
+    def _decode(self, path):
+        """
+        Decodes files that do not need bpy, bottom-up like Blender images;
+        returns None for the main thread to load them otherwise.
+        """
+        suffix = Path(path).suffix.lower()
+        try:
+            if suffix == '.npy':
+                pixels = np.load(path, allow_pickle=False)
+            elif suffix == '.png':
+                pixels = image_encode.read_png(path)[::-1]
+                if pixels.dtype == np.uint16:
+                    pixels = _linearize_png16(pixels)
+            else:
+                return None
+        except ValueError as e:
+            # Unusual PNG variants are left to Blender's loader
+            print(f"Watcher: Decoding '{Path(path).name}' with Blender: {e}")
+            return None
+        except Exception as e:
+            print(f"Watcher: Failed to decode '{path}': {e}")
+            return None
+        if pixels.ndim == 2:
+            pixels = pixels[:, :, None]
+        return pixels
+
+    def _apply(self, image_name, path, pixels):
+        """Main thread: pushes a decoded frame into its image and redraws."""
+        if self._apply_frame(image_name, path, pixels):
+            self.frames_applied += 1
+            self.last_file = Path(path).name
+            previews.invalidate([image_name])
+            _tag_image_editors()
+
+    def _apply_frame(self, image_name, path, pixels):
+        if pixels is None:
+            pixels = _load_with_blender(path)
+            if pixels is None:
+                return False
+
+        # Float frames (EXR, float .npy, 16-bit PNG) need a float image or they are clamped and quantized
+        height, width = pixels.shape[:2]
+        float_buffer = pixels.dtype.kind == 'f' or pixels.dtype.itemsize > 1
+        try:
+            img = image_ops.ensure_image(image_name, width, height, float_buffer=float_buffer)
+            rgba = _to_rgba(pixels, img.channels)
+            img.pixels.foreach_set(rgba.ravel())
+            img.update()
+            print(f"Watcher: '{Path(path).name}' → '{image_name}' ({width}x{height})")
+            return True
+        except Exception as e:
+            print(f"Watcher: Failed to update image '{image_name}' from '{path}': {e}")
+            return False
+
+
+def _linearize_png16(pixels):
+    """
+    Converts 16-bit PNG pixels to scene-linear float32, as Blender does when
+    it loads them into a float image: colour channels go through the inverse
+    sRGB transfer function, alpha stays linear.
+    """
+    out = pixels.astype(np.float32) / 65535.0
+    colour = out.shape[2] if out.shape[2] in (1, 3) else out.shape[2] - 1
+    out[:, :, :colour] = image_encode.srgb_to_linear(out[:, :, :colour])
+    return out
+
+
+def _load_with_blender(path):
+    """
+    Loads a file through a temporary image and returns its pixels (H, W, C):
+    float32 for float images, uint8 for byte images.
+    """
+    tmp = None
+    try:
+        tmp = bpy.data.images.load(path, check_existing=False)
+        width, height = tmp.size
+        channels = tmp.channels
+        buffer = np.empty(width * height * channels, dtype=np.float32)
+        tmp.pixels.foreach_get(buffer)
+        if not tmp.is_float:
+            buffer = (buffer * 255.0 + 0.5).astype(np.uint8)
+        return buffer.reshape(height, width, channels)
+    except Exception as e:
+        print(f"Watcher: Failed to load '{path}': {e}")
+        return None
+    finally:
+        if tmp is not None:
+            bpy.data.images.remove(tmp)
+
+
+def _to_rgba(pixels, channels=4):
+    """
+    Converts an (H, W, C) array to the float32 layout of a Blender image.
+    Integer pixels are scaled from their type's range to 0..1.
+    """
+    if pixels.dtype.kind in 'ui':
+        pixels = pixels.astype(np.float32) / np.iinfo(pixels.dtype).max
+    pixels = np.asarray(pixels, dtype=np.float32)
+    height, width, src_channels = pixels.shape
+    if src_channels == channels:
+        return pixels
+
+    out = np.ones((height, width, channels), dtype=np.float32)
+    if src_channels == 1:
+        out[:, :, :min(3, channels)] = pixels
+    else:
+        count = min(src_channels, channels)
+        out[:, :, :count] = pixels[:, :, :count]
+    return out
+
+
+def _tag_image_editors():
+    """Redraws Image Editors so streamed frames show up immediately."""
+    wm = bpy.context.window_manager
+    if wm is None:
+        return
+    for window in wm.windows:
+        for area in window.screen.areas:
+            if area.type == 'IMAGE_EDITOR':
+                area.tag_redraw()
+
+
+def start_watching(directory, image_names):
+    """
+    Starts watching a directory, replacing any watcher already running.
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    global _active_watcher
+
+    path = Path(bpy.path.abspath(directory))
+    if not path.is_dir():
+        return False, f"Watch directory not found: {path}"
+
+    image_names = [name for name in image_names if name.strip()]
+    if not image_names:
+        return False, "No target images to stream into"
+
+    stop_watching()
+
+    _active_watcher = OutputWatcher(path, image_names)
+    _active_watcher.start()
+
+    return True, f"Watching '{path.name}' for {len(image_names)} image(s)"
+
+
+def stop_watching():
+    """Stops the active watcher, if any."""
+    global _active_watcher
+
+    if _active_watcher is not None:
+        _active_watcher.stop()
+        _active_watcher = None
+
+
+def get_active_watcher():
+    """Returns the running OutputWatcher or None."""
+    return _active_watcher